@@ -0,0 +1,26 @@
+"""Banco de pruebas de rendimiento de ccepy.
+
+Mide el rendimiento de cada capa de la biblioteca (enteros módulo p,
+polinomios, cuerpos finitos, puntos de curvas elípticas y esquemas
+criptográficos) de forma reproducible: las semillas de los generadores
+aleatorios son fijas y no se usa la red.
+
+Se ejecuta como un módulo desde la raíz del repositorio: ::
+
+    # ejecuta todas las mediciones y guarda los resultados
+    python -m benchmarks --salida base.json
+
+    # solo las mediciones cuyo nombre contiene "ECDSA"
+    python -m benchmarks --filtro ECDSA
+
+    # compara con unos resultados guardados; termina con código 1 si
+    # alguna medición es más de un 10% más lenta
+    python -m benchmarks --comparar base.json --umbral 0.10
+
+    # lista las mediciones disponibles
+    python -m benchmarks --lista
+
+Las mediciones se definen en los módulos :mod:`benchmarks.aritmetica`,
+:mod:`benchmarks.curvas` y :mod:`benchmarks.esquemas` con el decorador
+:func:`benchmarks.nucleo.medicion`.
+"""
@@ -0,0 +1,48 @@
+import argparse
+import sys
+
+from benchmarks import nucleo
+from benchmarks import aritmetica, curvas, esquemas  # registran las mediciones
+
+
+def main(argv=None):
+    analizador = argparse.ArgumentParser(prog='python -m benchmarks',
+                                         description='Banco de pruebas de rendimiento de ccepy.')
+    analizador.add_argument('--filtro', help='expresión regular que deben contener los nombres')
+    analizador.add_argument('--lista', action='store_true', help='lista las mediciones y termina')
+    analizador.add_argument('--salida', help='fichero JSON donde guardar los resultados')
+    analizador.add_argument('--comparar', help='fichero JSON con unos resultados de referencia')
+    analizador.add_argument('--umbral', type=float, default=0.1,
+                            help='fracción de tiempo extra a partir de la cual hay regresión')
+    analizador.add_argument('--tiempo-minimo', type=float, default=0.2,
+                            help='segundos mínimos de cada repetición')
+    analizador.add_argument('--repeticiones', type=int, default=5)
+    args = analizador.parse_args(argv)
+
+    if args.lista:
+        for nombre in nucleo.nombres(args.filtro):
+            print(nombre)
+        return 0
+
+    def informa(nombre, resultado):
+        print("{0:<70} {1:>14.1f} op/s".format(nombre, resultado['operaciones_por_segundo']))
+
+    resultados = nucleo.ejecuta(args.filtro, args.tiempo_minimo, args.repeticiones, informa)
+    if args.salida:
+        nucleo.guarda(resultados, args.salida)
+
+    if args.comparar:
+        regresiones = 0
+        print()
+        for nombre, antes, ahora, cociente, regresion in nucleo.compara(
+                nucleo.carga(args.comparar), resultados, args.umbral):
+            regresiones += regresion
+            print("{0:<70} {1:>7.2f}x {2}".format(nombre, 1 / cociente,
+                                                  "REGRESIÓN" if regresion else ""))
+        if regresiones:
+            print("\n{0} regresiones".format(regresiones), file=sys.stderr)
+            return 1
+    return 0
+
+
+sys.exit(main())
@@ -0,0 +1,276 @@
+"""Mediciones de la aritmética de enteros módulo p, polinomios y cuerpos
+finitos."""
+import random
+
+from ccepy.aritmetica_elemental import Zp, PolinomioZp, alg_euclides, alg_euclides_polinomios, inverso_modular
+from ccepy.aritmetica_elemental import ArbolSubproductos, _euclides_coeficientes
+from ccepy.aritmetica_vectorial import VectorZp, PolinomioZpVectorial
+from ccepy.cuerpos_finitos import Fq
+
+from benchmarks.nucleo import medicion
+
+
+# primo de NIST P-256 y primo de Mersenne 2^31 - 1
+PRIMOS = {
+    'p256': 115792089210356248762697446949407573530086143415290314195533631308867097853951,
+    'p31': 2 ** 31 - 1,
+}
+
+
+def _registra_Zp(etiqueta, p):
+    @medicion("aritmetica/Zp.suma[{0}]".format(etiqueta))
+    def _():
+        Z = Zp(p)
+        a, b = Z(random.randrange(p)), Z(random.randrange(p))
+        return lambda: a + b
+
+    @medicion("aritmetica/Zp.multiplicacion[{0}]".format(etiqueta))
+    def _():
+        Z = Zp(p)
+        a, b = Z(random.randrange(p)), Z(random.randrange(p))
+        return lambda: a * b
+
+    @medicion("aritmetica/Zp.inverso[{0}]".format(etiqueta))
+    def _():
+        Z = Zp(p)
+        a = Z(random.randrange(1, p))
+        return a.inverso
+
+    @medicion("aritmetica/Zp.potencia[{0}]".format(etiqueta))
+    def _():
+        Z = Zp(p)
+        a, e = Z(random.randrange(1, p)), random.randrange(p)
+        return lambda: a ** e
+
+    @medicion("aritmetica/alg_euclides[{0}]".format(etiqueta))
+    def _():
+        a = random.randrange(1, p)
+        return lambda: alg_euclides(a, p)
+
+    @medicion("aritmetica/inverso_modular[{0}]".format(etiqueta))
+    def _():
+        a = random.randrange(1, p)
+        return lambda: inverso_modular(a, p, primo=True)
+
+
+for _etiqueta, _p in PRIMOS.items():
+    _registra_Zp(_etiqueta, _p)
+
+
+# enteros de 4096 bits: por encima del umbral de la variante de Lehmer
+@medicion("aritmetica/alg_euclides[4096 bits]")
+def _():
+    a, b = random.getrandbits(4096), random.getrandbits(4096)
+    return lambda: alg_euclides(a, b)
+
+
+def _registra_VectorZp(n, p):
+    # la misma operación con n objetos EnteroModuloP y con un VectorZp
+    @medicion("aritmetica/Zp.multiplicacion[p31, lista de {0}]".format(n))
+    def _():
+        Z = Zp(p)
+        a = [Z(random.randrange(p)) for _ in range(n)]
+        b = [Z(random.randrange(p)) for _ in range(n)]
+        return lambda: [x * y for x, y in zip(a, b)]
+
+    @medicion("aritmetica/VectorZp.multiplicacion[p31, {0} elementos]".format(n))
+    def _():
+        u = VectorZp([random.randrange(p) for _ in range(n)], p)
+        v = VectorZp([random.randrange(p) for _ in range(n)], p)
+        return lambda: u * v
+
+    @medicion("aritmetica/Zp.inverso[p31, lista de {0}]".format(n))
+    def _():
+        Z = Zp(p)
+        a = [Z(random.randrange(1, p)) for _ in range(n)]
+        return lambda: [x.inverso() for x in a]
+
+    @medicion("aritmetica/VectorZp.inverso[p31, {0} elementos]".format(n))
+    def _():
+        return VectorZp([random.randrange(1, p) for _ in range(n)], p).inverso
+
+    @medicion("aritmetica/VectorZp.producto_escalar[p31, {0} elementos]".format(n))
+    def _():
+        u = VectorZp([random.randrange(p) for _ in range(n)], p)
+        v = VectorZp([random.randrange(p) for _ in range(n)], p)
+        return lambda: u.producto_escalar(v)
+
+
+_registra_VectorZp(10 ** 5, PRIMOS['p31'])
+
+
+def _polinomio_aleatorio(grado, p):
+    return PolinomioZp([random.randrange(p) for _ in range(grado)] + [1], p)
+
+
+def _registra_PolinomioZp(grado, p):
+    @medicion("aritmetica/PolinomioZp.multiplicacion[p31, grado {0}]".format(grado))
+    def _():
+        f, g = _polinomio_aleatorio(grado, p), _polinomio_aleatorio(grado, p)
+        return lambda: f * g
+
+    @medicion("aritmetica/PolinomioZp.divmod[p31, grado {0}]".format(grado))
+    def _():
+        f, g = _polinomio_aleatorio(2 * grado, p), _polinomio_aleatorio(grado, p)
+        return lambda: divmod(f, g)
+
+    @medicion("aritmetica/alg_euclides_polinomios[p31, grado {0}]".format(grado))
+    def _():
+        f, g = _polinomio_aleatorio(grado, p), _polinomio_aleatorio(grado, p)
+        return lambda: alg_euclides_polinomios(f, g, p)
+
+
+for _grado in [8, 32, 128]:
+    _registra_PolinomioZp(_grado, PRIMOS['p31'])
+
+
+def _registra_PolinomioZpVectorial(grado, p):
+    @medicion("aritmetica/PolinomioZpVectorial.multiplicacion[p31, grado {0}]".format(grado))
+    def _():
+        f = PolinomioZpVectorial.de_polinomio(_polinomio_aleatorio(grado, p))
+        g = PolinomioZpVectorial.de_polinomio(_polinomio_aleatorio(grado, p))
+        return lambda: f * g
+
+    @medicion("aritmetica/PolinomioZpVectorial.divmod[p31, grado {0}]".format(grado))
+    def _():
+        f = PolinomioZpVectorial.de_polinomio(_polinomio_aleatorio(2 * grado, p))
+        g = PolinomioZpVectorial.de_polinomio(_polinomio_aleatorio(grado, p))
+        return lambda: divmod(f, g)
+
+    @medicion("aritmetica/PolinomioZpVectorial.evalua[p31, grado {0}, 10000 puntos]".format(grado))
+    def _():
+        f = PolinomioZpVectorial.de_polinomio(_polinomio_aleatorio(grado, p))
+        puntos = VectorZp([random.randrange(p) for _ in range(10000)], p)
+        return lambda: f.evalua(puntos)
+
+    @medicion("aritmetica/PolinomioZpVectorial.reduce_lote[p31, grado {0}, 1000 polinomios]"
+              .format(grado))
+    def _():
+        g = PolinomioZpVectorial.de_polinomio(_polinomio_aleatorio(grado, p))
+        polinomios = [PolinomioZpVectorial.de_polinomio(_polinomio_aleatorio(2 * grado, p))
+                      for _ in range(1000)]
+        return lambda: g.reduce_lote(polinomios)
+
+
+for _grado in [8, 32, 128, 1024]:
+    _registra_PolinomioZpVectorial(_grado, PRIMOS['p31'])
+
+
+def _registra_mcd(etiqueta, p, grado, algoritmo, umbral):
+    # umbral infinito: siempre el algoritmo clásico; umbral pequeño: siempre
+    # el medio mcd. Comparando las dos se ve el grado de cruce.
+    @medicion("aritmetica/mcd_polinomios[{0}, {1}, grado {2}]".format(algoritmo, etiqueta, grado))
+    def _():
+        f = [random.randrange(p) for _ in range(grado)] + [1]
+        g = [random.randrange(p) for _ in range(grado - 1)] + [1]
+        return lambda: _euclides_coeficientes(f, g, p, [([1], []), ([], [1])], umbral)
+
+
+for _etiqueta, _grados in [('p31', [64, 128, 256, 512, 1024]), ('p256', [256, 1024, 2048])]:
+    for _grado in _grados:
+        _registra_mcd(_etiqueta, PRIMOS[_etiqueta], _grado, 'clasico', float('inf'))
+        _registra_mcd(_etiqueta, PRIMOS[_etiqueta], _grado, 'medio', 32)
+
+
+def _registra_irreducible(etiqueta, p, grado):
+    # el peor caso del test es un polinomio irreducible
+    @medicion("aritmetica/PolinomioZp.es_irreducible[{0}, grado {1}]".format(etiqueta, grado))
+    def _():
+        f = PolinomioZp.genera_irreducible_disperso(grado, p)
+        return f.es_irreducible
+
+
+for _etiqueta, _p, _grado in [('p2', 2, 283), ('p3', 3, 100), ('p31', PRIMOS['p31'], 32)]:
+    _registra_irreducible(_etiqueta, _p, _grado)
+
+
+def _registra_factorizacion(etiqueta, p, grado):
+    @medicion("aritmetica/PolinomioZp.factoriza[{0}, grado {1}]".format(etiqueta, grado))
+    def _():
+        f = _polinomio_aleatorio(grado, p)
+        return f.factoriza
+
+    @medicion("aritmetica/PolinomioZp.raices[{0}, grado {1}]".format(etiqueta, grado))
+    def _():
+        f = _polinomio_aleatorio(grado, p)
+        return f.raices
+
+
+for _etiqueta, _p in [('p2', 2), ('p31', PRIMOS['p31']), ('p256', PRIMOS['p256'])]:
+    for _grado in [16, 64, 128]:
+        _registra_factorizacion(_etiqueta, _p, _grado)
+
+
+def _registra_evaluacion(etiqueta, p, n):
+    # polinomio de grado n - 1 en n puntos: punto a punto (Horner) frente al
+    # árbol de subproductos ya construido
+    def datos():
+        return _polinomio_aleatorio(n - 1, p), [random.randrange(p) for _ in range(n)]
+
+    @medicion("aritmetica/PolinomioZp.evalua[horner, {0}, {1} puntos]".format(etiqueta, n))
+    def _():
+        f, puntos = datos()
+        return lambda: [f.evalua(x) for x in puntos]
+
+    @medicion("aritmetica/PolinomioZp.evalua[arbol, {0}, {1} puntos]".format(etiqueta, n))
+    def _():
+        f, puntos = datos()
+        arbol = ArbolSubproductos(puntos, p)
+        arbol.evalua(f)  # calcula los inversos de los nodos
+        return lambda: f.evalua(arbol)
+
+    @medicion("aritmetica/PolinomioZp.interpola[{0}, {1} puntos]".format(etiqueta, n))
+    def _():
+        f, puntos = datos()
+        arbol = ArbolSubproductos(puntos, p)
+        valores = arbol.evalua(f)
+        arbol.interpola(valores)  # calcula los pesos de Lagrange
+        return lambda: PolinomioZp.interpola(arbol, valores, p)
+
+    @medicion("aritmetica/ArbolSubproductos[{0}, {1} puntos]".format(etiqueta, n))
+    def _():
+        puntos = datos()[1]
+        return lambda: ArbolSubproductos(puntos, p)
+
+
+for _etiqueta in ['p31', 'p256']:
+    for _n in [64, 256, 1024]:
+        _registra_evaluacion(_etiqueta, PRIMOS[_etiqueta], _n)
+
+
+# F_{2^8} con el polinomio de AES y F_{7^5}
+CUERPOS = {
+    'F2^8': (2, 8, PolinomioZp([1, 1, 0, 1, 1, 0, 0, 0, 1], 2)),
+    'F7^5': (7, 5, PolinomioZp([4, 1, 0, 0, 0, 1], 7)),
+}
+
+
+def _registra_Fq(etiqueta, p, n, pol_irreducible):
+    def aleatorio():
+        return Fq(p, n, pol_irreducible)([random.randrange(p) for _ in range(n)])
+
+    @medicion("cuerpos/Fq.suma[{0}]".format(etiqueta))
+    def _():
+        a, b = aleatorio(), aleatorio()
+        return lambda: a + b
+
+    @medicion("cuerpos/Fq.multiplicacion[{0}]".format(etiqueta))
+    def _():
+        a, b = aleatorio(), aleatorio()
+        return lambda: a * b
+
+    @medicion("cuerpos/Fq.inverso[{0}]".format(etiqueta))
+    def _():
+        a = aleatorio()
+        while a == 0:
+            a = aleatorio()
+        return a.inverso
+
+    @medicion("cuerpos/Fq.potencia[{0}]".format(etiqueta))
+    def _():
+        a, e = aleatorio(), random.randrange(p ** n)
+        return lambda: a ** e
+
+
+for _etiqueta, _parametros in CUERPOS.items():
+    _registra_Fq(_etiqueta, *_parametros)
@@ -0,0 +1,80 @@
+"""Mediciones de la aritmética de puntos de curvas elípticas."""
+import random
+
+from ccepy.curvas_elipticas import curva_eliptica_sobre_F2m, suma_multiescalar, TablaBaseFija
+from ccepy.cuerpos_finitos import Fq, PolinomioZp
+from ccepy.listado_curvas_elipticas import curvas_eliptipcas_sobre_Fq_famosas
+from ccepy.listado_curvas_elipticas import procesar_parametros_curva_eliptica
+
+from benchmarks.nucleo import medicion
+
+
+def _registra_curva(parametros):
+    nombre = parametros.nombre
+
+    def prepara():
+        E, generador, orden = procesar_parametros_curva_eliptica(parametros)
+        return E, generador, orden
+
+    @medicion("curvas/suma[{0}]".format(nombre))
+    def _():
+        E, generador, orden = prepara()
+        P, Q = random.randrange(orden) * generador, random.randrange(orden) * generador
+        return lambda: P + Q
+
+    @medicion("curvas/duplicacion[{0}]".format(nombre))
+    def _():
+        E, generador, orden = prepara()
+        P = random.randrange(orden) * generador
+        return lambda: P + P
+
+    @medicion("curvas/multiplicacion_escalar[{0}]".format(nombre))
+    def _():
+        E, generador, orden = prepara()
+        P, k = random.randrange(orden) * generador, random.randrange(orden)
+        return lambda: k * P
+
+    @medicion("curvas/TablaBaseFija.multiplica[{0}]".format(nombre))
+    def _():
+        E, generador, orden = prepara()
+        tabla = TablaBaseFija(generador, orden.bit_length())
+        k = random.randrange(orden)
+        return lambda: tabla.multiplica(k)
+
+    @medicion("curvas/suma_multiescalar[{0}, 16 puntos]".format(nombre))
+    def _():
+        E, generador, orden = prepara()
+        escalares = [random.randrange(orden) for _ in range(16)]
+        puntos = [random.randrange(orden) * generador for _ in range(16)]
+        return lambda: suma_multiescalar(escalares, puntos)
+
+
+for _parametros in curvas_eliptipcas_sobre_Fq_famosas:
+    _registra_curva(_parametros)
+
+
+def _curva_F2m():
+    # y^2 + x y = x^3 + a x^2 + b sobre F_{2^8} con el polinomio de AES
+    pol_irreducible = PolinomioZp([1, 1, 0, 1, 1, 0, 0, 0, 1], 2)
+    F = Fq(2, 8, pol_irreducible)
+    E = curva_eliptica_sobre_F2m(F([1]), F([0, 1]), 8, pol_irreducible)
+    for x in range(1, 256):
+        x = F([int(b) for b in reversed(bin(x)[2:])])
+        for y in range(256):
+            y = F([int(b) for b in reversed(bin(y)[2:])])
+            if E.contiene(x, y):
+                return E, E(x, y)
+
+
+@medicion("curvas/suma[F2^8]")
+def _():
+    E, P = _curva_F2m()
+    Q = 3 * P
+    return lambda: P + Q
+
+
+@medicion("curvas/multiplicacion_escalar[F2^8]")
+def _():
+    E, P = _curva_F2m()
+    k = random.randrange(128, 256)
+    return lambda: k * P
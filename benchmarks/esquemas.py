@@ -0,0 +1,64 @@
+"""Mediciones de extremo a extremo de los esquemas criptográficos para
+cada curva del listado."""
+from ccepy.esquemas_criptograficos import ECDH, ECDSA, Schnorr
+from ccepy.listado_curvas_elipticas import curvas_eliptipcas_sobre_Fq_famosas
+from ccepy.listado_curvas_elipticas import procesar_parametros_curva_eliptica
+
+from benchmarks.nucleo import medicion
+
+
+TAM_LOTE = 32
+
+
+def _registra_curva(parametros):
+    nombre = parametros.nombre
+
+    def participantes(clase, numero):
+        E, generador, orden = procesar_parametros_curva_eliptica(parametros)
+        return [clase(E, generador, orden) for _ in range(numero)]
+
+    @medicion("esquemas/ECDH.calcula_secreto_compartido[{0}]".format(nombre))
+    def _():
+        alicia, bob = participantes(ECDH, 2)
+        return lambda: alicia.calcula_secreto_compartido(bob.llave_publica)
+
+    @medicion("esquemas/ECDH.calcula_secretos_compartidos[{0}, lote de {1}]".format(nombre, TAM_LOTE))
+    def _():
+        alicia, *otros = participantes(ECDH, TAM_LOTE + 1)
+        llaves_publicas = [otro.llave_publica for otro in otros]
+        return lambda: alicia.calcula_secretos_compartidos(llaves_publicas)
+
+    @medicion("esquemas/ECDSA.firma[{0}]".format(nombre))
+    def _():
+        alicia, = participantes(ECDSA, 1)
+        return lambda: alicia.firma("mensaje")
+
+    @medicion("esquemas/ECDSA.verifica[{0}]".format(nombre))
+    def _():
+        alicia, bob = participantes(ECDSA, 2)
+        r, s = alicia.firma("mensaje")
+        return lambda: bob.verifica("mensaje", r, s, alicia.llave_publica)
+
+    @medicion("esquemas/Schnorr.firma[{0}]".format(nombre))
+    def _():
+        alicia, = participantes(Schnorr, 1)
+        return lambda: alicia.firma("mensaje")
+
+    @medicion("esquemas/Schnorr.verifica[{0}]".format(nombre))
+    def _():
+        alicia, bob = participantes(Schnorr, 2)
+        R, s = alicia.firma("mensaje")
+        return lambda: bob.verifica("mensaje", R, s, alicia.llave_publica)
+
+    @medicion("esquemas/Schnorr.verifica_lote[{0}, lote de {1}]".format(nombre, TAM_LOTE))
+    def _():
+        alicia, bob = participantes(Schnorr, 2)
+        firmas = []
+        for i in range(TAM_LOTE):
+            R, s = alicia.firma(str(i))
+            firmas.append((str(i), R, s, alicia.llave_publica))
+        return lambda: bob.verifica_lote(firmas)
+
+
+for _parametros in curvas_eliptipcas_sobre_Fq_famosas:
+    _registra_curva(_parametros)
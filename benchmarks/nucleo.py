@@ -0,0 +1,133 @@
+"""Registro, ejecución y comparación de mediciones."""
+import json
+import platform
+import random
+import re
+import sys
+import time
+from collections import OrderedDict
+
+
+SEMILLA = 5040
+
+# nombre -> función de preparación
+_mediciones = OrderedDict()
+
+
+def medicion(nombre):
+    """Registra una medición.
+
+    La función decorada prepara los datos (su tiempo no se mide) y devuelve
+    la función sin argumentos cuya ejecución se mide. ::
+
+        @medicion("aritmetica/Zp.mul")
+        def _():
+            Z = Zp(p)
+            a, b = Z(3), Z(5)
+            return lambda: a * b
+
+    Args:
+        nombre (str): el nombre de la medición, de la forma "capa/operación".
+    """
+    def registra(preparacion):
+        if nombre in _mediciones:
+            raise ValueError("La medición {0!r} ya existe.".format(nombre))
+        _mediciones[nombre] = preparacion
+        return preparacion
+    return registra
+
+
+def nombres(filtro=None):
+    """Devuelve los nombres de las mediciones registradas que contienen
+    la expresión regular *filtro*."""
+    return [nombre for nombre in _mediciones if filtro is None or re.search(filtro, nombre)]
+
+
+def mide(funcion, tiempo_minimo=0.2, repeticiones=5):
+    """Mide el tiempo por ejecución de *funcion*.
+
+    Se busca el número de ejecuciones n necesario para tardar al menos
+    *tiempo_minimo* segundos y se repite *repeticiones* veces la medida de
+    n ejecuciones. Se devuelve la mejor medida, que es la menos afectada
+    por el resto de procesos de la máquina.
+
+    Returns:
+        dict: los segundos por ejecución y el número de ejecuciones.
+    """
+    n = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(n):
+            funcion()
+        segundos = time.perf_counter() - inicio
+        if segundos >= tiempo_minimo:
+            break
+        n = max(n * 2, int(n * tiempo_minimo / max(segundos, 1e-9) * 1.1))
+
+    mejor = segundos / n
+    for _ in range(repeticiones - 1):
+        inicio = time.perf_counter()
+        for _ in range(n):
+            funcion()
+        mejor = min(mejor, (time.perf_counter() - inicio) / n)
+    return {'segundos_por_operacion': mejor, 'operaciones_por_segundo': 1 / mejor,
+            'ejecuciones': n, 'repeticiones': repeticiones}
+
+
+def ejecuta(filtro=None, tiempo_minimo=0.2, repeticiones=5, informa=None):
+    """Ejecuta las mediciones registradas.
+
+    Antes de preparar cada medición se fija la semilla de :mod:`random`,
+    así los datos de entrada son siempre los mismos.
+
+    Returns:
+        dict: los resultados (con metadatos) listos para guardarse en JSON.
+    """
+    resultados = OrderedDict()
+    for nombre in nombres(filtro):
+        random.seed(SEMILLA)
+        funcion = _mediciones[nombre]()
+        resultados[nombre] = mide(funcion, tiempo_minimo, repeticiones)
+        if informa is not None:
+            informa(nombre, resultados[nombre])
+    return {
+        'metadatos': {
+            'python': sys.version.split()[0],
+            'implementacion': platform.python_implementation(),
+            'plataforma': platform.platform(),
+            'semilla': SEMILLA,
+            'tiempo_minimo': tiempo_minimo,
+            'repeticiones': repeticiones,
+        },
+        'resultados': resultados,
+    }
+
+
+def compara(base, nuevos, umbral=0.1):
+    """Compara dos resultados de :func:`ejecuta`.
+
+    Returns:
+        List[Tuple]: para cada medición común, la tupla
+        (nombre, segundos base, segundos nuevos, cociente, es_regresion),
+        donde el cociente es nuevos / base y hay regresión si supera
+        1 + umbral.
+    """
+    comparacion = []
+    for nombre, nuevo in nuevos['resultados'].items():
+        if nombre not in base['resultados']:
+            continue
+        antes = base['resultados'][nombre]['segundos_por_operacion']
+        ahora = nuevo['segundos_por_operacion']
+        cociente = ahora / antes
+        comparacion.append((nombre, antes, ahora, cociente, cociente > 1 + umbral))
+    return comparacion
+
+
+def guarda(resultados, ruta):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+def carga(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
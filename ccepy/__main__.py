@@ -0,0 +1,5 @@
+import sys
+
+from ccepy.linea_comandos import main
+
+sys.exit(main())
@@ -43,10 +43,20 @@ habituales.
     X^6
 """
 from itertools import zip_longest
+import array
+import collections
+import itertools
+import multiprocessing
 import functools
 import math
 import copy
 import random
+import sys
+
+
+# Número de bits a partir del cual el algoritmo de Euclides para enteros
+# usa la variante de Lehmer
+_UMBRAL_LEHMER = 2048
 
 
 def alg_euclides(a, b):
@@ -58,6 +68,11 @@ def alg_euclides(a, b):
         >>> alg_euclides(54, 24)
         (1, -2, 6)
 
+    Para enteros de más de unos miles de bits se utiliza la variante de
+    Lehmer: los cocientes se calculan a partir de los bits más
+    significativos y se aplican de golpe a los enteros completos. El
+    resultado es el mismo que el del algoritmo clásico.
+
     Args:
         a (int): un número positivo.
         b (int): otro número positivo.
@@ -67,18 +82,84 @@ def alg_euclides(a, b):
     """
     if b > a:
         y, x, d = alg_euclides(b, a)  # Intercambiamos x, y
-    else:
-        if b == 0:
-            d, x, y = a, 1, 0
+        return x, y, d
+    x0, x1, y0, y1 = 1, 0, 0, 1
+    while b.bit_length() > _UMBRAL_LEHMER:
+        # se simulan los cocientes con los 62 bits más significativos; la
+        # condición de Collins garantiza que son los cocientes verdaderos
+        k = a.bit_length() - 62
+        a_alto, b_alto = a >> k, b >> k
+        A, B, C, D = 1, 0, 0, 1
+        while b_alto + C and b_alto + D:
+            q = (a_alto + A) // (b_alto + C)
+            if q != (a_alto + B) // (b_alto + D):
+                break
+            A, C = C, A - q * C
+            B, D = D, B - q * D
+            a_alto, b_alto = b_alto, a_alto - q * b_alto
+        if B == 0:
+            q, r = divmod(a, b)
+            a, b = b, r
+            x0, x1, y0, y1 = x1, x0 - q * x1, y1, y0 - q * y1
         else:
-            x2, x1, y2, y1 = 1, 0, 0, 1
-            while b > 0:
-                q, r = divmod(a, b)
-                x, y = x2 - q * x1, y2 - q * y1
-                a, b = b, r
-                x2, x1, y2, y1 = x1, x, y1, y
-            d, x, y = a, x2, y2
-    return x, y, d
+            a, b = A * a + B * b, C * a + D * b
+            x0, x1 = A * x0 + B * x1, C * x0 + D * x1
+            y0, y1 = A * y0 + B * y1, C * y0 + D * y1
+    while b > 0:
+        q, r = divmod(a, b)
+        a, b = b, r
+        x0, x1, y0, y1 = x1, x0 - q * x1, y1, y0 - q * y1
+    return x0, y0, a
+
+
+# pow(a, -1, m) está disponible a partir de Python 3.8
+try:
+    pow(2, -1, 3)
+    _POW_INVERSO = True
+except (TypeError, ValueError):
+    _POW_INVERSO = False
+
+# Número de bits hasta el cual, sin pow(a, -1, m), el inverso módulo un
+# primo se calcula más rápido con el pequeño teorema de Fermat que con el
+# algoritmo de Euclides
+_BITS_FERMAT = 20
+
+
+def inverso_modular(a, m, primo=False):
+    """Devuelve el inverso de a módulo m.
+
+        >>> inverso_modular(3, 7)
+        5
+        >>> inverso_modular(2**255 - 20, 2**255 - 19, primo=True) == 2**255 - 20
+        True
+
+    Se utiliza pow(a, -1, m), implementado en C, si está disponible (a
+    partir de Python 3.8). En otro caso se utiliza :func:`alg_euclides`
+    o, si m es un primo pequeño, :math:`a^{m - 2}`.
+
+    Args:
+        a (int): el entero a invertir.
+        m (int): el módulo, mayor que 1.
+        primo (bool): si se sabe que m es primo.
+
+    Returns:
+        int: el inverso, entre 1 y m - 1.
+
+    Raises:
+        ZeroDivisionError: si a y m no son coprimos.
+    """
+    if _POW_INVERSO:
+        try:
+            return pow(a, -1, m)
+        except ValueError:
+            raise ZeroDivisionError("{0} no es invertible módulo {1}.".format(a, m)) from None
+    a %= m
+    if primo and m.bit_length() <= _BITS_FERMAT and a:
+        return pow(a, m - 2, m)
+    x, _, d = alg_euclides(a, m)
+    if d != 1:
+        raise ZeroDivisionError("{0} no es invertible módulo {1}.".format(a, m))
+    return x % m
 
 
 def alg_euclides_polinomios(g, h, p):
@@ -96,6 +177,11 @@ def alg_euclides_polinomios(g, h, p):
         >>> alg_euclides_polinomios(f, g, p=2)
         (X^2 + X + 1, X^2 + 1, 1)
 
+    Para grados altos se utiliza el algoritmo del medio mcd (*half-gcd*),
+    que calcula recursivamente la primera mitad de los cocientes a partir
+    de la mitad superior de los coeficientes y tiene coste casi lineal en
+    el número de multiplicaciones de polinomios.
+
     Args:
         g (PolinomioZp): un polinomio no nulo con coeficientes enteros
             módulo p.
@@ -105,26 +191,850 @@ def alg_euclides_polinomios(g, h, p):
     Returns:
         List[PolinomioZp]: la lista [s, t, d].
     """
-    gg = PolinomioZp(g.coeficientes, p)
-    hh = PolinomioZp(h.coeficientes, p)
-    cero = PolinomioZp([0], p)
-    uno = PolinomioZp([1], p)
-    if hh == cero:
-        d, s, t = gg, uno, cero
-    else:
-        s2, s1, t2, t1 = uno, cero, cero, uno
-        while hh != cero:
-            q, r = divmod(gg, hh)
-            s, t = s2 - q * s1, t2 - q * t1
-            gg, hh = hh, r
-            s2, s1, t2, t1 = s1, s, t1, t
-        d, s, t = gg, s2, t2
-    if d.coeficiente_lider() != 1:
-        Z_p = Zp(p)
-        inverso = Z_p(d.coeficiente_lider()).inverso()
-        k = PolinomioZp([inverso], p)
-        s, t, d = s * k, t * k, d * k
-    return s, t, d
+    uno, cero = [1], []
+    d, (s, t) = _euclides_coeficientes(_recorta([int(c) for c in g.coeficientes]),
+                                       _recorta([int(c) for c in h.coeficientes]), p,
+                                       [(uno, cero), (cero, uno)])
+    inverso = inverso_modular(d[-1], p, primo=True)
+    return tuple(PolinomioZp([c * inverso % p for c in f] or [0], p) for f in (s, t, d))
+
+
+# Primos pequeños para la división por tentativa y las bases de Miller-Rabin
+_PRIMOS_PEQUENOS = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71,
+                    73, 79, 83, 89, 97, 101, 103, 107, 109, 113, 127, 131, 137, 139, 149, 151,
+                    157, 163, 167, 173, 179, 181, 191, 193, 197, 199, 211, 223, 227, 229, 233,
+                    239, 241, 251]
+
+
+def es_primo(n):
+    """Comprueba si un entero es primo (test de Miller-Rabin).
+
+        >>> es_primo(2**61 - 1)
+        True
+        >>> es_primo(2**61 + 1)
+        False
+
+    Con las bases utilizadas el test es determinista para n < 3.3 * 10^24;
+    para n mayores, la probabilidad de error es menor que 4^(-40).
+
+    Args:
+        n (int): un entero.
+
+    Returns:
+        bool: verdadero o falso.
+    """
+    if n < 2:
+        return False
+    for primo in _PRIMOS_PEQUENOS:
+        if n % primo == 0:
+            return n == primo
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+
+    bases = _PRIMOS_PEQUENOS[:13]
+    if n >= 3317044064679887385961981:
+        bases = bases + [random.randrange(2, n - 1) for _ in range(27)]
+    for base in bases:
+        x = pow(base, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def teorema_chino_resto(restos, modulos):
+    """Devuelve el x con x = r_i (mod m_i) para todo i (teorema chino del
+    resto).
+
+        >>> teorema_chino_resto([2, 3, 2], [3, 5, 7])
+        23
+
+    Args:
+        restos (List[int]): los restos r_i.
+        modulos (List[int]): los módulos m_i, coprimos dos a dos.
+
+    Returns:
+        int: el único x entre 0 y el producto de los módulos menos uno.
+    """
+    x, M = 0, 1
+    for r, m in zip(restos, modulos):
+        # x + M k = r (mod m)
+        k = (r - x) * inverso_modular(M, m) % m
+        x, M = x + M * k, M * m
+    return x % M
+
+
+def _raiz_entera(n):
+    """Devuelve la parte entera de la raíz cuadrada de n."""
+    if n < 2:
+        return n
+    x = 1 << ((n.bit_length() + 1) // 2)
+    while True:
+        y = (x + n // x) // 2
+        if y >= x:
+            return x
+        x = y
+
+
+def _factor_no_trivial(n):
+    """Devuelve un factor no trivial de un entero compuesto impar
+    (método rho de Pollard con la mejora de Brent)."""
+    while True:
+        c = random.randrange(1, n)
+        y = random.randrange(n)
+        m, g, r, q = 128, 1, 1, 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+        if g == n:
+            # se recorre el último bloque paso a paso
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def factoriza(n):
+    """Devuelve la factorización en primos de un entero positivo.
+
+        >>> factoriza(360)
+        {2: 3, 3: 2, 5: 1}
+        >>> factoriza(2**64 + 1)
+        {274177: 1, 67280421310721: 1}
+
+    Se usa división por tentativa para los primos pequeños y el método rho
+    de Pollard (con la mejora de Brent) para el resto, por lo que es
+    adecuado para enteros cuyo segundo mayor factor primo tenga a lo sumo
+    unos 60 bits.
+
+    Args:
+        n (int): un entero positivo.
+
+    Returns:
+        Dict[int, int]: a cada factor primo le asocia su exponente (los
+        primos están ordenados de menor a mayor).
+    """
+    if n < 1:
+        raise ValueError("n debe ser un entero positivo.")
+    factores = {}
+    for primo in _PRIMOS_PEQUENOS:
+        while n % primo == 0:
+            factores[primo] = factores.get(primo, 0) + 1
+            n //= primo
+
+    pendientes = [n] if n > 1 else []
+    while pendientes:
+        m = pendientes.pop()
+        if es_primo(m):
+            factores[m] = factores.get(m, 0) + 1
+        else:
+            d = _factor_no_trivial(m)
+            pendientes.extend([d, m // d])
+    return dict(sorted(factores.items()))
+
+
+# Aritmética de polinomios sobre listas de enteros.
+#
+# Los algoritmos que encadenan muchas operaciones con polinomios de grado
+# alto (conteo de puntos, factorización...) trabajan directamente con la
+# lista de coeficientes (enteros entre 0 y p - 1, ordenados de forma
+# ascendente y sin ceros al final; el polinomio cero es la lista vacía) y
+# solo construyen objetos :class:`PolinomioZp` al final.
+
+def _recorta(f):
+    """Elimina los ceros finales de la lista de coeficientes."""
+    while f and f[-1] == 0:
+        f.pop()
+    return f
+
+
+def _suma_coeficientes(f, g, p):
+    if len(f) < len(g):
+        f, g = g, f
+    return _recorta([(a + b) % p for a, b in zip_longest(f, g, fillvalue=0)])
+
+
+def _resta_coeficientes(f, g, p):
+    return _recorta([(a - b) % p for a, b in zip_longest(f, g, fillvalue=0)])
+
+
+# Tipos de array con 1, 2, 4 y 8 bytes por elemento, con los que se
+# empaquetan y desempaquetan los coeficientes sin recorrerlos en Python
+_TIPOS_ARRAY = {array.array(tipo).itemsize: tipo for tipo in "QLIHB"}
+
+
+def _tam_coeficiente(p, n):
+    """Número de bytes por coeficiente en la sustitución de Kronecker para
+    multiplicar polinomios de a lo sumo n coeficientes (redondeado a 1, 2,
+    4 u 8 bytes, si es posible, para poder usar array)."""
+    tam = (2 * (p - 1).bit_length() + n.bit_length() + 7) // 8
+    return next((t for t in (1, 2, 4, 8) if tam <= t and t in _TIPOS_ARRAY), tam)
+
+
+def _empaqueta(f, tam):
+    if tam in _TIPOS_ARRAY:
+        datos = array.array(_TIPOS_ARRAY[tam], f)
+        if sys.byteorder == 'big':
+            datos.byteswap()
+        return int.from_bytes(datos.tobytes(), 'little')
+    return int.from_bytes(b"".join(c.to_bytes(tam, 'little') for c in f), 'little')
+
+
+def _desempaqueta(H, n, tam, p):
+    datos = H.to_bytes(tam * n, 'little')
+    if tam in _TIPOS_ARRAY:
+        coeficientes = array.array(_TIPOS_ARRAY[tam])
+        coeficientes.frombytes(datos)
+        if sys.byteorder == 'big':
+            coeficientes.byteswap()
+        return _recorta([c % p for c in coeficientes])
+    return _recorta([int.from_bytes(datos[i:i + tam], 'little') % p
+                     for i in range(0, len(datos), tam)])
+
+
+def _producto_coeficientes(f, g, p):
+    """Multiplica dos polinomios mediante la sustitución de Kronecker: se
+    evalúan en una potencia de 2 suficientemente grande, se multiplican los
+    enteros resultantes y se recuperan los coeficientes."""
+    if not f or not g:
+        return []
+    if len(f) > len(g):
+        f, g = g, f
+    if len(f) <= 8:
+        # producto clásico si uno de los factores es pequeño
+        producto = [0] * (len(f) + len(g) - 1)
+        for i, c in enumerate(f):
+            if c:
+                producto[i:i + len(g)] = [a + c * b for a, b in zip(producto[i:i + len(g)], g)]
+        return _recorta([a % p for a in producto])
+    tam = _tam_coeficiente(p, len(f))
+    F = _empaqueta(f, tam)
+    H = F * F if g is f else F * _empaqueta(g, tam)
+    return _desempaqueta(H, len(f) + len(g) - 1, tam, p)
+
+
+def _divmod_coeficientes(f, g, p):
+    """Devuelve el cociente y el resto de la división (clásica) de f entre g."""
+    grado_g = len(g) - 1
+    if len(f) <= grado_g:
+        return [], list(f)
+    resto = list(f)
+    inverso = inverso_modular(g[-1], p, primo=True)
+    cociente = [0] * (len(f) - grado_g)
+    for i in range(len(f) - 1 - grado_g, -1, -1):
+        c = resto[i + grado_g] * inverso % p
+        cociente[i] = c
+        if c:
+            resto[i:i + grado_g] = [(a - c * b) % p for a, b in zip(resto[i:i + grado_g], g)]
+    return _recorta(cociente), _recorta(resto[:grado_g])
+
+
+# Grado a partir del cual el algoritmo de Euclides usa el medio mcd, para
+# primos de hasta 64 bits y para primos mayores (con coeficientes grandes el
+# producto de enteros de Python pierde ventaja frente a la división clásica)
+_UMBRALES_MEDIO_MCD = (128, 1024)
+
+
+def _umbral_medio_mcd(p):
+    return _UMBRALES_MEDIO_MCD[p.bit_length() > 64]
+
+
+def _paso_euclides(M, q, p):
+    """Devuelve el producto [[0, 1], [1, -q]] M (las matrices 2x2 de
+    polinomios se representan por filas)."""
+    a, b, c, d = M
+    return (c, d,
+            _resta_coeficientes(a, _producto_coeficientes(q, c, p), p),
+            _resta_coeficientes(b, _producto_coeficientes(q, d, p), p))
+
+
+def _aplica_matriz(M, u, v, p):
+    """Devuelve M (u, v)."""
+    a, b, c, d = M
+    return (_suma_coeficientes(_producto_coeficientes(a, u, p), _producto_coeficientes(b, v, p), p),
+            _suma_coeficientes(_producto_coeficientes(c, u, p), _producto_coeficientes(d, v, p), p))
+
+
+def _producto_matrices(M, N, p):
+    """Devuelve el producto M N."""
+    a, b, c, d = M
+    e, f, g, h = N
+    return _aplica_matriz((e, g, f, h), a, b, p) + _aplica_matriz((e, g, f, h), c, d, p)
+
+
+def _medio_mcd(a, b, p, umbral):
+    """Devuelve la matriz M del medio mcd de a y b (con grado a > grado b):
+    M (a, b) son dos restos consecutivos del algoritmo de Euclides, el
+    primero de grado al menos m = ceil(grado a / 2) y el segundo de grado
+    menor que m.
+
+    Solo la mitad superior de los coeficientes determina los cocientes
+    de la primera mitad del algoritmo, así que se calcula recursivamente
+    con a y b divididos entre X^m (y después con los restos divididos
+    entre X^k) y el coste es O(M(n) log(n)) en lugar de O(n^2)."""
+    n = len(a) - 1
+    m = (n + 1) // 2
+    M = ([1], [], [], [1])
+    if len(b) - 1 < m:
+        return M
+    if n < umbral:
+        while len(b) - 1 >= m:
+            q, r = _divmod_coeficientes(a, b, p)
+            a, b = b, r
+            M = _paso_euclides(M, q, p)
+        return M
+    M = _medio_mcd(a[m:], b[m:], p, umbral)
+    a, b = _aplica_matriz(M, a, b, p)
+    if len(b) - 1 < m:
+        return M
+    q, r = _divmod_coeficientes(a, b, p)
+    a, b = b, r
+    M = _paso_euclides(M, q, p)
+    if len(b) - 1 < m:
+        return M
+    k = 2 * m - (len(a) - 1)
+    return _producto_matrices(_medio_mcd(a[k:], b[k:], p, umbral), M, p)
+
+
+def _euclides_coeficientes(a, b, p, cofactores=(), umbral=None):
+    """Algoritmo de Euclides para a y b: devuelve el último resto no nulo
+    (sin normalizar) y la lista de cofactores.
+
+    Cada elemento de cofactores es un par (x0, x1) que se transforma como
+    el par de restos (a, b); por ejemplo, con ([1], []) y ([], [1]) se
+    obtienen los coeficientes de Bézout de a y b. Por encima del umbral (de
+    grado) se avanza con el medio mcd y un paso de división."""
+    if umbral is None:
+        umbral = _umbral_medio_mcd(p)
+    cofactores = list(cofactores)
+    while b:
+        if len(b) - 1 >= umbral and len(a) > len(b):
+            M = _medio_mcd(a, b, p, umbral)
+            a, b = _aplica_matriz(M, a, b, p)
+            cofactores = [_aplica_matriz(M, x0, x1, p) for x0, x1 in cofactores]
+            if not b:
+                break
+        q, r = _divmod_coeficientes(a, b, p)
+        a, b = b, r
+        cofactores = [(x1, _resta_coeficientes(x0, _producto_coeficientes(q, x1, p), p))
+                      for x0, x1 in cofactores]
+    return a, [x0 for x0, _ in cofactores]
+
+
+def _mcd_extendido_coeficientes(f, g, p):
+    """Devuelve (s, d) con s f = d (mod g) y d el máximo común divisor
+    mónico de f y g."""
+    d, (s,) = _euclides_coeficientes(g, f, p, [([], [1])])
+    inverso = inverso_modular(d[-1], p, primo=True)
+    return [c * inverso % p for c in s], [c * inverso % p for c in d]
+
+
+def _mcd_coeficientes(f, g, p):
+    """Devuelve el máximo común divisor mónico de f y g."""
+    d, _ = _euclides_coeficientes(f, g, p)
+    if not d:
+        return []
+    inverso = inverso_modular(d[-1], p, primo=True)
+    return [c * inverso % p for c in d]
+
+
+def _es_irreducible_coeficientes(f, p):
+    """Comprueba si el polinomio mónico f es irreducible mediante el test de
+    Ben-Or: f es reducible si y solo si comparte factor con algún
+    X^(p^i) - X con i <= grado / 2.
+
+    Los X^(p^i) se obtienen aplicando sucesivamente el automorfismo de
+    Frobenius en Z_p[X] / (f) y, en lugar de un mcd por cada i, se calcula
+    un mcd por bloque con el producto de los X^(p^i) - X del bloque. Los
+    bloques crecen (1, 1, 2, 4, ...) porque los factores de grado pequeño
+    son los más frecuentes: la mayoría de los polinomios reducibles se
+    descartan en los primeros pasos."""
+    n = len(f) - 1
+    if n <= 1:
+        return n == 1
+    if f[0] == 0:
+        return False
+    if p == 2:
+        return _es_irreducible_binario(int("".join(map(str, reversed(f))), 2), n)
+    anillo = _AnilloCociente(f, p)
+    x = [0, 1]
+    u = x_p = anillo.potencia(x, p)
+    frobenius = None
+    producto, fin_bloque = [1], 1
+    for i in range(1, n // 2 + 1):
+        if i > 1:
+            if frobenius is None and i >= 3:
+                # a partir de aquí compensa precalcular los X^(j p)
+                frobenius = anillo.frobenius(x_p)
+            u = anillo.potencia(u, p) if frobenius is None else frobenius(u)
+        producto = anillo.producto(producto, _resta_coeficientes(u, x, p))
+        if i == fin_bloque or i == n // 2:
+            if len(_mcd_coeficientes(f, producto, p)) > 1:
+                return False
+            producto, fin_bloque = [1], 2 * fin_bloque
+    return True
+
+
+# Aritmética de Z_2[X] con los polinomios representados por los bits de un
+# entero (el bit i es el coeficiente de X^i), que permite usar las
+# operaciones de bits de Python en lugar de listas.
+
+# el cuadrado intercala un cero entre cada par de bits (interpretar los
+# dígitos binarios en base 4)
+_BYTES_ESPARCIDOS = [int(format(i, 'b'), 4).to_bytes(2, 'little') for i in range(256)]
+
+
+def _cuadrado_binario(a):
+    datos = a.to_bytes((a.bit_length() + 7) // 8, 'little')
+    return int.from_bytes(b"".join([_BYTES_ESPARCIDOS[b] for b in datos]), 'little')
+
+
+def _reduce_binario(a, f, n, terminos):
+    """Devuelve a mod f, con f de grado n. Si f es disperso (terminos son
+    los exponentes de f menores que n), se reducen todos los bits altos a
+    la vez."""
+    if terminos is not None:
+        mascara = (1 << n) - 1
+        while a >> n:
+            alto = a >> n
+            a &= mascara
+            for e in terminos:
+                a ^= alto << e
+        return a
+    while a.bit_length() > n:
+        a ^= f << (a.bit_length() - 1 - n)
+    return a
+
+
+def _mcd_binario(a, b):
+    while b:
+        grado_b = b.bit_length()
+        while a.bit_length() >= grado_b:
+            a ^= b << (a.bit_length() - grado_b)
+        a, b = b, a
+    return a
+
+
+def _es_irreducible_binario(f, n):
+    """Test de Ben-Or para f en Z_2[X] de grado n."""
+    if bin(f).count("1") % 2 == 0:
+        return False  # f(1) = 0
+    terminos = [e for e in range(n) if f >> e & 1]
+    if len(terminos) > 8 or terminos[-1] > n // 2:
+        terminos = None
+    u = 2  # X
+    for _ in range(n // 2):
+        u = _reduce_binario(_cuadrado_binario(u), f, n, terminos)
+        if _mcd_binario(f, u ^ 2) != 1:
+            return False
+    return True
+
+
+# Número de candidatos que se envían juntos a cada proceso
+_TAM_LOTE_IRREDUCIBLES = 8
+
+
+def _primer_irreducible(argumentos):
+    lote, p = argumentos
+    return next((f for f in lote if _es_irreducible_coeficientes(f, p)), None)
+
+
+def _busca_irreducible(candidatos, p, procesos=1):
+    """Devuelve el primer candidato irreducible (en el orden de la
+    sucesión), repartiendo los candidatos en lotes entre varios procesos."""
+    if procesos <= 1:
+        return next(f for f in candidatos if _es_irreducible_coeficientes(f, p))
+    pool = multiprocessing.Pool(procesos)
+    try:
+        pendientes = collections.deque()
+
+        def envia():
+            lote = list(itertools.islice(candidatos, _TAM_LOTE_IRREDUCIBLES))
+            if lote:
+                pendientes.append(pool.apply_async(_primer_irreducible, ((lote, p),)))
+
+        # se mantienen 2 lotes por proceso en curso
+        for _ in range(2 * procesos):
+            envia()
+        while pendientes:
+            f = pendientes.popleft().get()
+            if f is not None:
+                return f
+            envia()
+        return None
+    finally:
+        # cancela los lotes pendientes
+        pool.terminate()
+
+
+# Factorización de polinomios (libre de cuadrados, por grados distintos y
+# Cantor-Zassenhaus) sobre listas de coeficientes.
+
+def _monico(f, p):
+    inverso = inverso_modular(f[-1], p, primo=True)
+    return [c * inverso % p for c in f]
+
+
+def _derivada_coeficientes(f, p):
+    return _recorta([i * c % p for i, c in enumerate(f)][1:])
+
+
+def _libre_de_cuadrados(f, p):
+    """Devuelve una lista de pares (g, e) con g mónico libre de cuadrados,
+    primos entre sí, y f = prod g^e (f mónico)."""
+    resultado = []
+    c = _mcd_coeficientes(f, _derivada_coeficientes(f, p), p)
+    w = _divmod_coeficientes(f, c, p)[0]
+    e = 1
+    while len(w) > 1:
+        y = _mcd_coeficientes(w, c, p)
+        factor = _divmod_coeficientes(w, y, p)[0]
+        if len(factor) > 1:
+            resultado.append((factor, e))
+        w, c = y, _divmod_coeficientes(c, y, p)[0]
+        e += 1
+    if len(c) > 1:
+        # c tiene derivada nula, luego es la potencia p-ésima del polinomio
+        # con coeficientes c_0, c_p, c_2p, ...
+        resultado.extend((g, e * p) for g, e in _libre_de_cuadrados(c[::p], p))
+    return resultado
+
+
+def _factores_grado_distinto(f, p):
+    """Devuelve una lista de pares (g, d) con g el producto de los factores
+    irreducibles de grado d de f (mónico y libre de cuadrados): el mcd de f
+    y X^(p^d) - X, una vez quitados los factores de grado menor.
+
+    Los mcd se calculan por bloques de grados consecutivos: se multiplican
+    (módulo f) los X^(p^d) - X del bloque y, solo si el mcd de f con el
+    producto no es 1, se separan los factores según su grado."""
+    resultado = []
+    x = [0, 1]
+    anillo, frobenius = _AnilloCociente(f, p), None
+    x_p = anillo.potencia(x, p)
+    u, d = x, 0
+    bloque = max(1, _raiz_entera(len(f) - 1) // 2)
+    while len(f) - 1 >= 2 * (d + 1):
+        diferencias, producto = [], [1]
+        while len(diferencias) < bloque and len(f) - 1 >= 2 * (d + 1):
+            d += 1
+            if d == 1:
+                u = x_p
+            else:
+                if frobenius is None:
+                    frobenius = (lambda u: anillo.producto(u, u)) if p == 2 else anillo.frobenius(x_p)
+                u = frobenius(u)
+            diferencias.append((d, _resta_coeficientes(u, x, p)))
+            producto = anillo.producto(producto, diferencias[-1][1])
+        g = _mcd_coeficientes(f, producto, p)
+        if len(g) == 1:
+            continue
+        f = _divmod_coeficientes(f, g, p)[0]
+        for e, diferencia in diferencias:
+            h = _mcd_coeficientes(g, diferencia, p)
+            if len(h) > 1:
+                resultado.append((h, e))
+                g = _divmod_coeficientes(g, h, p)[0]
+        if 2 * (len(f) - 1) < anillo.grado:
+            # se sigue trabajando módulo f, que ahora es mucho menor
+            anillo, frobenius = _AnilloCociente(f, p), None
+            u, x_p = anillo.reduce(u), anillo.reduce(x_p)
+    if len(f) > 1:
+        resultado.append((f, len(f) - 1))
+    return resultado
+
+
+def _factores_mismo_grado(f, d, p):
+    """Devuelve los factores irreducibles de f (mónico, producto de
+    irreducibles distintos de grado d) con el algoritmo de Cantor-Zassenhaus.
+
+    Para a aleatorio, b = a^((p^d - 1) / 2) - 1 (o la traza
+    a + a^2 + ... + a^(2^(d - 1)) si p = 2) se anula módulo cada factor
+    con probabilidad 1/2, luego mcd(f, b) suele ser un factor propio."""
+    if len(f) - 1 == d:
+        return [f]
+    n = len(f) - 1
+    anillo = _AnilloCociente(f, p)
+    frobenius = anillo.frobenius() if p > 2 and d > 1 else None
+    while True:
+        a = _recorta([random.randrange(p) for _ in range(n)])
+        if len(a) < 2:
+            continue
+        t = b = a
+        if p == 2:
+            for _ in range(d - 1):
+                t = anillo.producto(t, t)
+                b = _suma_coeficientes(b, t, p)
+        else:
+            # a^((p^d - 1) / 2) = (a a^p ... a^(p^(d - 1)))^((p - 1) / 2)
+            for _ in range(d - 1):
+                t = frobenius(t)
+                b = anillo.producto(b, t)
+            b = _resta_coeficientes(anillo.potencia(b, (p - 1) // 2), [1], p)
+        g = _mcd_coeficientes(f, b, p)
+        if 1 < len(g) < len(f):
+            h = _divmod_coeficientes(f, g, p)[0]
+            return _factores_mismo_grado(g, d, p) + _factores_mismo_grado(h, d, p)
+
+
+def _factoriza_coeficientes(f, p):
+    """Devuelve la lista ordenada de pares (g, e) con g irreducible mónico
+    y f = prod g^e (f mónico)."""
+    factores = []
+    for g, e in _libre_de_cuadrados(f, p):
+        for h, d in _factores_grado_distinto(g, p):
+            factores.extend((k, e) for k in _factores_mismo_grado(h, d, p))
+    return sorted(factores, key=lambda factor: (len(factor[0]), factor[0][::-1]))
+
+
+def _raices_coeficientes(f, p):
+    """Devuelve las raíces distintas de f (mónico) en Z_p ordenadas: las de
+    mcd(f, X^p - X), que es el producto de los factores lineales."""
+    if len(f) <= 1:
+        return []
+    x = [0, 1]
+    anillo = _AnilloCociente(f, p)
+    g = _mcd_coeficientes(f, _resta_coeficientes(anillo.potencia(x, p), x, p), p)
+    if len(g) <= 1:
+        return []
+    return sorted((-h[0]) % p for h in _factores_mismo_grado(g, 1, p))
+
+
+# Evaluación en varios puntos e interpolación con el árbol de subproductos
+# sobre listas de coeficientes.
+
+# Número de puntos a partir del cual el árbol de subproductos deja de
+# reducir y se evalúa con el método de Horner
+_HOJA_SUBPRODUCTOS = 32
+
+# Número de puntos y de coeficientes a partir del cual PolinomioZp.evalua
+# usa el árbol de subproductos en lugar de evaluar punto a punto
+_UMBRAL_SUBPRODUCTOS = 256
+
+
+def _inverso_serie(h, n, p):
+    """Devuelve el inverso de h (con h[0] no nulo) como serie de potencias
+    módulo X^n mediante la iteración de Newton g <- g (2 - h g)."""
+    g, k = [inverso_modular(h[0], p, primo=True)], 1
+    while k < n:
+        k = min(2 * k, n)
+        e = _producto_coeficientes(h[:k], g, p)[:k]
+        e = [(-c) % p for c in e] + [0] * (k - len(e))
+        e[0] = (e[0] + 2) % p
+        g = _recorta(_producto_coeficientes(g, _recorta(e), p)[:k])
+    return g
+
+
+def _resto_serie(f, g, inverso, p):
+    """Devuelve el resto de f entre g con dos multiplicaciones, dado el
+    inverso de g invertido (los coeficientes en orden inverso) módulo X^k
+    con k >= len(f) - len(g) + 1."""
+    d = len(g) - 1
+    k = len(f) - d  # número de coeficientes del cociente
+    if k <= 0:
+        return f
+    cociente = _producto_coeficientes(_recorta(f[:-k - 1:-1]), inverso[:k], p)[:k]
+    cociente = (cociente + [0] * (k - len(cociente)))[::-1]
+    return _resta_coeficientes(f[:d], _producto_coeficientes(cociente, g, p)[:d], p)
+
+
+def _horner(f, puntos, p):
+    """Evalúa f en cada punto con el método de Horner."""
+    valores = []
+    for x in puntos:
+        valor = 0
+        for c in reversed(f):
+            valor = (valor * x + c) % p
+        valores.append(valor)
+    return valores
+
+
+class _NodoSubproductos(object):
+    """Nodo del árbol de subproductos: el producto de los X - x_i con
+    inicio <= i < fin y, si se necesita, el inverso del producto invertido."""
+    __slots__ = ('producto', 'inverso', 'hijos', 'inicio', 'fin')
+
+    def __init__(self, puntos, inicio, fin, p):
+        self.inicio, self.fin, self.inverso = inicio, fin, None
+        if fin - inicio == 1:
+            self.producto, self.hijos = [(-puntos[inicio]) % p, 1], None
+        else:
+            medio = (inicio + fin) // 2
+            self.hijos = (_NodoSubproductos(puntos, inicio, medio, p),
+                          _NodoSubproductos(puntos, medio, fin, p))
+            self.producto = _producto_coeficientes(self.hijos[0].producto,
+                                                   self.hijos[1].producto, p)
+
+    def resto(self, f, p):
+        """Devuelve f módulo el producto, con f de grado menor que el del
+        nodo padre (el cociente no tiene más coeficientes que el nodo)."""
+        if len(f) < len(self.producto):
+            return f
+        if self.inverso is None:
+            self.inverso = _inverso_serie(self.producto[::-1], len(self.producto), p)
+        return _resto_serie(f, self.producto, self.inverso, p)
+
+
+def _combinaciones_colex(m, limite):
+    """Genera las m-tuplas crecientes de enteros en [1, limite) ordenadas
+    por su último elemento, después por el penúltimo, etc."""
+    if m == 0:
+        yield ()
+        return
+    for mayor in range(m, limite):
+        for resto in _combinaciones_colex(m - 1, mayor):
+            yield resto + (mayor,)
+
+
+def _tuplas_no_nulas(m, p):
+    """Genera las m-tuplas de enteros en [1, p) en orden lexicográfico
+    (sin construir las listas completas, p puede ser grande)."""
+    if m == 0:
+        yield ()
+        return
+    for c in range(1, p):
+        for resto in _tuplas_no_nulas(m - 1, p):
+            yield (c,) + resto
+
+
+def _candidatos_dispersos(grado, p):
+    """Genera los polinomios mónicos de dicho grado con término
+    independiente no nulo, de menos a más términos."""
+    for terminos in range(2, grado + 2):
+        if p == 2 and grado > 1 and terminos % 2 == 0:
+            continue  # se anulan en 1, luego son divisibles por X + 1
+        if terminos == 2 and grado > 1:
+            # X^n - a solo puede ser irreducible si todo primo que divide
+            # a n divide a p - 1 y, si 4 | n, p = 1 (mod 4)
+            if any((p - 1) % r for r in factoriza(grado)) or (grado % 4 == 0 and p % 4 != 1):
+                continue
+        for exponentes in _combinaciones_colex(terminos - 2, grado):
+            for coeficientes in _tuplas_no_nulas(terminos - 1, p):
+                f = [0] * grado + [1]
+                f[0] = coeficientes[0]
+                for e, c in zip(exponentes, coeficientes[1:]):
+                    f[e] = c
+                yield f
+
+
+class _AnilloCociente(object):
+    """Aritmética en Z_p[X] / (h) sobre listas de coeficientes.
+
+    La reducción módulo h usa el método de Barrett: se precalcula el
+    inverso de h invertido como serie de potencias, de modo que cada
+    reducción cuesta dos multiplicaciones (con los factores fijos ya
+    empaquetados para la sustitución de Kronecker)."""
+    def __init__(self, h, p):
+        inverso = inverso_modular(h[-1], p, primo=True)
+        self.h = [c * inverso % p for c in h]  # mónico
+        self.p = p
+        self.grado = d = len(h) - 1
+        # inverso de rev(h) módulo X^(d - 1) mediante la iteración de Newton
+        precision = max(d - 1, 1)
+        self._inverso_invertido = g = _inverso_serie(self.h[::-1], precision, p)
+        self._tam = _tam_coeficiente(p, d + 1)
+        self._h_empaquetado = _empaqueta(self.h, self._tam)
+        self._inverso_empaquetado = _empaqueta(g + [0] * (precision - len(g)), self._tam)
+
+    def reduce(self, f):
+        d, p, tam = self.grado, self.p, self._tam
+        if len(f) <= d:
+            return f
+        if len(f) > 2 * d - 1:
+            return _divmod_coeficientes(f, self.h, p)[1]
+        k = len(f) - d  # número de coeficientes del cociente
+        # rev(cociente) = rev(f) * rev(h)^(-1) (mod X^k)
+        if k == d - 1:
+            producto = _empaqueta(f[:-k - 1:-1], tam) * self._inverso_empaquetado
+        else:
+            producto = _empaqueta(f[:-k - 1:-1], tam) * _empaqueta(self._inverso_invertido[:k], tam)
+        cociente = _desempaqueta(producto & ((1 << (8 * tam * k)) - 1), k, tam, p)
+        cociente = (cociente + [0] * (k - len(cociente)))[::-1]
+        # resto = f - cociente * h, del que solo interesan los d primeros coeficientes
+        producto = (_empaqueta(cociente, tam) * self._h_empaquetado) & ((1 << (8 * tam * d)) - 1)
+        producto = _desempaqueta(producto, d, tam, p)
+        return _recorta([(a - b) % p for a, b in zip_longest(f[:d], producto, fillvalue=0)])
+
+    def producto(self, f, g):
+        return self.reduce(_producto_coeficientes(f, g, self.p))
+
+    def frobenius(self, x_p=None):
+        """Devuelve una función que calcula u^p.
+
+        Se usa que u -> u^p es lineal: u^p = u(X^p) = sum u_j X^(j p), de
+        modo que, precalculados los X^(j p) (empaquetados para la
+        sustitución de Kronecker), cada aplicación es una combinación lineal
+        de enteros en lugar de una exponenciación (incluso para p = 3 es
+        más rápido). Se puede pasar X^p si ya se ha calculado."""
+        p, d = self.p, self.grado
+        tam = _tam_coeficiente(p, d)
+        if x_p is None:
+            x_p = self.potencia([0, 1], p)
+        columnas, actual = [], [1]
+        for _ in range(d):
+            columnas.append(_empaqueta(actual, tam))
+            actual = self.producto(actual, x_p)
+
+        def aplica(u):
+            total = 0
+            for c, columna in zip(u, columnas):
+                if c:
+                    total += c * columna
+            return _desempaqueta(total, d, tam, p)
+        return aplica
+
+    def potencia(self, f, n):
+        """Calcula f^n mediante exponenciación por ventanas deslizantes."""
+        base = self.reduce(list(f))
+        if n == 0:
+            return [1] if self.grado > 0 else []
+        ancho = 1 if n.bit_length() < 16 else 4
+        # potencias impares f, f^3, ..., f^(2^ancho - 1)
+        cuadrado = self.producto(base, base)
+        impares = [base]
+        for _ in range((1 << (ancho - 1)) - 1):
+            impares.append(self.producto(impares[-1], cuadrado))
+
+        bits = bin(n)[2:]
+        resultado = None
+        i = 0
+        while i < len(bits):
+            if bits[i] == "0":
+                resultado = self.producto(resultado, resultado)
+                i += 1
+                continue
+            # ventana más larga (a lo sumo ancho bits) que termina en 1
+            j = min(i + ancho, len(bits))
+            while bits[j - 1] == "0":
+                j -= 1
+            valor = int(bits[i:j], 2)
+            if resultado is None:
+                resultado = impares[valor // 2]
+            else:
+                for _ in range(j - i):
+                    resultado = self.producto(resultado, resultado)
+                resultado = self.producto(resultado, impares[valor // 2])
+            i = j
+        return resultado
 
 
 @functools.lru_cache()
@@ -205,7 +1115,9 @@ def Zp(p):
         #    pass
 
         def __eq__(self, m):
-            return super().__eq__(EnteroModuloP(m))
+            if type(m) is not EnteroModuloP:
+                m = EnteroModuloP(m)
+            return int.__eq__(self, m)
 
         def __ne__(self, m):
             return not self.__eq__(m)
@@ -249,8 +1161,7 @@ def Zp(p):
             if self == 0:
                 raise ZeroDivisionError
 
-            x, y, d = alg_euclides(self, EnteroModuloP.p)
-            return EnteroModuloP(x)
+            return EnteroModuloP(inverso_modular(int(self), EnteroModuloP.p, primo=True))
 
         def __truediv__(self, m):
             return self * EnteroModuloP(m).inverso()
@@ -262,11 +1173,20 @@ def Zp(p):
         def __hash__(self):
             return super().__hash__()
 
+        # Necesario para enviar enteros a otros procesos (multiprocessing)
+        def __reduce__(self):
+            return (_reconstruye_entero_modulo_p, (EnteroModuloP.p, int(self)))
+
     EnteroModuloP.p = p
     EnteroModuloP.__name__ = "Z{0}".format(p)
     return EnteroModuloP
 
 
+def _reconstruye_entero_modulo_p(p, entero):
+    """Reconstruye un :class:`EnteroModuloP` serializado con pickle."""
+    return Zp(p)(entero)
+
+
 class PolinomioZp:
     """Representa un polinomio con coeficientes enteros módulo un primo p.
 
@@ -290,12 +1210,20 @@ class PolinomioZp:
     tipo :class:`PolinomioZp` y otro de tipo :py:class:`int`. En ambos casos el
     resultado será de tipo :class:`PolinomioZp`.
 
+    Los polinomios son inmutables y se pueden usar como claves de un
+    diccionario o elementos de un conjunto:
+
+        >>> len({f, g, PolinomioZp([0, 0, 1], p=2)})
+        2
+
     Args:
         coeficientes (List[int]): los coeficientes del polinomio ordenados
             de forma ascendente, esto es, el primero el término constante y
             el último el coeficiente líder.
         p (int): el primo p.
     """
+    __slots__ = ('_coeficientes', '_hash')
+
     def __init__(self, coeficientes, p):
         # Queremos que el último coeficiente no sea nulo
         # (excepto si es el polinomio cero)
@@ -308,7 +1236,21 @@ class PolinomioZp:
         else:
             ultimo_coef = 0
 
-        self._coeficientes = [Z_p(c) for c in coeficientes[:ultimo_coef + 1]]
+        object.__setattr__(self, '_coeficientes',
+                           tuple(Z_p(c) for c in coeficientes[:ultimo_coef + 1]))
+        object.__setattr__(self, '_hash', None)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Los polinomios son inmutables.")
+
+    __delattr__ = __setattr__
+
+    # Al ser inmutables, las copias pueden ser el propio objeto
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     @property
     def coeficientes(self):
@@ -316,7 +1258,7 @@ class PolinomioZp:
         forma ascendente, esto es, el primero es el término constante y el
         último el coeficiente líder. Es un atributo de solo lectura.
         """
-        return self._coeficientes
+        return list(self._coeficientes)
 
     def primo(self):
         """Devuelve el primo p."""
@@ -356,10 +1298,10 @@ class PolinomioZp:
         Returns:
             int: el grado del polinomio.
         """
-        if self == PolinomioZp([0], self.primo()):
+        if len(self._coeficientes) == 1 and self._coeficientes[0] == 0:
             return -math.inf
         else:
-            return len(self.coeficientes) - 1
+            return len(self._coeficientes) - 1
 
     def coeficiente_lider(self):
         """Devuelve el coeficiente asociado al término de mayor exponente.
@@ -373,7 +1315,120 @@ class PolinomioZp:
         Returns:
             EnteroModuloP: el coeficiente asociado al mayor exponente.
         """
-        return self.coeficientes[-1]
+        return self._coeficientes[-1]
+
+    def factoriza(self):
+        """Devuelve la factorización del polinomio en polinomios
+        irreducibles mónicos.
+
+            >>> f = PolinomioZp([2, 0, 0, 0, 2, 1], p=3)
+            >>> f
+            X^5 + 2*X^4 + 2
+            >>> f.factoriza()
+            {X + 1: 2, X^3 + 2*X + 2: 1}
+
+        Primero se separan los factores según su multiplicidad
+        (factorización libre de cuadrados), después según su grado (los de
+        grado d dividen a X^(p^d) - X) y, por último, se separan los de un
+        mismo grado con el algoritmo probabilístico de Cantor-Zassenhaus.
+
+        Returns:
+            dict: un diccionario {factor: multiplicidad} ordenado por grado.
+            El producto de los factores es el polinomio dividido entre su
+            coeficiente líder.
+
+        Raises:
+            ValueError: si el polinomio es nulo.
+        """
+        p = self.primo()
+        if self == 0:
+            raise ValueError("El polinomio nulo no se puede factorizar.")
+        f = _monico([int(c) for c in self._coeficientes], p)
+        return {PolinomioZp(g, p): e for g, e in _factoriza_coeficientes(f, p)}
+
+    def raices(self):
+        """Devuelve las raíces en Z_p del polinomio, sin repetir y ordenadas.
+
+            >>> f = PolinomioZp([2, 0, 0, 0, 2, 1], p=3)
+            >>> f.raices()
+            [2]
+            >>> PolinomioZp([1, 0, 1], p=7).raices()  # X^2 + 1
+            []
+
+        Returns:
+            List[EnteroModuloP]: las raíces.
+
+        Raises:
+            ValueError: si el polinomio es nulo.
+        """
+        p = self.primo()
+        if self == 0:
+            raise ValueError("El polinomio nulo no tiene un número finito de raíces.")
+        f = _monico([int(c) for c in self._coeficientes], p)
+        Z_p = Zp(p)
+        return [Z_p(r) for r in _raices_coeficientes(f, p)]
+
+    def evalua(self, puntos):
+        """Evalúa el polinomio en un punto o en una lista de puntos.
+
+            >>> f = PolinomioZp([1, 0, 3, 1], p=7)
+            >>> f.evalua(2)
+            0
+            >>> f.evalua([0, 1, 2, 3])
+            [1, 5, 0, 6]
+
+        En un punto se usa el método de Horner. Con muchos puntos y grado
+        alto se usa el árbol de subproductos (ver :class:`ArbolSubproductos`);
+        si se va a evaluar más de un polinomio en los mismos puntos, se puede
+        pasar el árbol en lugar de la lista de puntos para reutilizarlo.
+
+        Args:
+            puntos: un entero, una lista de enteros o un
+                :class:`ArbolSubproductos`.
+
+        Returns:
+            EnteroModuloP: el valor en el punto, si se evalúa en un entero.
+            List[EnteroModuloP]: los valores en cada punto, en otro caso.
+        """
+        if isinstance(puntos, ArbolSubproductos):
+            return puntos.evalua(self)
+        p = self.primo()
+        Z_p = Zp(p)
+        f = [int(c) for c in self._coeficientes]
+        if isinstance(puntos, int):
+            return Z_p(_horner(f, [puntos % p], p)[0])
+        puntos = [int(x) % p for x in puntos]
+        if min(len(puntos), len(f)) > _UMBRAL_SUBPRODUCTOS:
+            return ArbolSubproductos(puntos, p).evalua(self)
+        return [Z_p(v) for v in _horner(f, puntos, p)]
+
+    @classmethod
+    def interpola(cls, puntos, valores, p):
+        """Devuelve el único polinomio de grado menor que el número de
+        puntos que toma los valores dados en los puntos.
+
+            >>> PolinomioZp.interpola([0, 1, 2, 3], [1, 5, 0, 6], p=7)
+            X^3 + 3*X^2 + 1
+
+        Se usa el árbol de subproductos (ver :class:`ArbolSubproductos`),
+        que se puede pasar en lugar de la lista de puntos para reutilizarlo.
+
+        Args:
+            puntos: una lista de enteros distintos o un
+                :class:`ArbolSubproductos`.
+            valores (List[int]): los valores en cada punto.
+            p (int): el primo p.
+
+        Returns:
+            PolinomioZp: el polinomio interpolador.
+
+        Raises:
+            ValueError: si el número de valores no coincide con el de puntos
+                o si hay puntos repetidos.
+        """
+        if not isinstance(puntos, ArbolSubproductos):
+            puntos = ArbolSubproductos(puntos, p)
+        return puntos.interpola(valores)
 
     def es_irreducible(self):
         """Comprueba si el polinomio es irreducible.
@@ -388,22 +1443,12 @@ class PolinomioZp:
             bool: verdadero o falso.
         """
         p = self.primo()
-        f = PolinomioZp(self.coeficientes, p)
-        if f.coeficiente_lider() != 1:
-            f = f / PolinomioZp([f.coeficiente_lider()], p)  # lo hacemos mónico
-        m = f.grado()
-
-        x = PolinomioZp([0, 1], p)
-        u = copy.deepcopy(x)
-        for i in range(1, m // 2 + 1):
-            u = (u ** p) % f
-            _, _, d = alg_euclides_polinomios(f, u - x, p)
-            if d != PolinomioZp([1], p):
-                return False
-        return True
+        f = [int(c) for c in self._coeficientes]
+        inverso = inverso_modular(f[-1], p, primo=True)  # lo hacemos mónico
+        return _es_irreducible_coeficientes([c * inverso % p for c in f], p)
 
     @classmethod
-    def genera_irreducible(cls, grado, p):
+    def genera_irreducible(cls, grado, p, procesos=1):
         """Devuelve un polinomio irreducible de dicho grado con coeficientes
         módulo p.
 
@@ -411,47 +1456,91 @@ class PolinomioZp:
             >>> f.es_irreducible()
             True
 
+        Args:
+            grado (int): el grado del polinomio.
+            p (int): un número primo.
+            procesos (Optional[int]): el número de procesos entre los que
+                se reparten los candidatos.
+
         Returns:
             PolinomioZp: el polinomio irreducible.
         """
-        Z_p = Zp(p)
-        while True:
-            a_0 = Z_p(1 + random.randrange(p - 1))  # lo queremos != 0
-            a_m = Z_p(1)
-            coeficientes = [a_0]
-            coeficientes += [random.randrange(p) for i in range(1, grado)]
-            coeficientes += [a_m]
-            f = PolinomioZp(coeficientes, p)
-            if f.es_irreducible():
-                return f
+        def candidatos():
+            while True:
+                a_0 = 1 + random.randrange(p - 1)  # lo queremos != 0
+                yield [a_0] + [random.randrange(p) for i in range(1, grado)] + [1]
+
+        return PolinomioZp(_busca_irreducible(candidatos(), p, procesos), p)
+
+    @classmethod
+    def genera_irreducible_disperso(cls, grado, p, procesos=1):
+        """Devuelve el primer polinomio mónico irreducible de dicho grado
+        con coeficientes módulo p en el orden siguiente: primero los de menos
+        términos; a igual número de términos, el de menor segundo exponente,
+        después el de menor tercer exponente, etc.; y por último, el de
+        menores coeficientes.
+
+        Al contrario que :meth:`genera_irreducible`, el resultado no depende
+        del azar (ni del número de procesos). Para p = 2 se obtienen los
+        trinomios X^n + X^k + 1 con k mínimo y, si no existen, los
+        pentanomios X^n + X^k3 + X^k2 + X^k1 + 1 con k3, k2, k1 mínimos,
+        que son los que recogen los estándares.
+
+            >>> PolinomioZp.genera_irreducible_disperso(163, 2)
+            X^163 + X^7 + X^6 + X^3 + 1
+            >>> PolinomioZp.genera_irreducible_disperso(4, 3)
+            X^4 + X + 2
+
+        Args:
+            grado (int): el grado del polinomio.
+            p (int): un número primo.
+            procesos (Optional[int]): el número de procesos entre los que
+                se reparten los candidatos.
+
+        Returns:
+            PolinomioZp: el polinomio irreducible.
+        """
+        return PolinomioZp(_busca_irreducible(_candidatos_dispersos(grado, p), p, procesos), p)
 
     def __eq__(self, q):
+        if self is q:
+            return True
         if isinstance(q, PolinomioZp):
-            return self.coeficientes == q.coeficientes
-        else:
-            # Si el polinomio es una constante, hacemos
-            # la comparación con el coeficiente
-            if self.grado() < 1:
-                return self.coeficientes[0] == q
+            # si ya se conocen los hashes y son distintos no hace falta
+            # comparar los coeficientes
+            if self._hash is not None and q._hash is not None and self._hash != q._hash:
+                return False
+            return self._coeficientes == q._coeficientes
+        elif isinstance(q, int):
+            # Si el polinomio es una constante, hacemos la comparación con
+            # el coeficiente. Solo se admiten enteros entre 0 y p - 1 para
+            # que el hash (el del coeficiente) sea el mismo que el del entero
+            if len(self._coeficientes) == 1:
+                return 0 <= q < self.primo() and int(self._coeficientes[0]) == q
             else:
                 return False
+        # con otros tipos (p. ej. PolinomioZpVectorial) se usa su método
+        return NotImplemented
 
     def __ne__(self, q):
-        return not self.__eq__(q)
+        igual = self.__eq__(q)
+        return igual if igual is NotImplemented else not igual
 
     def __add__(self, q):
         if isinstance(q, PolinomioZp):
-            return PolinomioZp([a + b for a, b in zip_longest(self.coeficientes,
-                                                q.coeficientes,
+            return PolinomioZp([a + b for a, b in zip_longest(self._coeficientes,
+                                                q._coeficientes,
                                                 fillvalue=0)], self.primo())
+        elif not isinstance(q, int):
+            return NotImplemented
         else:
-            coeficientes = [self.coeficientes[0] + q] + self.coeficientes[1:]
+            coeficientes = [self._coeficientes[0] + q] + list(self._coeficientes[1:])
             return PolinomioZp(coeficientes, self.primo())
 
     __radd__ = __add__
 
     def __neg__(self):
-        return PolinomioZp([-a for a in self.coeficientes], self.primo())
+        return PolinomioZp([-a for a in self._coeficientes], self.primo())
 
     def __sub__(self, q):
         return self + (-q)
@@ -465,15 +1554,17 @@ class PolinomioZp:
             if self == cero or q == cero:
                 return cero
 
-            maximo_grado = len(self.coeficientes) + len(q.coeficientes)
+            maximo_grado = len(self._coeficientes) + len(q._coeficientes)
             multiplicacion = [0 for _ in range(maximo_grado)]
-            for i, a in enumerate(self.coeficientes):
-                for j, b in enumerate(q.coeficientes):
+            for i, a in enumerate(self._coeficientes):
+                for j, b in enumerate(q._coeficientes):
                     multiplicacion[i + j] += a * b
 
             return PolinomioZp(multiplicacion, self.primo())
+        elif not isinstance(q, int):
+            return NotImplemented
         else:
-            return PolinomioZp([a * q for a in self.coeficientes], self.primo())
+            return PolinomioZp([a * q for a in self._coeficientes], self.primo())
 
     __rmul__ = __mul__
 
@@ -512,9 +1603,9 @@ class PolinomioZp:
         else:
             monomios = []
             # Se imprime los monomios en orden descedente respecto al grado
-            for indice, coef in enumerate(reversed(self.coeficientes)):
+            for indice, coef in enumerate(reversed(self._coeficientes)):
                 if coef != 0:
-                    exponente = len(self.coeficientes) - indice - 1
+                    exponente = len(self._coeficientes) - indice - 1
                     # La siguiente casuística es escribir X
                     # en lugar de 1*X^1 y casos similares
                     if exponente == 0:
@@ -533,6 +1624,154 @@ class PolinomioZp:
 
     __repr__ = __str__
 
-    # Necesario para @functools.lru_cache de Fq()
+    # Necesario para @functools.lru_cache de Fq() y para usar los polinomios
+    # como claves. El hash se calcula una sola vez.
     def __hash__(self):
-        return hash(tuple(self.coeficientes))
+        if self._hash is None:
+            coeficientes = self._coeficientes
+            # un polinomio constante es igual a su coeficiente
+            valor = hash(coeficientes[0]) if len(coeficientes) == 1 else hash(coeficientes)
+            object.__setattr__(self, '_hash', valor)
+        return self._hash
+
+    # Necesario para copiar y serializar los polinomios con pickle, ya que
+    # no se pueden modificar sus atributos
+    def __reduce__(self):
+        return (PolinomioZp, ([int(c) for c in self._coeficientes], self.primo()))
+
+
+class ArbolSubproductos(object):
+    """Representa el árbol de subproductos de unos puntos x_0, ..., x_{n-1}
+    de Z_p, que permite evaluar polinomios en todos ellos e interpolar.
+
+        >>> arbol = ArbolSubproductos([0, 1, 2, 3], p=7)
+        >>> f = PolinomioZp([1, 0, 3, 1], p=7)
+        >>> f
+        X^3 + 3*X^2 + 1
+        >>> arbol.evalua(f)
+        [1, 5, 0, 6]
+        >>> arbol.interpola([1, 5, 0, 6])
+        X^3 + 3*X^2 + 1
+
+    Las hojas del árbol son los polinomios X - x_i y cada nodo es el producto
+    de sus dos hijos, de modo que la raíz es el producto de todos los
+    X - x_i. Para evaluar, se reduce el polinomio módulo cada nodo desde la
+    raíz hasta las hojas (el resto en la hoja X - x_i es f(x_i)); para
+    interpolar, se combinan los valores desde las hojas hasta la raíz
+    (fórmula de Lagrange). Ambas operaciones cuestan O(M(n) log(n))
+    operaciones, siendo M(n) el coste de multiplicar dos polinomios de grado
+    n, frente a las O(n^2) de evaluar punto a punto.
+
+    El árbol solo depende de los puntos, luego conviene construirlo una vez
+    y reutilizarlo con todos los polinomios que se evalúen o interpolen en
+    ellos (los inversos que se usan para reducir se calculan la primera vez
+    que se necesitan y se guardan en el árbol).
+
+    Args:
+        puntos (List[int]): los puntos x_0, ..., x_{n-1} (al menos uno).
+        p (int): el primo p.
+
+    Raises:
+        ValueError: si no hay ningún punto.
+    """
+    def __init__(self, puntos, p):
+        self.p = p
+        self._puntos = [int(x) % p for x in puntos]
+        if not self._puntos:
+            raise ValueError("El árbol de subproductos necesita al menos un punto.")
+        self._raiz = _NodoSubproductos(self._puntos, 0, len(self._puntos), p)
+        self._pesos = None
+
+    def __len__(self):
+        return len(self._puntos)
+
+    @property
+    def puntos(self):
+        """List[EnteroModuloP]: los puntos x_0, ..., x_{n-1}. Es un atributo
+        de solo lectura."""
+        Z_p = Zp(self.p)
+        return [Z_p(x) for x in self._puntos]
+
+    def anulador(self):
+        """Devuelve el polinomio mónico (X - x_0) ... (X - x_{n-1}).
+
+            >>> ArbolSubproductos([1, 2], p=7).anulador()
+            X^2 + 4*X + 2
+
+        Returns:
+            PolinomioZp: el producto de los X - x_i.
+        """
+        return PolinomioZp(self._raiz.producto, self.p)
+
+    def _evalua(self, f):
+        p = self.p
+        raiz = self._raiz
+        if len(f) >= 2 * len(raiz.producto):
+            # el cociente de f entre la raíz tiene más coeficientes que
+            # el inverso que se guarda en el nodo
+            inverso = _inverso_serie(raiz.producto[::-1], len(f) - len(raiz.producto) + 1, p)
+            f = _resto_serie(f, raiz.producto, inverso, p)
+        else:
+            f = raiz.resto(f, p)
+        valores = [0] * len(self._puntos)
+        pendientes = [(raiz, f)]
+        while pendientes:
+            nodo, f = pendientes.pop()
+            if nodo.fin - nodo.inicio <= _HOJA_SUBPRODUCTOS:
+                valores[nodo.inicio:nodo.fin] = _horner(f, self._puntos[nodo.inicio:nodo.fin], p)
+            else:
+                pendientes.extend((hijo, hijo.resto(f, p)) for hijo in nodo.hijos)
+        return valores
+
+    def evalua(self, f):
+        """Evalúa un polinomio en todos los puntos.
+
+        Args:
+            f (PolinomioZp): el polinomio.
+
+        Returns:
+            List[EnteroModuloP]: los valores f(x_0), ..., f(x_{n-1}).
+
+        Raises:
+            ValueError: si el polinomio no es del mismo primo que los puntos.
+        """
+        if f.primo() != self.p:
+            raise ValueError("El polinomio y los puntos deben ser del mismo primo.")
+        Z_p = Zp(self.p)
+        return [Z_p(v) for v in self._evalua(_recorta([int(c) for c in f._coeficientes]))]
+
+    def interpola(self, valores):
+        """Devuelve el único polinomio de grado menor que n que toma los
+        valores dados en los puntos.
+
+        Args:
+            valores (List[int]): los valores y_0, ..., y_{n-1} en los
+                puntos x_0, ..., x_{n-1}.
+
+        Returns:
+            PolinomioZp: el polinomio f con f(x_i) = y_i.
+
+        Raises:
+            ValueError: si el número de valores no coincide con el de puntos
+                o si hay puntos repetidos.
+        """
+        p = self.p
+        valores = [int(y) % p for y in valores]
+        if len(valores) != len(self._puntos):
+            raise ValueError("Debe haber un valor por cada punto.")
+        if self._pesos is None:
+            # f = sum y_i m(X) / ((X - x_i) m'(x_i)), con m la raíz del árbol
+            derivadas = self._evalua(_derivada_coeficientes(self._raiz.producto, p))
+            if not all(derivadas):
+                raise ValueError("Los puntos de interpolación deben ser distintos.")
+            self._pesos = [inverso_modular(d, p, primo=True) for d in derivadas]
+        c = [y * w % p for y, w in zip(valores, self._pesos)]
+
+        def combina(nodo):
+            if nodo.hijos is None:
+                return _recorta([c[nodo.inicio]])
+            izquierdo, derecho = nodo.hijos
+            a = _producto_coeficientes(combina(izquierdo), derecho.producto, p)
+            b = _producto_coeficientes(combina(derecho), izquierdo.producto, p)
+            return _suma_coeficientes(a, b, p)
+        return PolinomioZp(combina(self._raiz) or [0], p)
@@ -0,0 +1,693 @@
+"""Aritmética vectorial con enteros módulo un primo pequeño.
+
+Este módulo permite operar a la vez con muchos enteros módulo un primo
+p < 2^31, elemento a elemento, sin crear un objeto :class:`.EnteroModuloP`
+por cada uno. ::
+
+    from ccepy.aritmetica_vectorial import VectorZp, PolinomioZpVectorial
+
+Los vectores se construyen a partir de una lista de enteros (o de
+:class:`.EnteroModuloP`) y se operan con los operadores habituales.
+
+    >>> u = VectorZp([1, 2, 3, 4], p=7)
+    >>> v = VectorZp([6, 5, 4, 3], p=7)
+    >>> u + v
+    [0, 0, 0, 0]
+    >>> u * v
+    [6, 3, 5, 5]
+    >>> u ** 3
+    [1, 1, 6, 1]
+    >>> u.inverso()
+    [1, 4, 5, 2]
+    >>> u.producto_escalar(v)
+    5
+
+De la misma forma, :class:`PolinomioZpVectorial` representa un polinomio
+con coeficientes módulo p < 2^31 con la misma interfaz que
+:class:`.PolinomioZp`, pero con la multiplicación, la división y la
+evaluación en muchos puntos vectorizadas.
+
+    >>> f = PolinomioZpVectorial([1, 2, 3, 4], p=7)
+    >>> f
+    4*X^3 + 3*X^2 + 2*X + 1
+    >>> f.evalua(u)
+    [3, 0, 2, 5]
+
+Si NumPy está instalado (``pip install ccepy[numpy]``), los elementos se
+guardan en un array de enteros de 64 bits y cada operación se hace de una
+vez sobre todo el array: como p < 2^31, el producto de dos elementos cabe
+en 64 bits. Si no lo está, se usan listas de enteros de Python con el
+mismo resultado.
+"""
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+import math
+
+from ccepy.aritmetica_elemental import Zp, PolinomioZp, inverso_modular, _recorta, \
+    _suma_coeficientes, _resta_coeficientes, _producto_coeficientes, _divmod_coeficientes
+
+
+# Los productos de dos enteros módulo p < 2^31 caben en un entero de 64 bits
+_LIMITE_PRIMO = 2 ** 31
+
+# Los polinomios con menos de _UMBRAL_FFT coeficientes (el menor de los dos
+# factores) se multiplican con numpy.convolve y los mayores con la FFT, que
+# es exacta hasta productos de _MAXIMO_FFT coeficientes
+_UMBRAL_FFT = 128
+_MAXIMO_FFT = 2 ** 20
+
+# Longitud del cociente a partir de la cual se divide con la iteración de
+# Newton en vez de con la división clásica
+_UMBRAL_NEWTON = 128
+
+
+class VectorZp(object):
+    """Representa un vector de enteros módulo un primo p < 2^31.
+
+        >>> u = VectorZp([3, 10, -1], p=7)
+        >>> u
+        [3, 3, 6]
+        >>> len(u), u[1]
+        (3, 3)
+        >>> 2 * u - 1
+        [5, 5, 4]
+
+    Soporta los operadores ``+``, ``-``, ``*``, ``/`` y ``**`` elemento a
+    elemento. Los operandos pueden ser ambos de tipo :class:`VectorZp` (de
+    la misma longitud y con el mismo primo) o bien uno de tipo
+    :class:`VectorZp` y otro de tipo :py:class:`int`, que se opera con
+    todos los elementos.
+
+    Args:
+        enteros (List[int]): los elementos del vector (se reducen módulo
+            p). También puede ser un array de NumPy.
+        p (int): un primo menor que 2^31.
+
+    Raises:
+        ValueError: si p no es menor que 2^31.
+    """
+    def __init__(self, enteros, p):
+        if not 1 < p < _LIMITE_PRIMO:
+            raise ValueError("El primo debe ser menor que 2^31.")
+        self.p = p
+        if numpy is None:
+            self._datos = [int(n) % p for n in enteros]
+        elif isinstance(enteros, numpy.ndarray):
+            self._datos = enteros.astype(numpy.int64) % p
+        else:
+            self._datos = numpy.fromiter((int(n) % p for n in enteros), dtype=numpy.int64)
+
+    @classmethod
+    def _nuevo(cls, datos, p):
+        # datos ya reducidos módulo p
+        vector = cls.__new__(cls)
+        vector.p, vector._datos = p, datos
+        return vector
+
+    def primo(self):
+        """Devuelve el primo p."""
+        return self.p
+
+    def enteros(self):
+        """Devuelve la lista de elementos como enteros entre 0 y p - 1.
+
+            >>> VectorZp([9, 8], p=7).enteros()
+            [2, 1]
+
+        Returns:
+            List[int]: los elementos.
+        """
+        return list(self._datos) if numpy is None else self._datos.tolist()
+
+    def elementos(self):
+        """Devuelve la lista de elementos como enteros módulo p.
+
+            >>> VectorZp([9, 8], p=7).elementos()
+            [2, 1]
+
+        Returns:
+            List[EnteroModuloP]: los elementos.
+        """
+        Z_p = Zp(self.p)
+        return [Z_p(n) for n in self.enteros()]
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __iter__(self):
+        return iter(self.elementos())
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return VectorZp._nuevo(self._datos[indice], self.p)
+        return Zp(self.p)(int(self._datos[indice]))
+
+    def __eq__(self, v):
+        if not isinstance(v, VectorZp):
+            return NotImplemented
+        return self.p == v.p and self.enteros() == v.enteros()
+
+    def __ne__(self, v):
+        resultado = self.__eq__(v)
+        return resultado if resultado is NotImplemented else not resultado
+
+    __hash__ = None
+
+    def _operandos(self, v):
+        """Devuelve los datos de v (un vector o un entero) listos para operar."""
+        if isinstance(v, VectorZp):
+            if v.p != self.p or len(v) != len(self):
+                raise ValueError("Los vectores deben tener la misma longitud y el mismo primo.")
+            return v._datos
+        return int(v) % self.p
+
+    def __add__(self, v):
+        return self._opera(v, _suma)
+
+    __radd__ = __add__
+
+    def __sub__(self, v):
+        return self._opera(v, _resta)
+
+    def __rsub__(self, v):
+        return -self + v
+
+    def __neg__(self):
+        if numpy is None:
+            return VectorZp._nuevo([-a % self.p for a in self._datos], self.p)
+        return VectorZp._nuevo(-self._datos % self.p, self.p)
+
+    def __mul__(self, v):
+        return self._opera(v, _producto)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, v):
+        if isinstance(v, VectorZp):
+            return self * v.inverso()
+        return self * inverso_modular(int(v), self.p, primo=True)
+
+    def __rtruediv__(self, v):
+        return self.inverso() * v
+
+    def _opera(self, v, operacion):
+        v = self._operandos(v)
+        p = self.p
+        if numpy is not None:
+            return VectorZp._nuevo(operacion(self._datos, v) % p, p)
+        if isinstance(v, int):
+            return VectorZp._nuevo([operacion(a, v) % p for a in self._datos], p)
+        return VectorZp._nuevo([operacion(a, b) % p for a, b in zip(self._datos, v)], p)
+
+    def __pow__(self, e):
+        """Eleva cada elemento a e (si e es negativo, los elementos deben
+        ser no nulos)."""
+        if e < 0:
+            return self.inverso() ** (-e)
+        p = self.p
+        if numpy is None:
+            return VectorZp._nuevo([pow(a, e, p) for a in self._datos], p)
+        return VectorZp._nuevo(_potencia(self._datos, e, p), p)
+
+    def inverso(self):
+        """Devuelve el vector de los inversos de cada elemento.
+
+            >>> VectorZp([1, 2, 3], p=5).inverso()
+            [1, 3, 2]
+
+        Con NumPy se calcula :math:`a^{p - 2}` para todos los elementos a
+        la vez; sin NumPy se usa el truco de Montgomery, que necesita un
+        solo inverso y tres productos por elemento.
+
+        Returns:
+            VectorZp: los inversos.
+
+        Raises:
+            ZeroDivisionError: si algún elemento es nulo.
+        """
+        p = self.p
+        if numpy is not None:
+            if not self._datos.all():
+                raise ZeroDivisionError("El vector tiene elementos nulos.")
+            return VectorZp._nuevo(_potencia(self._datos, p - 2, p), p)
+        if not all(self._datos):
+            raise ZeroDivisionError("El vector tiene elementos nulos.")
+        # productos[i] = a_0 ... a_{i-1}
+        productos = [1]
+        for a in self._datos:
+            productos.append(productos[-1] * a % p)
+        inverso = inverso_modular(productos[-1], p, primo=True)  # (a_0 ... a_i)^(-1)
+        inversos = [0] * len(self._datos)
+        for i in range(len(self._datos) - 1, -1, -1):
+            inversos[i] = inverso * productos[i] % p
+            inverso = inverso * self._datos[i] % p
+        return VectorZp._nuevo(inversos, p)
+
+    def producto_escalar(self, v):
+        """Devuelve el producto escalar con otro vector.
+
+            >>> VectorZp([1, 2, 3], p=5).producto_escalar(VectorZp([4, 4, 4], p=5))
+            4
+
+        Args:
+            v (VectorZp): un vector de la misma longitud y con el mismo primo.
+
+        Returns:
+            EnteroModuloP: la suma de los productos de los elementos.
+        """
+        datos = self._operandos(v)
+        if numpy is None:
+            total = sum(a * b for a, b in zip(self._datos, datos))
+        else:
+            # cada producto reducido es menor que 2^31, así que la suma cabe
+            # en 64 bits para vectores de menos de 2^32 elementos
+            total = int((self._datos * datos % self.p).sum())
+        return Zp(self.p)(total)
+
+    def __str__(self):
+        return str(self.enteros())
+
+    __repr__ = __str__
+
+
+class PolinomioZpVectorial(object):
+    """Representa un polinomio con coeficientes enteros módulo un primo
+    p < 2^31.
+
+        >>> f = PolinomioZpVectorial([1, 0, 1], p=7)
+        >>> f
+        X^2 + 1
+        >>> g = PolinomioZpVectorial([6, 1], p=7)
+        >>> f * g
+        X^3 + 6*X^2 + X + 6
+        >>> divmod(f, g)
+        (X + 1, 2)
+        >>> f.evalua([0, 1, 2, 3])
+        [1, 2, 5, 3]
+
+    Tiene la misma interfaz que :class:`.PolinomioZp` (los operadores
+    ``+``, ``-``, ``*``, ``/``, ``%`` y ``**``, :meth:`grado`,
+    :meth:`coeficiente_lider`...). Se puede operar y comparar con un
+    :class:`.PolinomioZp` (a la derecha del operador) y convertir en uno:
+
+        >>> h = PolinomioZp([1, 0, 1], p=7)
+        >>> f == h and f.a_polinomio() == h and f + h == 2 * f
+        True
+
+    Si NumPy está instalado, los coeficientes se guardan en un array de
+    enteros de 64 bits. Para multiplicar sin desbordamientos, los
+    coeficientes se dividen en trozos: en dos de 16 bits para
+    :func:`numpy.convolve` (polinomios pequeños) y en tres de 11 bits para
+    la FFT (polinomios grandes), cuyo redondeo es exacto con esos tamaños.
+    La división de polinomios grandes se hace con la iteración de Newton
+    y la evaluación con el método de Horner en todos los puntos a la vez.
+    Si NumPy no está instalado, se usan las listas de coeficientes de
+    :mod:`.aritmetica_elemental`.
+
+    Args:
+        coeficientes (List[int]): los coeficientes del polinomio ordenados
+            de forma ascendente. También puede ser un array de NumPy.
+        p (int): un primo menor que 2^31.
+
+    Raises:
+        ValueError: si p no es menor que 2^31.
+    """
+    __slots__ = ('p', '_datos')
+
+    def __init__(self, coeficientes, p):
+        if not 1 < p < _LIMITE_PRIMO:
+            raise ValueError("El primo debe ser menor que 2^31.")
+        object.__setattr__(self, 'p', p)
+        object.__setattr__(self, '_datos', _recorta_datos(VectorZp(coeficientes, p)._datos))
+
+    @classmethod
+    def _nuevo(cls, datos, p):
+        # datos ya reducidos módulo p y sin ceros al final
+        polinomio = cls.__new__(cls)
+        object.__setattr__(polinomio, 'p', p)
+        object.__setattr__(polinomio, '_datos', datos)
+        return polinomio
+
+    @classmethod
+    def de_polinomio(cls, f):
+        """Devuelve el polinomio f (de tipo :class:`.PolinomioZp`) como
+        :class:`PolinomioZpVectorial`.
+
+        Args:
+            f (PolinomioZp): un polinomio con coeficientes módulo p < 2^31.
+
+        Returns:
+            PolinomioZpVectorial: el mismo polinomio.
+        """
+        return cls([int(c) for c in f.coeficientes], f.primo())
+
+    def a_polinomio(self):
+        """Devuelve el polinomio como :class:`.PolinomioZp`."""
+        return PolinomioZp(self.enteros() or [0], self.p)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Los polinomios son inmutables.")
+
+    __delattr__ = __setattr__
+
+    def primo(self):
+        """Devuelve el primo p."""
+        return self.p
+
+    def enteros(self):
+        """Devuelve los coeficientes como enteros entre 0 y p - 1, en orden
+        ascendente y sin ceros al final (el polinomio cero es la lista
+        vacía).
+
+        Returns:
+            List[int]: los coeficientes.
+        """
+        return list(self._datos) if numpy is None else self._datos.tolist()
+
+    @property
+    def coeficientes(self):
+        """List[EnteroModuloP]: los coeficientes del polinomio ordenados de
+        forma ascendente, como en :attr:`.PolinomioZp.coeficientes`."""
+        Z_p = Zp(self.p)
+        return [Z_p(c) for c in self.enteros() or [0]]
+
+    def grado(self):
+        """Devuelve el grado del polinomio (- :py:data:`math.inf` si es el
+        polinomio cero)."""
+        return len(self._datos) - 1 if len(self._datos) else -math.inf
+
+    def coeficiente_lider(self):
+        """Devuelve el coeficiente asociado al término de mayor exponente."""
+        return Zp(self.p)(int(self._datos[-1]) if len(self._datos) else 0)
+
+    def _operando(self, q):
+        """Devuelve los coeficientes de q (un polinomio o un entero)."""
+        if isinstance(q, PolinomioZpVectorial):
+            if q.p != self.p:
+                raise ValueError("Los polinomios deben tener el mismo primo.")
+            return q._datos
+        if isinstance(q, PolinomioZp):
+            if q.primo() != self.p:
+                raise ValueError("Los polinomios deben tener el mismo primo.")
+            return PolinomioZpVectorial.de_polinomio(q)._datos
+        return PolinomioZpVectorial([q], self.p)._datos
+
+    def evalua(self, puntos):
+        """Evalúa el polinomio en un punto o en varios a la vez.
+
+            >>> f = PolinomioZpVectorial([3, 0, 1], p=11)  # X^2 + 3
+            >>> f.evalua(5)
+            6
+            >>> f.evalua(VectorZp(range(5), p=11))
+            [3, 4, 7, 1, 8]
+
+        Args:
+            puntos: un entero o una lista (o un :class:`VectorZp`) de
+                enteros.
+
+        Returns:
+            EnteroModuloP o VectorZp: el valor o los valores del polinomio.
+        """
+        p = self.p
+        coeficientes = self.enteros()[::-1]
+        if not isinstance(puntos, (VectorZp, list, tuple, range)) and \
+                not (numpy is not None and isinstance(puntos, numpy.ndarray)):
+            valor, x = 0, int(puntos) % p
+            for c in coeficientes:
+                valor = (valor * x + c) % p
+            return Zp(p)(valor)
+        if not isinstance(puntos, VectorZp):
+            puntos = VectorZp(puntos, p)
+        elif puntos.p != p:
+            raise ValueError("Los puntos deben ser enteros módulo el mismo primo.")
+        x = puntos._datos
+        if numpy is None:
+            valores = []
+            for a in x:
+                valor = 0
+                for c in coeficientes:
+                    valor = (valor * a + c) % p
+                valores.append(valor)
+            return VectorZp._nuevo(valores, p)
+        valores = numpy.zeros_like(x)
+        for c in coeficientes:
+            valores = (valores * x + c) % p
+        return VectorZp._nuevo(valores, p)
+
+    def reduce_lote(self, polinomios):
+        """Devuelve los restos de dividir varios polinomios entre este.
+
+            >>> g = PolinomioZpVectorial([1, 0, 1], p=5)  # X^2 + 1
+            >>> g.reduce_lote([PolinomioZp([0, 0, 0, 1], 5), [1, 2, 3, 4, 0, 1]])
+            [4*X, 4*X + 3]
+
+        Con NumPy, todos los polinomios se dividen a la vez: se guardan en
+        las filas de una matriz y cada paso de la división clásica opera
+        con una columna. Si el divisor y los cocientes son grandes, se usa
+        la división de Newton con el inverso del divisor calculado una sola
+        vez para todos.
+
+        Args:
+            polinomios (list): los polinomios (de tipo
+                :class:`PolinomioZpVectorial` o :class:`.PolinomioZp`, o
+                listas de coeficientes).
+
+        Returns:
+            List[PolinomioZpVectorial]: los restos.
+        """
+        p, g = self.p, self._datos
+        filas = [f._datos if isinstance(f, PolinomioZpVectorial) else
+                 self._operando(f) if isinstance(f, PolinomioZp) else
+                 PolinomioZpVectorial(f, p)._datos for f in polinomios]
+        if not len(g):
+            raise ZeroDivisionError
+        if numpy is None or not filas:
+            return [self._nuevo(_divmod_datos(f, g, p)[1], p) for f in filas]
+        m = len(g) - 1
+        longitud = max(m, max(len(f) for f in filas))
+        if m * (longitud - m) > _UMBRAL_NEWTON ** 2 * 4:
+            # división de Newton con el inverso de g calculado una sola vez
+            inverso = _inverso_serie(g[::-1], longitud - m, p)
+            return [self._nuevo(_divmod_newton(f, g, inverso, p)[1], p)
+                    for f in filas]
+        restos = numpy.zeros((len(filas), longitud), dtype=numpy.int64)
+        for i, f in enumerate(filas):
+            restos[i, :len(f)] = f
+        inverso = inverso_modular(int(g[-1]), p, primo=True)
+        for i in range(longitud - 1, m - 1, -1):
+            cocientes = restos[:, i] * inverso % p
+            restos[:, i - m:i] = (restos[:, i - m:i] - cocientes[:, None] * g[:m]) % p
+        return [self._nuevo(_recorta_datos(r), p) for r in restos[:, :m]]
+
+    def __eq__(self, q):
+        if isinstance(q, PolinomioZpVectorial):
+            return self.p == q.p and self.enteros() == q.enteros()
+        if isinstance(q, PolinomioZp):
+            return self.p == q.primo() and tuple(self.enteros() or [0]) == q._coeficientes
+        if isinstance(q, int):
+            # como PolinomioZp, solo con enteros entre 0 y p - 1
+            return 0 <= q < self.p and (self.enteros() or [0]) == [q]
+        return NotImplemented
+
+    def __ne__(self, q):
+        igual = self.__eq__(q)
+        return igual if igual is NotImplemented else not igual
+
+    def __hash__(self):
+        # igual que el del PolinomioZp equivalente, con el que es igual
+        return hash(self.a_polinomio())
+
+    def __add__(self, q):
+        return self._nuevo(_suma_datos(self._datos, self._operando(q), self.p), self.p)
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return self._nuevo(_resta_datos(self._datos[:0], self._datos, self.p), self.p)
+
+    def __sub__(self, q):
+        return self._nuevo(_resta_datos(self._datos, self._operando(q), self.p), self.p)
+
+    def __rsub__(self, q):
+        return -self.__sub__(q)
+
+    def __mul__(self, q):
+        producto = _producto_datos(self._datos, self._operando(q), self.p)
+        return self._nuevo(_recorta_datos(producto), self.p)
+
+    __rmul__ = __mul__
+
+    def __pow__(self, n):
+        if n < 0:
+            raise ValueError("El exponente de un polinomio no puede ser negativo.")
+        potencia, base = PolinomioZpVectorial([1], self.p), self
+        while n:
+            if n & 1:
+                potencia = potencia * base
+            n >>= 1
+            if n:
+                base = base * base
+        return potencia
+
+    def __divmod__(self, q):
+        g = self._operando(q)
+        if not len(g):
+            raise ZeroDivisionError
+        cociente, resto = _divmod_datos(self._datos, g, self.p)
+        return self._nuevo(cociente, self.p), self._nuevo(resto, self.p)
+
+    def __truediv__(self, q):
+        return divmod(self, q)[0]
+
+    def __mod__(self, q):
+        return divmod(self, q)[1]
+
+    def __reduce__(self):
+        return (PolinomioZpVectorial, (self.enteros(), self.p))
+
+    def __str__(self):
+        return str(self.a_polinomio())
+
+    __repr__ = __str__
+
+
+def _suma(a, b):
+    return a + b
+
+
+def _resta(a, b):
+    return a - b
+
+
+def _producto(a, b):
+    return a * b
+
+
+def _potencia(datos, e, p):
+    """Eleva todos los elementos del array a e mediante el método binario."""
+    resultado = numpy.ones_like(datos)
+    while e:
+        if e & 1:
+            resultado = resultado * datos % p
+        e >>= 1
+        if e:
+            datos = datos * datos % p
+    return resultado
+
+
+# Operaciones con las listas de coeficientes de los polinomios (arrays de
+# NumPy en orden ascendente y sin ceros al final o, sin NumPy, las listas de
+# aritmetica_elemental). El polinomio cero no tiene coeficientes.
+
+def _recorta_datos(a):
+    if numpy is None:
+        return _recorta(a)
+    indices = numpy.flatnonzero(a)
+    return a[:indices[-1] + 1] if len(indices) else a[:0]
+
+
+def _ajusta(a, n):
+    """Devuelve los n primeros coeficientes de a, completando con ceros."""
+    if len(a) >= n:
+        return a[:n]
+    return numpy.concatenate([a, numpy.zeros(n - len(a), dtype=numpy.int64)])
+
+
+def _suma_datos(a, b, p):
+    if numpy is None:
+        return _suma_coeficientes(a, b, p)
+    if len(a) < len(b):
+        a, b = b, a
+    suma = a.copy()
+    suma[:len(b)] += b
+    return _recorta_datos(suma % p)
+
+
+def _resta_datos(a, b, p):
+    if numpy is None:
+        return _resta_coeficientes(a, b, p)
+    return _suma_datos(a, -b % p, p)
+
+
+def _producto_datos(a, b, p):
+    """Devuelve el producto de a y b, con len(a) + len(b) - 1 coeficientes
+    (no se recortan los ceros finales)."""
+    if numpy is None:
+        return _producto_coeficientes(a, b, p)
+    if not len(a) or not len(b):
+        return a[:0]
+    n = len(a) + len(b) - 1
+    if min(len(a), len(b)) < _UMBRAL_FFT:
+        # trozos de 16 bits: cada suma de productos es menor que n 2^32
+        a0, a1, b0, b1 = a & 0xFFFF, a >> 16, b & 0xFFFF, b >> 16
+        bajo = numpy.convolve(a0, b0) % p
+        medio = (numpy.convolve(a0, b1) + numpy.convolve(a1, b0)) % p
+        alto = numpy.convolve(a1, b1) % p
+        return (bajo + medio * (2 ** 16 % p) % p + alto * (2 ** 32 % p) % p) % p
+    if n > _MAXIMO_FFT:
+        producto = _producto_coeficientes(a.tolist(), b.tolist(), p)
+        return _ajusta(numpy.array(producto, dtype=numpy.int64), n)
+    # trozos de 11 bits: cada suma de productos es menor que 3 n 2^22 < 2^44
+    # y el error de redondeo de la FFT es mucho menor que 1/2
+    tam = 1 << (n - 1).bit_length()
+    A = [numpy.fft.rfft(a >> (11 * k) & 0x7FF, tam) for k in range(3)]
+    B = [numpy.fft.rfft(b >> (11 * k) & 0x7FF, tam) for k in range(3)]
+    producto = numpy.zeros(n, dtype=numpy.int64)
+    for k in range(5):
+        C = sum(A[i] * B[k - i] for i in range(max(0, k - 2), min(k, 2) + 1))
+        trozo = numpy.rint(numpy.fft.irfft(C, tam)[:n]).astype(numpy.int64) % p
+        producto = (producto + trozo * pow(2, 11 * k, p)) % p
+    return producto
+
+
+def _inverso_serie(h, n, p):
+    """Devuelve el inverso de la serie de potencias h (con h[0] no nulo)
+    módulo X^n mediante la iteración de Newton g <- g (2 - h g)."""
+    g = numpy.array([inverso_modular(int(h[0]), p, primo=True)], dtype=numpy.int64)
+    k = 1
+    while k < n:
+        k = min(2 * k, n)
+        e = -_ajusta(_producto_datos(_ajusta(h, k), g, p), k) % p
+        e[0] = (e[0] + 2) % p
+        g = _ajusta(_producto_datos(g, e, p), k)
+    return g
+
+
+def _divmod_datos(f, g, p):
+    """Devuelve el cociente y el resto de la división de f entre g."""
+    if numpy is None:
+        return _divmod_coeficientes(f, g, p)
+    m = len(g) - 1
+    k = len(f) - m  # número de coeficientes del cociente
+    if k <= 0:
+        return f[:0], f
+    if k < _UMBRAL_NEWTON or m == 0:
+        resto = f.copy()
+        cociente = numpy.zeros(k, dtype=numpy.int64)
+        inverso = inverso_modular(int(g[-1]), p, primo=True)
+        for i in range(k - 1, -1, -1):
+            c = int(resto[i + m]) * inverso % p
+            if c:
+                cociente[i] = c
+                resto[i:i + m + 1] = (resto[i:i + m + 1] - c * g) % p
+        return _recorta_datos(cociente), _recorta_datos(resto[:m])
+    return _divmod_newton(f, g, _inverso_serie(g[::-1], k, p), p)
+
+
+def _divmod_newton(f, g, inverso, p):
+    """Devuelve el cociente y el resto de la división de f entre g, dado
+    el inverso de g al revés módulo X^k (k al menos el número de
+    coeficientes del cociente)."""
+    m = len(g) - 1
+    k = len(f) - m
+    if k <= 0:
+        return f[:0], f
+    # los coeficientes de f y g al revés son series de potencias y el
+    # cociente al revés es el producto de f y el inverso de g módulo X^k
+    cociente = _ajusta(_producto_datos(f[::-1][:k], inverso[:k], p), k)[::-1]
+    cociente = _recorta_datos(cociente.copy())
+    resto = _recorta_datos((f[:m] - _ajusta(_producto_datos(cociente, g, p), m)) % p)
+    return cociente, resto
@@ -0,0 +1,583 @@
+"""Conteo de puntos de curvas elípticas.
+
+Este módulo permite calcular el número de puntos (el orden del grupo) de
+una curva elíptica sobre un cuerpo finito.
+
+Para utilizar las funciones y las clases de este módulo, debe importarlo
+previamente: ::
+
+    # reemplace ... por la función/clase que desea utilizar
+    from ccepy.conteo_puntos import ...
+
+Para obtener el orden de una curva elíptica, use la función
+:func:`orden_curva`:
+
+    >>> from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+    >>> E = curva_eliptica_sobre_Fq(2, 3, 97)
+    >>> orden_curva(E)
+    100
+    >>> E = curva_eliptica_sobre_Fq(1, 7, 2**40 - 87)
+    >>> orden_curva(E)
+    1099512104067
+
+Se utilizan tres métodos según el tamaño del cuerpo finito de q elementos:
+
+- ``enumeracion``: se recorren todos los elementos del cuerpo (solo para q
+  muy pequeños).
+- ``bsgs``: se calcula el orden de puntos aleatorios de la curva y de su
+  torcida cuadrática mediante el método paso de bebé, paso de gigante en
+  el intervalo de Hasse, hasta que solo queda un posible orden. Realiza del
+  orden de q^(1/4) operaciones con puntos.
+- ``schoof``: el algoritmo de Schoof calcula la traza de Frobenius módulo
+  primos pequeños l usando los polinomios de división (ver
+  :func:`polinomio_division`) y la reconstruye con el teorema chino del
+  resto. Solo está disponible para cuerpos de p elementos (p primo); es el
+  método por defecto cuando p tiene más de 60 bits.
+
+El algoritmo de Schoof implementado es el original: no usa los primos de
+Elkies ni de Atkin (algoritmo SEA), que requieren polinomios modulares.
+Con la curva y^2 = x^3 + 3 x + 7 tarda del orden de 1 segundo para p de 40
+bits, 10 segundos para 64 bits y 45 segundos para 80 bits, y el coste
+crece aproximadamente como log(p)^5, por lo que en la práctica no es
+utilizable por encima de unos 100 bits: los órdenes de curvas de tamaño
+criptográfico (160 a 256 bits) quedan fuera de su alcance.
+
+En el algoritmo de Schoof, cuando una inversión módulo el polinomio de
+división falla se obtiene un factor de dicho polinomio y se continúa
+trabajando módulo ese factor, que tiene menor grado (como en la mejora de
+Elkies, aunque sin usar polinomios modulares).
+"""
+import itertools
+import math
+import random
+import weakref
+
+from ccepy.aritmetica_elemental import PolinomioZp, es_primo, factoriza, teorema_chino_resto, \
+    inverso_modular, _raiz_entera, _recorta, \
+    _suma_coeficientes, _resta_coeficientes, _producto_coeficientes, \
+    _divmod_coeficientes, _mcd_extendido_coeficientes, _AnilloCociente
+from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq, curva_eliptica_sobre_F2m
+
+
+# Órdenes ya calculados y polinomios de división de cada curva
+_ordenes = weakref.WeakKeyDictionary()
+_polinomios_division = weakref.WeakKeyDictionary()
+
+
+def _cuerpo(E):
+    """Devuelve el constructor de elementos del cuerpo de la curva, su
+    característica y su grado."""
+    F = E.Fq if hasattr(E, 'Fq') else E.F2m
+    return F, F.p, getattr(F, 'n', 1)
+
+
+def orden_curva(E, metodo=None):
+    """Devuelve el número de puntos de una curva elíptica sobre un cuerpo
+    finito.
+
+        >>> from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+        >>> E = curva_eliptica_sobre_Fq(a=324, b=1287, p=3851)
+        >>> orden_curva(E)
+        3928
+        >>> orden_curva(E, metodo='schoof')
+        3928
+
+    El resultado se guarda, por lo que las siguientes llamadas con la misma
+    curva no repiten el cálculo.
+
+    Args:
+        E: la clase que representa los puntos de la curva (devuelta por
+            :func:`.curva_eliptica_sobre_Fq` o
+            :func:`.curva_eliptica_sobre_F2m`).
+        metodo (Optional[str]): ``'enumeracion'``, ``'bsgs'`` o
+            ``'schoof'``. Por defecto se elige según el tamaño del cuerpo.
+            Ningún método es práctico para cuerpos de más de unos 100 bits
+            (ver la documentación del módulo).
+
+    Returns:
+        int: el número de puntos de la curva (incluido el elemento neutro).
+    """
+    if metodo is None and E in _ordenes:
+        return _ordenes[E]
+
+    F, p, n = _cuerpo(E)
+    q = p ** n
+    if metodo is None:
+        if q < 2 ** 10:
+            metodo = 'enumeracion'
+        elif hasattr(E, 'Fq') and n == 1 and q.bit_length() > 60:
+            metodo = 'schoof'
+        else:
+            metodo = 'bsgs'
+
+    if metodo == 'enumeracion':
+        orden = _orden_por_enumeracion(E)
+    elif metodo == 'bsgs':
+        orden = _orden_por_bsgs(E)
+    elif metodo == 'schoof':
+        if not hasattr(E, 'Fq') or n != 1:
+            raise ValueError("El algoritmo de Schoof solo está disponible para cuerpos primos.")
+        a, b = E.coeficientes
+        orden = p + 1 - _traza_schoof(int(a), int(b), p, polinomios=_polinomios(E))
+    else:
+        raise ValueError("Método desconocido: {0}".format(metodo))
+
+    _ordenes[E] = orden
+    return orden
+
+
+def _elementos(F, p, n):
+    """Recorre todos los elementos del cuerpo finito."""
+    if n == 1:
+        return (F(x) for x in range(p))
+    return (F(list(coeficientes)) for coeficientes in itertools.product(range(p), repeat=n))
+
+
+def _traza_absoluta(c, m):
+    """Devuelve la traza de c sobre F_2 (c en el cuerpo de 2**m elementos)."""
+    traza = c
+    for _ in range(m - 1):
+        c = c * c
+        traza = traza + c
+    return traza
+
+
+def _orden_por_enumeracion(E):
+    F, p, n = _cuerpo(E)
+    q = p ** n
+    a, b = E.coeficientes
+    orden = 1  # elemento neutro
+    if p == 2:
+        # y^2 + x y = x^3 + a x^2 + b: para x = 0 hay una solución y para
+        # x != 0 hay dos si la traza de (x^3 + a x^2 + b) / x^2 es nula
+        for x in _elementos(F, p, n):
+            if x == F.cero():
+                orden += 1
+            elif _traza_absoluta((x * x * x + a * x * x + b) / (x * x), n) == F.cero():
+                orden += 2
+        return orden
+    for x in _elementos(F, p, n):
+        rhs = x * x * x + a * x + b
+        if rhs == F.cero():
+            orden += 1
+        elif rhs ** ((q - 1) // 2) == F.uno():
+            orden += 2
+    return orden
+
+
+# Paso de bebé, paso de gigante
+
+def _raiz_cuadrada(c, F, q):
+    """Devuelve una raíz cuadrada de c en el cuerpo finito de q elementos
+    (q impar) o None si c no es un cuadrado (algoritmo de Tonelli-Shanks)."""
+    if c == F.cero():
+        return c
+    if c ** ((q - 1) // 2) != F.uno():
+        return None
+    s, t = 0, q - 1
+    while t % 2 == 0:
+        s, t = s + 1, t // 2
+    while True:
+        z = _elemento_aleatorio(F)
+        if z != F.cero() and z ** ((q - 1) // 2) != F.uno():
+            break
+    m, c_, T, R = s, z ** t, c ** t, c ** ((t + 1) // 2)
+    while T != F.uno():
+        i, T2 = 0, T
+        while T2 != F.uno():
+            T2, i = T2 * T2, i + 1
+        b = c_ ** (2 ** (m - i - 1))
+        m, c_, T, R = i, b * b, T * b * b, R * b
+    return R
+
+
+def _elemento_aleatorio(F):
+    n = getattr(F, 'n', 1)
+    if n == 1:
+        return F(random.randrange(F.p))
+    return F([random.randrange(F.p) for _ in range(n)])
+
+
+def _resuelve_artin_schreier(c, F, m):
+    """Devuelve z con z^2 + z = c en el cuerpo de 2**m elementos, o None si
+    no existe (la traza de c no es nula)."""
+    if _traza_absoluta(c, m) != F.cero():
+        return None
+    if m % 2 == 1:
+        # semitraza
+        z, potencia = c, c
+        for _ in range((m - 1) // 2):
+            potencia = potencia * potencia * potencia * potencia
+            z = z + potencia
+        return z
+    while True:
+        tau = _elemento_aleatorio(F)
+        if _traza_absoluta(tau, m) != F.cero():
+            break
+    # z = sum_{i=1}^{m-1} (sum_{j=i}^{m-1} tau^(2^j)) c^(2^(i-1))
+    potencias_tau = [tau]
+    for _ in range(m - 1):
+        potencias_tau.append(potencias_tau[-1] * potencias_tau[-1])
+    z, potencia_c, suma_tau = F.cero(), c, F.cero()
+    for j in range(1, m):
+        suma_tau = suma_tau + potencias_tau[j]
+    for i in range(1, m):
+        z = z + suma_tau * potencia_c
+        potencia_c = potencia_c * potencia_c
+        suma_tau = suma_tau - potencias_tau[i]
+    return z
+
+
+def _punto_aleatorio(E):
+    """Devuelve un punto aleatorio de la curva distinto del elemento neutro."""
+    F, p, n = _cuerpo(E)
+    a, b = E.coeficientes
+    while True:
+        x = _elemento_aleatorio(F)
+        if p == 2:
+            if x == F.cero():
+                continue
+            z = _resuelve_artin_schreier((x * x * x + a * x * x + b) / (x * x), F, n)
+            if z is not None:
+                return E(x, x * z)
+        else:
+            y = _raiz_cuadrada(x * x * x + a * x + b, F, p ** n)
+            if y is not None:
+                return E(x, y)
+
+
+def _multiplo_en_intervalo(P, inferior, superior):
+    """Devuelve un m entre inferior y superior con m P = O (o None)
+    mediante el método paso de bebé, paso de gigante."""
+    anchura = superior - inferior
+    s = _raiz_entera(anchura) + 1
+    # pasos de bebé: j P para 0 <= j < s
+    pasos_bebe = {}
+    R = type(P).elemento_neutro()
+    for j in range(s):
+        pasos_bebe.setdefault(R, j)
+        R = R + P
+    paso_gigante = R  # s P
+    # pasos de gigante: (inferior + i s) P = -j P
+    R = inferior * P
+    for i in range(anchura // s + 1):
+        j = pasos_bebe.get(-R)
+        if j is not None and inferior + i * s + j <= superior:
+            return inferior + i * s + j
+        R = R + paso_gigante
+    return None
+
+
+def _orden_punto(P, multiplo):
+    """Devuelve el orden de P sabiendo que multiplo P = O."""
+    orden = multiplo
+    for primo, exponente in factoriza(multiplo).items():
+        for _ in range(exponente):
+            if ((orden // primo) * P).es_elemento_neutro():
+                orden //= primo
+            else:
+                break
+    return orden
+
+
+def _torcida(E):
+    """Devuelve la torcida cuadrática de la curva."""
+    F, p, n = _cuerpo(E)
+    a, b = E.coeficientes
+    pol = getattr(F, 'pol_irreducible', None)
+    if p == 2:
+        while True:
+            delta = _elemento_aleatorio(F)
+            if _traza_absoluta(delta, n) != F.cero():
+                return curva_eliptica_sobre_F2m(a + delta, b, n, pol)
+    q = p ** n
+    while True:
+        g = _elemento_aleatorio(F)
+        if g != F.cero() and g ** ((q - 1) // 2) != F.uno():
+            return curva_eliptica_sobre_Fq(a * g * g, b * g * g * g, p, n, pol)
+
+
+def _orden_por_bsgs(E, intentos=64):
+    F, p, n = _cuerpo(E)
+    q = p ** n
+    # intervalo de Hasse: |#E - (q + 1)| <= 2 sqrt(q)
+    inferior = q + 1 - _raiz_entera(4 * q)
+    superior = q + 1 + _raiz_entera(4 * q)
+    # el orden de E es múltiplo de mcm y el de la torcida (2q + 2 - #E)
+    # es múltiplo de mcm_torcida
+    mcm, mcm_torcida = 1, 1
+    torcida = None
+    for intento in range(intentos):
+        if intento % 2 == 0:
+            P = _punto_aleatorio(E)
+            m = _multiplo_en_intervalo(P, inferior, superior)
+            mcm = mcm * _orden_punto(P, m) // math.gcd(mcm, _orden_punto(P, m))
+        else:
+            torcida = torcida or _torcida(E)
+            P = _punto_aleatorio(torcida)
+            m = _multiplo_en_intervalo(P, 2 * q + 2 - superior, 2 * q + 2 - inferior)
+            orden = _orden_punto(P, m)
+            mcm_torcida = mcm_torcida * orden // math.gcd(mcm_torcida, orden)
+
+        candidatos = [N for N in range(-(-inferior // mcm) * mcm, superior + 1, mcm)
+                      if (2 * q + 2 - N) % mcm_torcida == 0]
+        if len(candidatos) == 1:
+            return candidatos[0]
+    if q < 2 ** 10:
+        # en cuerpos muy pequeños el intervalo de Hasse puede contener
+        # varios múltiplos del exponente de E y de su torcida
+        return _orden_por_enumeracion(E)
+    raise RuntimeError("No se ha podido determinar el orden de la curva.")
+
+
+# Polinomios de división
+
+class _PolinomiosDivision(object):
+    """Calcula y guarda los polinomios de división f_n de la curva
+    y^2 = x^3 + a x + b sobre Z_p (como listas de coeficientes).
+
+    Se tiene psi_n = f_n si n es impar y psi_n = y f_n si n es par. Los
+    polinomios se calculan de forma incremental con las fórmulas de
+    recurrencia, reutilizando los ya calculados."""
+    def __init__(self, a, b, p):
+        self.p = p
+        self.F = _recorta([b % p, a % p, 0, 1])  # x^3 + a x + b
+        self.F2 = _producto_coeficientes(self.F, self.F, p)
+        self.f = [
+            [],
+            [1],
+            [2 % p],
+            _recorta([(-a * a) % p, 12 * b % p, 6 * a % p, 0, 3 % p]),
+            _recorta([c * 4 % p for c in [(-a ** 3 - 8 * b * b) % p, (-4 * a * b) % p,
+                                          (-5 * a * a) % p, 20 * b % p, 5 * a % p, 0, 1]]),
+        ]
+        self._inverso_2 = inverso_modular(2, p, primo=True)
+
+    def __getitem__(self, n):
+        while len(self.f) <= n:
+            self._siguiente()
+        return self.f[n]
+
+    def _siguiente(self):
+        p, f, mul = self.p, self.f, _producto_coeficientes
+        n = len(f)
+        m = n // 2
+
+        def cubo(g):
+            return mul(mul(g, g, p), g, p)
+
+        if n % 2 == 1:
+            # psi_{2m+1} = psi_{m+2} psi_m^3 - psi_{m-1} psi_{m+1}^3
+            t1 = mul(f[m + 2], cubo(f[m]), p)
+            t2 = mul(f[m - 1], cubo(f[m + 1]), p)
+            if m % 2 == 0:
+                t1 = mul(t1, self.F2, p)
+            else:
+                t2 = mul(t2, self.F2, p)
+            f.append(_resta_coeficientes(t1, t2, p))
+        else:
+            # psi_{2m} = psi_m (psi_{m+2} psi_{m-1}^2 - psi_{m-2} psi_{m+1}^2) / (2 y)
+            t1 = mul(f[m + 2], mul(f[m - 1], f[m - 1], p), p)
+            t2 = mul(f[m - 2], mul(f[m + 1], f[m + 1], p), p)
+            g = mul(f[m], _resta_coeficientes(t1, t2, p), p)
+            f.append([c * self._inverso_2 % p for c in g])
+
+
+def _polinomios(E):
+    polinomios = _polinomios_division.get(E)
+    if polinomios is None:
+        a, b = E.coeficientes
+        polinomios = _polinomios_division[E] = _PolinomiosDivision(int(a), int(b), E.Fq.p)
+    return polinomios
+
+
+def polinomio_division(E, n):
+    """Devuelve el n-ésimo polinomio de división de una curva elíptica
+    y^2 = x^3 + a x + b sobre un cuerpo primo.
+
+        >>> from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+        >>> E = curva_eliptica_sobre_Fq(2, 3, 97)
+        >>> polinomio_division(E, 3)
+        3*X^4 + 12*X^2 + 36*X + 93
+
+    Las raíces del n-ésimo polinomio de división son las abscisas de los
+    puntos de n-torsión distintos del elemento neutro. Si n es par, el
+    polinomio de división psi_n es divisible por y, y se devuelve psi_n / y.
+
+    Los polinomios se guardan para cada curva y se calculan de forma
+    incremental, reutilizando los de índice menor.
+
+    Args:
+        E: la clase que representa los puntos de la curva (devuelta por
+            :func:`.curva_eliptica_sobre_Fq` con n = 1).
+        n (int): un entero no negativo.
+
+    Returns:
+        PolinomioZp: el polinomio de división.
+    """
+    return PolinomioZp(_polinomios(E)[n], E.Fq.p)
+
+
+# Algoritmo de Schoof
+
+class _FactorEncontrado(Exception):
+    """Se ha encontrado un factor propio del módulo al invertir."""
+    def __init__(self, factor):
+        super().__init__()
+        self.factor = factor
+
+
+def _traza_schoof(a, b, p, polinomios=None, restos=None):
+    """Devuelve la traza de Frobenius t = p + 1 - #E de la curva
+    y^2 = x^3 + a x + b sobre Z_p mediante el algoritmo de Schoof.
+
+    Se pueden indicar en el diccionario *restos* los valores de t mod l ya
+    conocidos para algunos primos l."""
+    if polinomios is None:
+        polinomios = _PolinomiosDivision(a, b, p)
+    restos = dict(restos or {})
+    if 2 not in restos:
+        restos[2] = _traza_modulo_2(p, polinomios)
+
+    cota = 4 * _raiz_entera(p) + 4
+    producto, l = 2, 2
+    while producto <= cota:
+        l = _siguiente_primo(l)
+        if l == p:
+            continue
+        if l not in restos:
+            restos[l] = _traza_modulo_l(l, a, p, polinomios)
+        producto *= l
+
+    modulos = sorted(restos)
+    t = teorema_chino_resto([restos[l] for l in modulos], modulos)
+    producto = 1
+    for l in modulos:
+        producto *= l
+    if t > producto // 2:
+        t -= producto
+    return t
+
+
+def _traza_modulo_2(p, polinomios):
+    """Devuelve t mod 2: t es par si y solo si la curva tiene un punto de
+    orden 2, esto es, si mcd(x^p - x, x^3 + a x + b) != 1."""
+    F = polinomios.F
+    anillo = _AnilloCociente(F, p)
+    x_p = anillo.potencia([0, 1], p)
+    _, d = _mcd_extendido_coeficientes(_resta_coeficientes(x_p, [0, 1], p), F, p)
+    return 0 if len(d) > 1 else 1
+
+
+def _siguiente_primo(n):
+    n += 1
+    while not es_primo(n):
+        n += 1
+    return n
+
+
+def _traza_modulo_l(l, a, p, polinomios):
+    """Devuelve t mod l comprobando para qué tau se cumple
+    pi^2(P) + [p mod l] P = tau pi(P) en los puntos de l-torsión."""
+    h = polinomios[l]
+    F = polinomios.F
+    anillo = _AnilloCociente(h, p)
+    # Frobenius: pi(x, y) = (x^p, y^p) = (x^p, F^((p-1)/2) y)
+    X1 = anillo.potencia([0, 1], p)
+    Y1 = anillo.potencia(F, (p - 1) // 2)
+    X2 = anillo.potencia(X1, p)
+    Y2 = anillo.producto(anillo.potencia(Y1, p), Y1)
+
+    while True:
+        try:
+            return _busca_traza(l, a, p, anillo, F, (X1, Y1), (X2, Y2))
+        except _FactorEncontrado as excepcion:
+            # se continúa módulo el factor (o el cofactor) de menor grado
+            g = excepcion.factor
+            cofactor = _divmod_coeficientes(anillo.h, g, p)[0]
+            anillo = _AnilloCociente(min(g, cofactor, key=len), p)
+            X1, Y1, X2, Y2 = [anillo.reduce(list(c)) for c in (X1, Y1, X2, Y2)]
+
+
+def _busca_traza(l, a, p, anillo, F, frobenius, frobenius_cuadrado):
+    F = anillo.reduce(list(F))
+    q_l = p % l
+    # [q_l](x, y)
+    Q = _multiplica_en_anillo((anillo.reduce([0, 1]), [1]), q_l, a, anillo, F)
+    S = _suma_en_anillo(frobenius_cuadrado, Q, a, anillo, F)
+    if S is None:
+        return 0
+    T = frobenius
+    for tau in range(1, (l - 1) // 2 + 1):
+        if T is not None and T[0] == S[0]:
+            if T[1] == S[1]:
+                return tau
+            elif not _suma_coeficientes(T[1], S[1], p):
+                return l - tau
+            # las ordenadas coinciden solo en algunos puntos
+            _, g = _mcd_extendido_coeficientes(_resta_coeficientes(T[1], S[1], p), anillo.h, p)
+            raise _FactorEncontrado(g)
+        T = _suma_en_anillo(T, frobenius, a, anillo, F)
+    raise RuntimeError("No se ha encontrado la traza módulo {0}.".format(l))
+
+
+def _inverso_en_anillo(c, anillo):
+    s, d = _mcd_extendido_coeficientes(c, anillo.h, anillo.p)
+    if len(d) > 1:
+        raise _FactorEncontrado(d)
+    return s
+
+
+def _suma_en_anillo(P, Q, a, anillo, F):
+    """Suma dos puntos (X, Y) que representan (X(x), Y(x) y) con X, Y en
+    Z_p[x] / (h). El elemento neutro es None."""
+    p = anillo.p
+    if P is None:
+        return Q
+    if Q is None:
+        return P
+    X1, Y1 = P
+    X2, Y2 = Q
+    if X1 == X2:
+        if Y1 == Y2:
+            return _duplica_en_anillo(P, a, anillo, F)
+        if not _suma_coeficientes(Y1, Y2, p):
+            return None
+        _, g = _mcd_extendido_coeficientes(_resta_coeficientes(Y1, Y2, p), anillo.h, p)
+        raise _FactorEncontrado(g)
+    # lambda = L y, con L = (Y2 - Y1) / (X2 - X1)
+    L = anillo.producto(_resta_coeficientes(Y2, Y1, p),
+                        _inverso_en_anillo(_resta_coeficientes(X2, X1, p), anillo))
+    return _completa_suma(L, X1, Y1, X2, anillo, F)
+
+
+def _duplica_en_anillo(P, a, anillo, F):
+    p = anillo.p
+    if P is None:
+        return None
+    X, Y = P
+    if not Y:
+        return None
+    # lambda = (3 X^2 + a) / (2 Y y) = L y, con L = (3 X^2 + a) / (2 Y F)
+    numerador = _suma_coeficientes([3 * c % p for c in anillo.producto(X, X)], [a % p], p)
+    denominador = anillo.producto([2 * c % p for c in Y], F)
+    L = anillo.producto(numerador, _inverso_en_anillo(denominador, anillo))
+    return _completa_suma(L, X, Y, X, anillo, F)
+
+
+def _completa_suma(L, X1, Y1, X2, anillo, F):
+    p = anillo.p
+    # X3 = lambda^2 - X1 - X2 = L^2 F - X1 - X2, Y3 = L (X1 - X3) - Y1
+    X3 = _resta_coeficientes(anillo.producto(anillo.producto(L, L), F),
+                             _suma_coeficientes(X1, X2, p), p)
+    Y3 = _resta_coeficientes(anillo.producto(L, _resta_coeficientes(X1, X3, p)), Y1, p)
+    return (X3, Y3)
+
+
+def _multiplica_en_anillo(P, k, a, anillo, F):
+    Q = None
+    for bit in bin(k)[2:]:
+        Q = _duplica_en_anillo(Q, a, anillo, F)
+        if bit == "1":
+            Q = _suma_en_anillo(Q, P, a, anillo, F)
+    return Q
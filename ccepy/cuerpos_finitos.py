@@ -16,20 +16,38 @@ Para operar con elementos de un cuerpo finito con q elementos, use la función
     >>> F16([1, 1, 0, 1]) + F16([1, 0, 0, 1])
     {[0, 1, 0, 0]; 16}
     >>> F16([1, 0, 1, 1]) * F16([1, 0, 0, 1])
-    {[1, 0, 0, 0]; 16}
+    {[1, 1, 1, 1]; 16}
     >>> F16([1, 1, 0, 1]) ** (-1)
-    {[0, 1, 0, 1]; 16}
+    {[1, 0, 1, 0]; 16}
     >>> F16([0, 0, 1, 0]) ** 2
-    {[1, 0, 0, 1]; 16}
+    {[1, 1, 0, 0]; 16}
 
 Se está utilizando la representación polinomial para los elementos de un
 cuerpo finito. En particular, para la creación y la representación de
 un elemento se utilizan los coeficientes del elemento visto como polinomio.
+
+Para cuerpos pequeños (hasta unos millones de elementos) que se usan
+intensivamente, :func:`FqZech` ofrece una representación logarítmica en la
+que cada operación es una o dos consultas a tablas precalculadas.
 """
-import copy
+import os
+import sys
+import mmap
+import array
+import struct
+import hashlib
 import functools
 
-from ccepy.aritmetica_elemental import Zp, PolinomioZp, alg_euclides_polinomios
+from ccepy.aritmetica_elemental import Zp, PolinomioZp, factoriza, inverso_modular, \
+    _AnilloCociente, _recorta, _suma_coeficientes, _tam_coeficiente, _empaqueta, _desempaqueta, \
+    _mcd_extendido_coeficientes
+from ccepy.listado_polinomios_irreducibles import polinomio_irreducible
+
+
+# Grado a partir del cual se invierte con el algoritmo de Itoh-Tsujii en
+# lugar del algoritmo extendido de Euclides (medido en F_{2^n}, F_{3^n} y
+# F_{7^n}: por debajo de este grado Euclides sobre listas es más rápido)
+_GRADO_ITOH_TSUJII = 256
 
 
 @functools.lru_cache()
@@ -40,7 +58,11 @@ def Fq(p, n=1, pol_irreducible=None):
         >>> F16
         <class 'ccepy.cuerpos_finitos.Fq.<locals>.ElementoFq'>
         >>> F16([0, 0, 0, 0, 1])
-        {[1, 0, 0, 1]; 16}
+        {[1, 1, 0, 0]; 16}
+
+    Si no se indica el polinomio irreducible, se usa el que devuelve
+    :func:`.polinomio_irreducible` (en este caso X^4 + X + 1), de modo que
+    ``Fq(p, n)`` es el mismo cuerpo en cualquier proceso.
 
     Se puede especificar el polinomio con el cual se hace módulo:
 
@@ -56,7 +78,7 @@ def Fq(p, n=1, pol_irreducible=None):
         p (int): un número primo.
         n (Optional[int]): un número natural.
         pol_irreducible (Optional[PolinomioZp]): un polinomio de grado
-            *n* irreducible.
+            *n* irreducible. Por defecto, el de :func:`.polinomio_irreducible`.
 
     Return:
         Si n es uno, devuelve :class:`.EnteroModuloP`.
@@ -65,6 +87,10 @@ def Fq(p, n=1, pol_irreducible=None):
     """
     if n == 1:
         return Zp(p)
+    if pol_irreducible is None:
+        # Así Fq(p, n) y Fq(p, n, pol_irreducible) devuelven la misma clase
+        pol_irreducible = polinomio_irreducible(p, n)
+        return Fq(p, n, pol_irreducible)
 
     # Copiar la clase fuera de la función para que aparezca en la documentación
     class ElementoFq(PolinomioZp):
@@ -88,6 +114,16 @@ def Fq(p, n=1, pol_irreducible=None):
         Soporta los operadores ``+``, ``-``, ``*``, ``/`` y ``**`` con su
         significado habitual.
 
+        Los elementos son inmutables y se pueden usar como claves de un
+        diccionario:
+
+            >>> {p: 1, q: 2}[F16([1, 1, 0, 1])]
+            1
+
+        Como en :func:`.Zp`, un elemento constante es igual a cualquier
+        entero congruente con él, pero solo tiene el mismo hash que el
+        representante entre 0 y p - 1 (el de :attr:`coeficientes`).
+
         Args:
             coeficientes (List[int]): los coeficientes del elemento visto
                 como polinomio.
@@ -101,10 +137,14 @@ def Fq(p, n=1, pol_irreducible=None):
             q (int): el número de elementos del cuerpo finito.
                 (*atributo de clase*)
         """
+        __slots__ = ()
+
         Zp = None
         p = None
         n = None
         pol_irreducible = None
+        _anillo_cociente = None
+        _tablas_frobenius = None
 
         @classmethod
         def cero(cls):
@@ -126,21 +166,28 @@ def Fq(p, n=1, pol_irreducible=None):
 
         def __init__(self, coeficientes):
             if isinstance(coeficientes, int):
-                pol = PolinomioZp([coeficientes], ElementoFq.p)
-            elif isinstance(coeficientes, list):
-                pol = PolinomioZp(coeficientes, ElementoFq.p)
-            else:
+                coeficientes = [coeficientes]
+            elif not isinstance(coeficientes, list):
                 # PolinomioZp o ElementoFq
-                pol = coeficientes
+                coeficientes = coeficientes._coeficientes
 
-            coeficientes_nuevos = (pol % ElementoFq.pol_irreducible).coeficientes
-            super().__init__(coeficientes_nuevos, ElementoFq.p)
+            p = ElementoFq.p
+            reducido = ElementoFq._anillo().reduce(_recorta([int(c) % p for c in coeficientes]))
+            super().__init__(reducido or [0], p)
 
         def __eq__(self, alfa):
-            return super().__eq__(ElementoFq(alfa))
+            # solo se reduce alfa si no es ya un elemento del cuerpo
+            if type(alfa) is not ElementoFq:
+                if not isinstance(alfa, (int, list, PolinomioZp)):
+                    return NotImplemented
+                alfa = ElementoFq(alfa)
+            return super().__eq__(alfa)
 
         def __ne__(self, alfa):
-            return not self.__eq__(alfa)
+            igual = self.__eq__(alfa)
+            return igual if igual is NotImplemented else not igual
+
+        __hash__ = PolinomioZp.__hash__
 
         def __add__(self, alfa):
             return ElementoFq(super().__add__(alfa))
@@ -157,48 +204,155 @@ def Fq(p, n=1, pol_irreducible=None):
             return -self.__sub__(alfa)
 
         def __mul__(self, alfa):
-            return ElementoFq(super().__mul__(alfa))
+            if type(alfa) is not ElementoFq:
+                alfa = ElementoFq(alfa)
+            producto = ElementoFq._anillo().producto(self._enteros(), alfa._enteros())
+            return ElementoFq._desde_enteros(producto)
 
         __rmul__ = __mul__
 
+        # Aritmética interna sobre listas de coeficientes (enteros entre 0 y
+        # p - 1, ver :class:`.PolinomioZp`), para encadenar muchas
+        # operaciones sin construir objetos intermedios.
+
+        @classmethod
+        def _anillo(cls):
+            """Devuelve el anillo Z_p[X] / (pol_irreducible)."""
+            return ElementoFq._anillo_cociente
+
+        def _enteros(self):
+            """Devuelve los coeficientes como lista de enteros."""
+            return _recorta([int(c) for c in self._coeficientes])
+
+        @classmethod
+        def _desde_enteros(cls, coeficientes):
+            """Construye el elemento a partir de una lista de coeficientes ya
+            reducida módulo el polinomio irreducible."""
+            elemento = ElementoFq.__new__(ElementoFq)
+            PolinomioZp.__init__(elemento, coeficientes or [0], ElementoFq.p)
+            return elemento
+
+        @classmethod
+        def _tabla_frobenius(cls, k):
+            """Devuelve la matriz de la aplicación lineal alfa -> alfa^(p^k).
+
+            La columna i son los coeficientes de X^(i p^k) empaquetados en un
+            entero (ver :func:`_empaqueta`), así que aplicar la matriz cuesta
+            n multiplicaciones de un entero por un coeficiente."""
+            tabla = ElementoFq._tablas_frobenius.get(k)
+            if tabla is None:
+                anillo, p, n = ElementoFq._anillo(), ElementoFq.p, ElementoFq.n
+                if k == 1:
+                    x_p = anillo.potencia([0, 1], p)
+                else:
+                    # X^(p^k) = (X^(p^(k-1)))^p
+                    x_p = ElementoFq._aplica_frobenius([0, 1], k - 1)
+                    x_p = ElementoFq._aplica_frobenius(x_p, 1)
+                columnas = [[1]]
+                for _ in range(1, n):
+                    columnas.append(anillo.producto(columnas[-1], x_p))
+                tam = _tam_coeficiente(p, n)
+                tabla = ElementoFq._tablas_frobenius[k] = (tam, [_empaqueta(c, tam) for c in columnas])
+            return tabla
+
         @classmethod
-        def _exponenciacion_binaria(cls, g, k):
-            """Calcula la potencia k-ésima del elemento g eficientemente.
+        def _aplica_frobenius(cls, coeficientes, k):
+            """Calcula alfa^(p^k) sobre listas de coeficientes."""
+            tam, columnas = ElementoFq._tabla_frobenius(k)
+            H = 0
+            for c, columna in zip(coeficientes, columnas):
+                if c:
+                    H += c * columna
+            return _desempaqueta(H, ElementoFq.n, tam, ElementoFq.p)
+
+        def frobenius(self, k=1):
+            """Devuelve la imagen del elemento por la k-ésima potencia del
+            automorfismo de Frobenius, esto es, el elemento elevado a p^k.
+
+                >>> F9 = Fq(3, 2)
+                >>> alfa = F9([1, 2])
+                >>> alfa.frobenius() == alfa ** 3
+                True
+                >>> alfa.frobenius(2) == alfa
+                True
+
+            El automorfismo de Frobenius es una aplicación lineal sobre Z_p,
+            así que se precalcula su matriz (la primera vez que se usa) y
+            cada aplicación es un producto matriz-vector.
 
             Args:
-                g (ElementoFq): un elemento del cuerpo finito.
-                k (int): un exponente natural entre el 0 y q-2 (ambos inclusive).
+                k (Optional[int]): el exponente.
 
-            Return:
-                ElementoFq: la potencia k-ésima del elemento g.
+            Returns:
+                ElementoFq: el elemento elevado a p^k.
             """
-            rep_binaria_k = "".join(reversed(bin(k)[2:]))
-            t = len(rep_binaria_k) - 1
-
-            s = ElementoFq([1])
+            k %= ElementoFq.n
             if k == 0:
-                return s
-            G = copy.deepcopy(g)
-            if rep_binaria_k[0] == "1":
-                s = copy.deepcopy(G)
-            for i in range(1, t + 1):
-                G = G * G
-                if rep_binaria_k[i] == "1":
-                    s = G * s
-            return s
+                return self
+            return ElementoFq._desde_enteros(ElementoFq._aplica_frobenius(self._enteros(), k))
+
+        def _conjugados(self):
+            """Devuelve la lista de coeficientes de alfa, alfa^p, ...,
+            alfa^(p^(n-1))."""
+            conjugados = [self._enteros()]
+            for _ in range(1, ElementoFq.n):
+                conjugados.append(ElementoFq._aplica_frobenius(conjugados[-1], 1))
+            return conjugados
+
+        def traza(self):
+            """Devuelve la traza del elemento sobre Z_p, esto es, la suma de
+            sus conjugados alfa, alfa^p, ..., alfa^(p^(n-1)).
+
+                >>> F9 = Fq(3, 2, PolinomioZp([1, 0, 1], p=3))
+                >>> F9([1, 2]).traza()
+                2
+
+            Returns:
+                EnteroModuloP: la traza.
+            """
+            traza = []
+            for conjugado in self._conjugados():
+                traza = _suma_coeficientes(traza, conjugado, ElementoFq.p)
+            return ElementoFq.Zp(traza[0] if traza else 0)
+
+        def norma(self):
+            """Devuelve la norma del elemento sobre Z_p, esto es, el producto
+            de sus conjugados alfa, alfa^p, ..., alfa^(p^(n-1)).
+
+                >>> F9 = Fq(3, 2, PolinomioZp([1, 0, 1], p=3))
+                >>> F9([1, 2]).norma()
+                2
+
+            Returns:
+                EnteroModuloP: la norma.
+            """
+            anillo = ElementoFq._anillo()
+            norma = [1]
+            for conjugado in self._conjugados():
+                norma = anillo.producto(norma, conjugado)
+            return ElementoFq.Zp(norma[0] if norma else 0)
 
         def __pow__(self, k):
+            # como en Zp, 0^0 = 1 y el cero no tiene potencias negativas
             if self == ElementoFq.cero():
-                return self
+                if k < 0:
+                    raise ZeroDivisionError
+                return ElementoFq.uno() if k == 0 else self
             if self == ElementoFq.uno() or k == 0:
                 return ElementoFq.uno()
 
             q = ElementoFq.q
             if k < 0:
-                inverso = self.inverso()
-                return ElementoFq._exponenciacion_binaria(inverso, -k % (q - 1))
-            else:
-                return ElementoFq._exponenciacion_binaria(self, k % (q - 1))
+                return self.inverso() ** (-k % (q - 1))
+            k %= q - 1
+            # las potencias p^j son productos matriz-vector (Frobenius)
+            p, potencia = ElementoFq.p, ElementoFq.p
+            for j in range(1, ElementoFq.n):
+                if k == potencia:
+                    return self.frobenius(j)
+                potencia *= p
+            # exponenciación por ventanas deslizantes
+            return ElementoFq._desde_enteros(ElementoFq._anillo().potencia(self._enteros(), k))
 
         def inverso(self):
             """Devuelve el inverso del elemento del cuerpo finito.
@@ -207,14 +361,46 @@ def Fq(p, n=1, pol_irreducible=None):
                 >>> F16([1, 1, 0, 1]).inverso()
                 {[0, 1, 0, 1]; 16}
 
+            Se utiliza el algoritmo extendido de Euclides o, para grados n
+            grandes, el algoritmo de Itoh-Tsujii.
+
             Returns:
                 ElementoFq: el inverso.
             """
             if self == ElementoFq.cero():
                 raise ZeroDivisionError
 
-            s, t, d = alg_euclides_polinomios(self, ElementoFq.pol_irreducible, ElementoFq.p)
-            return ElementoFq(s)
+            if ElementoFq.n >= _GRADO_ITOH_TSUJII:
+                return ElementoFq._desde_enteros(self._inverso_itoh_tsujii())
+            pol = ElementoFq._anillo().h
+            s, _ = _mcd_extendido_coeficientes(self._enteros(), pol, ElementoFq.p)
+            return ElementoFq._desde_enteros(s)
+
+        def _inverso_itoh_tsujii(self):
+            """Calcula el inverso (como lista de coeficientes) mediante el
+            algoritmo de Itoh-Tsujii.
+
+            Sea r = 1 + p + ... + p^(n-1) = (q - 1) / (p - 1). Entonces
+            alfa^r es la norma, que está en Z_p, y el inverso es
+            alfa^(r - 1) / alfa^r. Con e_k = 1 + p + ... + p^(k-1) se
+            cumple e_(i+j) = e_i + p^i e_j, así que alfa^(e_(n-1)) se
+            obtiene con una cadena de adición de n - 1 (del orden de log n
+            multiplicaciones y aplicaciones de Frobenius) y
+            alfa^(r-1) = (alfa^(e_(n-1)))^p. Solo se invierte en Z_p.
+            """
+            anillo, p = ElementoFq._anillo(), ElementoFq.p
+            alfa = self._enteros()
+            potencia, k = alfa, 1  # potencia = alfa^(e_k)
+            for bit in bin(ElementoFq.n - 1)[3:]:
+                potencia = anillo.producto(potencia, ElementoFq._aplica_frobenius(potencia, k))
+                k *= 2
+                if bit == "1":
+                    potencia = anillo.producto(alfa, ElementoFq._aplica_frobenius(potencia, 1))
+                    k += 1
+            potencia = ElementoFq._aplica_frobenius(potencia, 1)
+            norma = anillo.producto(alfa, potencia)[0]
+            inverso_norma = inverso_modular(norma, p, primo=True)
+            return [c * inverso_norma % p for c in potencia]
 
         def __truediv__(self, alfa):
             return self * ElementoFq(alfa).inverso()
@@ -223,18 +409,525 @@ def Fq(p, n=1, pol_irreducible=None):
             return ElementoFq(alfa).__truediv__(self)
 
         def __str__(self):
-            tope = ElementoFq.n - len(self.coeficientes)
-            coeficientes = self.coeficientes + [0 for _ in range(0, tope)]
+            tope = ElementoFq.n - len(self._coeficientes)
+            coeficientes = list(self._coeficientes) + [0 for _ in range(0, tope)]
             return "{{{0}; {1}}}".format(coeficientes, ElementoFq.q)
 
         __repr__ = __str__
 
+        # Necesario para enviar elementos a otros procesos (multiprocessing)
+        def __reduce__(self):
+            pol = tuple(int(c) for c in ElementoFq.pol_irreducible.coeficientes)
+            coeficientes = tuple(int(c) for c in self._coeficientes)
+            return (_reconstruye_elemento_fq, (ElementoFq.p, ElementoFq.n, pol, coeficientes))
+
     ElementoFq.Zp = Zp(p)
     ElementoFq.p = p
     ElementoFq.n = n
     ElementoFq.q = p ** n
-    if pol_irreducible is None:
-        pol_irreducible = PolinomioZp.genera_irreducible(grado=n, p=p)
     ElementoFq.pol_irreducible = pol_irreducible
+    ElementoFq._tablas_frobenius = {}
+    # se crea aquí y no la primera vez que se usa para que los atributos de
+    # la clase no cambien al operar (ver :func:`.cuenta_operaciones`)
+    ElementoFq._anillo_cociente = _AnilloCociente([int(c) for c in pol_irreducible.coeficientes], p)
     ElementoFq.__name__ = "F{0}".format(p**n)
     return ElementoFq
+
+
+def _reconstruye_elemento_fq(p, n, pol_irreducible, coeficientes):
+    """Reconstruye un :class:`ElementoFq` serializado con pickle."""
+    F_q = Fq(p, n, PolinomioZp(list(pol_irreducible), p))
+    return F_q(list(coeficientes))
+
+
+def inverso_simultaneo(elementos):
+    """Devuelve los inversos de una lista de elementos no nulos de un cuerpo
+    finito realizando una única inversión (truco de Montgomery).
+
+        >>> F7 = Fq(7)
+        >>> inverso_simultaneo([F7(2), F7(3), F7(6)])
+        [4, 5, 6]
+
+    Se sustituyen n inversiones por una inversión y 3(n - 1)
+    multiplicaciones.
+
+    Args:
+        elementos (List): una lista de elementos no nulos de un mismo
+            cuerpo finito.
+
+    Returns:
+        List: la lista de los inversos, en el mismo orden.
+    """
+    if not elementos:
+        return []
+
+    # productos[i] = elementos[0] * ... * elementos[i]
+    productos = [elementos[0]]
+    for elemento in elementos[1:]:
+        productos.append(productos[-1] * elemento)
+
+    inverso = productos[-1].inverso()
+    inversos = [None] * len(elementos)
+    for i in range(len(elementos) - 1, 0, -1):
+        inversos[i] = inverso * productos[i - 1]
+        inverso = inverso * elementos[i]
+    inversos[0] = inverso
+    return inversos
+
+
+# Representación logarítmica (tablas de Zech)
+
+# Mayor número de elementos de un cuerpo con tablas de Zech
+_Q_MAXIMO_ZECH = 2 ** 24
+
+
+class _TablasZech(object):
+    """Tablas de logaritmos, antilogaritmos y logaritmos de Zech de un
+    cuerpo finito de q elementos respecto de un elemento primitivo g.
+
+    Cada elemento se identifica con un índice entre 0 y q - 1: el entero
+    c_0 + c_1 p + ... + c_(n-1) p^(n-1), donde los c_i son sus coeficientes.
+    Las tablas son arrays de enteros de 4 bytes:
+
+    * ``logaritmos[indice]``: el logaritmo en base g del elemento (q - 1
+      para el cero).
+    * ``antilogaritmos[k]``: el índice de g^k, para 0 <= k < q - 1.
+    * ``zech[k]``: el logaritmo de 1 + g^k (q - 1 si es cero).
+    """
+    _cabecera = struct.Struct('<8s4sQQ32s')
+    _magico = b'CCEPYZEC'
+
+    def __init__(self, p, n, pol_irreducible):
+        self.p = p
+        self.n = n
+        self.q = q = p ** n
+        self.pol_irreducible = pol_irreducible
+        self.generador = _elemento_primitivo(p, n, pol_irreducible)
+
+        self.antilogaritmos = array.array('i', bytes(4 * (q - 1)))
+        for k, indice in enumerate(_potencias_generador(p, n, pol_irreducible, self.generador)):
+            self.antilogaritmos[k] = indice
+
+        self.logaritmos = array.array('i', bytes(4 * q))
+        self.logaritmos[0] = q - 1
+        for k, indice in enumerate(self.antilogaritmos):
+            self.logaritmos[indice] = k
+
+        # 1 + g^k: se suma uno al coeficiente constante del índice
+        logaritmos = self.logaritmos
+        self.zech = array.array('i', [logaritmos[indice + 1 if indice % p != p - 1 else indice + 1 - p]
+                                      for indice in self.antilogaritmos])
+        self._fichero = None
+
+    def _huella(self):
+        """Identifica el cuerpo y el generador."""
+        h = hashlib.sha256()
+        pol = None if self.pol_irreducible is None else \
+            [int(c) for c in self.pol_irreducible.coeficientes]
+        h.update(str((self.p, self.n, pol, self.generador)).encode('utf-8'))
+        return h.digest()
+
+    def guarda(self, ruta):
+        """Guarda las tablas en un fichero."""
+        orden_bytes = b'le  ' if sys.byteorder == 'little' else b'be  '
+        with open(ruta, 'wb') as f:
+            f.write(_TablasZech._cabecera.pack(_TablasZech._magico, orden_bytes,
+                                               self.p, self.n, self._huella()))
+            self.logaritmos.tofile(f)
+            self.antilogaritmos.tofile(f)
+            self.zech.tofile(f)
+
+    @classmethod
+    def carga(cls, ruta, p, n, pol_irreducible):
+        """Carga las tablas guardadas con :meth:`guarda` proyectando el
+        fichero en memoria. El fichero queda abierto hasta que se llama a
+        :meth:`cierra` (también se puede usar con ``with``)."""
+        q = p ** n
+        f = open(ruta, 'rb')
+        datos = vistas = None
+        try:
+            datos = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(datos) < cls._cabecera.size:
+                raise ValueError("El fichero no contiene tablas de Zech.")
+            magico, orden_bytes, p_fichero, n_fichero, huella = cls._cabecera.unpack_from(datos, 0)
+            if magico != cls._magico:
+                raise ValueError("El fichero no contiene tablas de Zech.")
+            if orden_bytes.strip() != (b'le' if sys.byteorder == 'little' else b'be'):
+                raise ValueError("Las tablas se guardaron con otro orden de bytes.")
+            if (p_fichero, n_fichero) != (p, n):
+                raise ValueError("Las tablas no corresponden a este cuerpo.")
+            inicio = cls._cabecera.size
+            if len(datos) < inicio + 4 * (3 * q - 2):
+                raise ValueError("El fichero de las tablas está incompleto.")
+
+            tablas = cls.__new__(cls)
+            tablas.p, tablas.n, tablas.q = p, n, q
+            tablas.pol_irreducible = pol_irreducible
+            vista = memoryview(datos)
+            vistas = [vista[inicio:inicio + 4 * q].cast('i'),
+                      vista[inicio + 4 * q:inicio + 4 * (2 * q - 1)].cast('i'),
+                      vista[inicio + 4 * (2 * q - 1):inicio + 4 * (3 * q - 2)].cast('i')]
+            vista.release()
+            tablas.logaritmos, tablas.antilogaritmos, tablas.zech = vistas
+            # el generador es el elemento de logaritmo 1
+            tablas.generador = _coeficientes_indice(tablas.antilogaritmos[1 % (q - 1)], p, n)
+            if huella != tablas._huella():
+                raise ValueError("Las tablas no corresponden a este cuerpo.")
+        except BaseException:
+            for v in vistas or []:
+                v.release()
+            if datos is not None:
+                datos.close()
+            f.close()
+            raise
+        tablas._fichero = (f, datos)
+        return tablas
+
+    def cierra(self):
+        """Cierra el fichero de unas tablas cargadas con :meth:`carga`;
+        después ya no se pueden usar. Si las tablas se construyeron en
+        memoria, no hace nada."""
+        if self._fichero is not None:
+            f, datos = self._fichero
+            for tabla in (self.logaritmos, self.antilogaritmos, self.zech):
+                tabla.release()
+            datos.close()
+            f.close()
+            self._fichero = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cierra()
+
+def _coeficientes_indice(indice, p, n):
+    """Devuelve la lista de los n coeficientes del elemento con ese índice."""
+    coeficientes = []
+    for _ in range(n):
+        indice, c = divmod(indice, p)
+        coeficientes.append(c)
+    return coeficientes
+
+
+def _elemento_primitivo(p, n, pol_irreducible):
+    """Devuelve los coeficientes del primer elemento primitivo (en el orden
+    de los índices, empezando por X)."""
+    q = p ** n
+    exponentes = [(q - 1) // r for r in factoriza(q - 1)] if q > 2 else []
+    if n == 1:
+        for g in range(1, p):
+            if all(pow(g, e, p) != 1 for e in exponentes):
+                return [g]
+    F = Fq(p, n, pol_irreducible)
+    for indice in range(p, q):
+        coeficientes = _coeficientes_indice(indice, p, n)
+        g = F(coeficientes)
+        if all(g ** e != F.uno() for e in exponentes):
+            return coeficientes
+
+
+def _potencias_generador(p, n, pol_irreducible, generador):
+    """Genera los índices de g^0, g^1, ..., g^(q-2)."""
+    q = p ** n
+    if n == 1:
+        g, indice = generador[0], 1
+        for _ in range(q - 1):
+            yield indice
+            indice = indice * g % p
+        return
+
+    h = [int(c) for c in pol_irreducible.coeficientes]
+    inverso = inverso_modular(h[-1], p, primo=True)
+    h = [c * inverso % p for c in h]  # mónico
+    if generador == [0, 1] + [0] * (n - 2):
+        if p == 2:
+            # multiplicar por X es desplazar los bits y reducir con h
+            modulo = sum(c << i for i, c in enumerate(h))
+            indice = 1
+            for _ in range(q - 1):
+                yield indice
+                indice <<= 1
+                if indice >> n:
+                    indice ^= modulo
+            return
+        # X c(X) = c_(n-1) X^n + ... y X^n = -(h_0 + ... + h_(n-1) X^(n-1))
+        potencias = [p ** i for i in range(n)]
+        coeficientes = [1] + [0] * (n - 1)
+        for _ in range(q - 1):
+            yield sum(c * potencia for c, potencia in zip(coeficientes, potencias))
+            lider = coeficientes[-1]
+            coeficientes = [0] + coeficientes[:-1]
+            if lider:
+                coeficientes = [(c - lider * b) % p for c, b in zip(coeficientes, h)]
+        return
+
+    anillo = _AnilloCociente(h, p)
+    potencias = [p ** i for i in range(n)]
+    coeficientes = [1]
+    for _ in range(q - 1):
+        yield sum(c * potencia for c, potencia in zip(coeficientes, potencias))
+        coeficientes = anillo.producto(coeficientes, _recorta(list(generador)))
+
+
+def FqZech(p, n=1, pol_irreducible=None, ruta_cache=None):
+    """Devuelve el constructor de elementos del cuerpo finito con p**n
+    elementos en la representación logarítmica (tablas de Zech).
+
+        >>> F16 = FqZech(2, 4, PolinomioZp([1, 1, 0, 0, 1], p=2))
+        >>> alfa, beta = F16([1, 1, 0, 1]), F16([1, 0, 0, 1])
+        >>> alfa * beta
+        {[0, 0, 1, 1]; 16}
+        >>> alfa + beta
+        {[0, 1, 0, 0]; 16}
+        >>> alfa.logaritmo()
+        7
+
+    Cada elemento no nulo se guarda como su logaritmo discreto k respecto
+    de un elemento primitivo g (el primero en el orden de los índices,
+    normalmente X). Multiplicar, dividir y elevar a una potencia son
+    operaciones con enteros módulo q - 1. Para sumar se usa el logaritmo
+    de Zech Z(k), el logaritmo de 1 + g^k:
+
+        g^a + g^b = g^a (1 + g^(b-a)) = g^(a + Z(b - a)).
+
+    Las tablas (tres arrays de q enteros de 4 bytes) se construyen la
+    primera vez que se crea el cuerpo en el proceso. Si se indica
+    *ruta_cache* y el fichero existe, las tablas se proyectan en memoria
+    (módulo :mod:`mmap`) en lugar de construirse; si no existe, se
+    construyen y se guardan en él. La ruta no distingue cuerpos: si el
+    cuerpo ya se había creado, se devuelve la misma clase (y se guardan sus
+    tablas en *ruta_cache* si el fichero no existe).
+
+    Los elementos admiten los mismos operadores que los de :func:`Fq` y se
+    convierten entre ambas representaciones a través de sus coeficientes.
+
+    Args:
+        p (int): un número primo.
+        n (Optional[int]): un número natural.
+        pol_irreducible (Optional[PolinomioZp]): un polinomio de grado
+            *n* irreducible. Por defecto, el de ``Fq(p, n)``.
+        ruta_cache (Optional[str]): la ruta del fichero de las tablas.
+
+    Returns:
+        ElementoFqZech: el constructor de elementos.
+
+    Raises:
+        ValueError: si el cuerpo tiene más de 2^24 elementos o el fichero
+            no corresponde al cuerpo.
+    """
+    if p ** n > _Q_MAXIMO_ZECH:
+        raise ValueError("El cuerpo tiene demasiados elementos para usar tablas de Zech.")
+    if n > 1 and pol_irreducible is None:
+        pol_irreducible = Fq(p, n).pol_irreducible
+    # se normalizan los argumentos para que la caché devuelva siempre la
+    # misma clase para el mismo cuerpo; la ruta no forma parte de la clave
+    clave = (p, n, pol_irreducible)
+    if clave not in _cuerpos_zech:
+        _cuerpos_zech[clave] = _cuerpo_zech(p, n, pol_irreducible, ruta_cache)
+    elif ruta_cache is not None and not os.path.exists(ruta_cache):
+        _cuerpos_zech[clave]._tablas.guarda(ruta_cache)
+    return _cuerpos_zech[clave]
+
+
+# Clases ya construidas por FqZech, indexadas por (p, n, pol_irreducible)
+_cuerpos_zech = {}
+
+
+def _cuerpo_zech(p, n, pol_irreducible, ruta_cache):
+    q = p ** n
+    if ruta_cache is not None and os.path.exists(ruta_cache):
+        tablas = _TablasZech.carga(ruta_cache, p, n, pol_irreducible)
+    else:
+        tablas = _TablasZech(p, n, pol_irreducible)
+        if ruta_cache is not None:
+            tablas.guarda(ruta_cache)
+
+    logaritmos, antilogaritmos, zech = tablas.logaritmos, tablas.antilogaritmos, tablas.zech
+    m = q - 1
+    CERO = m  # logaritmo del cero
+    # -1 = g^((q-1)/2) si p es impar y -1 = 1 si p = 2
+    MENOS_UNO = m // 2 if p != 2 else 0
+
+    class ElementoFqZech(object):
+        """Representa un elemento del cuerpo finito con q elementos mediante
+        su logaritmo discreto respecto de un elemento primitivo.
+
+        Args:
+            coeficientes: un entero, una lista de coeficientes o un
+                elemento de la representación polinomial.
+
+        Attributes:
+            p (int): el primo p. (*atributo de clase*)
+            n (int): el grado de la extensión. (*atributo de clase*)
+            q (int): el número de elementos. (*atributo de clase*)
+            pol_irreducible (PolinomioZp): el polinomio irreducible (None si
+                n es uno). (*atributo de clase*)
+        """
+        __slots__ = ('_logaritmo',)
+
+        @classmethod
+        def cero(cls):
+            """Devuelve el cero del cuerpo finito."""
+            return ElementoFqZech._desde_logaritmo(CERO)
+
+        @classmethod
+        def uno(cls):
+            """Devuelve el uno del cuerpo finito."""
+            return ElementoFqZech._desde_logaritmo(0)
+
+        @classmethod
+        def generador(cls):
+            """Devuelve el elemento primitivo g respecto del cual se toman
+            los logaritmos."""
+            return ElementoFqZech._desde_logaritmo(1 % m)
+
+        @classmethod
+        def _desde_logaritmo(cls, k):
+            elemento = object.__new__(ElementoFqZech)
+            object.__setattr__(elemento, '_logaritmo', k)
+            return elemento
+
+        def __init__(self, coeficientes):
+            if isinstance(coeficientes, ElementoFqZech):
+                k = coeficientes._logaritmo
+            else:
+                if isinstance(coeficientes, PolinomioZp):
+                    coeficientes = list(coeficientes._coeficientes)
+                elif not isinstance(coeficientes, (int, list)):
+                    # un elemento de otra representación
+                    coeficientes = coeficientes.coeficientes
+                if n == 1:
+                    if isinstance(coeficientes, list):
+                        coeficientes = coeficientes[0] if coeficientes else 0
+                    coeficientes = [int(Zp(p)(coeficientes))]
+                else:
+                    coeficientes = Fq(p, n, pol_irreducible)(coeficientes)._coeficientes
+                indice = sum(int(c) * p ** i for i, c in enumerate(coeficientes))
+                k = logaritmos[indice]
+            object.__setattr__(self, '_logaritmo', k)
+
+        def __setattr__(self, nombre, valor):
+            raise AttributeError("Los elementos son inmutables.")
+
+        def logaritmo(self):
+            """Devuelve el logaritmo discreto del elemento respecto del
+            elemento primitivo (ver :meth:`generador`).
+
+            Raises:
+                ValueError: si el elemento es el cero.
+            """
+            if self._logaritmo == CERO:
+                raise ValueError("El cero no tiene logaritmo.")
+            return self._logaritmo
+
+        @property
+        def coeficientes(self):
+            """List[EnteroModuloP]: los coeficientes del elemento visto como
+            polinomio (sin ceros al final)."""
+            if self._logaritmo == CERO:
+                return [Zp(p)(0)]
+            coeficientes = _recorta(_coeficientes_indice(antilogaritmos[self._logaritmo], p, n))
+            return [Zp(p)(c) for c in coeficientes]
+
+        def _convierte(self, alfa):
+            return alfa if type(alfa) is ElementoFqZech else ElementoFqZech(alfa)
+
+        def __eq__(self, alfa):
+            if not isinstance(alfa, (ElementoFqZech, int, list)) and \
+                    not hasattr(alfa, 'coeficientes'):
+                return NotImplemented
+            return self._logaritmo == self._convierte(alfa)._logaritmo
+
+        def __ne__(self, alfa):
+            igual = self.__eq__(alfa)
+            return igual if igual is NotImplemented else not igual
+
+        def __hash__(self):
+            # el mismo que el de ElementoFq (y el de Zp si n = 1), con los
+            # que se compara como igual: el de la tupla de coeficientes o,
+            # si es una constante, el del propio entero
+            if self._logaritmo == CERO:
+                return hash(0)
+            coeficientes = _recorta(_coeficientes_indice(antilogaritmos[self._logaritmo], p, n))
+            return hash(coeficientes[0]) if len(coeficientes) == 1 else hash(tuple(coeficientes))
+
+        def __add__(self, alfa):
+            a, b = self._logaritmo, self._convierte(alfa)._logaritmo
+            if a == CERO:
+                return self._convierte(alfa)
+            if b == CERO:
+                return self
+            z = zech[(b - a) % m]
+            if z == CERO:
+                return ElementoFqZech._desde_logaritmo(CERO)
+            return ElementoFqZech._desde_logaritmo((a + z) % m)
+
+        __radd__ = __add__
+
+        def __neg__(self):
+            if self._logaritmo == CERO:
+                return self
+            return ElementoFqZech._desde_logaritmo((self._logaritmo + MENOS_UNO) % m)
+
+        def __sub__(self, alfa):
+            return self + (-self._convierte(alfa))
+
+        def __rsub__(self, alfa):
+            return -self.__sub__(alfa)
+
+        def __mul__(self, alfa):
+            a, b = self._logaritmo, self._convierte(alfa)._logaritmo
+            if a == CERO or b == CERO:
+                return ElementoFqZech._desde_logaritmo(CERO)
+            return ElementoFqZech._desde_logaritmo((a + b) % m)
+
+        __rmul__ = __mul__
+
+        def __pow__(self, k):
+            if self._logaritmo == CERO:
+                if k < 0:
+                    raise ZeroDivisionError
+                return ElementoFqZech.uno() if k == 0 else self
+            return ElementoFqZech._desde_logaritmo(self._logaritmo * k % m)
+
+        def inverso(self):
+            """Devuelve el inverso del elemento del cuerpo finito."""
+            if self._logaritmo == CERO:
+                raise ZeroDivisionError
+            return ElementoFqZech._desde_logaritmo(-self._logaritmo % m)
+
+        def __truediv__(self, alfa):
+            return self * self._convierte(alfa).inverso()
+
+        def __rtruediv__(self, alfa):
+            return self._convierte(alfa).__truediv__(self)
+
+        def __str__(self):
+            coeficientes = [int(c) for c in self.coeficientes]
+            coeficientes += [0] * (n - len(coeficientes))
+            return "{{{0}; {1}}}".format(coeficientes, q)
+
+        __repr__ = __str__
+
+        # Necesario para enviar elementos a otros procesos (multiprocessing)
+        def __reduce__(self):
+            pol = None if pol_irreducible is None else \
+                tuple(int(c) for c in pol_irreducible.coeficientes)
+            coeficientes = [int(c) for c in self.coeficientes]
+            return (_reconstruye_elemento_fq_zech, (p, n, pol, ruta_cache, coeficientes))
+
+    ElementoFqZech.p = p
+    ElementoFqZech.n = n
+    ElementoFqZech.q = q
+    ElementoFqZech.pol_irreducible = pol_irreducible
+    ElementoFqZech._tablas = tablas
+    ElementoFqZech.__name__ = "F{0}Zech".format(q)
+    return ElementoFqZech
+
+
+def _reconstruye_elemento_fq_zech(p, n, pol_irreducible, ruta_cache, coeficientes):
+    """Reconstruye un :class:`ElementoFqZech` serializado con pickle."""
+    if pol_irreducible is not None:
+        pol_irreducible = PolinomioZp(list(pol_irreducible), p)
+    return FqZech(p, n, pol_irreducible, ruta_cache)(coeficientes)
@@ -28,6 +28,7 @@ Para operar con puntos de una curva elíptica, use las funciones de la forma
     (23,24)
 """
 import copy
+import weakref
 from fractions import Fraction
 from collections import namedtuple
 from abc import ABCMeta, abstractmethod
@@ -35,6 +36,13 @@ from abc import ABCMeta, abstractmethod
 EcuacionWeierstrass = namedtuple('Coeficientes', ['a', 'b'])
 
 from ccepy.cuerpos_finitos import Fq, PolinomioZp  # PolinomioZp para los test
+from ccepy.cuerpos_finitos import inverso_simultaneo
+from ccepy.trazas import tramo
+
+# Última curva creada en este proceso para cada lista de parámetros. Permite
+# que los puntos serializados con pickle se reconstruyan en la misma clase.
+_curvas_sobre_Fq = weakref.WeakValueDictionary()
+_curvas_sobre_F2m = weakref.WeakValueDictionary()
 
 
 class PuntoRacional(metaclass=ABCMeta):
@@ -43,8 +51,11 @@ class PuntoRacional(metaclass=ABCMeta):
 
     Esta clase no se puede instanciar. Sirve como punto de partida para
     crear curvas elípticas sobre nuevos cuerpos.
+
+    Los puntos son inmutables y se pueden usar como claves de un diccionario
+    o elementos de un conjunto (el hash se calcula una sola vez).
     """
-    __slots__ = ('_x', '_y')  # para mejorar la eficiencia si hay muchos objetos
+    __slots__ = ('_x', '_y', '_hash')  # para mejorar la eficiencia si hay muchos objetos
 
     @classmethod
     @abstractmethod
@@ -54,9 +65,27 @@ class PuntoRacional(metaclass=ABCMeta):
 
     @abstractmethod
     def __init__(self, x, y):
-        # Debe inicializar self._x y self._y.
+        # Debe inicializar las coordenadas con self._fija_coordenadas(x, y).
         return
 
+    def _fija_coordenadas(self, x, y):
+        """Inicializa las coordenadas del punto (solo desde el constructor)."""
+        object.__setattr__(self, '_x', x)
+        object.__setattr__(self, '_y', y)
+        object.__setattr__(self, '_hash', None)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Los puntos son inmutables.")
+
+    __delattr__ = __setattr__
+
+    # Al ser inmutables, las copias pueden ser el propio punto
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     def es_elemento_neutro(self):
         """Comprueba si es el elemento neutro (el punto del infinito).
 
@@ -91,12 +120,90 @@ class PuntoRacional(metaclass=ABCMeta):
             El elemento neutro."""
         return cls(None, None)
 
-    @abstractmethod
+    @classmethod
+    def _sin_comprobar(cls, x, y):
+        """Construye el punto (x, y) sin comprobar que pertenece a la curva.
+
+        Solo debe usarse con coordenadas que ya son del tipo adecuado y que
+        provienen de operar con puntos de la curva."""
+        punto = cls.__new__(cls)
+        punto._fija_coordenadas(x, y)
+        return punto
+
+    # Representación proyectiva de los puntos.
+    #
+    # Los algoritmos que encadenan muchas operaciones (multiplicación escalar,
+    # operaciones en lote) trabajan sobre una representación proyectiva y solo
+    # al final vuelven a coordenadas afines. Por defecto la representación
+    # proyectiva es el propio punto afín; las subclases pueden sobrescribir
+    # estos métodos para evitar una inversión por cada operación.
+
+    @classmethod
+    def _neutro_proyectivo(cls):
+        """Devuelve el elemento neutro en la representación proyectiva."""
+        return cls.elemento_neutro()
+
+    def _a_proyectivo(self):
+        """Devuelve el punto en la representación proyectiva."""
+        return self
+
+    @classmethod
+    def _suma_proyectiva(cls, P, Q):
+        """Suma dos puntos en la representación proyectiva."""
+        return P + Q
+
+    @classmethod
+    def _duplicacion_proyectiva(cls, P):
+        """Duplica un punto en la representación proyectiva."""
+        return P + P
+
+    @classmethod
+    def _normaliza_lote(cls, puntos):
+        """Pasa una lista de puntos en la representación proyectiva a
+        puntos afines."""
+        return list(puntos)
+
+    @classmethod
+    def _multiplicacion_proyectiva(cls, punto, k):
+        """Calcula k * punto (k >= 0) mediante el método de multiplicación
+        por duplicación y devuelve el resultado en la representación
+        proyectiva."""
+        Q = cls._neutro_proyectivo()
+        P = punto._a_proyectivo()
+
+        for k_i in bin(k)[2:]:  # (k_t, k_{t-1},..., k_0)
+            Q = cls._duplicacion_proyectiva(Q)  # duplicar
+            if k_i == "1":
+                Q = cls._suma_proyectiva(Q, P)  # sumar
+
+        return Q
+
     def __eq__(self, other):
-        return
+        if self is other:
+            return True
+        if not isinstance(other, PuntoRacional):
+            return NotImplemented
+        if self.es_elemento_neutro():
+            return other.es_elemento_neutro()
+        elif other.es_elemento_neutro():
+            return False
+        # si ya se conocen los hashes y son distintos los puntos son distintos
+        if self._hash is not None and other._hash is not None and self._hash != other._hash:
+            return False
+        return self._x == other._x and self._y == other._y
 
     def __ne__(self, other):
-        return not self.__eq__(other)
+        igual = self.__eq__(other)
+        return igual if igual is NotImplemented else not igual
+
+    def __hash__(self):
+        if self._hash is None:
+            if self.es_elemento_neutro():
+                valor = hash(None)
+            else:
+                valor = hash((self._x, self._y))
+            object.__setattr__(self, '_hash', valor)
+        return self._hash
 
     @abstractmethod
     def __add__(self, other):
@@ -202,6 +309,8 @@ def curva_eliptica_sobre_Fq(a, b, p, n=1, pol_irreducible=None):
             Fq: El constructor de elementos del cuerpo finito de q elementos. (atributo de clase)
         """
         # coeficientes (a, b) de la ecuación y^2 = x^3 + a*x + b
+        __slots__ = ()
+
         coeficientes = None
         discriminante = None
         Fq = None
@@ -215,23 +324,13 @@ def curva_eliptica_sobre_Fq(a, b, p, n=1, pol_irreducible=None):
 
         def __init__(self, x, y):
             if x is None or y is None:
-                self._x = None
-                self._y = None
+                self._fija_coordenadas(None, None)
             else:
-                self._x = PuntoFqRacional.Fq(x)
-                self._y = PuntoFqRacional.Fq(y)
+                self._fija_coordenadas(PuntoFqRacional.Fq(x), PuntoFqRacional.Fq(y))
                 if not PuntoFqRacional.contiene(self._x, self._y):
                     raise ValueError("El punto ({0}, {1})".format(x, y) +
                                     " no pertenece a la curva.")
 
-        def __eq__(self, other):
-            if self.es_elemento_neutro():
-                return other.es_elemento_neutro()
-            elif other.es_elemento_neutro():
-                return False
-
-            return self.x == other.x and self.y == other.y
-
         def __add__(self, other):
             if self.es_elemento_neutro():
                 return other
@@ -250,7 +349,7 @@ def curva_eliptica_sobre_Fq(a, b, p, n=1, pol_irreducible=None):
                     m = (Fq(3) * x1**2 + a) / (Fq(2) * y1)
                     x3 = m**2 - Fq(2) * x1
                     y3 = m * (x1 - x3) - y1
-                    return PuntoFqRacional(x3, y3)
+                    return PuntoFqRacional._sin_comprobar(x3, y3)
             elif x1 == x2:
                 # y1 != y2
                 return PuntoFqRacional.elemento_neutro()
@@ -258,28 +357,117 @@ def curva_eliptica_sobre_Fq(a, b, p, n=1, pol_irreducible=None):
                 m = (y2 - y1) / (x2 - x1)
                 x3 = m**2 - x1 - x2
                 y3 = m * (x1 - x3) - y1
-                return PuntoFqRacional(x3, y3)
+                return PuntoFqRacional._sin_comprobar(x3, y3)
 
         def __neg__(self):
             if self.es_elemento_neutro():
                 return self
             else:
-                return PuntoFqRacional(self.x, -self.y)
+                return PuntoFqRacional._sin_comprobar(self.x, -self.y)
+
+        def __reduce__(self):
+            # Necesario para enviar puntos a otros procesos (multiprocessing)
+            if self.es_elemento_neutro():
+                x, y = None, None
+            else:
+                x, y = _a_tipos_basicos(self.x), _a_tipos_basicos(self.y)
+            return (_reconstruye_punto_sobre_Fq, (PuntoFqRacional._parametros, x, y))
+
+        # Coordenadas jacobianas: (X, Y, Z) representa el punto afín
+        # (X / Z^2, Y / Z^3) y el elemento neutro es cualquier (X, Y, 0).
 
         @classmethod
-        def _multiplicacion_por_duplicacion(cls, punto, k):
-            """Realiza la multiplicación k * punto mediante el método de
-            multiplicación por duplicación."""
-            rep_binaria_k = "".join(bin(k)[2:])  # (k_t, k_{t-1},..., k_0)
-            Q = PuntoFqRacional.elemento_neutro()
-            P = punto
+        def _neutro_proyectivo(cls):
+            F_q = PuntoFqRacional.Fq
+            return (F_q.uno(), F_q.uno(), F_q.cero())
 
-            for k_i in rep_binaria_k:
-                Q = Q + Q  # duplicar
-                if k_i == "1":
-                    Q = Q + P  # sumar
+        def _a_proyectivo(self):
+            if self.es_elemento_neutro():
+                return PuntoFqRacional._neutro_proyectivo()
+            else:
+                return (self.x, self.y, PuntoFqRacional.Fq.uno())
 
-            return Q
+        @classmethod
+        def _duplicacion_proyectiva(cls, P):
+            X1, Y1, Z1 = P
+            cero = PuntoFqRacional.Fq.cero()
+            if Z1 == cero or Y1 == cero:
+                return PuntoFqRacional._neutro_proyectivo()
+
+            a = PuntoFqRacional.coeficientes.a
+            YY = Y1 * Y1
+            ZZ = Z1 * Z1
+            S = 4 * X1 * YY
+            M = 3 * X1 * X1 + a * ZZ * ZZ
+            X3 = M * M - 2 * S
+            Y3 = M * (S - X3) - 8 * YY * YY
+            Z3 = 2 * Y1 * Z1
+            return (X3, Y3, Z3)
+
+        @classmethod
+        def _suma_proyectiva(cls, P, Q):
+            X1, Y1, Z1 = P
+            X2, Y2, Z2 = Q
+            cero = PuntoFqRacional.Fq.cero()
+            uno = PuntoFqRacional.Fq.uno()
+            if Z1 == cero:
+                return Q
+            elif Z2 == cero:
+                return P
+
+            Z1Z1 = Z1 * Z1
+            U2 = X2 * Z1Z1
+            S2 = Y2 * Z1 * Z1Z1
+            mixta = Z2 == uno  # Q en coordenadas afines
+            if mixta:
+                U1, S1 = X1, Y1
+            else:
+                Z2Z2 = Z2 * Z2
+                U1 = X1 * Z2Z2
+                S1 = Y1 * Z2 * Z2Z2
+
+            H = U2 - U1
+            R = S2 - S1
+            if H == cero:
+                if R == cero:
+                    return PuntoFqRacional._duplicacion_proyectiva(P)
+                else:
+                    return PuntoFqRacional._neutro_proyectivo()
+
+            HH = H * H
+            HHH = H * HH
+            V = U1 * HH
+            X3 = R * R - HHH - 2 * V
+            Y3 = R * (V - X3) - S1 * HHH
+            Z3 = Z1 * H if mixta else Z1 * Z2 * H
+            return (X3, Y3, Z3)
+
+        @classmethod
+        def _normaliza_lote(cls, puntos):
+            # una sola inversión para todas las coordenadas Z
+            cero = PuntoFqRacional.Fq.cero()
+            with tramo("inversion"):
+                inversos = iter(inverso_simultaneo([Z for _, _, Z in puntos if Z != cero]))
+
+            afines = []
+            for X, Y, Z in puntos:
+                if Z == cero:
+                    afines.append(PuntoFqRacional.elemento_neutro())
+                else:
+                    inverso_Z = next(inversos)
+                    inverso_ZZ = inverso_Z * inverso_Z
+                    x = X * inverso_ZZ
+                    y = Y * inverso_ZZ * inverso_Z
+                    afines.append(PuntoFqRacional._sin_comprobar(x, y))
+            return afines
+
+        @classmethod
+        def _multiplicacion_por_duplicacion(cls, punto, k):
+            """Realiza la multiplicación k * punto mediante el método de
+            multiplicación por duplicación en coordenadas jacobianas."""
+            with tramo("multiplicacion_escalar"):
+                Q = PuntoFqRacional._multiplicacion_proyectiva(punto, k)
+                return PuntoFqRacional._normaliza_lote([Q])[0]
 
         def __mul__(self, entero):
             if self.es_elemento_neutro():
@@ -304,6 +492,9 @@ def curva_eliptica_sobre_Fq(a, b, p, n=1, pol_irreducible=None):
     PuntoFqRacional.discriminante = discriminante
     PuntoFqRacional.coeficientes = EcuacionWeierstrass(A, B)
     PuntoFqRacional.Fq = F_q
+    PuntoFqRacional._parametros = (_a_tipos_basicos(A), _a_tipos_basicos(B), p, n,
+                                   _a_tipos_basicos(getattr(F_q, 'pol_irreducible', None)))
+    _curvas_sobre_Fq[PuntoFqRacional._parametros] = PuntoFqRacional
     return PuntoFqRacional
 
 
@@ -389,6 +580,8 @@ def curva_eliptica_sobre_F2m(a, b, m, pol_irreducible=None):
             Fq: El constructor de elementos del cuerpo finito de 2**m elementos. (atributo de clase)
         """
         # coeficientes (a, b) de la ecuación y^2 + x y = x^3 + a x^2 + b
+        __slots__ = ()
+
         coeficientes = None
         discriminante = None
         F2m = None
@@ -411,23 +604,13 @@ def curva_eliptica_sobre_F2m(a, b, m, pol_irreducible=None):
 
         def __init__(self, x, y):
             if x is None or y is None:
-                self._x = None
-                self._y = None
+                self._fija_coordenadas(None, None)
             else:
-                self._x = PuntoF2mRacional.F2m(x)
-                self._y = PuntoF2mRacional.F2m(y)
+                self._fija_coordenadas(PuntoF2mRacional.F2m(x), PuntoF2mRacional.F2m(y))
                 if not PuntoF2mRacional.contiene(self._x, self._y):
                     raise ValueError("El punto ({0}, {1})".format(x, y) +
                                     " no pertenece a la curva.")
 
-        def __eq__(self, other):
-            if self.es_elemento_neutro():
-                return other.es_elemento_neutro()
-            elif other.es_elemento_neutro():
-                return False
-
-            return self.x == other.x and self.y == other.y
-
         def __add__(self, other):
             if self.es_elemento_neutro():
                 return other
@@ -465,16 +648,25 @@ def curva_eliptica_sobre_F2m(a, b, m, pol_irreducible=None):
             else:
                 return PuntoF2mRacional(self.x, self.x + self.y)
 
+        def __reduce__(self):
+            # Necesario para enviar puntos a otros procesos (multiprocessing)
+            if self.es_elemento_neutro():
+                x, y = None, None
+            else:
+                x, y = _a_tipos_basicos(self.x), _a_tipos_basicos(self.y)
+            return (_reconstruye_punto_sobre_F2m, (PuntoF2mRacional._parametros, x, y))
+
         @classmethod
         def _multiplicacion_por_duplicacion(cls, punto, k):
             rep_binaria_k = "".join(bin(k)[2:])  # (k_t, k_{t-1},..., k_0)
             Q = PuntoF2mRacional.elemento_neutro()
             P = punto
 
-            for k_i in rep_binaria_k:
-                Q = Q + Q  # duplicar
-                if k_i == "1":
-                    Q = Q + P  # sumar
+            with tramo("multiplicacion_escalar"):
+                for k_i in rep_binaria_k:
+                    Q = Q + Q  # duplicar
+                    if k_i == "1":
+                        Q = Q + P  # sumar
 
             return Q
 
@@ -498,6 +690,9 @@ def curva_eliptica_sobre_F2m(a, b, m, pol_irreducible=None):
     PuntoF2mRacional.discriminante = discriminante
     PuntoF2mRacional.coeficientes = EcuacionWeierstrass(A, B)
     PuntoF2mRacional.F2m = F2m
+    PuntoF2mRacional._parametros = (_a_tipos_basicos(A), _a_tipos_basicos(B), m,
+                                    _a_tipos_basicos(getattr(F2m, 'pol_irreducible', None)))
+    _curvas_sobre_F2m[PuntoF2mRacional._parametros] = PuntoF2mRacional
     return PuntoF2mRacional
 
 
@@ -563,6 +758,8 @@ def curva_eliptica_sobre_Q(a, b):
             coeficientes (Tuple): los coeficientes (a, b) de la ecuación de Weierstrass. (atributo de clase)
             discriminante: El discriminate de la curva elíptica. (atributo de clase)
         """
+        __slots__ = ()
+
         coeficientes = None
         discriminante = None
 
@@ -584,24 +781,14 @@ def curva_eliptica_sobre_Q(a, b):
 
         def __init__(self, x, y):
             if x is None or y is None:
-                self._x = None
-                self._y = None
+                self._fija_coordenadas(None, None)
             else:
                 if PuntoQRacional.contiene(x, y):
-                    self._x = Fraction(x)  # para aceptar también int
-                    self._y = Fraction(y)
+                    self._fija_coordenadas(Fraction(x), Fraction(y))  # para aceptar también int
                 else:
                     raise ValueError("El punto ({0}, {1})".format(x, y) +
                                     " no pertenece a la curva.")
 
-        def __eq__(self, other):
-            if self.es_elemento_neutro():
-                return other.es_elemento_neutro()
-            elif other.es_elemento_neutro():
-                return False
-
-            return self.x == other.x and self.y == other.y
-
         def __add__(self, other):
             if self.es_elemento_neutro():
                 return other
@@ -649,3 +836,206 @@ def curva_eliptica_sobre_Q(a, b):
     PuntoQRacional.discriminante = discriminante
     PuntoQRacional.coeficientes = EcuacionWeierstrass(a, b)
     return PuntoQRacional
+
+
+def suma_multiescalar(escalares, puntos):
+    """Calcula la suma de productos k_1 P_1 + k_2 P_2 + ... + k_n P_n.
+
+        >>> E = curva_eliptica_sobre_Fq(a=2, b=3, p=97)
+        >>> P, Q = E(0, 10), E(3, 6)
+        >>> suma_multiescalar([3, -2], [P, Q])
+        (10,21)
+        >>> 3 * P - 2 * Q
+        (10,21)
+
+    Se utiliza el método de Pippenger (o de los cubos): los escalares se
+    dividen en ventanas de c bits y, para cada ventana, los puntos se
+    agrupan según el valor de su ventana, de modo que el coste por punto
+    es de unas (número de bits) / c sumas en vez de las 1.5 veces (número
+    de bits) de la multiplicación por duplicación. Es mucho más rápido que
+    calcular cada producto por separado cuando hay muchos puntos.
+
+    Args:
+        escalares (List[int]): los enteros k_i.
+        puntos (List[PuntoRacional]): los puntos P_i (todos de la misma
+            curva).
+
+    Returns:
+        PuntoRacional: el punto resultante.
+    """
+    if len(escalares) != len(puntos):
+        raise ValueError("Debe haber tantos escalares como puntos.")
+    if not puntos:
+        raise ValueError("La lista de puntos no puede ser vacía.")
+
+    with tramo("suma_multiescalar"):
+        return _suma_multiescalar(escalares, puntos)
+
+
+def _suma_multiescalar(escalares, puntos):
+    E = type(puntos[0])
+    pares = []
+    for k, P in zip(escalares, puntos):
+        if k < 0:
+            k, P = -k, -P
+        if k != 0 and not P.es_elemento_neutro():
+            pares.append((k, P._a_proyectivo()))
+    if not pares:
+        return E.elemento_neutro()
+
+    # tamaño de ventana aproximadamente óptimo (log2 del número de puntos)
+    c = max(1, len(pares).bit_length() - 2)
+    mascara = (1 << c) - 1
+    bits = max(k.bit_length() for k, _ in pares)
+    numero_ventanas = -(-bits // c)  # techo
+
+    resultado = E._neutro_proyectivo()
+    for j in reversed(range(numero_ventanas)):
+        for _ in range(c):
+            resultado = E._duplicacion_proyectiva(resultado)
+
+        cubos = [None] * mascara  # cubos[d - 1] acumula los puntos con ventana d
+        for k, P in pares:
+            d = (k >> (j * c)) & mascara
+            if d:
+                cubos[d - 1] = P if cubos[d - 1] is None else E._suma_proyectiva(cubos[d - 1], P)
+
+        # suma_ventana = sum(d * cubos[d - 1]) mediante sumas acumuladas
+        acumulado = E._neutro_proyectivo()
+        suma_ventana = E._neutro_proyectivo()
+        for cubo in reversed(cubos):
+            if cubo is not None:
+                acumulado = E._suma_proyectiva(acumulado, cubo)
+            suma_ventana = E._suma_proyectiva(suma_ventana, acumulado)
+        resultado = E._suma_proyectiva(resultado, suma_ventana)
+
+    return E._normaliza_lote([resultado])[0]
+
+
+class TablaBaseFija(object):
+    """Representa una tabla de precomputación para multiplicar un punto
+    fijo por muchos escalares distintos.
+
+        >>> E = curva_eliptica_sobre_Fq(a=2, b=3, p=97)
+        >>> P = E(0, 10)
+        >>> tabla = TablaBaseFija(P, bits=7)
+        >>> tabla.multiplica(3)
+        (23,24)
+        >>> 3 * P
+        (23,24)
+
+    Los escalares se escriben en base 2^w (w es el ancho de ventana) y se
+    guardan los puntos d 2^(w i) P para cada dígito d y cada posición i. Así
+    una multiplicación se reduce a una suma por dígito no nulo, sin ninguna
+    duplicación. Compensa cuando se multiplica el mismo punto muchas veces,
+    como ocurre con el generador al crear llaves efímeras.
+
+    Args:
+        punto: el punto fijo P.
+        bits (int): el número máximo de bits de los escalares. Los escalares
+            más grandes se multiplican sin usar la tabla.
+        ancho_ventana (Optional[int]): el número de bits de cada dígito.
+
+    Attributes:
+        punto: el punto fijo P.
+        bits (int): el número máximo de bits de los escalares.
+        ancho_ventana (int): el número de bits de cada dígito.
+    """
+    def __init__(self, punto, bits, ancho_ventana=4):
+        self.punto = punto
+        self.bits = bits
+        self.ancho_ventana = ancho_ventana
+
+        E = type(punto)
+        digitos = (1 << ancho_ventana) - 1  # dígitos no nulos
+        numero_ventanas = -(-bits // ancho_ventana)  # techo
+
+        proyectivos = []
+        base = punto._a_proyectivo()
+        for _ in range(numero_ventanas):
+            multiplo = base
+            for _ in range(digitos):
+                proyectivos.append(multiplo)
+                multiplo = E._suma_proyectiva(multiplo, base)
+            base = multiplo  # 2^w veces la base anterior
+
+        # se normalizan todos los puntos con una única inversión para
+        # que las sumas posteriores sean sumas mixtas
+        afines = [P._a_proyectivo() for P in E._normaliza_lote(proyectivos)]
+        self._tabla = [afines[i:i + digitos] for i in range(0, len(afines), digitos)]
+
+    def multiplica(self, k):
+        """Devuelve k * punto.
+
+        Args:
+            k (int): un entero.
+
+        Returns:
+            el punto k * punto.
+        """
+        if k < 0:
+            return -self.multiplica(-k)
+        if k.bit_length() > self.bits:
+            return k * self.punto
+
+        E = type(self.punto)
+        with tramo("multiplicacion_escalar"):
+            return E._normaliza_lote([self._multiplica_proyectivo(k)])[0]
+
+    def _multiplica_proyectivo(self, k):
+        """Devuelve k * punto (0 <= k < 2^bits) en la representación
+        proyectiva."""
+        E = type(self.punto)
+        mascara = (1 << self.ancho_ventana) - 1
+        Q = E._neutro_proyectivo()
+        for fila in self._tabla:
+            d = k & mascara
+            if d:
+                Q = E._suma_proyectiva(Q, fila[d - 1])
+            k >>= self.ancho_ventana
+        return Q
+
+
+def _a_tipos_basicos(elemento):
+    """Representa un elemento de un cuerpo finito (o un polinomio) con tipos
+    básicos de python: un entero o una tupla de enteros."""
+    if elemento is None:
+        return None
+    elif isinstance(elemento, PolinomioZp):
+        return tuple(int(c) for c in elemento.coeficientes)
+    else:
+        return int(elemento)
+
+
+def _desde_tipos_basicos(valor):
+    """Inversa de :func:`_a_tipos_basicos` (devuelve un valor que aceptan los
+    constructores de :func:`.Fq`)."""
+    return list(valor) if isinstance(valor, tuple) else valor
+
+
+def _reconstruye_punto_sobre_Fq(parametros, x, y):
+    """Reconstruye un :class:`PuntoFqRacional` serializado con pickle."""
+    E = _curvas_sobre_Fq.get(parametros)
+    if E is None:
+        a, b, p, n, pol_irreducible = parametros
+        if pol_irreducible is not None:
+            pol_irreducible = PolinomioZp(list(pol_irreducible), p)
+        E = curva_eliptica_sobre_Fq(_desde_tipos_basicos(a), _desde_tipos_basicos(b),
+                                    p, n, pol_irreducible)
+    if x is None:
+        return E.elemento_neutro()
+    return E._sin_comprobar(E.Fq(_desde_tipos_basicos(x)), E.Fq(_desde_tipos_basicos(y)))
+
+
+def _reconstruye_punto_sobre_F2m(parametros, x, y):
+    """Reconstruye un :class:`PuntoF2mRacional` serializado con pickle."""
+    E = _curvas_sobre_F2m.get(parametros)
+    if E is None:
+        a, b, m, pol_irreducible = parametros
+        if pol_irreducible is not None:
+            pol_irreducible = PolinomioZp(list(pol_irreducible), 2)
+        E = curva_eliptica_sobre_F2m(_desde_tipos_basicos(a), _desde_tipos_basicos(b),
+                                     m, pol_irreducible)
+    if x is None:
+        return E.elemento_neutro()
+    return E._sin_comprobar(E.F2m(_desde_tipos_basicos(x)), E.F2m(_desde_tipos_basicos(y)))
@@ -1,8 +1,9 @@
 """Esquemas criptográficos con curvas elípticas.
 
 Este módulo permite trabajar con protocolos criptográficos asimétricos,
-como el esquema Diffie-Hellman conocido como ECDH o el algoritmo
-de firmas digitales conocido como ECDSA.
+como el esquema Diffie-Hellman conocido como ECDH, los esquemas de cifrado
+ECIES (híbrido) y ElGamal (homomórfico) o los algoritmos de firmas
+digitales ECDSA y Schnorr.
 
 Para utilizar las funciones y las clases de este módulo, debe importarlo
 previamente: ::
@@ -30,11 +31,20 @@ y llamar a los métodos correspondientes. Veamos un ejemplo con EDCH:
     >>> bob.calcula_secreto_compartido(alicia.llave_publica)
     1136
 """
+import io
+import sys
+import hmac
+import mmap
+import array
+import bisect
+import struct
 import random
 import hashlib
+import multiprocessing
 
-from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
-from ccepy.aritmetica_elemental import Zp, alg_euclides
+from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq, suma_multiescalar, TablaBaseFija
+from ccepy.aritmetica_elemental import Zp, alg_euclides, _raiz_entera
+from ccepy.trazas import tramo
 
 
 class ECDH(object):
@@ -105,8 +115,10 @@ class ECDH(object):
         self.orden = orden
 
         # generamos las llaves
-        self.llave_privada = random.randrange(1, self.orden)
-        self.llave_publica = self.llave_privada * self.generador
+        with tramo("ECDH.genera_llaves"):
+            with tramo("nonce"):
+                self.llave_privada = random.randrange(1, self.orden)
+            self.llave_publica = self.llave_privada * self.generador
 
     def calcula_secreto_compartido(self, otra_llave_publica):
         """Devuelve el punto de la curva elíptica que hace de
@@ -118,7 +130,696 @@ class ECDH(object):
         Returns:
             el secreto compartido.
         """
-        return (self.llave_privada * otra_llave_publica).x
+        with tramo("ECDH.calcula_secreto_compartido"):
+            return (self.llave_privada * otra_llave_publica).x
+
+    def calcula_secretos_compartidos(self, llaves_publicas, procesos=None):
+        """Devuelve los secretos compartidos con varios participantes.
+
+        Equivale a llamar a :meth:`calcula_secreto_compartido` con cada
+        llave pública, pero las multiplicaciones escalares se hacen en
+        coordenadas proyectivas y todos los resultados se pasan a
+        coordenadas afines con una única inversión.
+
+            >>> E = curva_eliptica_sobre_Fq(a=324, b=1287, p=3851)
+            >>> generador = E(920, 303)
+            >>> alicia = ECDH(E, generador, 8)
+            >>> bob, eva = ECDH(E, generador, 8), ECDH(E, generador, 8)
+            >>> secretos = alicia.calcula_secretos_compartidos([bob.llave_publica, eva.llave_publica])
+            >>> secretos == [alicia.calcula_secreto_compartido(bob.llave_publica),
+            ...              alicia.calcula_secreto_compartido(eva.llave_publica)]
+            True
+
+        Si se indica el número de procesos, las llaves públicas se reparten
+        en bloques entre varios procesos (módulo :mod:`multiprocessing`) y
+        cada bloque se normaliza con una única inversión. Solo compensa con
+        muchas llaves públicas.
+
+        Args:
+            llaves_publicas: una lista con las llaves públicas de los otros
+                participantes.
+            procesos (Optional[int]): el número de procesos a utilizar.
+
+        Returns:
+            List: la lista de secretos compartidos, en el mismo orden.
+        """
+        llaves_publicas = list(llaves_publicas)
+        if not llaves_publicas:
+            return []
+
+        if procesos is None or procesos <= 1 or len(llaves_publicas) < 2:
+            with tramo("ECDH.calcula_secretos_compartidos"):
+                return _secretos_compartidos(self.llave_privada, llaves_publicas)
+
+        tam_bloque = -(-len(llaves_publicas) // procesos)  # techo
+        bloques = [(self.llave_privada, llaves_publicas[i:i + tam_bloque])
+                   for i in range(0, len(llaves_publicas), tam_bloque)]
+        with multiprocessing.Pool(processes=procesos) as pool:
+            resultados = pool.starmap(_secretos_compartidos, bloques)
+        return [secreto for bloque in resultados for secreto in bloque]
+
+
+def _secretos_compartidos(llave_privada, llaves_publicas):
+    """Calcula los secretos compartidos de una lista de llaves públicas
+    de una misma curva con una única inversión."""
+    E = type(llaves_publicas[0])
+    with tramo("multiplicacion_escalar"):
+        productos = [E._multiplicacion_proyectiva(Q, llave_privada) for Q in llaves_publicas]
+    return [S.x for S in E._normaliza_lote(productos)]
+
+
+class ECIES(ECDH):
+    """Representa un participante del esquema de cifrado híbrido ECIES.
+
+    El esquema de cifrado integrado para curvas elípticas o ECIES combina
+    un ECDH con una llave efímera y un cifrado simétrico autenticado:
+    el emisor genera un par de llaves efímero, calcula el secreto
+    compartido con la llave pública del destinatario y deriva de él las
+    llaves simétricas con las que cifra y autentica el mensaje.
+
+        >>> E = curva_eliptica_sobre_Fq(a=5, b=7, p=113)
+        >>> generador = E(16, 51)
+        >>> alicia = ECIES(E, generador, 127)
+        >>> bob = ECIES(E, generador, 127)
+        >>> cifrado = alicia.cifra(b"hola bob", bob.llave_publica)
+        >>> bob.descifra(cifrado)
+        b'hola bob'
+
+    La capa simétrica utiliza solo la biblioteca estándar:
+
+    - Las llaves se derivan con la función de derivación de ANSI X9.63
+      sobre ``SHA-256``.
+    - El cifrado es un flujo cuya secuencia cifrante son los bloques
+      ``HMAC-SHA256(k_cifrado, bloque || contador)``.
+    - El mensaje se procesa en bloques y cada bloque lleva su propia
+      etiqueta ``HMAC-SHA256(k_mac, ...)``, que incluye su posición y si
+      es el último. Así se puede descifrar un fichero por bloques sin
+      cargarlo entero en memoria y sin entregar nunca texto no autenticado
+      (ver :meth:`cifra_fichero` y :meth:`descifra_fichero`).
+
+    Las llaves efímeras se calculan con una :class:`.TablaBaseFija` del
+    generador, que se construye la primera vez que se cifra.
+
+    Como en :class:`ECDSA`, la curva elíptica debe estar definida sobre un
+    cuerpo finito de orden un primo.
+
+    Args:
+        curva_eliptica: el constructor de puntos de una curva elíptica.
+        generador: un punto de la curva elíptica.
+        orden(int): el orden del generador.
+
+    Attributes:
+        curva_eliptica: el constructor de puntos de una curva elíptica.
+        generador: un punto de la curva elíptica.
+        orden(int): el orden del generador.
+        llave_privada(int): un entero que hace de llave privada del participante.
+        llave_publica: un punto de la curva elíptica que hace de llave pública
+            del participante.
+    """
+    #: El tamaño por defecto (en bytes) de los bloques del cifrado.
+    tam_bloque = 64 * 1024
+
+    def __init__(self, curva_eliptica, generador, orden):
+        if hasattr(curva_eliptica.Fq, 'n'):
+            raise ValueError("El cardinal del cuerpo finito debe ser un número primo.")
+
+        super().__init__(curva_eliptica, generador, orden)
+        self._tabla_generador = None
+        self._longitud = (curva_eliptica.Fq.p.bit_length() + 7) // 8
+
+    def _codifica_punto(self, punto):
+        """Codifica un punto con el formato sin comprimir de SEC 1."""
+        return (b'\x04' + int(punto.x).to_bytes(self._longitud, byteorder='big') +
+                int(punto.y).to_bytes(self._longitud, byteorder='big'))
+
+    def _decodifica_punto(self, datos):
+        if len(datos) != 1 + 2 * self._longitud or datos[0] != 4:
+            raise ValueError("La llave efímera no es válida.")
+        x = int.from_bytes(datos[1:1 + self._longitud], byteorder='big')
+        y = int.from_bytes(datos[1 + self._longitud:], byteorder='big')
+        R = self.curva_eliptica(x, y)  # comprueba que está en la curva
+        if R.es_elemento_neutro():
+            raise ValueError("La llave efímera no es válida.")
+        return R
+
+    def _deriva_llaves(self, secreto, llave_efimera):
+        """Deriva las llaves (k_cifrado, k_mac) con la función de
+        derivación de ANSI X9.63 sobre SHA-256."""
+        Z = int(secreto).to_bytes(self._longitud, byteorder='big')
+        material = b''
+        contador = 1
+        while len(material) < 64:
+            material += hashlib.sha256(Z + contador.to_bytes(4, byteorder='big') +
+                                       llave_efimera).digest()
+            contador += 1
+        return material[:32], material[32:64]
+
+    @staticmethod
+    def _aplica_flujo(llave_cifrado, indice, datos):
+        """Cifra (o descifra) el bloque ``indice`` haciendo el XOR con la
+        secuencia cifrante."""
+        base = hmac.new(llave_cifrado, indice.to_bytes(8, byteorder='big'), hashlib.sha256)
+        secuencia = []
+        for contador in range(-(-len(datos) // 32)):
+            h = base.copy()
+            h.update(contador.to_bytes(4, byteorder='big'))
+            secuencia.append(h.digest())
+        secuencia = b''.join(secuencia)[:len(datos)]
+        resultado = int.from_bytes(datos, 'big') ^ int.from_bytes(secuencia, 'big')
+        return resultado.to_bytes(len(datos), byteorder='big')
+
+    @staticmethod
+    def _etiqueta(llave_mac, indice, ultimo, cifrado):
+        cabecera = indice.to_bytes(8, byteorder='big') + (b'\x01' if ultimo else b'\x00')
+        return hmac.new(llave_mac, cabecera + cifrado, hashlib.sha256).digest()
+
+    def cifra_fichero(self, entrada, salida, llave_publica_destinatario, tam_bloque=None):
+        """Cifra el contenido de un fichero para el destinatario.
+
+        Lee ``entrada`` por bloques y escribe el cifrado en ``salida``, de
+        modo que nunca hay más de un bloque en memoria.
+
+        Args:
+            entrada: un objeto fichero binario abierto para lectura.
+            salida: un objeto fichero binario abierto para escritura.
+            llave_publica_destinatario: la llave pública del destinatario.
+            tam_bloque (Optional[int]): el tamaño de los bloques en bytes.
+        """
+        tam_bloque = tam_bloque or self.tam_bloque
+        if self._tabla_generador is None:
+            self._tabla_generador = TablaBaseFija(self.generador, self.orden.bit_length())
+
+        k = random.randrange(1, self.orden)
+        llave_efimera = self._codifica_punto(self._tabla_generador.multiplica(k))
+        secreto = (k * llave_publica_destinatario).x
+        llave_cifrado, llave_mac = self._deriva_llaves(secreto, llave_efimera)
+
+        salida.write(llave_efimera)
+        indice = 0
+        bloque = entrada.read(tam_bloque)
+        while True:
+            # leemos por adelantado para saber si es el último bloque
+            siguiente = entrada.read(tam_bloque)
+            ultimo = not siguiente
+            cifrado = ECIES._aplica_flujo(llave_cifrado, indice, bloque)
+            salida.write((b'\x01' if ultimo else b'\x00') +
+                         len(cifrado).to_bytes(4, byteorder='big') + cifrado +
+                         ECIES._etiqueta(llave_mac, indice, ultimo, cifrado))
+            if ultimo:
+                return
+            bloque = siguiente
+            indice += 1
+
+    def descifra_fichero(self, entrada, salida):
+        """Descifra el contenido de un fichero cifrado con :meth:`cifra_fichero`.
+
+        Cada bloque se autentica antes de escribirse en ``salida``. Si el
+        cifrado ha sido manipulado o truncado, o la llave efímera no es un
+        punto válido (no está en la curva o el secreto compartido es el
+        elemento neutro), se lanza una excepción ``ValueError`` (los
+        bloques anteriores ya escritos son auténticos).
+
+        Args:
+            entrada: un objeto fichero binario abierto para lectura.
+            salida: un objeto fichero binario abierto para escritura.
+        """
+        llave_efimera = entrada.read(1 + 2 * self._longitud)
+        R = self._decodifica_punto(llave_efimera)
+        S = self.llave_privada * R
+        if S.es_elemento_neutro():
+            # R tiene orden pequeño (en una curva con cofactor) y no puede
+            # ser una llave efímera legítima
+            raise ValueError("La llave efímera no es válida.")
+        secreto = S.x
+        llave_cifrado, llave_mac = self._deriva_llaves(secreto, llave_efimera)
+
+        indice = 0
+        while True:
+            cabecera = entrada.read(5)
+            if len(cabecera) != 5:
+                raise ValueError("El cifrado está incompleto.")
+            ultimo = cabecera[0] == 1
+            longitud = int.from_bytes(cabecera[1:], byteorder='big')
+            cifrado = entrada.read(longitud)
+            etiqueta = entrada.read(32)
+            if len(cifrado) != longitud or len(etiqueta) != 32:
+                raise ValueError("El cifrado está incompleto.")
+            etiqueta_esperada = ECIES._etiqueta(llave_mac, indice, ultimo, cifrado)
+            if not hmac.compare_digest(etiqueta, etiqueta_esperada):
+                raise ValueError("El cifrado no es auténtico.")
+            salida.write(ECIES._aplica_flujo(llave_cifrado, indice, cifrado))
+            if ultimo:
+                if entrada.read(1):
+                    raise ValueError("Hay datos tras el último bloque.")
+                return
+            indice += 1
+
+    def cifra(self, mensaje, llave_publica_destinatario):
+        """Cifra un mensaje para el destinatario.
+
+        Args:
+            mensaje(bytes): el mensaje que se desea cifrar.
+            llave_publica_destinatario: la llave pública del destinatario.
+
+        Returns:
+            bytes: el cifrado.
+        """
+        salida = io.BytesIO()
+        self.cifra_fichero(io.BytesIO(mensaje), salida, llave_publica_destinatario)
+        return salida.getvalue()
+
+    def descifra(self, cifrado):
+        """Descifra un mensaje cifrado con :meth:`cifra`.
+
+        Args:
+            cifrado(bytes): el cifrado.
+
+        Returns:
+            bytes: el mensaje.
+        """
+        salida = io.BytesIO()
+        self.descifra_fichero(io.BytesIO(cifrado), salida)
+        return salida.getvalue()
+
+
+class CifradoElGamal(object):
+    """Representa un cifrado del esquema :class:`ElGamal`.
+
+    Es un par de puntos ``(c1, c2)``. Soporta los operadores ``+`` y ``-``
+    entre cifrados y ``*`` por un entero, que se corresponden con las mismas
+    operaciones sobre los mensajes.
+
+    Args:
+        c1: el primer punto del cifrado.
+        c2: el segundo punto del cifrado.
+
+    Attributes:
+        c1: el primer punto del cifrado.
+        c2: el segundo punto del cifrado.
+    """
+    __slots__ = ('c1', 'c2')
+
+    def __init__(self, c1, c2):
+        self.c1 = c1
+        self.c2 = c2
+
+    def __eq__(self, other):
+        return self.c1 == other.c1 and self.c2 == other.c2
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __add__(self, other):
+        return CifradoElGamal(self.c1 + other.c1, self.c2 + other.c2)
+
+    def __neg__(self):
+        return CifradoElGamal(-self.c1, -self.c2)
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __mul__(self, entero):
+        return CifradoElGamal(entero * self.c1, entero * self.c2)
+
+    __rmul__ = __mul__
+
+    def __str__(self):
+        return "({0}, {1})".format(self.c1, self.c2)
+
+    __repr__ = __str__
+
+
+class TablaLogaritmoDiscreto(object):
+    """Representa una tabla para calcular logaritmos discretos pequeños
+    mediante el algoritmo paso enano-paso gigante.
+
+    Dado un punto M = m P con 0 <= m < limite, :meth:`logaritmo` devuelve m.
+
+        >>> E = curva_eliptica_sobre_Fq(a=5, b=7, p=113)
+        >>> P = E(16, 51)
+        >>> tabla = TablaLogaritmoDiscreto(P, limite=100)
+        >>> tabla.logaritmo(42 * P)
+        42
+
+    Los pasos enanos j P (1 <= j <= t) se calculan una única vez y se
+    guardan de forma compacta: un hash de 8 bytes de la coordenada x y un
+    entero de 4 bytes con j y la paridad de la coordenada y. Como P y -P
+    tienen la misma coordenada x, la tabla cubre los 2 t + 1 valores
+    -t, ..., t y cada paso gigante avanza 2 t + 1. Cada logaritmo cuesta a
+    lo sumo limite / (2 t + 1) pasos gigantes.
+
+    La tabla se puede guardar en un fichero con :meth:`guarda` y cargar
+    con :meth:`carga`, que la proyecta en memoria (módulo :mod:`mmap`) en
+    lugar de leerla; el fichero se cierra con :meth:`cierra`.
+
+    Solo está disponible para curvas sobre un cuerpo finito de orden
+    un primo.
+
+    Args:
+        punto: el punto P.
+        limite (int): la cota superior (no incluida) de los logaritmos.
+        tam_tabla (Optional[int]): el número t de pasos enanos. Por defecto
+            es la raíz cuadrada de limite / 2.
+
+    Attributes:
+        punto: el punto P.
+        limite (int): la cota superior (no incluida) de los logaritmos.
+        tam_tabla (int): el número t de pasos enanos.
+    """
+    _cabecera = struct.Struct('<8s4sQQ32s')
+    _magico = b'CCEPYBSG'
+
+    def __init__(self, punto, limite, tam_tabla=None):
+        if tam_tabla is None:
+            tam_tabla = max(1, _raiz_entera(limite // 2))
+        if tam_tabla >= 2 ** 31:
+            raise ValueError("La tabla no puede tener más de 2^31 - 1 pasos enanos.")
+        self.punto = punto
+        self.limite = limite
+        self.tam_tabla = tam_tabla
+        self._prepara_pasos()
+
+        E = type(punto)
+        pasos_enanos = []
+        Q = punto._a_proyectivo()
+        for _ in range(tam_tabla):
+            pasos_enanos.append(Q)
+            Q = E._suma_proyectiva(Q, self._punto_proyectivo)
+
+        entradas = []
+        for j, R in enumerate(E._normaliza_lote(pasos_enanos), start=1):
+            if not R.es_elemento_neutro():
+                entradas.append((TablaLogaritmoDiscreto._hash(R), j if int(R.y) % 2 == 0 else -j))
+        entradas.sort()
+        self._hashes = array.array('Q', [h for h, _ in entradas])
+        self._indices = array.array('i', [j for _, j in entradas])
+        self._fichero = None
+
+    def _prepara_pasos(self):
+        E = type(self.punto)
+        t = self.tam_tabla
+        self._punto_proyectivo = self.punto._a_proyectivo()
+        self._tabla_punto = TablaBaseFija(self.punto, max(1, self.limite.bit_length()))
+        # M_0 = M - t P y M_{i+1} = M_i - (2 t + 1) P
+        self._paso_inicial = (-t * self.punto)._a_proyectivo()
+        self._paso_gigante = (-(2 * t + 1) * self.punto)._a_proyectivo()
+        self._numero_pasos = -(-self.limite // (2 * t + 1))  # techo
+
+    @staticmethod
+    def _hash(R):
+        x = int(R.x)
+        return int.from_bytes(hashlib.blake2b(x.to_bytes((x.bit_length() + 7) // 8, 'big'),
+                                              digest_size=8).digest(), 'big')
+
+    def _candidatos(self, R):
+        """Devuelve los s en [-t, t] con R = s P según la tabla."""
+        if R.es_elemento_neutro():
+            return [0]
+        h = TablaLogaritmoDiscreto._hash(R)
+        paridad_R = int(R.y) % 2
+        candidatos = []
+        k = bisect.bisect_left(self._hashes, h)
+        while k < len(self._hashes) and self._hashes[k] == h:
+            j = self._indices[k]
+            paridad_j = 0 if j > 0 else 1
+            candidatos.append(abs(j) if paridad_j == paridad_R else -abs(j))
+            k += 1
+        return candidatos
+
+    def logaritmo(self, M):
+        """Devuelve el m en [0, limite) tal que M = m P o ``None`` si no existe.
+
+        Args:
+            M: un punto de la curva elíptica.
+
+        Returns:
+            int: el logaritmo discreto m.
+        """
+        return self.logaritmos([M])[0]
+
+    def logaritmos(self, puntos):
+        """Devuelve los logaritmos discretos de una lista de puntos.
+
+        Los pasos gigantes de todos los puntos se dan a la vez, de modo que
+        cada ronda necesita una única inversión.
+
+        Args:
+            puntos: una lista de puntos de la curva elíptica.
+
+        Returns:
+            List[int]: la lista de logaritmos (``None`` si no existe).
+        """
+        E = type(self.punto)
+        t = self.tam_tabla
+        resultados = [None] * len(puntos)
+        proyectivos = [E._suma_proyectiva(M._a_proyectivo(), self._paso_inicial) for M in puntos]
+        pendientes = list(zip(range(len(puntos)), E._normaliza_lote(proyectivos)))
+
+        for i in range(self._numero_pasos):
+            siguientes = []
+            for indice, R in pendientes:
+                for s in self._candidatos(R):
+                    m = i * (2 * t + 1) + t + s
+                    # se descartan las colisiones del hash
+                    if 0 <= m < self.limite and self._tabla_punto.multiplica(m) == puntos[indice]:
+                        resultados[indice] = m
+                        break
+                else:
+                    siguientes.append((indice, R))
+            if not siguientes:
+                break
+            proyectivos = [E._suma_proyectiva(R._a_proyectivo(), self._paso_gigante)
+                           for _, R in siguientes]
+            pendientes = list(zip([indice for indice, _ in siguientes], E._normaliza_lote(proyectivos)))
+
+        return resultados
+
+    def _huella(self):
+        """Identifica el punto P y el tamaño de la tabla."""
+        h = hashlib.sha256()
+        h.update(str(self.punto).encode('utf-8'))
+        h.update(str((self.limite, self.tam_tabla)).encode('utf-8'))
+        return h.digest()
+
+    def guarda(self, ruta):
+        """Guarda la tabla en un fichero.
+
+        Args:
+            ruta (str): la ruta del fichero.
+        """
+        orden_bytes = b'le  ' if sys.byteorder == 'little' else b'be  '
+        with open(ruta, 'wb') as f:
+            f.write(TablaLogaritmoDiscreto._cabecera.pack(
+                TablaLogaritmoDiscreto._magico, orden_bytes, self.limite,
+                self.tam_tabla, self._huella()))
+            f.write(struct.pack('<Q', len(self._hashes)))
+            self._hashes.tofile(f)
+            self._indices.tofile(f)
+
+    @classmethod
+    def carga(cls, ruta, punto):
+        """Carga una tabla guardada con :meth:`guarda` proyectando el
+        fichero en memoria.
+
+        La tabla mantiene el fichero abierto hasta que se llama a
+        :meth:`cierra` (también se puede usar con ``with``).
+
+        Args:
+            ruta (str): la ruta del fichero.
+            punto: el punto P con el que se construyó la tabla.
+
+        Returns:
+            TablaLogaritmoDiscreto: la tabla.
+
+        Raises:
+            ValueError: si el fichero no contiene una tabla de P.
+        """
+        f = open(ruta, 'rb')
+        datos = None
+        try:
+            datos = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(datos) < cls._cabecera.size + 8:
+                raise ValueError("El fichero no contiene una tabla de logaritmos.")
+            magico, orden_bytes, limite, tam_tabla, huella = cls._cabecera.unpack_from(datos, 0)
+            if magico != cls._magico:
+                raise ValueError("El fichero no contiene una tabla de logaritmos.")
+            if orden_bytes.strip() != (b'le' if sys.byteorder == 'little' else b'be'):
+                raise ValueError("La tabla se guardó con otro orden de bytes.")
+
+            tabla = cls.__new__(cls)
+            tabla.punto = punto
+            tabla.limite = limite
+            tabla.tam_tabla = tam_tabla
+            if huella != tabla._huella():
+                raise ValueError("La tabla no corresponde a este punto.")
+
+            inicio = cls._cabecera.size
+            numero, = struct.unpack_from('<Q', datos, inicio)
+            inicio += 8
+            if len(datos) < inicio + 12 * numero:
+                raise ValueError("El fichero de la tabla está incompleto.")
+            tabla._prepara_pasos()
+        except BaseException:
+            if datos is not None:
+                datos.close()
+            f.close()
+            raise
+
+        vista = memoryview(datos)
+        tabla._hashes = vista[inicio:inicio + 8 * numero].cast('Q')
+        tabla._indices = vista[inicio + 8 * numero:inicio + 12 * numero].cast('i')
+        vista.release()
+        tabla._fichero = (f, datos)
+        return tabla
+
+    def cierra(self):
+        """Cierra el fichero de una tabla cargada con :meth:`carga`; después
+        la tabla ya no se puede usar. Si la tabla se construyó en memoria,
+        no hace nada."""
+        if self._fichero is not None:
+            f, datos = self._fichero
+            self._hashes.release()
+            self._indices.release()
+            datos.close()
+            f.close()
+            self._fichero = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cierra()
+
+
+class ElGamal(ECDH):
+    """Representa un participante del esquema de cifrado ElGamal sobre
+    curvas elípticas.
+
+    El mensaje es un entero m que se codifica como el punto m P, por lo que
+    el esquema es aditivamente homomórfico: la suma de dos cifrados es un
+    cifrado de la suma de los mensajes. Esto permite, por ejemplo, sumar
+    contadores cifrados sin descifrarlos.
+
+        >>> E = curva_eliptica_sobre_Fq(a=5, b=7, p=113)
+        >>> generador = E(16, 51)
+        >>> alicia = ElGamal(E, generador, 127)
+        >>> c = alicia.cifra(3, alicia.llave_publica) + alicia.cifra(4, alicia.llave_publica)
+        >>> tabla = TablaLogaritmoDiscreto(generador, limite=100)
+        >>> alicia.descifra(c, tabla)
+        7
+
+    Para descifrar hay que resolver un logaritmo discreto, lo que solo es
+    posible si el mensaje es pequeño. Se utiliza una
+    :class:`TablaLogaritmoDiscreto` precalculada, que conviene reutilizar
+    para todos los descifrados.
+
+    Como en :class:`ECDSA`, la curva elíptica debe estar definida sobre un
+    cuerpo finito de orden un primo.
+
+    Args:
+        curva_eliptica: el constructor de puntos de una curva elíptica.
+        generador: un punto de la curva elíptica.
+        orden(int): el orden del generador.
+
+    Attributes:
+        curva_eliptica: el constructor de puntos de una curva elíptica.
+        generador: un punto de la curva elíptica.
+        orden(int): el orden del generador.
+        llave_privada(int): un entero que hace de llave privada del participante.
+        llave_publica: un punto de la curva elíptica que hace de llave pública
+            del participante.
+    """
+    def __init__(self, curva_eliptica, generador, orden):
+        if hasattr(curva_eliptica.Fq, 'n'):
+            raise ValueError("El cardinal del cuerpo finito debe ser un número primo.")
+
+        super().__init__(curva_eliptica, generador, orden)
+        self._tabla_generador = None
+
+    def _multiplica_generador_proyectivo(self, k):
+        if self._tabla_generador is None:
+            self._tabla_generador = TablaBaseFija(self.generador, self.orden.bit_length())
+        return self._tabla_generador._multiplica_proyectivo(k % self.orden)
+
+    def cifra(self, mensaje, llave_publica_destinatario):
+        """Cifra un mensaje para el destinatario.
+
+        Args:
+            mensaje(int): el mensaje que se desea cifrar.
+            llave_publica_destinatario: la llave pública del destinatario.
+
+        Returns:
+            CifradoElGamal: el cifrado (r P, m P + r Q).
+        """
+        E = self.curva_eliptica
+        r = random.randrange(1, self.orden)
+        rQ = E._multiplicacion_proyectiva(llave_publica_destinatario, r)
+        c1, c2 = E._normaliza_lote([self._multiplica_generador_proyectivo(r),
+                                    E._suma_proyectiva(rQ, self._multiplica_generador_proyectivo(mensaje))])
+        return CifradoElGamal(c1, c2)
+
+    def rerandomiza_lote(self, cifrados, llave_publica_destinatario):
+        """Devuelve otros cifrados de los mismos mensajes.
+
+        A cada cifrado se le suma un cifrado de cero con aleatoriedad nueva.
+        Las multiplicaciones por P y por la llave pública se hacen con tablas
+        de base fija y todos los puntos resultantes se normalizan con una
+        única inversión.
+
+        Args:
+            cifrados (List[CifradoElGamal]): los cifrados.
+            llave_publica_destinatario: la llave pública con la que se
+                cifraron.
+
+        Returns:
+            List[CifradoElGamal]: los nuevos cifrados, en el mismo orden.
+        """
+        E = self.curva_eliptica
+        tabla_Q = TablaBaseFija(llave_publica_destinatario, self.orden.bit_length())
+        proyectivos = []
+        for cifrado in cifrados:
+            r = random.randrange(1, self.orden)
+            proyectivos.append(E._suma_proyectiva(self._multiplica_generador_proyectivo(r),
+                                                  cifrado.c1._a_proyectivo()))
+            proyectivos.append(E._suma_proyectiva(tabla_Q._multiplica_proyectivo(r),
+                                                  cifrado.c2._a_proyectivo()))
+        afines = E._normaliza_lote(proyectivos)
+        return [CifradoElGamal(afines[i], afines[i + 1]) for i in range(0, len(afines), 2)]
+
+    def descifra(self, cifrado, tabla):
+        """Descifra un cifrado.
+
+        Args:
+            cifrado (CifradoElGamal): el cifrado.
+            tabla (TablaLogaritmoDiscreto): la tabla de logaritmos del
+                generador.
+
+        Returns:
+            int: el mensaje o ``None`` si no está en el rango de la tabla.
+        """
+        return self.descifra_lote([cifrado], tabla)[0]
+
+    def descifra_lote(self, cifrados, tabla):
+        """Descifra una lista de cifrados.
+
+        Los puntos m P se calculan en coordenadas proyectivas y se
+        normalizan con una única inversión; después se resuelven todos los
+        logaritmos a la vez con :meth:`TablaLogaritmoDiscreto.logaritmos`.
+
+        Args:
+            cifrados (List[CifradoElGamal]): los cifrados.
+            tabla (TablaLogaritmoDiscreto): la tabla de logaritmos del
+                generador.
+
+        Returns:
+            List[int]: los mensajes (``None`` si no están en el rango de la
+            tabla).
+        """
+        E = self.curva_eliptica
+        proyectivos = [E._suma_proyectiva(E._multiplicacion_proyectiva(-c.c1, self.llave_privada),
+                                          c.c2._a_proyectivo())
+                       for c in cifrados]
+        return tabla.logaritmos(E._normaliza_lote(proyectivos))
 
 
 class ECDSA(object):
@@ -214,6 +915,10 @@ class ECDSA(object):
         Returns:
             Tuple[int]: el par ``(r, s)`` que forma la firma del mensaje.
         """
+        with tramo("ECDSA.firma"):
+            return self._firma(mensaje)
+
+    def _firma(self, mensaje):
         # renombramos las variables
         P = self.generador
         n = self.orden
@@ -221,7 +926,8 @@ class ECDSA(object):
         m = mensaje
 
         while True:
-            k = random.randrange(1, self.orden - 1)
+            with tramo("nonce"):
+                k = random.randrange(1, self.orden - 1)
             kP = k * P
 
             Zn = Zp(n)
@@ -229,10 +935,12 @@ class ECDSA(object):
             if r == 0:
                 continue
 
-            hash_mensaje = hashlib.sha1(bytes(m, 'utf-8')).digest()
-            e = int.from_bytes(hash_mensaje[:n.bit_length()], byteorder='big')
+            with tramo("hash"):
+                hash_mensaje = hashlib.sha1(bytes(m, 'utf-8')).digest()
+                e = int.from_bytes(hash_mensaje[:n.bit_length()], byteorder='big')
 
-            inverso_k = Zn(k).inverso()
+            with tramo("inversion"):
+                inverso_k = Zn(k).inverso()
             s = inverso_k * (e + d * r)
             if s == 0:
                 continue
@@ -258,6 +966,10 @@ class ECDSA(object):
         Returns:
             bool: verdadero o falso.
         """
+        with tramo("ECDSA.verifica"):
+            return self._verifica(mensaje, r, s, llave_publica_firmante)
+
+    def _verifica(self, mensaje, r, s, llave_publica_firmante):
         # renombramos las variables
         P = self.generador
         n = self.orden
@@ -267,11 +979,13 @@ class ECDSA(object):
         if not (1 <= r <= n - 1 and 1 <= s <= n - 1):
             return False
 
-        hash_mensaje = hashlib.sha1(bytes(m, 'utf-8')).digest()
-        e = int.from_bytes(hash_mensaje[:n.bit_length()], byteorder='big')
+        with tramo("hash"):
+            hash_mensaje = hashlib.sha1(bytes(m, 'utf-8')).digest()
+            e = int.from_bytes(hash_mensaje[:n.bit_length()], byteorder='big')
 
         Zn = Zp(n)
-        w = Zn(s).inverso()
+        with tramo("inversion"):
+            w = Zn(s).inverso()
         u1 = int(e * w)
         u2 = int(r * w)
 
@@ -285,3 +999,201 @@ class ECDSA(object):
             return True
         else:
             return False
+
+
+class Schnorr(object):
+    """Representa un participante del esquema de firmas de Schnorr.
+
+    El esquema de firmas de Schnorr sobre curvas elípticas es una
+    alternativa a ECDSA cuya ecuación de verificación es lineal, lo que
+    permite verificar muchas firmas a la vez (ver :meth:`verifica_lote`).
+
+    Veamos un ejemplo de la creación del participante que hará de firmante:
+
+        >>> # definimos los parámetros
+        >>> E = curva_eliptica_sobre_Fq(a=5, b=7, p=113)
+        >>> generador = E(16, 51)
+        >>> orden_generador = 127
+        >>> # definimos el participante
+        >>> alicia = Schnorr(E, generador, orden_generador)
+
+    Para firmar, basta llamar al método :meth:`firma` pasándole el
+    mensaje que se desea firmar. A diferencia de ECDSA, la firma es un
+    par ``(R, s)`` formado por un punto de la curva y un entero:
+
+        >>> R, s = alicia.firma("mensaje")
+
+    Para que otra entidad compruebe la firma, basta llamar a
+    :meth:`verifica` pasándole como argumentos el mensaje,
+    la firma y la llave pública del firmante:
+
+        >>> bob = Schnorr(E, generador, orden_generador)
+        >>> bob.verifica("mensaje", R, s, alicia.llave_publica)
+        True
+
+    Los requisitos de los parámetros y la generación de llaves son los
+    mismos que en :class:`ECDSA`.
+
+    Args:
+        curva_eliptica: el constructor de puntos de una curva elíptica.
+        generador: un punto de la curva elíptica.
+        orden(int): el orden del generador.
+
+    Attributes:
+        curva_eliptica: el constructor de puntos de una curva elíptica.
+        generador: un punto de la curva elíptica.
+        orden(int): el orden del generador.
+        llave_privada(int): un entero que hace de llave privada del participante.
+        llave_publica: un punto de la curva elíptica que hace de llave pública
+            del participante.
+
+    """
+    def __init__(self, curva_eliptica, generador, orden):
+        if hasattr(curva_eliptica.Fq, 'n'):
+            raise ValueError("El cardinal del cuerpo finito debe ser un número primo.")
+
+        self.curva_eliptica = curva_eliptica
+        self.generador = generador
+        self.orden = orden  # debe ser primo
+        # por la cota de Hasse, la curva tiene a lo sumo p + 1 + 2 sqrt(p)
+        # puntos; si 2 orden es mayor, todos sus puntos son múltiplos del
+        # generador (cofactor 1)
+        p = curva_eliptica.Fq.p
+        self._cofactor_uno = 2 * orden > p + 1 + 2 * (_raiz_entera(p) + 1)
+
+        # generamos las llaves
+        self.llave_privada = random.randrange(1, self.orden)
+        self.llave_publica = self.llave_privada * self.generador
+
+    def _reto(self, R, llave_publica, mensaje):
+        """Devuelve el reto e = H(R || Q || m) módulo el orden.
+
+        Se utiliza la función hash ``SHA-256`` (del módulo :mod:`hashlib`)
+        y se incluye la llave pública Q para que la firma quede ligada
+        al firmante."""
+        longitud = (self.curva_eliptica.Fq.p.bit_length() + 7) // 8
+        h = hashlib.sha256()
+        for punto in (R, llave_publica):
+            h.update(int(punto.x).to_bytes(longitud, byteorder='big'))
+            h.update(int(punto.y).to_bytes(longitud, byteorder='big'))
+        h.update(bytes(mensaje, 'utf-8'))
+        return int.from_bytes(h.digest(), byteorder='big') % self.orden
+
+    def firma(self, mensaje):
+        """Firma el mensaje utilizando la llave privada del participante.
+
+        La firma es el par ``(R, s)`` con R = k P, siendo k un entero
+        aleatorio, y s = k + e d, siendo e el reto calculado a partir
+        de R, la llave pública y el mensaje.
+
+        Args:
+            mensaje(str): el mensaje que se desea firmar.
+
+        Returns:
+            Tuple: el par ``(R, s)`` que forma la firma del mensaje.
+        """
+        # renombramos las variables
+        P = self.generador
+        n = self.orden
+        d = self.llave_privada
+
+        k = random.randrange(1, n)
+        R = k * P
+        e = self._reto(R, self.llave_publica, mensaje)
+        s = (k + e * d) % n
+        return R, s
+
+    def _firma_bien_formada(self, R, s):
+        return not R.es_elemento_neutro() and 0 <= s < self.orden
+
+    def verifica(self, mensaje, R, s, llave_publica_firmante):
+        """Comprueba la firma de un mensaje.
+
+        Se comprueba la igualdad s P - e Q = R con una única suma
+        multiescalar.
+
+        Args:
+            mensaje(str): el mensaje que se desea comprobar su firma.
+            R: la primera componente de la firma.
+            s(int): la segunda componente de la firma.
+            llave_publica_firmante: la llave pública del firmante.
+
+        Returns:
+            bool: verdadero o falso.
+        """
+        if not self._firma_bien_formada(R, s):
+            return False
+
+        e = self._reto(R, llave_publica_firmante, mensaje)
+        X = suma_multiescalar([s, -e], [self.generador, llave_publica_firmante])
+        return X == R
+
+    def verifica_lote(self, firmas):
+        """Comprueba un lote de firmas a la vez.
+
+            >>> E = curva_eliptica_sobre_Fq(a=5, b=7, p=113)
+            >>> generador = E(16, 51)
+            >>> alicia = Schnorr(E, generador, 127)
+            >>> bob = Schnorr(E, generador, 127)
+            >>> firmas = []
+            >>> for mensaje in ["hola", "adiós"]:
+            ...     R, s = alicia.firma(mensaje)
+            ...     firmas.append((mensaje, R, s, alicia.llave_publica))
+            >>> bob.verifica_lote(firmas)
+            True
+
+        Se eligen pesos aleatorios a_i y se comprueba que
+
+        .. math::
+
+            (\\sum a_i s_i) P - \\sum a_i R_i - \\sum (a_i e_i) Q_i = O
+
+        con una única suma multiescalar de 2N + 1 términos, que cuesta
+        bastante menos que N verificaciones independientes. Si alguna
+        firma no es válida, la igualdad falla salvo con probabilidad
+        despreciable; en ese caso puede usar :meth:`verifica` para
+        localizar las firmas incorrectas.
+
+        En una curva con cofactor, un R_i o un Q_i con una componente de
+        orden pequeño podría anularse al multiplicarlo por a_i, así que se
+        comprueba además que n R_i y n Q_i son el elemento neutro (una
+        multiplicación escalar más por punto). Si el orden del generador
+        es mayor que la mitad de la cota de Hasse, la curva no tiene
+        cofactor y la comprobación se omite.
+
+        Args:
+            firmas: una lista de tuplas ``(mensaje, R, s, llave_publica_firmante)``
+                con los mismos argumentos que :meth:`verifica`.
+
+        Returns:
+            bool: verdadero si todas las firmas son válidas.
+        """
+        n = self.orden
+        escalares = [0]
+        puntos = [self.generador]
+        en_subgrupo = set()  # las llaves públicas ya comprobadas
+        for indice, (mensaje, R, s, Q) in enumerate(firmas):
+            if not self._firma_bien_formada(R, s):
+                return False
+            if not self._cofactor_uno:
+                if not (n * R).es_elemento_neutro():
+                    return False
+                if Q not in en_subgrupo:
+                    if not (n * Q).es_elemento_neutro():
+                        return False
+                    en_subgrupo.add(Q)
+            e = self._reto(R, Q, mensaje)
+            # el primer peso puede ser 1 sin pérdida de seguridad
+            a = 1 if indice == 0 else _aleatorio_seguro.getrandbits(128)
+            escalares[0] += a * s
+            escalares += [-a, -(a * e) % n]
+            puntos += [R, Q]
+
+        if len(puntos) == 1:
+            return True
+        escalares[0] %= n
+        return suma_multiescalar(escalares, puntos).es_elemento_neutro()
+
+
+# Los pesos de la verificación por lotes no deben ser predecibles
+_aleatorio_seguro = random.SystemRandom()
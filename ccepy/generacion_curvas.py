@@ -0,0 +1,199 @@
+"""Generación de curvas elípticas de orden primo.
+
+Este módulo permite generar curvas elípticas y^2 = x^3 + a x + b sobre un
+cuerpo de p elementos (p primo) cuyo número de puntos es primo (o un primo
+por un cofactor pequeño), listas para usarse en los esquemas de
+:mod:`esquemas_criptograficos`.
+
+Para utilizar las funciones y las clases de este módulo, debe importarlo
+previamente: ::
+
+    # reemplace ... por la función/clase que desea utilizar
+    from ccepy.generacion_curvas import ...
+
+Para generar una curva, use la función :func:`genera_curva_orden_primo`:
+
+    >>> parametros = genera_curva_orden_primo(10007, semilla=1)
+    >>> parametros.orden
+    10067
+    >>> from ccepy.listado_curvas_elipticas import procesar_parametros_curva_eliptica
+    >>> E, P, n = procesar_parametros_curva_eliptica(parametros)
+    >>> (n * P).es_elemento_neutro()
+    True
+
+Los coeficientes (a, b) se eligen al azar y cada candidato pasa por una
+serie de filtros, de menor a mayor coste:
+
+1. El discriminante -16 (4 a^3 + 27 b^2) debe ser no nulo.
+2. Criba de primos pequeños: para cada primo pequeño l mayor que el
+   cofactor permitido se calcula la traza de Frobenius módulo l (como en el
+   algoritmo de Schoof, ver :mod:`conteo_puntos`) y se descarta la curva si
+   l divide a su orden. La mayoría de los candidatos se descartan aquí.
+3. Conteo de puntos (ver :func:`.orden_curva`), reutilizando las trazas
+   módulo l calculadas en la criba.
+4. El orden debe ser h r con r primo y h menor o igual que el cofactor
+   permitido, la curva no debe ser anómala (r = p) y el grado de inmersión
+   (el menor k tal que r divide a p^k - 1) debe ser mayor que el mínimo
+   pedido, para evitar los ataques MOV y de Smart.
+
+Los candidatos se reparten entre varios procesos; en cuanto se encuentra
+una curva válida se cancelan los cálculos pendientes. El resultado solo
+depende de la semilla (no del número de procesos): es la primera curva
+válida de la sucesión de candidatos.
+"""
+import collections
+import itertools
+import multiprocessing
+import random
+
+from ccepy.aritmetica_elemental import Zp, es_primo
+from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+from ccepy.conteo_puntos import orden_curva, _raiz_cuadrada, \
+    _PolinomiosDivision, _traza_schoof, _traza_modulo_2, _traza_modulo_l
+from ccepy.listado_curvas_elipticas import ParametrosCurvaElipticaSobreFq
+
+
+# Primos de la criba
+_PRIMOS_CRIBA = [2, 3, 5, 7, 11]
+
+
+def _evalua_candidato(argumentos):
+    """Devuelve el orden de la curva si cumple los criterios o None."""
+    p, a, b, cofactor_maximo, grado_inmersion_minimo = argumentos
+    if (4 * a ** 3 + 27 * b ** 2) % p == 0:
+        return None
+
+    polinomios = _PolinomiosDivision(a, b, p)
+    restos = {}
+    for l in _PRIMOS_CRIBA:
+        if l <= cofactor_maximo or l == p:
+            continue
+        t = _traza_modulo_2(p, polinomios) if l == 2 else _traza_modulo_l(l, a, p, polinomios)
+        if (p + 1 - t) % l == 0:
+            return None
+        restos[l] = t
+
+    if p.bit_length() > 60:
+        orden = p + 1 - _traza_schoof(a, b, p, polinomios, restos)
+    else:
+        orden = orden_curva(curva_eliptica_sobre_Fq(a, b, p))
+
+    cofactor = _cofactor(orden, cofactor_maximo)
+    if cofactor is None:
+        return None
+    r = orden // cofactor
+    if r == p or any(pow(p, k, r) == 1 for k in range(1, grado_inmersion_minimo + 1)):
+        return None
+    return orden
+
+
+def _cofactor(orden, cofactor_maximo):
+    """Devuelve el menor h <= cofactor_maximo tal que orden / h es primo."""
+    for h in range(1, cofactor_maximo + 1):
+        if orden % h == 0 and es_primo(orden // h):
+            return h
+    return None
+
+
+def _candidatos(p, semilla, cofactor_maximo, grado_inmersion_minimo):
+    aleatorio = random.Random(semilla)
+    while True:
+        a, b = aleatorio.randrange(p), aleatorio.randrange(p)
+        yield p, a, b, cofactor_maximo, grado_inmersion_minimo
+
+
+def genera_curva_orden_primo(p, cofactor_maximo=1, grado_inmersion_minimo=20, procesos=1,
+                             nombre=None, semilla=None, intentos=None):
+    """Genera una curva elíptica sobre Z_p de orden primo.
+
+        >>> parametros = genera_curva_orden_primo(2**31 - 1, cofactor_maximo=4, semilla=7)
+        >>> parametros.orden
+        2147492959
+
+    Args:
+        p (int): un número primo mayor que 3.
+        cofactor_maximo (Optional[int]): el mayor cofactor h permitido (el
+            número de puntos de la curva es h r con r primo).
+        grado_inmersion_minimo (Optional[int]): se descartan las curvas cuyo
+            grado de inmersión es menor o igual que este valor.
+        procesos (Optional[int]): el número de procesos entre los que se
+            reparten los candidatos.
+        nombre (Optional[str]): el nombre de la curva. Por defecto, se
+            forma a partir de p y los coeficientes.
+        semilla (Optional[int]): la semilla con la que se eligen los
+            coeficientes.
+        intentos (Optional[int]): el número máximo de candidatos. Por
+            defecto no hay límite.
+
+    Returns:
+        ParametrosCurvaElipticaSobreFq: los parámetros de la curva. El
+        punto (x1, y1) es un generador del subgrupo de orden primo r y el
+        campo ``orden`` es r.
+
+    Raises:
+        ValueError: si p no es un primo mayor que 3.
+        RuntimeError: si ningún candidato cumple los criterios.
+    """
+    if p <= 3 or not es_primo(p):
+        raise ValueError("p debe ser un primo mayor que 3.")
+
+    candidatos = _candidatos(p, semilla, cofactor_maximo, grado_inmersion_minimo)
+    if intentos is not None:
+        candidatos = itertools.islice(candidatos, intentos)
+
+    if procesos > 1:
+        encontrado = _busca_en_paralelo(candidatos, procesos)
+    else:
+        encontrado = next(((c, orden) for c, orden in ((c, _evalua_candidato(c)) for c in candidatos)
+                           if orden is not None), None)
+    if encontrado is None:
+        raise RuntimeError("Ningún candidato cumple los criterios.")
+
+    (p, a, b, _, _), orden = encontrado
+    cofactor = _cofactor(orden, cofactor_maximo)
+    x1, y1 = _generador(p, a, b, cofactor, random.Random(semilla))
+    if nombre is None:
+        nombre = "ccepy-p{0}-{1:x}-{2:x}".format(p.bit_length(), a, b)
+    return ParametrosCurvaElipticaSobreFq(nombre, p, a, b, x1, y1, orden // cofactor)
+
+
+def _busca_en_paralelo(candidatos, procesos):
+    """Evalúa los candidatos en varios procesos y devuelve el primero
+    (en el orden de la sucesión) que cumple los criterios."""
+    pool = multiprocessing.Pool(procesos)
+    try:
+        pendientes = collections.deque()
+
+        def envia():
+            candidato = next(candidatos, None)
+            if candidato is not None:
+                pendientes.append((candidato, pool.apply_async(_evalua_candidato, (candidato,))))
+
+        # se mantienen 2 candidatos por proceso en curso
+        for _ in range(2 * procesos):
+            envia()
+        while pendientes:
+            candidato, resultado = pendientes.popleft()
+            orden = resultado.get()
+            if orden is not None:
+                return candidato, orden
+            envia()
+        return None
+    finally:
+        # cancela los candidatos pendientes
+        pool.terminate()
+
+
+def _generador(p, a, b, cofactor, aleatorio):
+    """Devuelve un punto de la curva de orden #E / cofactor."""
+    E = curva_eliptica_sobre_Fq(a, b, p)
+    F = Zp(p)
+    while True:
+        x = F(aleatorio.randrange(p))
+        y = _raiz_cuadrada(x * x * x + a * x + b, F, p)
+        if y is None:
+            continue
+        # de las dos raíces se elige la menor
+        P = cofactor * E(x, min(int(y), p - int(y)))
+        if not P.es_elemento_neutro():
+            return int(P.x), int(P.y)
@@ -0,0 +1,281 @@
+"""Instrumentación de la aritmética.
+
+Este módulo permite contar las operaciones (multiplicaciones, cuadrados,
+inversiones, reducciones polinomiales, sumas y duplicaciones de puntos...)
+que realiza un cálculo, y medir el tiempo de fragmentos de código. Así se
+pueden comparar sistemas de coordenadas o métodos de multiplicación escalar
+por su coste en operaciones y no solo por su tiempo de ejecución.
+
+Para utilizar las funciones y las clases de este módulo, debe importarlo
+previamente: ::
+
+    # reemplace ... por la función/clase que desea utilizar
+    from ccepy.instrumentacion import ...
+
+Para contar operaciones, use el gestor de contexto :func:`cuenta_operaciones`
+con las clases que desee instrumentar (las devueltas por :func:`.Zp`,
+:func:`.Fq`, :func:`.curva_eliptica_sobre_Fq`...):
+
+    >>> from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+    >>> E = curva_eliptica_sobre_Fq(2, 3, 97)
+    >>> P = E(0, 10)
+    >>> with cuenta_operaciones(E, E.Fq) as recuento:
+    ...     Q = 13 * P
+    >>> Q
+    (87,70)
+    >>> recuento[E]['duplicacion'], recuento[E]['suma']
+    (4, 3)
+    >>> recuento[E.Fq]['inversion']
+    1
+
+La instrumentación solo está activa dentro del bloque ``with``: fuera de él
+las clases no se modifican y no hay ningún coste añadido.
+"""
+import collections
+import contextlib
+import inspect
+import time
+
+from ccepy.aritmetica_elemental import PolinomioZp
+from ccepy.curvas_elipticas import PuntoRacional
+
+
+# Operaciones instrumentadas de los elementos de un cuerpo (EnteroModuloP y
+# ElementoFq). Cada entrada es (método, clasificador, exclusiva): el
+# clasificador devuelve el nombre de la operación a partir de los argumentos
+# y, si la operación es exclusiva, no se cuentan las operaciones de la misma
+# clase que realice internamente (una resta no cuenta además una suma).
+
+def _clasifica_multiplicacion(clase, elemento, otro):
+    if otro is elemento:
+        return 'cuadrado'
+    elif isinstance(otro, int) and not isinstance(otro, clase):
+        return 'multiplicacion_constante'
+    else:
+        return 'multiplicacion'
+
+
+def _clasifica_potencia(clase, elemento, exponente):
+    return 'cuadrado' if exponente == 2 else 'potencia'
+
+
+_OPERACIONES_CUERPO = [
+    ('__add__', 'suma', True),
+    ('__radd__', 'suma', True),
+    ('__sub__', 'suma', True),
+    ('__rsub__', 'suma', True),
+    ('__neg__', 'negacion', True),
+    ('__mul__', _clasifica_multiplicacion, True),
+    ('__rmul__', _clasifica_multiplicacion, True),
+    ('__pow__', _clasifica_potencia, True),
+    ('inverso', 'inversion', True),
+]
+
+# Cada vez que se construye un ElementoFq se reduce módulo el irreducible.
+_OPERACIONES_POLINOMIALES = [
+    ('__init__', 'reduccion', False),
+]
+
+
+def _clasifica_suma_puntos(clase, punto, otro):
+    # la comparación no debe contar operaciones
+    with _pausa():
+        duplicacion = otro is punto or punto == otro
+    return 'duplicacion' if duplicacion else 'suma'
+
+
+_OPERACIONES_CURVA = [
+    ('__add__', _clasifica_suma_puntos, True),
+    ('__sub__', 'suma', True),
+    ('__neg__', 'negacion', True),
+    # las sumas y duplicaciones internas también se cuentan
+    ('__mul__', 'multiplicacion_escalar', False),
+    ('__rmul__', 'multiplicacion_escalar', False),
+    ('_suma_proyectiva', 'suma', True),
+    ('_duplicacion_proyectiva', 'duplicacion', True),
+    ('_normaliza_lote', 'normalizacion', True),
+]
+
+
+# Instrumentación pausada (se usa al clasificar operaciones)
+_pausada = [0]
+
+
+@contextlib.contextmanager
+def _pausa():
+    _pausada[0] += 1
+    try:
+        yield
+    finally:
+        _pausada[0] -= 1
+
+
+class RecuentoOperaciones(object):
+    """Almacena el número de operaciones realizadas por clase y los tiempos
+    medidos.
+
+    No se instancia directamente: lo devuelve :func:`cuenta_operaciones`.
+
+        >>> from ccepy.aritmetica_elemental import Zp
+        >>> Z7 = Zp(7)
+        >>> with cuenta_operaciones(Z7) as recuento:
+        ...     x = Z7(3)
+        ...     y = x * x + 2 * x - x / Z7(5)
+        >>> sorted(recuento[Z7].items())
+        [('cuadrado', 1), ('inversion', 1), ('multiplicacion', 1), ('multiplicacion_constante', 1), ('suma', 2)]
+
+    Attributes:
+        operaciones (Dict): a cada clase le asocia un
+            :py:class:`collections.Counter` con el número de veces que se ha
+            realizado cada operación.
+        tiempos (Dict): a cada etiqueta le asocia una lista con el número
+            de mediciones y el total de segundos medidos (ver
+            :meth:`cronometra`).
+    """
+    def __init__(self):
+        self.operaciones = collections.defaultdict(collections.Counter)
+        self.tiempos = collections.defaultdict(lambda: [0, 0.0])
+        # profundidad de las operaciones exclusivas en curso por clase
+        self._nivel = collections.Counter()
+
+    def __getitem__(self, clase):
+        return self.operaciones[clase]
+
+    def total(self, operacion):
+        """Devuelve el número de veces que se ha realizado una operación,
+        sumando todas las clases.
+
+        Args:
+            operacion (str): el nombre de la operación.
+
+        Returns:
+            int: el número de veces.
+        """
+        return sum(contador[operacion] for contador in self.operaciones.values())
+
+    @contextlib.contextmanager
+    def cronometra(self, etiqueta):
+        """Gestor de contexto que mide el tiempo del bloque y lo acumula en
+        ``tiempos[etiqueta]``.
+
+            >>> with cuenta_operaciones() as recuento:
+            ...     for _ in range(3):
+            ...         with recuento.cronometra("bucle"):
+            ...             pass
+            >>> recuento.tiempos["bucle"][0]
+            3
+
+        Args:
+            etiqueta (str): el nombre del fragmento de código medido.
+        """
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            medicion = self.tiempos[etiqueta]
+            medicion[0] += 1
+            medicion[1] += time.perf_counter() - inicio
+
+    def __str__(self):
+        lineas = []
+        for clase, contador in self.operaciones.items():
+            for operacion, veces in sorted(contador.items()):
+                lineas.append("{0} {1}: {2}".format(clase.__name__, operacion, veces))
+        for etiqueta, (veces, segundos) in self.tiempos.items():
+            lineas.append("{0}: {1} veces, {2:.6f} s".format(etiqueta, veces, segundos))
+        return "\n".join(lineas)
+
+    def _envuelve(self, clase, nombre, operacion, exclusiva):
+        """Devuelve la función que sustituye al método *nombre* de la clase
+        para contar la operación."""
+        original = inspect.getattr_static(clase, nombre)
+        es_metodo_de_clase = isinstance(original, classmethod)
+        funcion = original.__func__ if es_metodo_de_clase else original
+        contador = self.operaciones[clase]
+        nivel = self._nivel
+
+        def envoltorio(primero, *args):
+            if _pausada[0] or (exclusiva and nivel[clase]):
+                return funcion(primero, *args)
+            if callable(operacion):
+                contador[operacion(clase, primero, *args)] += 1
+            elif nombre == '_normaliza_lote':
+                contador[operacion] += len(args[0])
+            else:
+                contador[operacion] += 1
+            if not exclusiva:
+                return funcion(primero, *args)
+            nivel[clase] += 1
+            try:
+                return funcion(primero, *args)
+            finally:
+                nivel[clase] -= 1
+
+        return classmethod(envoltorio) if es_metodo_de_clase else envoltorio
+
+
+def _operaciones_instrumentables(clase):
+    if issubclass(clase, PuntoRacional):
+        return _OPERACIONES_CURVA
+    elif issubclass(clase, PolinomioZp) and getattr(clase, 'pol_irreducible', None) is not None:
+        return _OPERACIONES_CUERPO + _OPERACIONES_POLINOMIALES
+    elif issubclass(clase, int) and getattr(clase, 'p', None) is not None:
+        return _OPERACIONES_CUERPO
+    else:
+        raise TypeError("No se puede instrumentar la clase {0}.".format(clase))
+
+
+@contextlib.contextmanager
+def cuenta_operaciones(*clases):
+    """Gestor de contexto que cuenta las operaciones realizadas con las
+    clases dadas dentro del bloque.
+
+    Se pueden instrumentar las clases de enteros módulo p (:func:`.Zp`), de
+    elementos de cuerpos finitos (:func:`.Fq`) y de puntos de curvas
+    elípticas. Las operaciones contadas son:
+
+    - cuerpos: ``suma`` (incluye las restas), ``negacion``,
+      ``multiplicacion``, ``cuadrado``, ``multiplicacion_constante`` (por un
+      :py:class:`int`), ``potencia``, ``inversion`` y ``reduccion`` (módulo
+      el polinomio irreducible, solo en :class:`.ElementoFq`).
+    - curvas: ``suma``, ``duplicacion``, ``negacion``,
+      ``multiplicacion_escalar`` y ``normalizacion`` (paso de coordenadas
+      proyectivas a afines, por punto). Las sumas y duplicaciones se cuentan
+      tanto en coordenadas afines como proyectivas.
+
+    Las operaciones de una clase que se realizan internamente dentro de
+    otra operación de la misma clase no se cuentan (por ejemplo, una
+    potencia cuenta como una operación), salvo en la multiplicación
+    escalar, que cuenta además sus sumas y duplicaciones. Las operaciones
+    de otras clases sí se cuentan: una multiplicación en :class:`.ElementoFq`
+    cuenta las operaciones de :class:`.EnteroModuloP` que realiza si
+    también se ha instrumentado su clase.
+
+    Las clases se restauran al salir del bloque, por lo que fuera de él la
+    instrumentación no tiene ningún coste. Sin clases, solo se pueden medir
+    tiempos con :meth:`RecuentoOperaciones.cronometra`.
+
+    Args:
+        clases: las clases a instrumentar.
+
+    Returns:
+        RecuentoOperaciones: el recuento de operaciones (se actualiza
+        mientras el bloque se ejecuta).
+    """
+    recuento = RecuentoOperaciones()
+    sustituidos = []
+    try:
+        for clase in clases:
+            for nombre, operacion, exclusiva in _operaciones_instrumentables(clase):
+                propio = nombre in vars(clase)
+                anterior = vars(clase).get(nombre)
+                envoltorio = recuento._envuelve(clase, nombre, operacion, exclusiva)
+                setattr(clase, nombre, envoltorio)
+                sustituidos.append((clase, nombre, propio, anterior))
+        yield recuento
+    finally:
+        for clase, nombre, propio, anterior in reversed(sustituidos):
+            if propio:
+                setattr(clase, nombre, anterior)
+            else:
+                delattr(clase, nombre)
@@ -0,0 +1,360 @@
+"""Programa de línea de comandos.
+
+Este módulo permite usar los esquemas criptográficos de
+:mod:`esquemas_criptograficos` desde la línea de comandos, sin escribir
+código en python. Al instalar *ccepy* se instala el programa ``ccepy``
+(también se puede ejecutar con ``python -m ccepy``): ::
+
+    # genera 10 pares de llaves
+    ccepy keygen --curva "NIST P-256" -n 10 > llaves.jsonl
+
+    # firma y verifica registros usando 4 procesos
+    ccepy sign --curva "NIST P-256" --llave-privada 1234 registros.jsonl > firmas.jsonl
+    ccepy verify --curva "NIST P-256" --procesos 4 firmas.jsonl
+
+    # calcula los secretos compartidos con una lista de llaves públicas
+    ccepy ecdh --curva "NIST P-256" --llave-privada 1234 llaves.jsonl
+
+    # muestra las curvas disponibles
+    ccepy curvas
+
+Las curvas se indican por su nombre en :mod:`listado_curvas_elipticas`.
+
+La entrada (los ficheros indicados o, si no se indica ninguno, la entrada
+estándar) y la salida son registros JSON, uno por línea. Los puntos se
+escriben como una lista ``[x, y]``. Cada orden lee los campos:
+
+- ``sign``: ``mensaje``. Añade la firma: ``r`` y ``s`` (ECDSA) o ``R`` y
+  ``s`` (Schnorr) y ``llave_publica``.
+- ``verify``: ``mensaje``, la firma y ``llave_publica`` (o la opción
+  ``--llave-publica``). Añade el campo ``valida``.
+- ``ecdh``: ``llave_publica``. Añade el campo ``secreto``.
+
+Los registros se procesan por lotes (opción ``--lote``), que se reparten
+entre varios procesos si se indica la opción ``--procesos``. Al terminar
+se escribe en la salida de error el número de registros procesados por
+segundo (con ``--progreso``, también tras cada lote). La orden ``verify``
+termina con código de salida 1 si alguna firma no es válida (también si
+su llave pública o su punto R no pertenecen a la curva). Si un registro no
+es JSON válido, le falta algún campo o algún campo no es del tipo
+esperado (o, en ``ecdh``, la llave pública no pertenece a la curva), se
+indica el fichero y la línea en la salida de error y se termina con código
+de salida 2.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import random
+import sys
+import time
+
+from ccepy.esquemas_criptograficos import ECDH, ECDSA, Schnorr
+from ccepy.curvas_elipticas import TablaBaseFija
+from ccepy.listado_curvas_elipticas import parametros_dominio, curvas_eliptipcas_sobre_Fq_famosas
+
+
+# Estado de cada proceso (se inicializa con _inicializa)
+_estado = {}
+
+
+def _inicializa(nombre_curva, esquema, llave_privada, llave_publica):
+    """Prepara la curva y el participante del proceso actual."""
+    E, generador, orden = parametros_dominio(nombre_curva)
+    clase = {'ecdsa': ECDSA, 'schnorr': Schnorr}.get(esquema, ECDH)
+    participante = clase(E, generador, orden)
+    if llave_privada is not None:
+        participante.llave_privada = llave_privada
+        participante.llave_publica = llave_privada * generador
+    _estado.clear()
+    _estado.update(curva=E, generador=generador, orden=orden, esquema=esquema,
+                   participante=participante, tabla=None,
+                   llave_publica=None if llave_publica is None else E(*llave_publica))
+
+
+def _punto(lista):
+    return _estado['curva'](*lista)
+
+
+def _punto_o_none(lista):
+    """Devuelve el punto o None si no pertenece a la curva."""
+    try:
+        return _punto(lista)
+    except ValueError:
+        return None
+
+
+def _lista(punto):
+    return [int(punto.x), int(punto.y)]
+
+
+def _keygen(registros):
+    if _estado['tabla'] is None:
+        _estado['tabla'] = TablaBaseFija(_estado['generador'], _estado['orden'].bit_length())
+    E, orden = _estado['curva'], _estado['orden']
+    llaves_privadas = [random.randrange(1, orden) for _ in registros]
+    proyectivos = [_estado['tabla']._multiplica_proyectivo(d) for d in llaves_privadas]
+    return [{'llave_privada': d, 'llave_publica': _lista(Q)}
+            for d, Q in zip(llaves_privadas, E._normaliza_lote(proyectivos))]
+
+
+def _sign(registros):
+    participante = _estado['participante']
+    llave_publica = _lista(participante.llave_publica)
+    for registro in registros:
+        if _estado['esquema'] == 'schnorr':
+            R, s = participante.firma(registro['mensaje'])
+            registro.update(R=_lista(R), s=s)
+        else:
+            r, s = participante.firma(registro['mensaje'])
+            registro.update(r=r, s=s)
+        registro['llave_publica'] = llave_publica
+    return registros
+
+
+def _llave_publica(registro):
+    if 'llave_publica' in registro:
+        return _punto_o_none(registro['llave_publica'])
+    elif _estado['llave_publica'] is not None:
+        return _estado['llave_publica']
+    else:
+        raise ValueError("Falta la llave pública del registro.")
+
+
+def _verify(registros):
+    participante = _estado['participante']
+    # las firmas con puntos que no están en la curva no son válidas
+    if _estado['esquema'] == 'schnorr':
+        firmas = [(registro['mensaje'], _punto_o_none(registro['R']), registro['s'],
+                   _llave_publica(registro))
+                  for registro in registros]
+        bien_formadas = [None not in firma for firma in firmas]
+        if participante.verifica_lote([firma for firma, bien in zip(firmas, bien_formadas) if bien]):
+            validas = bien_formadas
+        else:
+            # se buscan las firmas incorrectas una a una
+            validas = [bien and participante.verifica(*firma)
+                       for firma, bien in zip(firmas, bien_formadas)]
+    else:
+        validas = []
+        for registro in registros:
+            Q = _llave_publica(registro)
+            validas.append(Q is not None and
+                           participante.verifica(registro['mensaje'], registro['r'], registro['s'], Q))
+    for registro, valida in zip(registros, validas):
+        registro['valida'] = valida
+    return registros
+
+
+def _ecdh(registros):
+    participante = _estado['participante']
+    llaves_publicas = [_punto(registro['llave_publica']) for registro in registros]
+    secretos = participante.calcula_secretos_compartidos(llaves_publicas)
+    for registro, secreto in zip(registros, secretos):
+        registro['secreto'] = int(secreto)
+    return registros
+
+
+_ordenes = {'keygen': _keygen, 'sign': _sign, 'verify': _verify, 'ecdh': _ecdh}
+
+
+class _ErrorEntrada(ValueError):
+    """Un registro de la entrada no es válido (el mensaje indica el
+    fichero y la línea)."""
+
+
+def _campos_requeridos(orden):
+    if orden == 'sign':
+        return ['mensaje']
+    if orden == 'ecdh':
+        return ['llave_publica']
+    campos = ['mensaje', 'R' if _estado['esquema'] == 'schnorr' else 'r', 's']
+    if _estado['llave_publica'] is None:
+        campos.append('llave_publica')
+    return campos
+
+
+def _es_entero(valor):
+    return isinstance(valor, int) and not isinstance(valor, bool)
+
+
+def _es_punto(valor):
+    return isinstance(valor, list) and len(valor) == 2 and all(_es_entero(c) for c in valor)
+
+
+# Comprobación del tipo de cada campo y descripción del tipo esperado
+_tipos_campos = {
+    'mensaje': (lambda valor: isinstance(valor, str), "una cadena"),
+    'r': (_es_entero, "un entero"),
+    's': (_es_entero, "un entero"),
+    'R': (_es_punto, "un punto [x, y]"),
+    'llave_publica': (_es_punto, "un punto [x, y]"),
+}
+
+
+def _lee_registro(orden, origen, numero, linea):
+    """Devuelve el registro de una línea de la entrada o lanza
+    _ErrorEntrada si no es válido."""
+    try:
+        registro = json.loads(linea)
+    except ValueError as error:
+        raise _ErrorEntrada("{0}:{1}: registro JSON no válido ({2})".format(origen, numero, error))
+    if not isinstance(registro, dict):
+        raise _ErrorEntrada("{0}:{1}: el registro no es un objeto JSON".format(origen, numero))
+    campos = _campos_requeridos(orden)
+    if orden == 'verify' and 'llave_publica' in registro and 'llave_publica' not in campos:
+        campos.append('llave_publica')
+    for campo in campos:
+        if campo not in registro:
+            raise _ErrorEntrada("{0}:{1}: falta el campo {2!r}".format(origen, numero, campo))
+        es_valido, tipo = _tipos_campos[campo]
+        if not es_valido(registro[campo]):
+            raise _ErrorEntrada("{0}:{1}: el campo {2!r} debe ser {3}".format(origen, numero, campo, tipo))
+    # en verify, un punto fuera de la curva solo hace que la firma no sea válida
+    if orden == 'ecdh' and _punto_o_none(registro['llave_publica']) is None:
+        raise _ErrorEntrada("{0}:{1}: la llave pública no pertenece a la curva".format(origen, numero))
+    return registro
+
+
+def _procesa_lote(argumentos):
+    """Procesa un lote de líneas y devuelve las líneas de salida y el
+    número de firmas no válidas."""
+    orden, lineas = argumentos
+    if orden == 'keygen':
+        registros = [{} for _ in range(lineas)]
+    else:
+        registros = [_lee_registro(orden, *linea) for linea in lineas]
+    registros = _ordenes[orden](registros)
+    invalidas = sum(1 for registro in registros if registro.get('valida') is False)
+    return [json.dumps(registro, ensure_ascii=False) for registro in registros], invalidas
+
+
+def _lineas(ficheros):
+    """Genera las líneas no vacías de la entrada junto con su origen (el
+    fichero y el número de línea)."""
+    if not ficheros:
+        for numero, linea in enumerate(sys.stdin, start=1):
+            if linea.strip():
+                yield '<stdin>', numero, linea
+    for ruta in ficheros:
+        try:
+            fichero = open(ruta, encoding='utf-8')
+        except OSError as error:
+            raise _ErrorEntrada("no se puede leer {0} ({1})".format(ruta, error.strerror))
+        with fichero:
+            for numero, linea in enumerate(fichero, start=1):
+                if linea.strip():
+                    yield ruta, numero, linea
+
+
+def _lotes(args):
+    """Genera los lotes de trabajo de la orden."""
+    if args.orden == 'keygen':
+        for inicio in range(0, args.n, args.lote):
+            yield args.orden, min(args.lote, args.n - inicio)
+        return
+
+    lineas = _lineas(args.ficheros)
+    while True:
+        lote = list(itertools.islice(lineas, args.lote))
+        if not lote:
+            return
+        yield args.orden, lote
+
+
+def _crea_analizador():
+    analizador = argparse.ArgumentParser(
+        prog='ccepy', description='Criptografía con curvas elípticas por lotes.')
+    ordenes = analizador.add_subparsers(dest='orden')
+    ordenes.add_parser('curvas', help='muestra los nombres de las curvas disponibles')
+
+    ayudas = {
+        'keygen': 'genera pares de llaves',
+        'sign': 'firma los mensajes de los registros',
+        'verify': 'verifica las firmas de los registros',
+        'ecdh': 'calcula secretos compartidos ECDH',
+    }
+    for orden, ayuda in ayudas.items():
+        sub = ordenes.add_parser(orden, help=ayuda)
+        sub.add_argument('--curva', required=True, help='el nombre de la curva')
+        sub.add_argument('--procesos', type=int, default=1, help='el número de procesos')
+        sub.add_argument('--lote', type=int, default=256, help='el número de registros por lote')
+        sub.add_argument('--progreso', action='store_true',
+                         help='informa del rendimiento tras cada lote')
+        if orden == 'keygen':
+            sub.add_argument('-n', type=int, default=1, help='el número de pares de llaves')
+        else:
+            sub.add_argument('ficheros', nargs='*', help='los ficheros de entrada')
+        if orden in ('sign', 'verify'):
+            sub.add_argument('--esquema', choices=['ecdsa', 'schnorr'], default='ecdsa')
+        if orden in ('sign', 'ecdh'):
+            sub.add_argument('--llave-privada', type=lambda x: int(x, 0), required=True)
+        if orden == 'verify':
+            sub.add_argument('--llave-publica', type=lambda x: [int(c, 0) for c in x.split(',')],
+                             help='la llave pública "x,y" de los registros que no la incluyan')
+    return analizador
+
+
+def main(argv=None):
+    """Punto de entrada del programa ``ccepy``.
+
+    Args:
+        argv (Optional[List[str]]): los argumentos (por defecto los de
+            :data:`sys.argv`).
+
+    Returns:
+        int: el código de salida.
+    """
+    args = _crea_analizador().parse_args(argv)
+    if args.orden is None:
+        _crea_analizador().print_help(sys.stderr)
+        return 2
+    if args.orden == 'curvas':
+        for curva in curvas_eliptipcas_sobre_Fq_famosas:
+            print(curva.nombre)
+        return 0
+    if parametros_dominio(args.curva) is None:
+        print("ccepy: no existe la curva {0!r}".format(args.curva), file=sys.stderr)
+        return 2
+
+    inicializacion = (args.curva, getattr(args, 'esquema', None),
+                      getattr(args, 'llave_privada', None), getattr(args, 'llave_publica', None))
+    if args.procesos > 1:
+        pool = multiprocessing.Pool(args.procesos, _inicializa, inicializacion)
+        resultados = pool.imap(_procesa_lote, _lotes(args))
+    else:
+        pool = None
+        _inicializa(*inicializacion)
+        resultados = map(_procesa_lote, _lotes(args))
+
+    inicio = time.perf_counter()
+    total = 0
+    invalidas = 0
+    try:
+        for lineas, invalidas_lote in resultados:
+            for linea in lineas:
+                print(linea)
+            total += len(lineas)
+            invalidas += invalidas_lote
+            if args.progreso:
+                _informa(total, inicio)
+    except _ErrorEntrada as error:
+        sys.stdout.flush()
+        print("ccepy: {0}".format(error), file=sys.stderr)
+        return 2
+    finally:
+        if pool is not None:
+            pool.terminate()
+    sys.stdout.flush()
+    _informa(total, inicio)
+    if invalidas:
+        print("ccepy: {0} firmas no válidas".format(invalidas), file=sys.stderr)
+        return 1
+    return 0
+
+
+def _informa(total, inicio):
+    segundos = time.perf_counter() - inicio
+    rendimiento = total / segundos if segundos > 0 else float('inf')
+    print("ccepy: {0} registros en {1:.2f} s ({2:.1f} registros/s)".format(
+        total, segundos, rendimiento), file=sys.stderr)
@@ -138,6 +138,30 @@ def procesar_parametros_curva_eliptica(parametros_curva_eliptica):
     return E, generador, orden
 
 
+def registra_curva(parametros_curva_eliptica):
+    """Añade una curva al listado para poder usarla con
+    :func:`parametros_dominio` (por ejemplo, una curva generada con
+    :func:`.genera_curva_orden_primo`).
+
+        >>> parametros = ParametrosCurvaElipticaSobreFq("Curva de prueba", 97, 2, 3, 3, 6, 5)
+        >>> registra_curva(parametros)
+        >>> E, P, n = parametros_dominio("Curva de prueba")
+        >>> (n * P).es_elemento_neutro()
+        True
+        >>> curvas_eliptipcas_sobre_Fq_famosas.remove(parametros)  # se deja el listado como estaba
+
+    Args:
+        parametros_curva_eliptica (ParametrosCurvaElipticaSobreFq): los
+            parámetros de la curva.
+
+    Raises:
+        ValueError: si ya existe una curva con el mismo nombre.
+    """
+    if any(c.nombre == parametros_curva_eliptica.nombre for c in curvas_eliptipcas_sobre_Fq_famosas):
+        raise ValueError("Ya existe una curva con el nombre {0}.".format(parametros_curva_eliptica.nombre))
+    curvas_eliptipcas_sobre_Fq_famosas.append(parametros_curva_eliptica)
+
+
 def parametros_dominio(nombre):
     """Devuelve los parámetros de dominio de una curva en el listado.:
 
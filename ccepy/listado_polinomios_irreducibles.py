@@ -0,0 +1,422 @@
+"""Listado de polinomios irreducibles.
+
+Este módulo elige el polinomio irreducible con el que :func:`.Fq` construye
+el cuerpo F_{p^n} cuando no se le indica ninguno. La elección es
+determinista: se toma el polinomio que devuelve
+:meth:`.PolinomioZp.genera_irreducible_disperso`, es decir, el de menos
+términos (trinomios y pentanomios para p = 2) y menores exponentes. Así,
+dos procesos distintos construyen el mismo cuerpo y sus elementos son
+compatibles. ::
+
+    from ccepy.listado_polinomios_irreducibles import polinomio_irreducible
+
+Para evitar la búsqueda en cada arranque, el módulo incluye los polinomios
+ya calculados para p = 2 y grado hasta 1024 y para los primos impares
+pequeños con grados moderados:
+
+    >>> polinomio_irreducible(2, 163)
+    X^163 + X^7 + X^6 + X^3 + 1
+    >>> polinomio_irreducible(3, 5)
+    X^5 + 2*X + 1
+
+El resto se calculan la primera vez y se guardan en un fichero de texto
+(una línea ``p n e:c e:c ...`` por polinomio con los exponentes y
+coeficientes de los términos no principales). Al leerlo se comprueba que
+cada polinomio es irreducible y se ignoran las líneas que no lo sean. Por defecto, el fichero está
+en el directorio indicado por la variable de entorno ``CCEPY_CACHE`` o, si
+no existe, en ``~/.cache/ccepy``; si ``CCEPY_CACHE`` está vacía no se usa
+ninguna caché en disco.
+"""
+import functools
+import os
+
+from ccepy.aritmetica_elemental import PolinomioZp, _es_irreducible_coeficientes
+
+
+# Exponentes de los términos intermedios de X^n + X^k + 1 o
+# X^n + X^k3 + X^k2 + X^k1 + 1 para cada grado n.
+_TRINOMIOS_PENTANOMIOS_BINARIOS = {
+    2: (1,), 3: (1,), 4: (1,), 5: (2,), 6: (1,), 7: (1,),
+    8: (4, 3, 1), 9: (1,), 10: (3,), 11: (2,), 12: (3,), 13: (4, 3, 1),
+    14: (5,), 15: (1,), 16: (5, 3, 1), 17: (3,), 18: (3,), 19: (5, 2, 1),
+    20: (3,), 21: (2,), 22: (1,), 23: (5,), 24: (4, 3, 1), 25: (3,),
+    26: (4, 3, 1), 27: (5, 2, 1), 28: (1,), 29: (2,), 30: (1,), 31: (3,),
+    32: (7, 3, 2), 33: (10,), 34: (7,), 35: (2,), 36: (9,), 37: (6, 4, 1),
+    38: (6, 5, 1), 39: (4,), 40: (5, 4, 3), 41: (3,), 42: (7,), 43: (6, 4, 3),
+    44: (5,), 45: (4, 3, 1), 46: (1,), 47: (5,), 48: (5, 3, 2), 49: (9,),
+    50: (4, 3, 2), 51: (6, 3, 1), 52: (3,), 53: (6, 2, 1), 54: (9,), 55: (7,),
+    56: (7, 4, 2), 57: (4,), 58: (19,), 59: (7, 4, 2), 60: (1,), 61: (5, 2, 1),
+    62: (29,), 63: (1,), 64: (4, 3, 1), 65: (18,), 66: (3,), 67: (5, 2, 1),
+    68: (9,), 69: (6, 5, 2), 70: (5, 3, 1), 71: (6,), 72: (10, 9, 3), 73: (25,),
+    74: (35,), 75: (6, 3, 1), 76: (21,), 77: (6, 5, 2), 78: (6, 5, 3), 79: (9,),
+    80: (9, 4, 2), 81: (4,), 82: (8, 3, 1), 83: (7, 4, 2), 84: (5,), 85: (8, 2, 1),
+    86: (21,), 87: (13,), 88: (7, 6, 2), 89: (38,), 90: (27,), 91: (8, 5, 1),
+    92: (21,), 93: (2,), 94: (21,), 95: (11,), 96: (10, 9, 6), 97: (6,),
+    98: (11,), 99: (6, 3, 1), 100: (15,), 101: (7, 6, 1), 102: (29,), 103: (9,),
+    104: (4, 3, 1), 105: (4,), 106: (15,), 107: (9, 7, 4), 108: (17,), 109: (5, 4, 2),
+    110: (33,), 111: (10,), 112: (5, 4, 3), 113: (9,), 114: (5, 3, 2), 115: (8, 7, 5),
+    116: (4, 2, 1), 117: (5, 2, 1), 118: (33,), 119: (8,), 120: (4, 3, 1), 121: (18,),
+    122: (6, 2, 1), 123: (2,), 124: (19,), 125: (7, 6, 5), 126: (21,), 127: (1,),
+    128: (7, 2, 1), 129: (5,), 130: (3,), 131: (8, 3, 2), 132: (17,), 133: (9, 8, 2),
+    134: (57,), 135: (11,), 136: (5, 3, 2), 137: (21,), 138: (8, 7, 1), 139: (8, 5, 3),
+    140: (15,), 141: (10, 4, 1), 142: (21,), 143: (5, 3, 2), 144: (7, 4, 2), 145: (52,),
+    146: (71,), 147: (14,), 148: (27,), 149: (10, 9, 7), 150: (53,), 151: (3,),
+    152: (6, 3, 2), 153: (1,), 154: (15,), 155: (62,), 156: (9,), 157: (6, 5, 2),
+    158: (8, 6, 5), 159: (31,), 160: (5, 3, 2), 161: (18,), 162: (27,), 163: (7, 6, 3),
+    164: (10, 8, 7), 165: (9, 8, 3), 166: (37,), 167: (6,), 168: (15, 3, 2), 169: (34,),
+    170: (11,), 171: (6, 5, 2), 172: (1,), 173: (8, 5, 2), 174: (13,), 175: (6,),
+    176: (11, 3, 2), 177: (8,), 178: (31,), 179: (4, 2, 1), 180: (3,), 181: (7, 6, 1),
+    182: (81,), 183: (56,), 184: (9, 8, 7), 185: (24,), 186: (11,), 187: (7, 6, 5),
+    188: (6, 5, 2), 189: (6, 5, 2), 190: (8, 7, 6), 191: (9,), 192: (7, 2, 1), 193: (15,),
+    194: (87,), 195: (8, 3, 2), 196: (3,), 197: (9, 4, 2), 198: (9,), 199: (34,),
+    200: (5, 3, 2), 201: (14,), 202: (55,), 203: (8, 7, 1), 204: (27,), 205: (9, 5, 2),
+    206: (10, 9, 5), 207: (43,), 208: (9, 3, 1), 209: (6,), 210: (7,), 211: (11, 10, 8),
+    212: (105,), 213: (6, 5, 2), 214: (73,), 215: (23,), 216: (7, 3, 1), 217: (45,),
+    218: (11,), 219: (8, 4, 1), 220: (7,), 221: (8, 6, 2), 222: (5, 4, 2), 223: (33,),
+    224: (9, 8, 3), 225: (32,), 226: (10, 7, 3), 227: (10, 9, 4), 228: (113,), 229: (10, 4, 1),
+    230: (8, 7, 6), 231: (26,), 232: (9, 4, 2), 233: (74,), 234: (31,), 235: (9, 6, 1),
+    236: (5,), 237: (7, 4, 1), 238: (73,), 239: (36,), 240: (8, 5, 3), 241: (70,),
+    242: (95,), 243: (8, 5, 1), 244: (111,), 245: (6, 4, 1), 246: (11, 2, 1), 247: (82,),
+    248: (15, 14, 10), 249: (35,), 250: (103,), 251: (7, 4, 2), 252: (15,), 253: (46,),
+    254: (7, 2, 1), 255: (52,), 256: (10, 5, 2), 257: (12,), 258: (71,), 259: (10, 6, 2),
+    260: (15,), 261: (7, 6, 4), 262: (9, 8, 4), 263: (93,), 264: (9, 6, 2), 265: (42,),
+    266: (47,), 267: (8, 6, 3), 268: (25,), 269: (7, 6, 1), 270: (53,), 271: (58,),
+    272: (9, 3, 2), 273: (23,), 274: (67,), 275: (11, 10, 9), 276: (63,), 277: (12, 6, 3),
+    278: (5,), 279: (5,), 280: (9, 5, 2), 281: (93,), 282: (35,), 283: (12, 7, 5),
+    284: (53,), 285: (10, 7, 5), 286: (69,), 287: (71,), 288: (11, 10, 1), 289: (21,),
+    290: (5, 3, 2), 291: (12, 11, 5), 292: (37,), 293: (11, 6, 1), 294: (33,), 295: (48,),
+    296: (7, 3, 2), 297: (5,), 298: (11, 8, 4), 299: (11, 6, 4), 300: (5,), 301: (9, 5, 2),
+    302: (41,), 303: (1,), 304: (11, 2, 1), 305: (102,), 306: (7, 3, 1), 307: (8, 4, 2),
+    308: (15,), 309: (10, 6, 4), 310: (93,), 311: (7, 5, 3), 312: (9, 7, 4), 313: (79,),
+    314: (15,), 315: (10, 9, 1), 316: (63,), 317: (7, 4, 2), 318: (45,), 319: (36,),
+    320: (4, 3, 1), 321: (31,), 322: (67,), 323: (10, 3, 1), 324: (51,), 325: (10, 5, 2),
+    326: (10, 3, 1), 327: (34,), 328: (8, 3, 1), 329: (50,), 330: (99,), 331: (10, 6, 2),
+    332: (89,), 333: (2,), 334: (5, 2, 1), 335: (10, 7, 2), 336: (7, 4, 1), 337: (55,),
+    338: (4, 3, 1), 339: (16, 10, 7), 340: (45,), 341: (10, 8, 6), 342: (125,), 343: (75,),
+    344: (7, 2, 1), 345: (22,), 346: (63,), 347: (11, 10, 3), 348: (103,), 349: (6, 5, 2),
+    350: (53,), 351: (34,), 352: (13, 11, 6), 353: (69,), 354: (99,), 355: (6, 5, 1),
+    356: (10, 9, 7), 357: (11, 10, 2), 358: (57,), 359: (68,), 360: (5, 3, 2), 361: (7, 4, 1),
+    362: (63,), 363: (8, 5, 3), 364: (9,), 365: (9, 6, 5), 366: (29,), 367: (21,),
+    368: (7, 3, 2), 369: (91,), 370: (139,), 371: (8, 3, 2), 372: (111,), 373: (8, 7, 2),
+    374: (8, 6, 5), 375: (16,), 376: (8, 7, 5), 377: (41,), 378: (43,), 379: (10, 8, 5),
+    380: (47,), 381: (5, 2, 1), 382: (81,), 383: (90,), 384: (12, 3, 2), 385: (6,),
+    386: (83,), 387: (8, 7, 1), 388: (159,), 389: (10, 9, 5), 390: (9,), 391: (28,),
+    392: (13, 10, 6), 393: (7,), 394: (135,), 395: (11, 6, 5), 396: (25,), 397: (12, 7, 6),
+    398: (7, 6, 2), 399: (26,), 400: (5, 3, 2), 401: (152,), 402: (171,), 403: (9, 8, 5),
+    404: (65,), 405: (13, 8, 2), 406: (141,), 407: (71,), 408: (5, 3, 2), 409: (87,),
+    410: (10, 4, 3), 411: (12, 10, 3), 412: (147,), 413: (10, 7, 6), 414: (13,), 415: (102,),
+    416: (9, 5, 2), 417: (107,), 418: (199,), 419: (15, 5, 4), 420: (7,), 421: (5, 4, 2),
+    422: (149,), 423: (25,), 424: (9, 7, 2), 425: (12,), 426: (63,), 427: (11, 6, 5),
+    428: (105,), 429: (10, 8, 7), 430: (14, 6, 1), 431: (120,), 432: (13, 4, 3), 433: (33,),
+    434: (12, 11, 5), 435: (12, 9, 5), 436: (165,), 437: (6, 2, 1), 438: (65,), 439: (49,),
+    440: (4, 3, 1), 441: (7,), 442: (7, 5, 2), 443: (10, 6, 1), 444: (81,), 445: (7, 6, 4),
+    446: (105,), 447: (73,), 448: (11, 6, 4), 449: (134,), 450: (47,), 451: (16, 10, 1),
+    452: (6, 5, 4), 453: (15, 6, 4), 454: (8, 6, 1), 455: (38,), 456: (18, 9, 6), 457: (16,),
+    458: (203,), 459: (12, 5, 2), 460: (19,), 461: (7, 6, 1), 462: (73,), 463: (93,),
+    464: (19, 18, 13), 465: (31,), 466: (14, 11, 6), 467: (11, 6, 1), 468: (27,), 469: (9, 5, 2),
+    470: (9,), 471: (1,), 472: (11, 3, 2), 473: (200,), 474: (191,), 475: (9, 8, 4),
+    476: (9,), 477: (16, 15, 7), 478: (121,), 479: (104,), 480: (15, 9, 6), 481: (138,),
+    482: (9, 6, 5), 483: (9, 6, 4), 484: (105,), 485: (17, 16, 6), 486: (81,), 487: (94,),
+    488: (4, 3, 1), 489: (83,), 490: (219,), 491: (11, 6, 3), 492: (7,), 493: (10, 5, 3),
+    494: (17,), 495: (76,), 496: (16, 5, 2), 497: (78,), 498: (155,), 499: (11, 6, 5),
+    500: (27,), 501: (5, 4, 2), 502: (8, 5, 4), 503: (3,), 504: (15, 14, 6), 505: (156,),
+    506: (23,), 507: (13, 6, 3), 508: (9,), 509: (8, 7, 3), 510: (69,), 511: (10,),
+    512: (8, 5, 2), 513: (26,), 514: (67,), 515: (14, 7, 4), 516: (21,), 517: (12, 10, 2),
+    518: (33,), 519: (79,), 520: (15, 11, 2), 521: (32,), 522: (39,), 523: (13, 6, 2),
+    524: (167,), 525: (6, 4, 1), 526: (97,), 527: (47,), 528: (11, 6, 2), 529: (42,),
+    530: (10, 7, 3), 531: (10, 5, 4), 532: (1,), 533: (4, 3, 2), 534: (161,), 535: (8, 6, 2),
+    536: (7, 5, 3), 537: (94,), 538: (195,), 539: (10, 5, 4), 540: (9,), 541: (13, 10, 4),
+    542: (8, 6, 1), 543: (16,), 544: (8, 3, 1), 545: (122,), 546: (8, 2, 1), 547: (13, 7, 4),
+    548: (10, 5, 3), 549: (16, 4, 3), 550: (193,), 551: (135,), 552: (19, 16, 9), 553: (39,),
+    554: (10, 8, 7), 555: (10, 9, 4), 556: (153,), 557: (7, 6, 5), 558: (73,), 559: (34,),
+    560: (11, 9, 6), 561: (71,), 562: (11, 4, 2), 563: (14, 7, 3), 564: (163,), 565: (11, 6, 1),
+    566: (153,), 567: (28,), 568: (15, 7, 6), 569: (77,), 570: (67,), 571: (10, 5, 2),
+    572: (12, 8, 1), 573: (10, 6, 4), 574: (13,), 575: (146,), 576: (13, 4, 3), 577: (25,),
+    578: (23, 22, 16), 579: (12, 9, 7), 580: (237,), 581: (13, 7, 6), 582: (85,), 583: (130,),
+    584: (14, 13, 3), 585: (88,), 586: (7, 5, 2), 587: (11, 6, 1), 588: (35,), 589: (10, 4, 3),
+    590: (93,), 591: (9, 6, 4), 592: (13, 6, 3), 593: (86,), 594: (19,), 595: (9, 2, 1),
+    596: (273,), 597: (14, 12, 9), 598: (7, 6, 1), 599: (30,), 600: (9, 5, 2), 601: (201,),
+    602: (215,), 603: (6, 4, 3), 604: (105,), 605: (10, 7, 5), 606: (165,), 607: (105,),
+    608: (19, 13, 6), 609: (31,), 610: (127,), 611: (10, 4, 2), 612: (81,), 613: (19, 10, 4),
+    614: (45,), 615: (211,), 616: (19, 10, 3), 617: (200,), 618: (295,), 619: (9, 8, 5),
+    620: (9,), 621: (12, 6, 5), 622: (297,), 623: (68,), 624: (11, 6, 5), 625: (133,),
+    626: (251,), 627: (13, 8, 4), 628: (223,), 629: (6, 5, 2), 630: (7, 4, 2), 631: (307,),
+    632: (9, 2, 1), 633: (101,), 634: (39,), 635: (14, 10, 4), 636: (217,), 637: (14, 9, 1),
+    638: (6, 5, 1), 639: (16,), 640: (14, 3, 2), 641: (11,), 642: (119,), 643: (11, 3, 2),
+    644: (11, 6, 5), 645: (11, 8, 4), 646: (249,), 647: (5,), 648: (13, 3, 1), 649: (37,),
+    650: (3,), 651: (14,), 652: (93,), 653: (10, 8, 7), 654: (33,), 655: (88,),
+    656: (7, 5, 4), 657: (38,), 658: (55,), 659: (15, 4, 2), 660: (11,), 661: (12, 11, 4),
+    662: (21,), 663: (107,), 664: (11, 9, 8), 665: (33,), 666: (10, 7, 2), 667: (18, 7, 3),
+    668: (147,), 669: (5, 4, 2), 670: (153,), 671: (15,), 672: (11, 6, 5), 673: (28,),
+    674: (11, 7, 4), 675: (6, 3, 1), 676: (31,), 677: (8, 4, 3), 678: (15, 5, 3), 679: (66,),
+    680: (23, 16, 9), 681: (11, 9, 3), 682: (171,), 683: (11, 6, 1), 684: (209,), 685: (4, 3, 1),
+    686: (197,), 687: (13,), 688: (19, 14, 6), 689: (14,), 690: (79,), 691: (13, 6, 2),
+    692: (299,), 693: (15, 8, 2), 694: (169,), 695: (177,), 696: (23, 10, 2), 697: (267,),
+    698: (215,), 699: (15, 10, 1), 700: (75,), 701: (16, 4, 2), 702: (37,), 703: (12, 7, 1),
+    704: (8, 3, 2), 705: (17,), 706: (12, 11, 8), 707: (15, 8, 5), 708: (15,), 709: (4, 3, 1),
+    710: (13, 12, 4), 711: (92,), 712: (5, 4, 3), 713: (41,), 714: (23,), 715: (7, 4, 1),
+    716: (183,), 717: (16, 7, 1), 718: (165,), 719: (150,), 720: (9, 6, 4), 721: (9,),
+    722: (231,), 723: (16, 10, 4), 724: (207,), 725: (9, 6, 5), 726: (5,), 727: (180,),
+    728: (4, 3, 2), 729: (58,), 730: (147,), 731: (8, 6, 2), 732: (343,), 733: (8, 7, 2),
+    734: (11, 6, 1), 735: (44,), 736: (13, 8, 6), 737: (5,), 738: (347,), 739: (18, 16, 8),
+    740: (135,), 741: (9, 8, 3), 742: (85,), 743: (90,), 744: (13, 11, 1), 745: (258,),
+    746: (351,), 747: (10, 6, 4), 748: (19,), 749: (7, 6, 1), 750: (309,), 751: (18,),
+    752: (13, 10, 3), 753: (158,), 754: (19,), 755: (12, 10, 1), 756: (45,), 757: (7, 6, 1),
+    758: (233,), 759: (98,), 760: (11, 6, 5), 761: (3,), 762: (83,), 763: (16, 14, 9),
+    764: (6, 5, 3), 765: (9, 7, 4), 766: (22, 19, 9), 767: (168,), 768: (19, 17, 4), 769: (120,),
+    770: (14, 5, 2), 771: (17, 15, 6), 772: (7,), 773: (10, 8, 6), 774: (185,), 775: (93,),
+    776: (15, 14, 7), 777: (29,), 778: (375,), 779: (10, 8, 3), 780: (13,), 781: (17, 16, 2),
+    782: (329,), 783: (68,), 784: (13, 9, 6), 785: (92,), 786: (12, 10, 3), 787: (7, 6, 3),
+    788: (17, 10, 3), 789: (5, 2, 1), 790: (9, 6, 1), 791: (30,), 792: (9, 7, 3), 793: (253,),
+    794: (143,), 795: (7, 4, 1), 796: (9, 4, 1), 797: (12, 10, 4), 798: (53,), 799: (25,),
+    800: (9, 7, 1), 801: (217,), 802: (15, 13, 9), 803: (14, 9, 2), 804: (75,), 805: (8, 7, 2),
+    806: (21,), 807: (7,), 808: (14, 3, 2), 809: (15,), 810: (159,), 811: (12, 10, 8),
+    812: (29,), 813: (10, 3, 1), 814: (21,), 815: (333,), 816: (11, 8, 2), 817: (52,),
+    818: (119,), 819: (16, 9, 7), 820: (123,), 821: (15, 11, 2), 822: (17,), 823: (9,),
+    824: (11, 6, 4), 825: (38,), 826: (255,), 827: (12, 10, 7), 828: (189,), 829: (4, 3, 1),
+    830: (17, 10, 7), 831: (49,), 832: (13, 5, 2), 833: (149,), 834: (15,), 835: (14, 7, 5),
+    836: (10, 9, 2), 837: (8, 6, 5), 838: (61,), 839: (54,), 840: (11, 5, 1), 841: (144,),
+    842: (47,), 843: (11, 10, 7), 844: (105,), 845: (2,), 846: (105,), 847: (136,),
+    848: (11, 4, 1), 849: (253,), 850: (111,), 851: (13, 10, 5), 852: (159,), 853: (10, 7, 1),
+    854: (7, 5, 3), 855: (29,), 856: (19, 10, 3), 857: (119,), 858: (207,), 859: (17, 15, 4),
+    860: (35,), 861: (14,), 862: (349,), 863: (6, 3, 2), 864: (21, 10, 6), 865: (1,),
+    866: (75,), 867: (9, 5, 2), 868: (145,), 869: (11, 7, 6), 870: (301,), 871: (378,),
+    872: (13, 3, 1), 873: (352,), 874: (12, 7, 4), 875: (12, 8, 1), 876: (149,), 877: (6, 5, 4),
+    878: (12, 9, 8), 879: (11,), 880: (15, 7, 5), 881: (78,), 882: (99,), 883: (17, 16, 12),
+    884: (173,), 885: (8, 7, 1), 886: (13, 9, 8), 887: (147,), 888: (19, 18, 10), 889: (127,),
+    890: (183,), 891: (12, 4, 1), 892: (31,), 893: (11, 8, 6), 894: (173,), 895: (12,),
+    896: (7, 5, 3), 897: (113,), 898: (207,), 899: (18, 15, 5), 900: (1,), 901: (13, 7, 6),
+    902: (21,), 903: (35,), 904: (12, 7, 2), 905: (117,), 906: (123,), 907: (12, 10, 2),
+    908: (143,), 909: (14, 4, 1), 910: (15, 9, 7), 911: (204,), 912: (7, 5, 1), 913: (91,),
+    914: (4, 2, 1), 915: (8, 6, 3), 916: (183,), 917: (12, 10, 7), 918: (77,), 919: (36,),
+    920: (14, 9, 6), 921: (221,), 922: (7, 6, 5), 923: (16, 14, 13), 924: (31,), 925: (16, 15, 7),
+    926: (365,), 927: (403,), 928: (10, 3, 2), 929: (11, 4, 3), 930: (31,), 931: (10, 9, 4),
+    932: (177,), 933: (16, 6, 1), 934: (22, 6, 5), 935: (417,), 936: (15, 13, 12), 937: (217,),
+    938: (207,), 939: (7, 5, 4), 940: (10, 7, 1), 941: (11, 6, 1), 942: (45,), 943: (24,),
+    944: (12, 11, 9), 945: (77,), 946: (21, 20, 13), 947: (9, 6, 5), 948: (189,), 949: (8, 3, 2),
+    950: (13, 12, 10), 951: (260,), 952: (16, 9, 7), 953: (168,), 954: (131,), 955: (7, 6, 3),
+    956: (305,), 957: (10, 9, 6), 958: (13, 9, 4), 959: (143,), 960: (12, 9, 3), 961: (18,),
+    962: (15, 8, 5), 963: (20, 9, 6), 964: (103,), 965: (15, 4, 2), 966: (201,), 967: (36,),
+    968: (9, 5, 2), 969: (31,), 970: (11, 7, 2), 971: (6, 2, 1), 972: (7,), 973: (13, 6, 4),
+    974: (9, 8, 7), 975: (19,), 976: (17, 10, 6), 977: (15,), 978: (9, 3, 1), 979: (178,),
+    980: (8, 7, 6), 981: (12, 6, 5), 982: (177,), 983: (230,), 984: (24, 9, 3), 985: (222,),
+    986: (3,), 987: (16, 13, 12), 988: (121,), 989: (10, 4, 2), 990: (161,), 991: (39,),
+    992: (17, 15, 13), 993: (62,), 994: (223,), 995: (15, 12, 2), 996: (65,), 997: (12, 6, 3),
+    998: (101,), 999: (59,), 1000: (5, 4, 3), 1001: (17,), 1002: (5, 3, 2), 1003: (13, 8, 3),
+    1004: (10, 9, 7), 1005: (12, 8, 2), 1006: (5, 4, 3), 1007: (75,), 1008: (19, 17, 8), 1009: (55,),
+    1010: (99,), 1011: (10, 7, 4), 1012: (115,), 1013: (9, 8, 6), 1014: (385,), 1015: (186,),
+    1016: (15, 6, 3), 1017: (9, 4, 1), 1018: (12, 10, 5), 1019: (10, 8, 1), 1020: (135,), 1021: (5, 2, 1),
+    1022: (317,), 1023: (7,), 1024: (19, 6, 1),
+}
+
+# Pares (exponente, coeficiente) de los términos no principales para
+# algunos primos impares pequeños.
+_IRREDUCIBLES_IMPARES = {
+    (3, 2): ((0, 1),), (3, 3): ((1, 2), (0, 1)), (3, 4): ((1, 1), (0, 2)),
+    (3, 5): ((1, 2), (0, 1)), (3, 6): ((1, 1), (0, 2)), (3, 7): ((2, 2), (0, 1)),
+    (3, 8): ((2, 1), (0, 2)), (3, 9): ((4, 2), (0, 1)), (3, 10): ((2, 2), (0, 1)),
+    (3, 11): ((2, 2), (0, 1)), (3, 12): ((2, 1), (0, 2)), (3, 13): ((1, 2), (0, 1)),
+    (3, 14): ((1, 1), (0, 2)), (3, 15): ((2, 2), (0, 1)), (3, 16): ((4, 1), (0, 2)),
+    (3, 17): ((1, 2), (0, 1)), (3, 18): ((7, 1), (0, 2)), (3, 19): ((2, 2), (0, 1)),
+    (3, 20): ((5, 1), (0, 2)), (3, 21): ((5, 2), (0, 1)), (3, 22): ((4, 2), (0, 1)),
+    (3, 23): ((3, 2), (0, 1)), (3, 24): ((4, 1), (0, 2)), (3, 25): ((3, 2), (0, 1)),
+    (3, 26): ((2, 2), (0, 1)), (3, 27): ((7, 2), (0, 1)), (3, 28): ((2, 1), (0, 2)),
+    (3, 29): ((4, 2), (0, 1)), (3, 30): ((1, 1), (0, 2)), (3, 31): ((5, 2), (0, 1)),
+    (3, 32): ((5, 1), (0, 2)), (3, 33): ((5, 2), (0, 1)), (3, 34): ((2, 2), (0, 1)),
+    (3, 35): ((2, 2), (0, 1)), (3, 36): ((14, 1), (0, 2)), (3, 37): ((6, 2), (0, 1)),
+    (3, 38): ((4, 2), (0, 1)), (3, 39): ((7, 2), (0, 1)), (3, 40): ((1, 1), (0, 2)),
+    (3, 41): ((1, 2), (0, 1)), (3, 42): ((7, 1), (0, 2)), (3, 43): ((17, 2), (0, 1)),
+    (3, 44): ((3, 1), (0, 2)), (3, 45): ((17, 2), (0, 1)), (3, 46): ((5, 1), (0, 2)),
+    (3, 47): ((15, 2), (0, 1)), (3, 48): ((8, 1), (0, 2)), (3, 49): ((3, 2), (2, 1), (0, 1)),
+    (3, 50): ((6, 2), (0, 1)), (3, 51): ((1, 2), (0, 1)), (3, 52): ((7, 1), (0, 2)),
+    (3, 53): ((13, 2), (0, 1)), (3, 54): ((1, 1), (0, 2)), (3, 55): ((11, 2), (0, 1)),
+    (3, 56): ((3, 1), (0, 2)), (3, 57): ((7, 1), (2, 2), (0, 1)), (3, 58): ((8, 2), (0, 1)),
+    (3, 59): ((17, 2), (0, 1)), (3, 60): ((2, 1), (0, 2)), (3, 61): ((7, 2), (0, 1)),
+    (3, 62): ((10, 2), (0, 1)), (3, 63): ((26, 2), (0, 1)), (3, 64): ((3, 1), (0, 2)),
+    (3, 65): ((5, 1), (3, 1), (0, 1)), (3, 66): ((10, 2), (0, 1)), (3, 67): ((2, 2), (0, 1)),
+    (3, 68): ((3, 1), (2, 1), (0, 1)), (3, 69): ((17, 2), (0, 1)), (3, 70): ((4, 2), (0, 1)),
+    (3, 71): ((20, 2), (0, 1)), (3, 72): ((28, 1), (0, 2)), (3, 73): ((1, 2), (0, 1)),
+    (3, 74): ((12, 2), (0, 1)), (3, 75): ((5, 2), (4, 1), (0, 1)), (3, 76): ((9, 1), (0, 2)),
+    (3, 77): ((16, 2), (0, 1)), (3, 78): ((13, 1), (0, 2)), (3, 79): ((26, 2), (0, 1)),
+    (3, 80): ((2, 1), (0, 2)), (3, 81): ((40, 2), (0, 1)), (3, 82): ((2, 2), (0, 1)),
+    (3, 83): ((27, 2), (0, 1)), (3, 84): ((14, 1), (0, 2)), (3, 85): ((16, 2), (0, 1)),
+    (3, 86): ((13, 1), (0, 2)), (3, 87): ((26, 2), (0, 1)), (3, 88): ((6, 1), (0, 2)),
+    (3, 89): ((13, 2), (0, 1)), (3, 90): ((19, 1), (0, 2)), (3, 91): ((17, 2), (0, 1)),
+    (3, 92): ((10, 1), (0, 2)), (3, 93): ((23, 2), (0, 1)), (3, 94): ((30, 2), (0, 1)),
+    (3, 95): ((47, 2), (0, 1)), (3, 96): ((16, 1), (0, 2)), (3, 97): ((12, 2), (0, 1)),
+    (3, 98): ((4, 1), (3, 1), (0, 1)), (3, 99): ((19, 2), (0, 1)), (3, 100): ((25, 1), (0, 2)),
+    (3, 101): ((31, 2), (0, 1)), (3, 102): ((2, 2), (0, 1)), (3, 103): ((47, 2), (0, 1)),
+    (3, 104): ((5, 1), (0, 2)), (3, 105): ((6, 1), (2, 1), (0, 1)), (3, 106): ((26, 2), (0, 1)),
+    (3, 107): ((3, 2), (0, 1)), (3, 108): ((2, 1), (0, 2)), (3, 109): ((9, 2), (0, 1)),
+    (3, 110): ((22, 2), (0, 1)), (3, 111): ((2, 2), (0, 1)), (3, 112): ((6, 1), (0, 2)),
+    (3, 113): ((19, 2), (0, 1)), (3, 114): ((7, 1), (0, 2)), (3, 115): ((32, 2), (0, 1)),
+    (3, 116): ((15, 1), (0, 2)), (3, 117): ((52, 2), (0, 1)), (3, 118): ((34, 2), (0, 1)),
+    (3, 119): ((2, 2), (0, 1)), (3, 120): ((4, 1), (0, 2)), (3, 121): ((1, 2), (0, 1)),
+    (3, 122): ((14, 2), (0, 1)), (3, 123): ((7, 1), (4, 2), (0, 1)), (3, 124): ((25, 1), (0, 2)),
+    (3, 125): ((52, 2), (0, 1)), (3, 126): ((49, 1), (0, 2)), (3, 127): ((8, 2), (0, 1)),
+    (3, 128): ((6, 1), (0, 2)),
+    (5, 2): ((0, 2),), (5, 3): ((1, 1), (0, 1)), (5, 4): ((0, 2),),
+    (5, 5): ((1, 4), (0, 1)), (5, 6): ((1, 1), (0, 2)), (5, 7): ((1, 1), (0, 1)),
+    (5, 8): ((0, 2),), (5, 9): ((4, 4), (0, 1)), (5, 10): ((2, 4), (0, 2)),
+    (5, 11): ((1, 2), (0, 1)), (5, 12): ((1, 1), (0, 4)), (5, 13): ((6, 1), (0, 1)),
+    (5, 14): ((2, 3), (0, 2)), (5, 15): ((2, 2), (0, 1)), (5, 16): ((0, 2),),
+    (5, 17): ((3, 1), (0, 1)), (5, 18): ((1, 1), (0, 1)), (5, 19): ((9, 1), (0, 1)),
+    (5, 20): ((4, 4), (0, 2)), (5, 21): ((1, 4), (0, 1)), (5, 22): ((1, 1), (0, 1)),
+    (5, 23): ((2, 1), (0, 1)), (5, 24): ((4, 1), (0, 2)), (5, 25): ((7, 2), (0, 1)),
+    (5, 26): ((12, 3), (0, 2)), (5, 27): ((1, 1), (0, 1)), (5, 28): ((4, 3), (0, 2)),
+    (5, 29): ((6, 1), (0, 1)), (5, 30): ((4, 1), (0, 2)), (5, 31): ((1, 1), (0, 1)),
+    (5, 32): ((0, 2),), (5, 33): ((14, 2), (0, 1)), (5, 34): ((6, 3), (0, 2)),
+    (5, 35): ((4, 1), (1, 4), (0, 1)), (5, 36): ((6, 1), (0, 2)), (5, 37): ((13, 4), (0, 1)),
+    (5, 38): ((9, 1), (0, 1)), (5, 39): ((7, 4), (0, 1)), (5, 40): ((8, 4), (0, 2)),
+    (5, 41): ((3, 1), (0, 1)), (5, 42): ((2, 4), (0, 2)), (5, 43): ((1, 2), (0, 1)),
+    (5, 44): ((4, 3), (0, 2)), (5, 45): ((1, 4), (0, 1)), (5, 46): ((4, 3), (0, 2)),
+    (5, 47): ((8, 4), (0, 1)), (5, 48): ((8, 1), (0, 2)), (5, 49): ((9, 4), (0, 1)),
+    (5, 50): ((14, 3), (0, 2)), (5, 51): ((10, 1), (0, 1)), (5, 52): ((11, 1), (0, 4)),
+    (5, 53): ((6, 2), (0, 1)), (5, 54): ((2, 4), (0, 2)), (5, 55): ((4, 4), (0, 1)),
+    (5, 56): ((8, 3), (0, 2)), (5, 57): ((1, 4), (0, 1)), (5, 58): ((12, 3), (0, 2)),
+    (5, 59): ((7, 4), (0, 1)), (5, 60): ((8, 1), (0, 2)), (5, 61): ((6, 2), (0, 1)),
+    (5, 62): ((2, 3), (0, 2)), (5, 63): ((2, 2), (0, 1)), (5, 64): ((0, 2),),
+    (7, 2): ((0, 1),), (7, 3): ((0, 2),), (7, 4): ((1, 1), (0, 1)),
+    (7, 5): ((1, 3), (0, 1)), (7, 6): ((0, 2),), (7, 7): ((1, 6), (0, 1)),
+    (7, 8): ((1, 1), (0, 3)), (7, 9): ((0, 2),), (7, 10): ((1, 2), (0, 3)),
+    (7, 11): ((1, 4), (0, 1)), (7, 12): ((3, 1), (0, 2)), (7, 13): ((2, 3), (0, 1)),
+    (7, 14): ((1, 3), (0, 1)), (7, 15): ((3, 2), (0, 2)), (7, 16): ((1, 2), (0, 3)),
+    (7, 17): ((1, 4), (0, 1)), (7, 18): ((0, 2),), (7, 19): ((2, 6), (0, 1)),
+    (7, 20): ((2, 2), (0, 3)), (7, 21): ((3, 6), (0, 2)), (7, 22): ((2, 4), (0, 1)),
+    (7, 23): ((4, 3), (0, 1)), (7, 24): ((3, 1), (0, 3)), (7, 25): ((4, 1), (0, 1)),
+    (7, 26): ((4, 3), (0, 1)), (7, 27): ((0, 2),), (7, 28): ((10, 2), (0, 3)),
+    (7, 29): ((1, 3), (0, 1)), (7, 30): ((3, 2), (0, 3)), (7, 31): ((2, 6), (0, 1)),
+    (7, 32): ((1, 3), (0, 1)), (7, 33): ((1, 1), (0, 1)), (7, 34): ((1, 2), (0, 3)),
+    (7, 35): ((4, 4), (0, 1)), (7, 36): ((9, 1), (0, 2)), (7, 37): ((1, 6), (0, 1)),
+    (7, 38): ((4, 6), (0, 1)), (7, 39): ((2, 1), (0, 3)), (7, 40): ((1, 2), (0, 3)),
+    (7, 41): ((4, 4), (0, 1)), (7, 42): ((1, 1), (0, 6)), (7, 43): ((4, 1), (0, 1)),
+    (7, 44): ((3, 1), (0, 1)), (7, 45): ((9, 2), (0, 2)), (7, 46): ((8, 3), (0, 1)),
+    (7, 47): ((7, 4), (0, 1)), (7, 48): ((3, 2), (0, 3)), (7, 49): ((3, 3), (0, 1)),
+    (7, 50): ((8, 1), (0, 1)), (7, 51): ((3, 2), (0, 2)), (7, 52): ((1, 1), (0, 1)),
+    (7, 53): ((1, 3), (0, 1)), (7, 54): ((0, 2),), (7, 55): ((9, 1), (0, 1)),
+    (7, 56): ((20, 2), (0, 3)), (7, 57): ((1, 3), (0, 2)), (7, 58): ((2, 3), (0, 1)),
+    (7, 59): ((4, 3), (0, 1)), (7, 60): ((6, 2), (0, 3)), (7, 61): ((4, 1), (0, 1)),
+    (7, 62): ((4, 6), (0, 1)), (7, 63): ((9, 6), (0, 2)), (7, 64): ((1, 2), (0, 3)),
+    (11, 2): ((0, 1),), (11, 3): ((1, 4), (0, 1)), (11, 4): ((1, 4), (0, 1)),
+    (11, 5): ((0, 2),), (11, 6): ((1, 1), (0, 2)), (11, 7): ((1, 3), (0, 1)),
+    (11, 8): ((1, 4), (0, 1)), (11, 9): ((1, 4), (0, 1)), (11, 10): ((0, 3),),
+    (11, 11): ((1, 10), (0, 1)), (11, 12): ((1, 4), (0, 2)), (11, 13): ((1, 8), (0, 1)),
+    (11, 14): ((2, 3), (0, 1)), (11, 15): ((1, 2), (0, 1)), (11, 16): ((4, 1), (0, 2)),
+    (11, 17): ((1, 5), (0, 1)), (11, 18): ((1, 4), (0, 1)), (11, 19): ((5, 4), (0, 1)),
+    (11, 20): ((5, 1), (0, 2)), (11, 21): ((2, 1), (0, 1)), (11, 22): ((1, 5), (0, 1)),
+    (11, 23): ((5, 2), (0, 1)), (11, 24): ((1, 1), (0, 2)), (11, 25): ((0, 2),),
+    (11, 26): ((1, 3), (0, 1)), (11, 27): ((2, 10), (0, 1)), (11, 28): ((1, 4), (0, 1)),
+    (11, 29): ((1, 6), (0, 1)), (11, 30): ((2, 2), (0, 1)), (11, 31): ((3, 5), (0, 1)),
+    (11, 32): ((3, 4), (0, 1)),
+    (13, 2): ((0, 2),), (13, 3): ((0, 2),), (13, 4): ((0, 2),),
+    (13, 5): ((1, 8), (0, 1)), (13, 6): ((0, 2),), (13, 7): ((1, 10), (0, 1)),
+    (13, 8): ((0, 2),), (13, 9): ((0, 2),), (13, 10): ((2, 4), (0, 2)),
+    (13, 11): ((1, 4), (0, 1)), (13, 12): ((0, 2),), (13, 13): ((1, 12), (0, 1)),
+    (13, 14): ((1, 1), (0, 2)), (13, 15): ((1, 4), (0, 4)), (13, 16): ((0, 2),),
+    (13, 17): ((3, 10), (0, 1)), (13, 18): ((0, 2),), (13, 19): ((1, 4), (0, 1)),
+    (13, 20): ((4, 4), (0, 2)), (13, 21): ((2, 2), (0, 4)), (13, 22): ((2, 3), (0, 2)),
+    (13, 23): ((1, 4), (0, 1)), (13, 24): ((0, 2),), (13, 25): ((8, 8), (0, 1)),
+    (13, 26): ((2, 12), (0, 2)), (13, 27): ((0, 2),), (13, 28): ((2, 1), (0, 2)),
+    (13, 29): ((2, 7), (0, 1)), (13, 30): ((1, 2), (0, 3)), (13, 31): ((2, 5), (0, 1)),
+    (13, 32): ((0, 2),),
+}
+
+_NOMBRE_FICHERO_CACHE = "polinomios_irreducibles.txt"
+
+
+def _ruta_cache_por_defecto():
+    directorio = os.environ.get("CCEPY_CACHE")
+    if directorio is None:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        directorio = os.path.join(base, "ccepy")
+    elif not directorio:
+        return None
+    return os.path.join(directorio, _NOMBRE_FICHERO_CACHE)
+
+
+def _polinomio_tabla(p, n):
+    if p == 2 and n in _TRINOMIOS_PENTANOMIOS_BINARIOS:
+        terminos = [(e, 1) for e in _TRINOMIOS_PENTANOMIOS_BINARIOS[n]] + [(0, 1)]
+    elif (p, n) in _IRREDUCIBLES_IMPARES:
+        terminos = _IRREDUCIBLES_IMPARES[(p, n)]
+    else:
+        return None
+    return _construye(p, n, terminos)
+
+
+def _construye(p, n, terminos):
+    coeficientes = [0] * n + [1]
+    for e, c in terminos:
+        coeficientes[e] = c
+    return PolinomioZp(coeficientes, p)
+
+
+def _lee_cache(ruta, p, n):
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            for linea in f:
+                campos = linea.split()
+                if len(campos) < 3 or campos[:2] != [str(p), str(n)]:
+                    continue
+                terminos = [tuple(int(x) for x in campo.split(":")) for campo in campos[2:]]
+                if all(0 <= e < n and 0 < c < p for e, c in terminos) and terminos[-1][0] == 0:
+                    f = _construye(p, n, terminos)
+                    # se ignoran las líneas con polinomios reducibles (el
+                    # fichero puede estar corrupto o haberse editado a mano)
+                    if _es_irreducible_coeficientes([int(c) for c in f.coeficientes], p):
+                        return f
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _escribe_cache(ruta, p, n, f):
+    terminos = " ".join("{0}:{1}".format(e, int(c))
+                        for e, c in reversed(list(enumerate(f.coeficientes))) if c and e < n)
+    try:
+        os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+        with open(ruta, 'a', encoding='utf-8') as fichero:
+            fichero.write("{0} {1} {2}\n".format(p, n, terminos))
+    except OSError:
+        pass  # la caché es opcional
+
+
+@functools.lru_cache()
+def _polinomio_irreducible(p, n, ruta_cache, procesos):
+    f = _polinomio_tabla(p, n)
+    if f is None and ruta_cache is not None:
+        f = _lee_cache(ruta_cache, p, n)
+    if f is None:
+        f = PolinomioZp.genera_irreducible_disperso(n, p, procesos)
+        if ruta_cache is not None:
+            _escribe_cache(ruta_cache, p, n, f)
+    return f
+
+
+def polinomio_irreducible(p, n, ruta_cache=None, procesos=1):
+    """Devuelve el polinomio irreducible de grado n sobre Z_p que se usa
+    para construir F_{p^n}.
+
+        >>> polinomio_irreducible(2, 4)
+        X^4 + X + 1
+        >>> polinomio_irreducible(7, 6)
+        X^6 + 2
+
+    El polinomio se busca primero en las tablas del módulo, después en la
+    caché en disco y, si no está en ninguna, se calcula y se añade a la
+    caché.
+
+    Args:
+        p (int): un número primo.
+        n (int): el grado del polinomio.
+        ruta_cache (Optional[str]): la ruta del fichero de caché. Por
+            defecto, la indicada en la documentación del módulo.
+        procesos (Optional[int]): el número de procesos entre los que se
+            reparte la búsqueda (el resultado no depende de él).
+
+    Returns:
+        PolinomioZp: el polinomio irreducible mónico.
+    """
+    if ruta_cache is None:
+        ruta_cache = _ruta_cache_por_defecto()
+    return _polinomio_irreducible(p, n, ruta_cache, procesos)
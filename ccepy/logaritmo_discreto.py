@@ -0,0 +1,717 @@
+"""Logaritmos discretos en curvas elípticas.
+
+Este módulo permite calcular logaritmos discretos: dados dos puntos P y Q
+de una curva elíptica sobre un cuerpo finito, encontrar el entero k tal que
+Q = k P. Sirve para comprobar que los parámetros de una curva no son
+débiles y para auditar curvas de tamaño reducido.
+
+Para utilizar las funciones y las clases de este módulo, debe importarlo
+previamente: ::
+
+    # reemplace ... por la función/clase que desea utilizar
+    from ccepy.logaritmo_discreto import ...
+
+Para calcular un logaritmo discreto en un subgrupo de orden primo, use la
+función :func:`rho_pollard`:
+
+    >>> from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+    >>> E = curva_eliptica_sobre_Fq(1, 28, 10007)
+    >>> P = E(4384, 7691)
+    >>> rho_pollard(P, 5678 * P, orden=9851)
+    5678
+
+El método rho de Pollard realiza unas 0.89 sqrt(n) sumas de puntos, donde n
+es el orden del subgrupo, y la memoria que necesita no depende de n. Los
+caminos aleatorios se reparten entre varios procesos (parámetro
+``procesos``) y el tiempo de cálculo disminuye de forma casi lineal con el
+número de procesos.
+
+Si el orden del subgrupo es compuesto, use :func:`pohlig_hellman`, que
+también calcula logaritmos discretos en el grupo multiplicativo de un
+cuerpo finito:
+
+    >>> from ccepy.aritmetica_elemental import Zp
+    >>> Z1009 = Zp(1009)
+    >>> pohlig_hellman(Z1009(11), Z1009(11) ** 500)
+    500
+
+El coste de :func:`pohlig_hellman` lo determina el mayor factor primo l del
+orden: del orden de sqrt(l) operaciones en el grupo.
+
+Si se sabe que el logaritmo está en un intervalo [a, b] (por ejemplo, al
+descifrar mensajes pequeños con ElGamal), :func:`canguro` lo calcula con
+unas 2 sqrt(b - a) sumas de puntos, independientemente del orden de P.
+"""
+import collections
+import math
+import multiprocessing
+import random
+import time
+
+from ccepy.aritmetica_elemental import factoriza, inverso_modular, teorema_chino_resto, _raiz_entera
+from ccepy.curvas_elipticas import PuntoRacional, suma_multiescalar, _a_tipos_basicos
+from ccepy.conteo_puntos import orden_curva
+
+
+Progreso = collections.namedtuple('Progreso', ['pasos', 'pasos_esperados', 'puntos_distinguidos',
+                                               'segundos', 'segundos_restantes'])
+Progreso.__doc__ = """Estado de un cálculo de logaritmos discretos.
+
+Se pasa a la función ``informa`` de :func:`rho_pollard` tras cada ronda.
+
+Attributes:
+    pasos (int): el número de sumas de puntos realizadas.
+    pasos_esperados (int): el número esperado de sumas de puntos.
+    puntos_distinguidos (int): el número de puntos distinguidos guardados.
+    segundos (float): el tiempo transcurrido.
+    segundos_restantes (float): una estimación del tiempo restante según
+        el rendimiento medido (0 si ya se han superado los pasos esperados).
+"""
+
+
+# Número de particiones de los caminos aleatorios
+_BITS_PARTICION = 5
+_PARTICIONES = 1 << _BITS_PARTICION
+
+# Constante multiplicativa (2^64 / razón áurea) para mezclar los bits
+_MEZCLA = 0x9E3779B97F4A7C15
+_MASCARA_64 = 2 ** 64 - 1
+
+
+def _huella(R):
+    """Devuelve un entero de 64 bits que depende de la abscisa del punto.
+
+    Los 5 bits más significativos determinan la partición y los menos
+    significativos si el punto es distinguido."""
+    return (hash(R.x) * _MEZCLA) & _MASCARA_64
+
+
+def _particion(huella):
+    return huella >> (64 - _BITS_PARTICION)
+
+
+def _canonico(R):
+    """Devuelve el representante de {R, -R} y 1 o -1 según sea R o -R."""
+    S = -R
+    if _a_tipos_basicos(S.y) < _a_tipos_basicos(R.y):
+        return S, -1
+    return R, 1
+
+
+class _EstadoCamino(object):
+    """Un camino aleatorio R = c P + d Q (anterior es la posición previa)."""
+    __slots__ = ('R', 'c', 'd', 'longitud', 'anterior')
+
+    def __init__(self, R, c, d):
+        self.R, self.c, self.d = R, c, d
+        self.longitud = 0
+        self.anterior = None
+
+    def avanza(self, R, c, d):
+        self.anterior = (self.R, self.c, self.d)
+        self.R, self.c, self.d = R, c, d
+        self.longitud += 1
+
+
+def _escapa_ciclo(camino, orden):
+    """Sale del ciclo {R, anterior} duplicando el menor de sus dos puntos
+    (ambos caminos que entren en el ciclo salen por el mismo punto)."""
+    R, c, d = min((camino.R, camino.c, camino.d), camino.anterior,
+                  key=lambda estado: _a_tipos_basicos(estado[0].x))
+    T, signo = _canonico(R + R)
+    camino.avanza(T, signo * 2 * c % orden, signo * 2 * d % orden)
+    camino.anterior = None
+
+
+def _reinicia_camino(R, c, d, reinicios, orden, aleatorio):
+    """Empieza un camino nuevo en R + T, con T = c_T P + d_T Q elegido al
+    azar de la tabla de reinicios (así cuesta una suma en lugar de una
+    multiplicación escalar)."""
+    while True:
+        T, c_T, d_T = aleatorio.choice(reinicios)
+        S = R + T
+        if not S.es_elemento_neutro():
+            S, signo = _canonico(S)
+            return _EstadoCamino(S, signo * (c + c_T) % orden, signo * (d + d_T) % orden)
+
+
+def _camina_rho(argumentos):
+    """Avanza los caminos aleatorios de un proceso.
+
+    Devuelve los puntos distinguidos encontrados (clave, c, d), los caminos
+    (para continuarlos en la siguiente ronda) y el número de pasos."""
+    P, Q, orden, saltos, coeficientes, reinicios, bits_distinguido, caminos, pasos, semilla = argumentos
+    E = type(P)
+    aleatorio = random.Random(semilla)
+    mascara = (1 << bits_distinguido) - 1
+    longitud_maxima = 20 << bits_distinguido
+    saltos_proyectivos = [S._a_proyectivo() for S in saltos]
+    distinguidos = []
+    pasos_dados = 0
+
+    while pasos_dados < pasos:
+        # j_i es la partición del camino i; si la siguiente posición está en
+        # la misma partición se usa la siguiente partición para evitar los
+        # ciclos R -> -(R + M_j) -> R que introduce el mapa de negación
+        originales = [_particion(_huella(camino.R)) for camino in caminos]
+        particiones = list(originales)
+        pendientes = list(range(len(caminos)))
+        for intento in range(_PARTICIONES):
+            if not pendientes:
+                break
+            proyectivos = [E._suma_proyectiva(caminos[i].R._a_proyectivo(), saltos_proyectivos[particiones[i]])
+                           for i in pendientes]
+            pasos_dados += len(pendientes)
+            siguientes = []
+            for i, S in zip(pendientes, E._normaliza_lote(proyectivos)):
+                camino = caminos[i]
+                j = particiones[i]
+                if S.es_elemento_neutro():
+                    caminos[i] = _reinicia_camino(camino.R, camino.c, camino.d, reinicios, orden, aleatorio)
+                    continue
+                S, signo = _canonico(S)
+                huella = _huella(S)
+                if _particion(huella) == originales[i] and intento < _PARTICIONES - 1:
+                    particiones[i] = (j + 1) % _PARTICIONES
+                    siguientes.append(i)
+                    continue
+                c_j, d_j = coeficientes[j]
+                anterior = camino.anterior
+                camino.avanza(S, signo * (camino.c + c_j) % orden, signo * (camino.d + d_j) % orden)
+                if anterior is not None and anterior[0] == S:
+                    # ciclo infructuoso R -> S -> R
+                    _escapa_ciclo(camino, orden)
+                    S = camino.R
+                    huella = _huella(S)
+                if huella & mascara == 0:
+                    distinguidos.append((_a_tipos_basicos(S.x), camino.c, camino.d))
+                    caminos[i] = _reinicia_camino(S, camino.c, camino.d, reinicios, orden, aleatorio)
+                elif camino.longitud > longitud_maxima:
+                    # ciclo infructuoso de mayor longitud: se abandona el camino
+                    caminos[i] = _reinicia_camino(S, camino.c, camino.d, reinicios, orden, aleatorio)
+            pendientes = siguientes
+
+    return distinguidos, caminos, pasos_dados
+
+
+def rho_pollard(P, Q, orden, procesos=1, caminos=16, bits_distinguido=None,
+                informa=None, semilla=None):
+    """Devuelve el logaritmo discreto de Q en base P mediante el método rho
+    de Pollard con puntos distinguidos.
+
+        >>> from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+        >>> E = curva_eliptica_sobre_Fq(1843546981, 285990742, 2**31 - 1)
+        >>> P = E(695425564, 925964042)  # de orden n = 2147492959
+        >>> k = rho_pollard(P, 123456789 * P, orden=2147492959, procesos=2)
+        >>> k
+        123456789
+
+    Cada proceso avanza varios caminos aleatorios a la vez (parámetro
+    ``caminos``), de modo que todas las sumas de un paso comparten una
+    única inversión. Los caminos son de tipo r-adding (R -> R + M_j, donde
+    M_j = c_j P + d_j Q es uno de 32 puntos aleatorios y j depende de la
+    abscisa de R) y usan el mapa de negación: cada posición se identifica
+    con su opuesta, lo que reduce el número esperado de pasos en un factor
+    sqrt(2), hasta sqrt(pi n / 4).
+
+    Un punto es distinguido si los últimos ``bits_distinguido`` bits de su
+    huella son nulos. Los caminos solo comunican sus puntos distinguidos
+    al proceso principal, que los guarda y detecta las colisiones; la
+    memoria necesaria es del orden de sqrt(n) / 2^bits_distinguido.
+
+    Args:
+        P: un punto de la curva de orden primo ``orden``.
+        Q: un punto del subgrupo generado por P.
+        orden (int): el orden (primo) de P.
+        procesos (Optional[int]): el número de procesos.
+        caminos (Optional[int]): el número de caminos de cada proceso.
+        bits_distinguido (Optional[int]): por defecto se elige según el
+            orden y el número de caminos.
+        informa (Optional[Callable]): si se indica, se llama tras cada
+            ronda con un :class:`Progreso`.
+        semilla (Optional[int]): la semilla de los caminos aleatorios.
+
+    Returns:
+        int: el entero k en [0, orden) tal que Q = k P.
+    """
+    if P.es_elemento_neutro():
+        raise ValueError("P no puede ser el elemento neutro.")
+    if Q.es_elemento_neutro():
+        return 0
+    if orden < 2 ** 12:
+        return _busqueda_exhaustiva(P, Q, orden)
+
+    total_caminos = procesos * caminos
+    if bits_distinguido is None:
+        # cada camino desperdicia unos 2^bits pasos al final, lo que debe
+        # ser pequeño frente a los sqrt(n) pasos esperados
+        bits_distinguido = max(0, orden.bit_length() // 2 - total_caminos.bit_length() - 4)
+    pasos_esperados = int(math.sqrt(math.pi * orden / 4)) + (total_caminos << bits_distinguido)
+    pasos_ronda = max(caminos << bits_distinguido, 256)
+
+    aleatorio = random.Random(semilla)
+    coeficientes = [(aleatorio.randrange(orden), aleatorio.randrange(orden)) for _ in range(_PARTICIONES)]
+    saltos = [suma_multiescalar([c, d], [P, Q]) for c, d in coeficientes]
+    # los puntos de reinicio y los de partida se obtienen sumando saltos
+    reinicios = []
+    for j in range(_PARTICIONES):
+        k = (j + 1) % _PARTICIONES
+        T = saltos[j] + saltos[k]
+        if not T.es_elemento_neutro():
+            reinicios.append((T, coeficientes[j][0] + coeficientes[k][0], coeficientes[j][1] + coeficientes[k][1]))
+    estados = []
+    for _ in range(procesos):
+        estados.append([])
+        for _ in range(caminos):
+            j = aleatorio.randrange(_PARTICIONES)
+            estados[-1].append(_reinicia_camino(saltos[j], coeficientes[j][0], coeficientes[j][1],
+                                                reinicios, orden, aleatorio))
+
+    guardados = {}
+    pasos = 0
+    inicio = time.perf_counter()
+    pool = multiprocessing.Pool(procesos) if procesos > 1 else None
+    try:
+        while True:
+            tareas = [(P, Q, orden, saltos, coeficientes, reinicios, bits_distinguido, estados[i],
+                       pasos_ronda, aleatorio.getrandbits(64)) for i in range(procesos)]
+            resultados = pool.map(_camina_rho, tareas) if pool else map(_camina_rho, tareas)
+            for i, (distinguidos, caminos_proceso, pasos_proceso) in enumerate(resultados):
+                estados[i] = caminos_proceso
+                pasos += pasos_proceso
+                for clave, c, d in distinguidos:
+                    anterior = guardados.setdefault(clave, (c, d))
+                    k = _resuelve_colision(anterior, (c, d), orden)
+                    if k is not None and k * P == Q:
+                        return k
+            if informa is not None:
+                informa(_progreso(pasos, pasos_esperados, len(guardados), inicio))
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+
+def _resuelve_colision(anterior, nuevo, orden):
+    """Devuelve k tal que c1 + d1 k = c2 + d2 k (mod orden) o None."""
+    (c1, d1), (c2, d2) = anterior, nuevo
+    if (d1 - d2) % orden == 0:
+        return None
+    return (c2 - c1) * inverso_modular(d1 - d2, orden, primo=True) % orden
+
+
+def _progreso(pasos, pasos_esperados, puntos_distinguidos, inicio):
+    segundos = time.perf_counter() - inicio
+    restantes = max(0, pasos_esperados - pasos) * segundos / pasos if pasos else float('inf')
+    return Progreso(pasos, pasos_esperados, puntos_distinguidos, segundos, restantes)
+
+
+def _busqueda_exhaustiva(P, Q, orden):
+    R = P.elemento_neutro()
+    for k in range(orden):
+        if R == Q:
+            return k
+        R = R + P
+    raise ValueError("Q no pertenece al subgrupo generado por P.")
+
+
+# Método de los canguros
+
+class _Canguro(object):
+    """Un canguro en la posición R = e P (domesticado) o R = Q + e P
+    (salvaje)."""
+    __slots__ = ('R', 'e', 'salvaje')
+
+    def __init__(self, R, e, salvaje):
+        self.R, self.e, self.salvaje = R, e, salvaje
+
+
+def _salta_canguros(argumentos):
+    """Avanza los canguros de un proceso.
+
+    Devuelve los puntos distinguidos encontrados (clave, e, salvaje,
+    índice del canguro), los canguros y el número de saltos."""
+    P, saltos, longitudes, bits_distinguido, canguros, pasos = argumentos
+    E = type(P)
+    mascara = (1 << bits_distinguido) - 1
+    saltos_proyectivos = [S._a_proyectivo() for S in saltos]
+    distinguidos = []
+    pasos_dados = 0
+
+    while pasos_dados < pasos:
+        particiones = [_particion(_huella(canguro.R)) for canguro in canguros]
+        proyectivos = [E._suma_proyectiva(canguro.R._a_proyectivo(), saltos_proyectivos[j])
+                       for canguro, j in zip(canguros, particiones)]
+        pasos_dados += len(canguros)
+        for indice, (canguro, j, R) in enumerate(zip(canguros, particiones, E._normaliza_lote(proyectivos))):
+            if R.es_elemento_neutro():
+                # R = -S_j: se usa el siguiente salto (la regla sigue siendo
+                # una función de la posición)
+                j = (j + 1) % _PARTICIONES
+                R = canguro.R + saltos[j]
+            canguro.R = R
+            canguro.e += longitudes[j]
+            huella = _huella(R)
+            if huella & mascara == 0:
+                distinguidos.append((_a_tipos_basicos(R.x), canguro.e, canguro.salvaje, indice))
+
+    return distinguidos, canguros, pasos_dados
+
+
+def canguro(P, Q, inferior, superior, procesos=1, canguros=8, bits_distinguido=None,
+            informa=None, semilla=None, pasos_maximos=None):
+    """Devuelve el logaritmo discreto de Q en base P sabiendo que está en el
+    intervalo [inferior, superior], mediante el método de los canguros de
+    Pollard en la versión paralela de van Oorschot y Wiener.
+
+        >>> from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+        >>> E = curva_eliptica_sobre_Fq(1843546981, 285990742, 2**31 - 1)
+        >>> P = E(695425564, 925964042)
+        >>> canguro(P, 1234567 * P, 1000000, 2000000)
+        1234567
+
+    Hay dos manadas de canguros: los domesticados parten de posiciones e P
+    conocidas, con e en [(a + b) / 2, (a + b) / 2 + m), y los salvajes de
+    Q + e P, con e en [0, m), donde m = N sqrt(b - a) / 4 es el salto
+    medio y N el número total de canguros. Todos saltan de R a R + s_j P,
+    donde el salto s_j (elegido al azar en [1, 2 m]) depende de la abscisa
+    de R. Cuando un canguro salvaje cae
+    en una posición visitada por uno domesticado, ambos siguen el mismo
+    camino hasta el siguiente punto distinguido, donde se detecta la
+    colisión y se obtiene el logaritmo. Si colisionan dos canguros de la
+    misma manada, uno de ellos vuelve a empezar desde otra posición.
+
+    Se realizan unas 2 sqrt(b - a) sumas de puntos en total, repartidas
+    entre todos los canguros y procesos, y solo se guardan los puntos
+    distinguidos: la memoria es del orden de sqrt(b - a) / 2^bits_distinguido.
+
+    Args:
+        P: un punto de una curva elíptica.
+        Q: un punto de la forma k P con k en [inferior, superior].
+        inferior (int): el extremo inferior a del intervalo.
+        superior (int): el extremo superior b del intervalo.
+        procesos (Optional[int]): el número de procesos.
+        canguros (Optional[int]): el número de canguros de cada proceso
+            (la mitad domesticados y la mitad salvajes).
+        bits_distinguido (Optional[int]): por defecto se elige según el
+            tamaño del intervalo y el número de canguros.
+        informa (Optional[Callable]): si se indica, se llama tras cada
+            ronda con un :class:`Progreso`.
+        semilla (Optional[int]): la semilla de las posiciones iniciales y
+            los saltos.
+        pasos_maximos (Optional[int]): el número máximo de saltos. Por
+            defecto, 16 veces los esperados.
+
+    Returns:
+        int: el entero k en [inferior, superior] tal que Q = k P.
+
+    Raises:
+        ValueError: si no se encuentra el logaritmo (por ejemplo, porque no
+            está en el intervalo).
+    """
+    if inferior > superior:
+        raise ValueError("El intervalo está vacío.")
+    anchura = superior - inferior
+    if anchura < 2 ** 12:
+        R = inferior * P
+        for k in range(inferior, superior + 1):
+            if R == Q:
+                return k
+            R = R + P
+        raise ValueError("El logaritmo no está en el intervalo.")
+
+    canguros = max(2, canguros - canguros % 2)
+    total_canguros = procesos * canguros
+    raiz = _raiz_entera(anchura)
+    if bits_distinguido is None:
+        bits_distinguido = max(0, (raiz // total_canguros).bit_length() - 4)
+    pasos_esperados = 2 * raiz + (total_canguros << bits_distinguido)
+    if pasos_maximos is None:
+        pasos_maximos = 16 * pasos_esperados
+    pasos_ronda = max(canguros << bits_distinguido, 256)
+
+    aleatorio = random.Random(semilla)
+    media = max(1, total_canguros * raiz // 4)
+    longitudes = [aleatorio.randint(1, 2 * media) for _ in range(_PARTICIONES)]
+    saltos = [s * P for s in longitudes]
+
+    def nuevo(salvaje):
+        # los canguros de cada manada parten de posiciones cercanas (a
+        # menos de un salto medio): los domesticados del centro del
+        # intervalo y los salvajes de Q
+        e = aleatorio.randrange(media)
+        if salvaje:
+            return _Canguro(Q + e * P, e, True)
+        e += inferior + anchura // 2
+        return _Canguro(e * P, e, False)
+
+    estados = [[nuevo(i % 2 == 1) for i in range(canguros)] for _ in range(procesos)]
+    guardados = {}
+    pasos = 0
+    inicio = time.perf_counter()
+    pool = multiprocessing.Pool(procesos) if procesos > 1 else None
+    try:
+        while pasos < pasos_maximos:
+            tareas = [(P, saltos, longitudes, bits_distinguido, estados[i], pasos_ronda)
+                      for i in range(procesos)]
+            resultados = pool.map(_salta_canguros, tareas) if pool else map(_salta_canguros, tareas)
+            reinicios = []
+            for i, (distinguidos, canguros_proceso, pasos_proceso) in enumerate(resultados):
+                estados[i] = canguros_proceso
+                pasos += pasos_proceso
+                for clave, e, salvaje, indice in distinguidos:
+                    e_anterior, salvaje_anterior = guardados.setdefault(clave, (e, salvaje))
+                    if salvaje_anterior != salvaje:
+                        # e_domesticado P = Q + e_salvaje P
+                        k = e_anterior - e if salvaje else e - e_anterior
+                        # si los canguros han dado la vuelta al grupo, k
+                        # puede diferir del logaritmo en un múltiplo del orden
+                        if inferior <= k <= superior and k * P == Q:
+                            return k
+                    elif e_anterior != e:
+                        reinicios.append((i, indice))
+            for i, indice in reinicios:
+                estados[i][indice] = nuevo(estados[i][indice].salvaje)
+            if informa is not None:
+                informa(_progreso(pasos, pasos_esperados, len(guardados), inicio))
+    finally:
+        if pool is not None:
+            pool.terminate()
+    raise ValueError("No se ha encontrado el logaritmo en el intervalo.")
+
+
+# Pohlig-Hellman y paso de bebé, paso de gigante
+#
+# Los algoritmos genéricos trabajan con un grupo abstracto para servir
+# tanto para los puntos de una curva elíptica (notación aditiva) como para
+# el grupo multiplicativo de un cuerpo finito.
+
+class _GrupoPuntos(object):
+    """Operaciones del grupo de puntos de una curva elíptica."""
+    def __init__(self, g):
+        self.neutro = g.elemento_neutro()
+
+    @staticmethod
+    def opera(a, b):
+        return a + b
+
+    @staticmethod
+    def potencia(a, k):
+        return k * a
+
+    @staticmethod
+    def inverso(a):
+        return -a
+
+    @staticmethod
+    def orden_grupo(g):
+        return orden_curva(type(g))
+
+
+class _GrupoMultiplicativo(object):
+    """Operaciones del grupo multiplicativo de un cuerpo finito."""
+    def __init__(self, g):
+        self.neutro = type(g).uno()
+
+    @staticmethod
+    def opera(a, b):
+        return a * b
+
+    @staticmethod
+    def potencia(a, k):
+        return a ** k
+
+    @staticmethod
+    def inverso(a):
+        return a.inverso()
+
+    @staticmethod
+    def orden_grupo(g):
+        F = type(g)
+        return F.p ** getattr(F, 'n', 1) - 1
+
+
+def _grupo(g):
+    return _GrupoPuntos(g) if isinstance(g, PuntoRacional) else _GrupoMultiplicativo(g)
+
+
+def orden_elemento(g, multiplo=None):
+    """Devuelve el orden de un punto de una curva elíptica o de un elemento
+    no nulo de un cuerpo finito.
+
+        >>> from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+        >>> E = curva_eliptica_sobre_Fq(2, 3, 97)
+        >>> orden_elemento(E(3, 6))
+        5
+
+    Args:
+        g: un punto o un elemento del cuerpo finito.
+        multiplo (Optional[int]): un múltiplo del orden. Por defecto, el
+            orden del grupo (calculado con :func:`.orden_curva` para los
+            puntos).
+
+    Returns:
+        int: el orden de g.
+    """
+    grupo = _grupo(g)
+    orden = grupo.orden_grupo(g) if multiplo is None else multiplo
+    for primo, exponente in factoriza(orden).items():
+        for _ in range(exponente):
+            if grupo.potencia(g, orden // primo) == grupo.neutro:
+                orden //= primo
+            else:
+                break
+    return orden
+
+
+def paso_bebe_paso_gigante(g, h, orden, tam_tabla=None):
+    """Devuelve el logaritmo discreto de h en base g mediante el algoritmo
+    paso de bebé, paso de gigante.
+
+        >>> from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+        >>> E = curva_eliptica_sobre_Fq(1, 28, 10007)
+        >>> P = E(4384, 7691)
+        >>> paso_bebe_paso_gigante(P, 1234 * P, 9851)
+        1234
+
+    Se guardan los pasos de bebé j g (0 <= j < m) en un diccionario indexado
+    por las coordenadas del punto (o el valor del elemento) y se buscan los
+    pasos de gigante h - i m g en la tabla. Con m = sqrt(orden) realiza
+    unas 2 sqrt(orden) operaciones. La memoria se puede limitar con
+    ``tam_tabla``, a costa de más pasos de gigante (orden / m).
+
+    Args:
+        g: un punto de una curva elíptica o un elemento no nulo de un
+            cuerpo finito.
+        h: un elemento del subgrupo generado por g.
+        orden (int): el orden de g (o un múltiplo).
+        tam_tabla (Optional[int]): el número máximo m de pasos de bebé.
+
+    Returns:
+        int: el entero k en [0, orden) tal que h = k g (o g^k = h).
+
+    Raises:
+        ValueError: si h no pertenece al subgrupo generado por g.
+    """
+    grupo = _grupo(g)
+    m = _raiz_entera(orden - 1) + 1
+    if tam_tabla is not None:
+        m = max(1, min(m, tam_tabla))
+
+    tabla = {}
+    paso = grupo.neutro
+    for j in range(m):
+        tabla.setdefault(paso, j)
+        paso = grupo.opera(paso, g)
+
+    # paso = m g
+    gigante = grupo.inverso(paso)
+    actual = h
+    for i in range(-(-orden // m)):
+        j = tabla.get(actual)
+        if j is not None:
+            return (i * m + j) % orden
+        actual = grupo.opera(actual, gigante)
+    raise ValueError("h no pertenece al subgrupo generado por g.")
+
+
+def pohlig_hellman(g, h, orden=None, procesos=1, tam_tabla=2 ** 20):
+    """Devuelve el logaritmo discreto de h en base g mediante el algoritmo
+    de Pohlig-Hellman.
+
+        >>> from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+        >>> E = curva_eliptica_sobre_Fq(324, 1287, 3851)
+        >>> P = E(900, 1265)  # de orden 1964 = 2^2 491
+        >>> pohlig_hellman(P, 1500 * P)
+        1500
+
+    Se factoriza el orden n de g y, para cada potencia de primo l^e que lo
+    divide, se calcula el logaritmo módulo l^e resolviendo e logaritmos en
+    el subgrupo de orden l, generado por (n / l) g. Los logaritmos módulo
+    cada l^e se combinan con el teorema chino del resto.
+
+    Los logaritmos en los subgrupos de orden primo l se calculan con
+    :func:`paso_bebe_paso_gigante` si sqrt(l) no supera ``tam_tabla`` y con
+    el método rho de Pollard (:func:`rho_pollard` para los puntos, en
+    ``procesos`` procesos) en otro caso. Ambos realizan del orden de
+    sqrt(l) operaciones: un factor l de 60 bits supone unos 2^30 pasos.
+
+    Args:
+        g: un punto de una curva elíptica o un elemento no nulo de un
+            cuerpo finito.
+        h: un elemento del subgrupo generado por g.
+        orden (Optional[int]): el orden de g. Por defecto se calcula con
+            :func:`orden_elemento`.
+        procesos (Optional[int]): el número de procesos del método rho.
+        tam_tabla (Optional[int]): el número máximo de pasos de bebé.
+
+    Returns:
+        int: el entero k en [0, orden) tal que h = k g (o g^k = h).
+
+    Raises:
+        ValueError: si h no pertenece al subgrupo generado por g. Antes de
+            usar el método rho se comprueba que el orden de h divide al de
+            g, lo que basta en los grupos cíclicos (los cuerpos finitos).
+            En una curva elíptica con todos los puntos de l-torsión
+            (lo que exige que l divida a q - 1), un h de orden l fuera del
+            subgrupo no se detecta y el método rho no termina.
+    """
+    grupo = _grupo(g)
+    if orden is None:
+        orden = orden_elemento(g)
+    # el método rho no termina si h no está en el subgrupo, luego se
+    # comprueba antes que el orden de h divide al de g
+    if grupo.potencia(h, orden) != grupo.neutro:
+        raise ValueError("h no pertenece al subgrupo generado por g.")
+
+    restos, modulos = [], []
+    for primo, exponente in factoriza(orden).items():
+        # g_0 tiene orden primo
+        g_0 = grupo.potencia(g, orden // primo)
+        x = 0
+        for i in range(exponente):
+            # h_i = (n / l^(i+1)) (h - x g) está en el subgrupo de g_0
+            h_i = grupo.potencia(grupo.opera(h, grupo.inverso(grupo.potencia(g, x))),
+                                 orden // primo ** (i + 1))
+            if grupo.potencia(h_i, primo) != grupo.neutro:
+                raise ValueError("h no pertenece al subgrupo generado por g.")
+            x += _logaritmo_orden_primo(grupo, g_0, h_i, primo, procesos, tam_tabla) * primo ** i
+        restos.append(x)
+        modulos.append(primo ** exponente)
+
+    k = teorema_chino_resto(restos, modulos) if modulos else 0
+    if grupo.potencia(g, k) != h:
+        raise ValueError("h no pertenece al subgrupo generado por g.")
+    return k
+
+
+def _logaritmo_orden_primo(grupo, g, h, primo, procesos, tam_tabla):
+    if h == grupo.neutro:
+        return 0
+    if _raiz_entera(primo) < tam_tabla:
+        return paso_bebe_paso_gigante(g, h, primo)
+    if isinstance(grupo, _GrupoPuntos):
+        return rho_pollard(g, h, primo, procesos=procesos)
+    return _rho_generico(grupo, g, h, primo)
+
+
+def _rho_generico(grupo, g, h, orden, semilla=None):
+    """Método rho de Pollard (caminos r-adding con puntos distinguidos) en
+    un grupo de orden primo, en un único proceso."""
+    aleatorio = random.Random(semilla)
+    coeficientes = [(aleatorio.randrange(orden), aleatorio.randrange(orden)) for _ in range(_PARTICIONES)]
+    saltos = [grupo.opera(grupo.potencia(g, c), grupo.potencia(h, d)) for c, d in coeficientes]
+    mascara = (1 << max(0, orden.bit_length() // 2 - 6)) - 1
+    guardados = {}
+    while True:
+        c, d = aleatorio.randrange(orden), aleatorio.randrange(orden)
+        R = grupo.opera(grupo.potencia(g, c), grupo.potencia(h, d))
+        for _ in range(20 * (mascara + 1)):
+            huella = (hash(R) * _MEZCLA) & _MASCARA_64
+            if huella & mascara == 0:
+                k = _resuelve_colision(guardados.setdefault(R, (c, d)), (c, d), orden)
+                if k is not None and grupo.potencia(g, k) == h:
+                    return k
+                break
+            j = _particion(huella)
+            R = grupo.opera(R, saltos[j])
+            c, d = (c + coeficientes[j][0]) % orden, (d + coeficientes[j][1]) % orden
@@ -0,0 +1,320 @@
+"""Trazas de las operaciones criptográficas.
+
+Este módulo permite medir cuánto tiempo dedica cada operación de
+:mod:`esquemas_criptograficos` a cada una de sus fases (cálculo del hash,
+generación del nonce, multiplicación escalar, inversión...). A diferencia
+de :mod:`instrumentacion`, las fases están marcadas permanentemente en el
+código y su coste con las trazas desactivadas es despreciable, por lo que
+se pueden dejar activadas en producción muestreando solo algunas
+operaciones.
+
+Para utilizar las funciones y las clases de este módulo, debe importarlo
+previamente: ::
+
+    # reemplace ... por la función/clase que desea utilizar
+    from ccepy.trazas import ...
+
+Cada fase es un *tramo* (ver :func:`tramo`). Los tramos se anidan: el
+nombre de un tramo incluye el de los tramos que lo contienen separados por
+``/``. Al cerrarse un tramo se llama a los recolectores activos con su
+nombre y su duración. El recolector por defecto es :class:`Histograma`:
+
+    >>> from ccepy.listado_curvas_elipticas import parametros_dominio
+    >>> from ccepy.esquemas_criptograficos import ECDSA
+    >>> alicia = ECDSA(*parametros_dominio("NIST P-224"))
+    >>> with trazando() as histograma:
+    ...     for _ in range(3):
+    ...         firma = alicia.firma("mensaje")
+    >>> histograma.tramos["ECDSA.firma"].llamadas
+    3
+    >>> sorted(histograma.tramos)  # doctest: +NORMALIZE_WHITESPACE
+    ['ECDSA.firma', 'ECDSA.firma/hash', 'ECDSA.firma/inversion',
+     'ECDSA.firma/multiplicacion_escalar',
+     'ECDSA.firma/multiplicacion_escalar/inversion', 'ECDSA.firma/nonce']
+
+Un recolector es cualquier función con los parámetros ``(nombre, segundos)``.
+Con ``muestreo=N`` solo se registra una de cada N operaciones (tramos
+que no están contenidos en otro tramo), junto con todas sus fases.
+
+Las trazas se pueden usar desde varios hilos: cada hilo tiene sus propios
+tramos abiertos y los recolectores se comparten (:class:`Histograma` se
+puede llamar desde varios hilos a la vez).
+"""
+import collections
+import threading
+import time
+
+
+# Recolectores activos: listas [recolector, muestreo, contador]. Se
+# modifican (también los contadores) con el cerrojo adquirido.
+_recolectores = []
+_cerrojo = threading.Lock()
+
+# Tramos abiertos de cada hilo (atributo tramos): pares (nombre completo,
+# recolectores que registran el tramo)
+_pila = threading.local()
+
+
+def _tramos_abiertos():
+    try:
+        return _pila.tramos
+    except AttributeError:
+        _pila.tramos = []
+        return _pila.tramos
+
+
+class _TramoNulo(object):
+    """Tramo que no mide nada (se usa con las trazas desactivadas)."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        return False
+
+
+_TRAMO_NULO = _TramoNulo()
+
+
+class _Tramo(object):
+    __slots__ = ('_nombre', '_inicio')
+
+    def __init__(self, nombre):
+        self._nombre = nombre
+
+    def __enter__(self):
+        tramos = _tramos_abiertos()
+        if tramos:
+            nombre_padre, recolectores = tramos[-1]
+            nombre = nombre_padre + "/" + self._nombre
+        else:
+            nombre = self._nombre
+            recolectores = []
+            with _cerrojo:
+                for registro in _recolectores:
+                    registro[2] += 1
+                    if registro[2] >= registro[1]:
+                        registro[2] = 0
+                        recolectores.append(registro[0])
+        tramos.append((nombre, recolectores))
+        self._inicio = time.perf_counter() if recolectores else None
+        return self
+
+    def __exit__(self, *excepcion):
+        nombre, recolectores = _tramos_abiertos().pop()
+        if recolectores:
+            segundos = time.perf_counter() - self._inicio
+            for recolector in recolectores:
+                recolector(nombre, segundos)
+        return False
+
+
+def tramo(nombre):
+    """Devuelve un gestor de contexto que marca una fase de una operación.
+
+        >>> with trazando() as histograma:
+        ...     with tramo("operacion"):
+        ...         with tramo("fase"):
+        ...             pass
+        >>> sorted(histograma.tramos)
+        ['operacion', 'operacion/fase']
+
+    Si no hay recolectores activos, devuelve un gestor de contexto que no
+    hace nada.
+
+    Args:
+        nombre (str): el nombre de la fase.
+    """
+    if not _recolectores:
+        return _TRAMO_NULO
+    return _Tramo(nombre)
+
+
+def activa_trazas(recolector=None, muestreo=1):
+    """Activa un recolector de trazas.
+
+    Args:
+        recolector (Optional[Callable]): una función con parámetros
+            ``(nombre, segundos)``. Por defecto, un nuevo :class:`Histograma`.
+        muestreo (Optional[int]): solo se registra una de cada *muestreo*
+            operaciones.
+
+    Returns:
+        el recolector.
+    """
+    if muestreo < 1:
+        raise ValueError("El muestreo debe ser un entero positivo.")
+    if recolector is None:
+        recolector = Histograma()
+    with _cerrojo:
+        # así se registra la primera operación
+        _recolectores.append([recolector, muestreo, muestreo - 1])
+    return recolector
+
+
+def desactiva_trazas(recolector=None):
+    """Desactiva un recolector de trazas (por defecto, todos)."""
+    with _cerrojo:
+        if recolector is None:
+            del _recolectores[:]
+        else:
+            _recolectores[:] = [r for r in _recolectores if r[0] is not recolector]
+
+
+class trazando(object):
+    """Gestor de contexto que activa un recolector de trazas dentro del
+    bloque ``with`` y lo devuelve.
+
+    Los argumentos son los de :func:`activa_trazas`.
+    """
+    def __init__(self, recolector=None, muestreo=1):
+        self.recolector = recolector
+        self.muestreo = muestreo
+
+    def __enter__(self):
+        self.recolector = activa_trazas(self.recolector, self.muestreo)
+        return self.recolector
+
+    def __exit__(self, *excepcion):
+        desactiva_trazas(self.recolector)
+        return False
+
+
+class EstadisticaTramo(object):
+    """Resumen de las duraciones de un tramo.
+
+    Las duraciones se agrupan en cubetas de escala logarítmica: la cubeta
+    *i* contiene las duraciones de entre 2^(i-1) y 2^i nanosegundos.
+
+    Attributes:
+        llamadas (int): el número de duraciones registradas.
+        total (float): la suma de las duraciones (en segundos).
+        minimo (float): la menor duración.
+        maximo (float): la mayor duración.
+        cubetas (Counter): el número de duraciones de cada cubeta.
+    """
+    __slots__ = ('llamadas', 'total', 'minimo', 'maximo', 'cubetas')
+
+    def __init__(self):
+        self.llamadas = 0
+        self.total = 0.0
+        self.minimo = float('inf')
+        self.maximo = 0.0
+        self.cubetas = collections.Counter()
+
+    def registra(self, segundos):
+        """Añade una duración."""
+        self.llamadas += 1
+        self.total += segundos
+        self.minimo = min(self.minimo, segundos)
+        self.maximo = max(self.maximo, segundos)
+        self.cubetas[int(segundos * 1e9).bit_length()] += 1
+
+    def fusiona(self, otra):
+        """Añade las duraciones de otra estadística."""
+        self.llamadas += otra.llamadas
+        self.total += otra.total
+        self.minimo = min(self.minimo, otra.minimo)
+        self.maximo = max(self.maximo, otra.maximo)
+        self.cubetas.update(otra.cubetas)
+
+    def media(self):
+        """Devuelve la duración media (en segundos)."""
+        return self.total / self.llamadas if self.llamadas else 0.0
+
+    def percentil(self, q):
+        """Devuelve una cota superior del percentil q (entre 0 y 100) de las
+        duraciones (en segundos), con la precisión de las cubetas."""
+        objetivo = self.llamadas * q / 100
+        acumulado = 0
+        for cubeta in sorted(self.cubetas):
+            acumulado += self.cubetas[cubeta]
+            if acumulado >= objetivo:
+                return min(2 ** cubeta / 1e9, self.maximo)
+        return self.maximo
+
+
+class Histograma(object):
+    """Recolector de trazas que guarda en memoria un histograma de las
+    duraciones de cada tramo.
+
+        >>> histograma = Histograma()
+        >>> for segundos in [0.001, 0.002, 0.004]:
+        ...     histograma("firma", segundos)
+        >>> estadistica = histograma.tramos["firma"]
+        >>> estadistica.llamadas, estadistica.maximo
+        (3, 0.004)
+
+    Los histogramas se pueden exportar a un fichero de texto con
+    :meth:`exporta` (una línea por tramo, con los campos separados por
+    tabuladores) y cargar con :meth:`carga`, por ejemplo para unir los
+    histogramas de varios procesos con :meth:`fusiona`.
+
+    Attributes:
+        tramos (Dict[str, EstadisticaTramo]): la estadística de cada tramo.
+    """
+    cabecera = "# ccepy-trazas 1\n# tramo\tllamadas\ttotal\tminimo\tmaximo\tcubetas\n"
+
+    def __init__(self):
+        self.tramos = {}
+        self._cerrojo = threading.Lock()
+
+    def __call__(self, nombre, segundos):
+        with self._cerrojo:
+            estadistica = self.tramos.get(nombre)
+            if estadistica is None:
+                estadistica = self.tramos[nombre] = EstadisticaTramo()
+            estadistica.registra(segundos)
+
+    def fusiona(self, otro):
+        """Añade los tramos de otro histograma."""
+        with self._cerrojo:
+            for nombre, estadistica in otro.tramos.items():
+                self.tramos.setdefault(nombre, EstadisticaTramo()).fusiona(estadistica)
+
+    def __str__(self):
+        lineas = []
+        for nombre in sorted(self.tramos):
+            e = self.tramos[nombre]
+            lineas.append("{0}: {1} llamadas, media {2:.6f} s, p99 {3:.6f} s, máximo {4:.6f} s".format(
+                nombre, e.llamadas, e.media(), e.percentil(99), e.maximo))
+        return "\n".join(lineas)
+
+    def exporta(self, ruta):
+        """Escribe el histograma en un fichero de texto.
+
+        Args:
+            ruta (str): la ruta del fichero.
+        """
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write(Histograma.cabecera)
+            for nombre in sorted(self.tramos):
+                e = self.tramos[nombre]
+                cubetas = ",".join("{0}:{1}".format(c, v) for c, v in sorted(e.cubetas.items()))
+                f.write("{0}\t{1}\t{2!r}\t{3!r}\t{4!r}\t{5}\n".format(
+                    nombre, e.llamadas, e.total, e.minimo, e.maximo, cubetas))
+
+    @classmethod
+    def carga(cls, ruta):
+        """Lee un histograma escrito con :meth:`exporta`.
+
+        Args:
+            ruta (str): la ruta del fichero.
+
+        Returns:
+            Histograma: el histograma leído.
+        """
+        histograma = cls()
+        with open(ruta, encoding='utf-8') as f:
+            for linea in f:
+                if linea.startswith("#") or not linea.strip():
+                    continue
+                nombre, llamadas, total, minimo, maximo, cubetas = linea.rstrip("\n").split("\t")
+                e = histograma.tramos[nombre] = EstadisticaTramo()
+                e.llamadas = int(llamadas)
+                e.total, e.minimo, e.maximo = float(total), float(minimo), float(maximo)
+                for par in filter(None, cubetas.split(",")):
+                    cubeta, veces = par.split(":")
+                    e.cubetas[int(cubeta)] = int(veces)
+        return histograma
@@ -64,7 +64,7 @@ setup(
 
     # You can just specify the packages manually here if your project is
     # simple. Or you can use find_packages().
-    packages=find_packages(exclude=['docs', 'tests']),
+    packages=find_packages(exclude=['docs', 'tests', 'benchmarks']),
 
     # Alternatively, if you want to distribute just a my_module.py, uncomment
     # this:
@@ -89,6 +89,7 @@ setup(
     extras_require={
         'dev': ['sphinx'],
         'test': ['hypothesis'],
+        'numpy': ['numpy'],
     },
 
     # If there are data files included in your packages that need to be
@@ -109,7 +110,7 @@ setup(
     # pip to create the appropriate form of executable for the target platform.
     entry_points={
         'console_scripts': [
-            'sample=sample:main',
+            'ccepy=ccepy.linea_comandos:main',
         ],
     },
 )
@@ -0,0 +1,12 @@
+"""Tests de ccepy.
+
+La caché en disco de los polinomios irreducibles (ver
+:mod:`ccepy.listado_polinomios_irreducibles`) se redirige a un directorio
+temporal para que los tests, incluidas las llamadas a ``Fq(p, n)``, no
+escriban en la caché del usuario.
+"""
+import os
+import tempfile
+
+_directorio_cache = tempfile.TemporaryDirectory(prefix="ccepy-tests-")
+os.environ["CCEPY_CACHE"] = _directorio_cache.name
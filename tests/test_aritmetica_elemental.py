@@ -1,14 +1,18 @@
 import sys
 sys.path.append('../ccepy')
+import random
 import unittest
+from unittest import mock
 from math import gcd
 import doctest
 
-from hypothesis import given, assume
+from hypothesis import given, assume, settings
 from hypothesis.strategies import integers, lists, sampled_from
 
 from ccepy import aritmetica_elemental  # para cargar los docstring
 from ccepy.aritmetica_elemental import PolinomioZp, Zp, alg_euclides, alg_euclides_polinomios
+from ccepy.aritmetica_elemental import ArbolSubproductos
+from ccepy.aritmetica_elemental import es_primo, factoriza, inverso_modular, teorema_chino_resto
 
 # secuencia A000040 de OEIS
 primos = [
@@ -138,12 +142,145 @@ class TestPolinomioZp(unittest.TestCase):
         assert ((p * q).grado()) == p.grado() + q.grado()
         assert (p + q).grado() <= max(p.grado(), q.grado())
 
+    @given(lists(integers()), lists(integers()), sampled_from(primos))
+    def test_hash_inmutable(self, l1, l2, primo):
+        assume(l1)
+        assume(l2)
+        p = PolinomioZp(l1, primo)
+        q = PolinomioZp(l2, primo)
+        if p == q:
+            assert hash(p) == hash(q)
+        assert {p: 1}[PolinomioZp(l1, primo)] == 1
+        with self.assertRaises(AttributeError):
+            p._coeficientes = q._coeficientes
+        p.coeficientes.append(1)
+        assert p == PolinomioZp(l1, primo)
+
+    @given(integers(), sampled_from(primos))
+    def test_hash_constantes(self, n, primo):
+        # un polinomio constante solo es igual al entero entre 0 y p - 1
+        # que lo representa, que tiene su mismo hash
+        c = PolinomioZp([n], primo)
+        assert c == n % primo and hash(c) == hash(n % primo)
+        assert (c == n) == (0 <= n < primo)
+        if c == n:
+            assert hash(c) == hash(n)
+
     @given(integers(min_value=1, max_value=4))
     def test_polinomios_irreducibles_Z2(self, n):
         assume(n)
         f = PolinomioZp.genera_irreducible(grado=n, p=2)
         assert f in irreducibles_Z2_hasta_grado_4
 
+    @settings(deadline=None)
+    @given(sampled_from(primos[:4]), integers(min_value=1, max_value=8))
+    def test_irreducible_disperso(self, primo, n):
+        f = PolinomioZp.genera_irreducible_disperso(n, primo)
+        assert f.grado() == n and f.coeficiente_lider() == 1
+        assert f.es_irreducible()
+        # todos los candidatos anteriores son reducibles
+        for g in aritmetica_elemental._candidatos_dispersos(n, primo):
+            if g == f.coeficientes:
+                break
+            assert not PolinomioZp(g, primo).es_irreducible()
+        assert PolinomioZp.genera_irreducible_disperso(n, primo) == f
+
+    @settings(deadline=None, max_examples=30)
+    @given(sampled_from(primos[:8] + [2**31 - 1, 2**61 - 1]), integers(min_value=1, max_value=12),
+           lists(integers(), min_size=1, max_size=12))
+    def test_es_irreducible(self, primo, n, l1):
+        # se compara con la definición: no tiene divisores de grado <= n / 2
+        f = PolinomioZp(l1 + [1], primo)
+        assume(f.grado() >= 1)
+        X = PolinomioZp([0, 1], primo)
+        u = X
+        reducible = False
+        anillo = aritmetica_elemental._AnilloCociente([int(c) for c in f.coeficientes], primo)
+        for _ in range(f.grado() // 2):
+            u = PolinomioZp(anillo.potencia([int(c) for c in u.coeficientes], primo) or [0], primo)
+            _, _, d = alg_euclides_polinomios(f, u - X, primo)
+            reducible = reducible or d.grado() > 0
+        assert f.es_irreducible() == (not reducible)
+        g = PolinomioZp.genera_irreducible(n, primo)
+        assert g.grado() == n and g.es_irreducible()
+        assert (g * f).es_irreducible() is False
+
+    def test_busqueda_en_paralelo(self):
+        for grado, primo in [(64, 2), (12, 3), (5, 2**31 - 1)]:
+            f = PolinomioZp.genera_irreducible_disperso(grado, primo)
+            assert PolinomioZp.genera_irreducible_disperso(grado, primo, procesos=2) == f
+        g = PolinomioZp.genera_irreducible(40, 3, procesos=2)
+        assert g.grado() == 40 and g.es_irreducible()
+
+    @settings(deadline=None, max_examples=40)
+    @given(sampled_from(primos[:6] + [2**31 - 1]),
+           lists(lists(integers(), min_size=1, max_size=6), min_size=1, max_size=4),
+           lists(integers(min_value=1, max_value=3), min_size=4, max_size=4))
+    def test_factoriza(self, primo, factores, multiplicidades):
+        f = PolinomioZp([1], primo)
+        for l1, m in zip(factores, multiplicidades):
+            f = f * PolinomioZp(l1 + [1], primo) ** m
+        factorizacion = f.factoriza()
+        g = PolinomioZp([1], primo)
+        for h, m in factorizacion.items():
+            assert h.coeficiente_lider() == 1 and h.es_irreducible()
+            g = g * h ** m
+        assert g == f
+        raices = [int(r) for r in f.raices()]
+        assert raices == sorted(int(-h.coeficientes[0]) for h in factorizacion if h.grado() == 1)
+        if primo < 20:
+            X = PolinomioZp([0, 1], primo)
+            assert raices == [a for a in range(primo) if f % (X - a) == 0]
+
+    def test_factoriza_potencias_p(self):
+        # (X + 1)^3 (X^2 + 1)^6 sobre Z_3: la derivada se anula en parte
+        X = PolinomioZp([0, 1], 3)
+        f = (X + 1) ** 3 * (X ** 2 + 1) ** 6
+        assert f.factoriza() == {X + 1: 3, X ** 2 + 1: 6}
+        assert f.raices() == [2]
+        with self.assertRaises(ValueError):
+            PolinomioZp([0], 3).factoriza()
+
+    @settings(deadline=None, max_examples=40)
+    @given(sampled_from(primos[:6] + [2**31 - 1, 2**255 - 19]), lists(integers(), max_size=40),
+           lists(integers(), min_size=1, max_size=40), sampled_from([1, 2, 32]))
+    def test_evalua_interpola(self, primo, l1, puntos, hoja):
+        f = PolinomioZp(l1 or [0], primo)
+        Z = Zp(primo)
+        valores = [sum((c * Z(x) ** i for i, c in enumerate(f.coeficientes)), Z(0)) for x in puntos]
+        assert [f.evalua(x) for x in puntos] == f.evalua(puntos) == valores
+        # hojas pequeñas para recorrer el árbol de subproductos con pocos puntos
+        with mock.patch.object(aritmetica_elemental, '_HOJA_SUBPRODUCTOS', hoja):
+            arbol = ArbolSubproductos(puntos, primo)
+            assert arbol.evalua(f) == f.evalua(arbol) == valores
+            distintos = sorted(set(x % primo for x in puntos))
+            if len(distintos) == len(puntos):
+                g = PolinomioZp.interpola(arbol, valores, primo)
+                assert g.grado() < len(puntos) and g.evalua(puntos) == valores
+                if f.grado() < len(puntos):
+                    assert g == f
+            else:
+                with self.assertRaises(ValueError):
+                    arbol.interpola(valores)
+            m = arbol.anulador()
+            assert m.grado() == len(puntos) and m.coeficiente_lider() == 1
+            assert m.evalua(puntos) == [0] * len(puntos)
+
+    @settings(deadline=None, max_examples=10)
+    @given(sampled_from([2, 2**31 - 1, 2**255 - 19]), integers(min_value=200, max_value=600),
+           integers(min_value=0, max_value=900), integers())
+    def test_evalua_interpola_muchos_puntos(self, primo, n, grado, semilla):
+        rng = random.Random(semilla)
+        puntos = rng.sample(range(min(primo, 10**6)), min(n, primo))
+        f = PolinomioZp([rng.randrange(primo) for _ in range(grado + 1)], primo)
+        arbol = ArbolSubproductos(puntos, primo)
+        valores = arbol.evalua(f)
+        assert valores == aritmetica_elemental._horner(
+            [int(c) for c in f.coeficientes], puntos, primo)
+        assert f.evalua(puntos) == valores
+        g = arbol.interpola(valores)
+        assert g == f % arbol.anulador()
+
 
 class TestAlgoritmoExtendidoEuclides(unittest.TestCase):
     """Conjuto de test para los algoritmos extendidos de euclides"""
@@ -156,6 +293,30 @@ class TestAlgoritmoExtendidoEuclides(unittest.TestCase):
             assert x < b // d
             assert y < a // d
 
+    @settings(deadline=None)
+    @given(integers(min_value=1, max_value=2**4000), integers(min_value=1, max_value=2**4000))
+    def test_alg_euclides_lehmer(self, a, b):
+        # con un umbral pequeño se usa la variante de Lehmer, que debe
+        # obtener exactamente los mismos coeficientes que la clásica
+        with mock.patch.object(aritmetica_elemental, '_UMBRAL_LEHMER', 64):
+            x, y, d = alg_euclides(a, b)
+        assert (x, y, d) == alg_euclides(a, b)
+        assert x * a + y * b == d == gcd(a, b)
+
+    @given(integers(), sampled_from([2, 3, 7919, 2**31 - 1, 2**255 - 19, 2**521 - 1]),
+           sampled_from([True, False]))
+    def test_inverso_modular(self, a, primo, pow_inverso):
+        with mock.patch.object(aritmetica_elemental, '_POW_INVERSO', pow_inverso):
+            if a % primo == 0:
+                with self.assertRaises(ZeroDivisionError):
+                    inverso_modular(a, primo, primo=True)
+            else:
+                inverso = inverso_modular(a, primo, primo=True)
+                assert 0 < inverso < primo and a * inverso % primo == 1
+                assert inverso_modular(a, primo) == inverso
+            with self.assertRaises(ZeroDivisionError):
+                inverso_modular(6 * a, 2**64 + 2)
+
     @given(lists(integers()), lists(integers()), sampled_from(primos))
     def test_alg_euclides_polinomios(self, l1, l2, primo):
         assume(l1)
@@ -171,6 +332,52 @@ class TestAlgoritmoExtendidoEuclides(unittest.TestCase):
             assert s.grado() <= h.grado() and t.grado() <= g.grado()
 
 
+    @settings(deadline=None, max_examples=40)
+    @given(sampled_from([2, 3, 31, 2**61 - 1, 2**127 - 1]), integers(min_value=0, max_value=150),
+           integers(min_value=0, max_value=150), integers(min_value=0, max_value=60),
+           sampled_from([2, 8, 32]))
+    def test_medio_mcd(self, primo, n, m, k, umbral):
+        # con un umbral pequeño se recorre la recursión del medio mcd
+        # y el resultado debe coincidir con el algoritmo clásico
+        rng = random.Random(n * m + k)
+        aleatorio = lambda grado: [rng.randrange(primo) for _ in range(grado)] + [1]
+        comun = aleatorio(k)
+        f = aritmetica_elemental._producto_coeficientes(aleatorio(n), comun, primo)
+        g = aritmetica_elemental._producto_coeficientes(aleatorio(m), comun, primo)
+        cofactores = [([1], []), ([], [1])]
+        euclides = aritmetica_elemental._euclides_coeficientes
+        d, (s, t) = euclides(f, g, primo, cofactores, umbral=umbral)
+        assert (d, [s, t]) == euclides(f, g, primo, cofactores, umbral=float('inf'))
+        assert len(d) >= len(comun)
+        producto = aritmetica_elemental._producto_coeficientes
+        suma = aritmetica_elemental._suma_coeficientes
+        assert suma(producto(s, f, primo), producto(t, g, primo), primo) == d
+
+class TestFactorizacion(unittest.TestCase):
+    """Conjuto de test para es_primo, factoriza y teorema_chino_resto"""
+    @given(integers(min_value=-10, max_value=10**4))
+    def test_es_primo(self, n):
+        criba = n > 1 and all(n % d for d in range(2, int(n**0.5) + 1))
+        assert es_primo(n) == criba
+
+    @given(integers(min_value=1, max_value=2**80))
+    def test_factoriza(self, n):
+        factores = factoriza(n)
+        producto = 1
+        for primo, exponente in factores.items():
+            assert es_primo(primo) and exponente >= 1
+            producto *= primo ** exponente
+        assert producto == n
+
+    @given(lists(integers(min_value=0), min_size=1, max_size=5), integers(min_value=0, max_value=20))
+    def test_teorema_chino_resto(self, restos, inicio):
+        modulos = [p for p in primos[inicio:] + primos[:inicio]][:len(restos)]
+        restos = restos[:len(modulos)]
+        x = teorema_chino_resto(restos, modulos)
+        for r, m in zip(restos, modulos):
+            assert x % m == r % m
+
+
 def load_tests(loader, tests, ignore):
     """Añade los ejemplos insertados en los docstring."""
     tests.addTests(doctest.DocTestSuite(aritmetica_elemental))
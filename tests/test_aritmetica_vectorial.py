@@ -0,0 +1,140 @@
+import sys
+sys.path.append('../ccepy')
+import random
+import unittest
+from unittest import mock
+import doctest
+
+from hypothesis import given, settings
+from hypothesis.strategies import integers, lists, sampled_from
+
+from ccepy import aritmetica_vectorial  # para cargar los docstring
+from ccepy.aritmetica_vectorial import VectorZp, PolinomioZpVectorial
+from ccepy.aritmetica_elemental import Zp, PolinomioZp
+from ccepy.aritmetica_elemental import _producto_coeficientes, _divmod_coeficientes
+
+primos = [2, 3, 7, 251, 65537, 2**31 - 1]
+
+# con NumPy (si está instalado) y con listas de Python
+motores = [aritmetica_vectorial.numpy, None] if aritmetica_vectorial.numpy is not None else [None]
+
+
+class TestVectorZp(unittest.TestCase):
+    """Conjunto de test para VectorZp"""
+    @settings(deadline=None)
+    @given(sampled_from(primos), lists(integers(), min_size=1, max_size=20),
+           lists(integers(), min_size=1, max_size=20), integers(min_value=-5, max_value=2**40))
+    def test_coincide_con_Zp(self, primo, l1, l2, e):
+        n = min(len(l1), len(l2))
+        l1, l2 = l1[:n], l2[:n]
+        Z = Zp(primo)
+        a, b = [Z(x) for x in l1], [Z(x) for x in l2]
+        for motor in motores:
+            with mock.patch.object(aritmetica_vectorial, 'numpy', motor):
+                u, v = VectorZp(l1, primo), VectorZp(b, primo)
+                assert u.elementos() == a and list(v) == b and len(u) == n
+                assert (u + v).elementos() == [x + y for x, y in zip(a, b)]
+                assert (u - v).elementos() == [x - y for x, y in zip(a, b)]
+                assert (u * v).elementos() == [x * y for x, y in zip(a, b)]
+                assert (e - u * e).elementos() == [e - x * e for x in a]
+                assert u.producto_escalar(v) == sum((x * y for x, y in zip(a, b)), Z(0))
+                if e >= 0 or all(a):
+                    assert (u ** e).elementos() == [x ** e for x in a]
+                if all(b):
+                    assert v.inverso().elementos() == [y.inverso() for y in b]
+                    assert (u / v).elementos() == [x / y for x, y in zip(a, b)]
+                else:
+                    with self.assertRaises(ZeroDivisionError):
+                        v.inverso()
+
+    def test_errores(self):
+        for motor in motores:
+            with mock.patch.object(aritmetica_vectorial, 'numpy', motor):
+                with self.assertRaises(ValueError):
+                    VectorZp([1, 2], 2**31 + 11)
+                with self.assertRaises(ValueError):
+                    VectorZp([1, 2], 7) + VectorZp([1, 2, 3], 7)
+                with self.assertRaises(ValueError):
+                    VectorZp([1, 2], 7) * VectorZp([1, 2], 5)
+                u = VectorZp(range(10), 11)
+                assert u[2:4] == VectorZp([2, 3], 11) and u[-1] == 9
+                assert u != VectorZp(range(10), 13)
+
+    @unittest.skipIf(aritmetica_vectorial.numpy is None, "NumPy no está instalado")
+    def test_array_numpy(self):
+        numpy = aritmetica_vectorial.numpy
+        p = 2**31 - 1
+        datos = numpy.arange(-5, 10 ** 5, dtype=numpy.int64) * 65537
+        u = VectorZp(datos, p)
+        assert u.enteros() == [int(x) % p for x in datos.tolist()]
+        assert (u * u).enteros()[-1] == (int(datos[-1]) ** 2) % p
+
+
+class TestPolinomioZpVectorial(unittest.TestCase):
+    """Conjunto de test para PolinomioZpVectorial"""
+    @settings(deadline=None)
+    @given(sampled_from(primos), lists(integers(), max_size=12), lists(integers(), max_size=8),
+           integers(min_value=0, max_value=4), lists(integers(), max_size=5))
+    def test_coincide_con_PolinomioZp(self, primo, l1, l2, e, puntos):
+        f, g = PolinomioZp(l1 or [0], primo), PolinomioZp(l2 or [0], primo)
+        for motor in motores:
+            with mock.patch.object(aritmetica_vectorial, 'numpy', motor):
+                u, v = PolinomioZpVectorial(l1, primo), PolinomioZpVectorial.de_polinomio(g)
+                assert u == f and f == u and not f != u and hash(u) == hash(f)
+                assert u.a_polinomio() == f and len({u, f}) == len({f, u}) == 1
+                assert (u == primo) is (f == primo) is False
+                assert f + v == u + v and f - v == u - v and f * v == u * v
+                assert u.coeficientes == f.coeficientes and u.grado() == f.grado()
+                assert u.coeficiente_lider() == f.coeficiente_lider()
+                assert u + v == f + g and u - g == f - g and 3 - u == 3 - f
+                assert u * v == f * g and u * 5 == f * 5 and u ** e == f ** e
+                if g != 0:
+                    q, r = divmod(u, v)
+                    assert r.grado() < v.grado() and q * v + r == u
+                    assert u / v == q and u % g == r
+                    assert v.reduce_lote([u, f, l1]) == [r, r, r]
+                Z = Zp(primo)
+                valores = [sum((c * Z(x) ** i for i, c in enumerate(f.coeficientes)), Z(0))
+                           for x in puntos]
+                assert u.evalua(puntos).elementos() == valores
+                assert [u.evalua(x) for x in puntos] == valores
+
+    @settings(deadline=None, max_examples=20)
+    @given(sampled_from([2, 65537, 2**31 - 1]), integers(min_value=0, max_value=1500),
+           integers(min_value=0, max_value=700), integers())
+    def test_polinomios_grandes(self, primo, n, m, semilla):
+        # la FFT y la división con la iteración de Newton frente a las
+        # operaciones con listas de aritmetica_elemental
+        rng = random.Random(semilla)
+        a = [rng.randrange(primo) for _ in range(n)]
+        b = [rng.randrange(primo) for _ in range(m)] + [rng.randrange(1, primo)]
+        f, g = PolinomioZpVectorial(a, primo), PolinomioZpVectorial(b, primo)
+        assert (f * g).enteros() == _producto_coeficientes(f.enteros(), g.enteros(), primo)
+        q, r = divmod(f, g)
+        assert (q.enteros(), r.enteros()) == _divmod_coeficientes(f.enteros(), g.enteros(), primo)
+        assert g.reduce_lote([f, f * 2]) == [r, r * 2]
+
+    def test_errores(self):
+        for motor in motores:
+            with mock.patch.object(aritmetica_vectorial, 'numpy', motor):
+                f = PolinomioZpVectorial([1, 2, 3], 7)
+                with self.assertRaises(ValueError):
+                    PolinomioZpVectorial([1], 2**31 + 11)
+                with self.assertRaises(ValueError):
+                    f + PolinomioZpVectorial([1], 5)
+                with self.assertRaises(ZeroDivisionError):
+                    divmod(f, PolinomioZpVectorial([0, 7], 7))
+                with self.assertRaises(ValueError):
+                    f ** -1
+                with self.assertRaises(AttributeError):
+                    f.p = 5
+
+
+def load_tests(loader, tests, ignore):
+    """Añade los ejemplos insertados en los docstring."""
+    tests.addTests(doctest.DocTestSuite(aritmetica_vectorial))
+    return tests
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import sys
+sys.path.append('../ccepy')
+import unittest
+
+from benchmarks import nucleo
+from benchmarks import aritmetica, curvas, esquemas  # registran las mediciones
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Conjuto de test para el banco de pruebas de rendimiento"""
+    def test_ejecuta_compara(self):
+        resultados = nucleo.ejecuta(r"Zp\.suma\[p31\]|suma\[Anomalous\]", tiempo_minimo=0.001, repeticiones=2)
+        assert list(resultados['resultados']) == ["aritmetica/Zp.suma[p31]", "curvas/suma[Anomalous]"]
+        assert resultados['metadatos']['semilla'] == nucleo.SEMILLA
+
+        mas_lentos = {'metadatos': {}, 'resultados': {}}
+        for nombre, resultado in resultados['resultados'].items():
+            mas_lentos['resultados'][nombre] = dict(resultado)
+            mas_lentos['resultados'][nombre]['segundos_por_operacion'] *= 2
+        comparacion = nucleo.compara(resultados, mas_lentos, umbral=0.5)
+        assert [regresion for *_, regresion in comparacion] == [True, True]
+        comparacion = nucleo.compara(mas_lentos, resultados, umbral=0.5)
+        assert [regresion for *_, regresion in comparacion] == [False, False]
+
+    def test_nombres_unicos(self):
+        with self.assertRaises(ValueError):
+            nucleo.medicion("aritmetica/Zp.suma[p31]")(lambda: None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import sys
+sys.path.append('../ccepy')
+import unittest
+import doctest
+import random
+
+from hypothesis import given, assume, settings
+from hypothesis.strategies import integers, sampled_from
+
+from ccepy import conteo_puntos
+from ccepy.conteo_puntos import orden_curva, polinomio_division, _punto_aleatorio
+from ccepy.aritmetica_elemental import PolinomioZp, es_primo
+from ccepy.cuerpos_finitos import Fq
+from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq, curva_eliptica_sobre_F2m
+
+
+primos = [5, 7, 11, 13, 97, 101, 211, 1009, 3851, 10007]
+
+
+class TestOrdenCurva(unittest.TestCase):
+    """Conjuto de test para orden_curva"""
+    @classmethod
+    def setUpClass(cls):
+        random.seed(5040)
+
+    @settings(deadline=None, max_examples=40)
+    @given(sampled_from(primos), integers(min_value=0), integers(min_value=0))
+    def test_metodos_cuerpo_primo(self, p, a, b):
+        assume((4 * a**3 + 27 * b**2) % p != 0)
+        E = curva_eliptica_sobre_Fq(a, b, p)
+        ordenes = [orden_curva(E, metodo) for metodo in ('enumeracion', 'bsgs', 'schoof')]
+        assert ordenes[0] == ordenes[1] == ordenes[2]
+
+    @settings(deadline=None, max_examples=10)
+    @given(sampled_from([(5, 2), (7, 2), (5, 3), (11, 2)]), integers(min_value=1),
+           integers(min_value=1))
+    def test_metodos_cuerpo_no_primo(self, pn, a, b):
+        p, n = pn
+        F = Fq(p, n)
+        A = F([a % p, (a // p) % p])
+        B = F([b % p, (b // p) % p])
+        assume(F(4) * A**3 + F(27) * B**2 != F.cero())
+        E = curva_eliptica_sobre_Fq(A, B, p, n, F.pol_irreducible)
+        assert orden_curva(E, 'enumeracion') == orden_curva(E, 'bsgs')
+
+    @settings(deadline=None, max_examples=10)
+    @given(sampled_from([3, 4, 5, 7, 8]), integers(min_value=0), integers(min_value=1))
+    def test_metodos_caracteristica_2(self, m, a, b):
+        F = Fq(2, m)
+        A = F([(a >> i) & 1 for i in range(m)])
+        B = F([(b >> i) & 1 for i in range(m)])
+        assume(B != F.cero())
+        E = curva_eliptica_sobre_F2m(A, B, m, F.pol_irreducible)
+        assert orden_curva(E, 'enumeracion') == orden_curva(E, 'bsgs')
+
+    @settings(deadline=None, max_examples=5)
+    @given(integers(min_value=1), integers(min_value=1))
+    def test_schoof(self, a, b):
+        p = 2**40 - 87
+        E = curva_eliptica_sobre_Fq(a, b, p)
+        N = orden_curva(E, 'schoof')
+        assert abs(N - (p + 1)) <= 2 * p**0.5
+        for _ in range(3):
+            assert (N * _punto_aleatorio(E)).es_elemento_neutro()
+        assert orden_curva(E, 'bsgs') == N
+
+    def test_curva_famosa(self):
+        # a partir de 60 bits el método por defecto es el de Schoof
+        p = 2**64 - 59
+        assert es_primo(p)
+        E = curva_eliptica_sobre_Fq(2, 3, p)
+        assert orden_curva(E) == orden_curva(E, 'schoof') == orden_curva(E, 'bsgs')
+
+
+class TestPolinomioDivision(unittest.TestCase):
+    """Conjuto de test para polinomio_division"""
+    def test_raices_puntos_torsion(self):
+        p = 101
+        E = curva_eliptica_sobre_Fq(2, 3, p)
+        puntos = [E(x, y) for x in range(p) for y in range(p) if E.contiene(E.Fq(x), E.Fq(y))]
+        for n in [3, 5, 7, 9]:
+            psi = polinomio_division(E, n)
+            assert psi.grado() == (n**2 - 1) // 2
+            for P in puntos:
+                valor = sum(c * P.x**i for i, c in enumerate(psi.coeficientes))
+                assert (valor == 0) == (n * P).es_elemento_neutro()
+
+    def test_pares(self):
+        p = 97
+        E = curva_eliptica_sobre_Fq(2, 3, p)
+        assert polinomio_division(E, 2) == PolinomioZp([2], p)
+        # psi_4 / y = 4 (x^6 + 5 a x^4 + 20 b x^3 - 5 a^2 x^2 - 4 a b x - 8 b^2 - a^3)
+        assert polinomio_division(E, 4) == PolinomioZp([-4 * 80, -4 * 24, -4 * 20, 4 * 60, 4 * 10, 0, 4], p)
+
+
+def load_tests(loader, tests, ignore):
+    """Añade los ejemplos insertados en los docstring."""
+    tests.addTests(doctest.DocTestSuite(conteo_puntos))
+    return tests
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,15 @@
 import sys
 sys.path.append('../ccepy')
+import os
+import pickle
+import tempfile
 import unittest
+from unittest import mock
 
-from hypothesis import given, assume
+from hypothesis import given, assume, settings
 from hypothesis.strategies import integers, lists, sampled_from
 
-from ccepy.cuerpos_finitos import Fq
+from ccepy.cuerpos_finitos import Fq, FqZech, _TablasZech
 
 
 # parte de la secuencia A000040 de OEIS
@@ -58,6 +62,132 @@ class TestElementoFpn(unittest.TestCase):
         if x != Fpn.cero():
             assert x ** e / x ** f == x ** (e - f)
 
+    @settings(deadline=None)
+    @given(sampled_from(primos), integers(min_value=2, max_value=4), lists(integers()),
+        lists(integers()), integers(min_value=0, max_value=4))
+    def test_frobenius_traza_norma(self, p, n, l1, l2, k):
+        assume(l1)
+        assume(l2)
+        Fpn = Fq(p, n)
+        x, y = Fpn(l1), Fpn(l2)
+        conjugado = x
+        for _ in range(k):
+            conjugado = conjugado * conjugado ** (p - 1)
+        assert x.frobenius(k) == conjugado
+        assert (x + y).frobenius(k) == x.frobenius(k) + y.frobenius(k)
+        assert (x * y).frobenius(k) == x.frobenius(k) * y.frobenius(k)
+        assert (x + y).traza() == x.traza() + y.traza()
+        assert (x * y).norma() == x.norma() * y.norma()
+        assert x.norma() == (x ** ((p ** n - 1) // (p - 1))).coeficientes[0]
+
+    @settings(deadline=None)
+    @given(sampled_from(primos), integers(min_value=2, max_value=6), lists(integers()))
+    def test_inverso_itoh_tsujii(self, p, n, l1):
+        assume(l1)
+        Fpn = Fq(p, n)
+        x = Fpn(l1)
+        assume(x != Fpn.cero())
+        assert x * x.inverso() == Fpn.uno()
+        assert Fpn(x._inverso_itoh_tsujii()) == x.inverso()
+
+    @settings(deadline=None)
+    @given(sampled_from(primos), integers(min_value=2, max_value=3), lists(integers()),
+        lists(integers()))
+    def test_hash(self, p, n, l1, l2):
+        assume(l1)
+        assume(l2)
+        Fpn = Fq(p, n)
+        x, y = Fpn(l1), Fpn(l2)
+        assert hash(x) == hash(Fpn(l1)) == hash(x * Fpn.uno())
+        assert (x == y) == (len({x, y}) == 1)
+        assert {x: 1}.get(y) == (1 if x == y else None)
+        if x == Fpn(x.coeficientes[0]):
+            assert x == int(x.coeficientes[0]) and hash(x) == hash(int(x.coeficientes[0]))
+
+    def test_constantes_y_enteros(self):
+        # limitación documentada: las constantes son iguales a cualquier
+        # entero congruente, pero el hash solo coincide con el reducido
+        F25 = Fq(5, 2)
+        assert F25(3) == 8 and F25(3) == 3
+        assert hash(F25(3)) == hash(3) != hash(8)
+
+
+class TestElementoFqZech(unittest.TestCase):
+    """Conjuto de test para ElementoFqZech"""
+    @settings(deadline=None)
+    @given(sampled_from(primos[:6]), integers(min_value=1, max_value=3), lists(integers()),
+        lists(integers()), integers(min_value=-10, max_value=10))
+    def test_igual_que_representacion_polinomial(self, p, n, l1, l2, e):
+        assume(l1)
+        assume(l2)
+        assume(p ** n <= 2 ** 12)
+        Z = FqZech(p, n)
+        F = Fq(p, n, Z.pol_irreducible) if n > 1 else Fq(p)
+        x, y = Z(l1), Z(l2)
+        X, Y = F(l1 if n > 1 else l1[0]), F(l2 if n > 1 else l2[0])
+        def convierte(elemento):
+            return Z(elemento if n == 1 else elemento.coeficientes)
+        assert x + y == convierte(X + Y)
+        assert x - y == convierte(X - Y)
+        assert x * y == convierte(X * Y)
+        if X != 0:
+            assert x ** e == convierte(X ** e)
+            assert x * x.inverso() == Z.uno()
+            assert Z.generador() ** x.logaritmo() == x
+        if Y != 0:
+            assert x / y == convierte(X / Y)
+        assert pickle.loads(pickle.dumps(x)) == x
+        assert hash(x) == hash(Z(l1)) == hash(X)
+        assert len({x, X}) == 1
+
+    def test_cache(self):
+        pol = Fq(3, 5).pol_irreducible
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "tablas_zech")
+            Z = FqZech(3, 5, pol, ruta_cache=ruta)
+            assert os.path.exists(ruta)
+            # la ruta no forma parte de la clave de la caché
+            assert FqZech(3, 5, pol, ruta_cache=ruta) is Z
+            assert FqZech(3, 5) is Z and FqZech(3, 5, pol) is Z
+            abiertos = []
+
+            def abre(*args):
+                abiertos.append(open(*args))
+                return abiertos[-1]
+
+            with mock.patch('ccepy.cuerpos_finitos.open', abre, create=True):
+                with _TablasZech.carga(ruta, 3, 5, pol) as tablas:
+                    assert list(tablas.zech) == list(Z._tablas.zech)
+                    assert list(tablas.logaritmos) == list(Z._tablas.logaritmos)
+                    assert tablas.generador == Z._tablas.generador
+                # el fichero se cierra también si no contiene las tablas
+                with self.assertRaises(ValueError):
+                    _TablasZech.carga(ruta, 3, 4, Fq(3, 4).pol_irreducible)
+                with open(ruta, 'r+b') as fichero:
+                    fichero.truncate(100)
+                with self.assertRaises(ValueError):
+                    _TablasZech.carga(ruta, 3, 5, pol)
+            assert len(abiertos) == 3 and all(fichero.closed for fichero in abiertos)
+
+    def test_cero_y_tipos_ajenos(self):
+        for p, n in [(2, 4), (5, 1)]:
+            Z, F = FqZech(p, n), Fq(p, n)
+            for cero in [Z.cero(), F.cero()]:
+                assert cero ** 0 == 1 and cero ** 2 == 0
+                with self.assertRaises(ZeroDivisionError):
+                    cero ** -1
+            assert Z(1) == 1 and hash(Z(1)) == hash(1) and hash(Z.cero()) == hash(0)
+            assert Z.uno() != None and not Z.uno() == None
+            assert Z.uno() != "1" and Z.uno() != 1.5
+        F16, F16Zech = Fq(2, 4), FqZech(2, 4)
+        assert F16.uno() != None and not F16.uno() == None
+        assert F16.uno() == F16Zech.uno() and F16Zech.uno() == F16.uno()
+        assert len({F16.uno(), F16Zech.uno()}) == 1
+
+    def test_cuerpo_grande(self):
+        with self.assertRaises(ValueError):
+            FqZech(2, 40)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,7 @@ import sys
 sys.path.append('../ccepy')
 import unittest
 import doctest
+import pickle
 
 from hypothesis import given, assume
 from hypothesis.strategies import integers, sampled_from
@@ -50,6 +51,33 @@ class TestCurvaElipticaFq(unittest.TestCase):
 
         assert P * e == multiplicacion
 
+    @given(sampled_from(curvas_eliptipcas_sobre_Fq_famosas), integers(min_value=0))
+    def test_serializacion(self, ce, k):
+        E, generador, orden = procesar_parametros_curva_eliptica(ce)
+
+        P = generador * k
+        Q = pickle.loads(pickle.dumps(P))
+        assert type(Q) is E
+        assert Q == P
+
+    @given(sampled_from(curvas_eliptipcas_sobre_Fq_famosas), integers(min_value=0),
+           integers(min_value=0))
+    def test_hash_inmutable(self, ce, k1, k2):
+        E, generador, orden = procesar_parametros_curva_eliptica(ce)
+
+        P = generador * k1
+        Q = generador * k2
+        O = E.elemento_neutro()
+
+        assert hash(P) == hash(pickle.loads(pickle.dumps(P)))
+        assert hash(P + O) == hash(P)
+        assert hash(O) == hash(P + (-P))
+        assert (P == Q) == (len({P, Q}) == 1)
+        assert {P: k1}[generador * k1] == k1
+        with self.assertRaises(AttributeError):
+            P._x = Q._x
+        assert P != None
+
 
 def load_tests(loader, tests, ignore):
     """Añade los ejemplos insertados en los docstring."""
@@ -2,13 +2,18 @@ import sys
 sys.path.append('../ccepy')
 import unittest
 import random
+import io
+import os
+import tempfile
+from unittest import mock
 
-from hypothesis import given, assume
-from hypothesis.strategies import sampled_from, text
+from hypothesis import given, assume, settings
+from hypothesis.strategies import sampled_from, text, lists, binary, integers
 
-from ccepy.esquemas_criptograficos import ECDH, ECDSA
+from ccepy.esquemas_criptograficos import ECDH, ECIES, ElGamal, TablaLogaritmoDiscreto, ECDSA, Schnorr
 from ccepy.listado_curvas_elipticas import curvas_eliptipcas_sobre_Fq_famosas
 from ccepy.listado_curvas_elipticas import procesar_parametros_curva_eliptica
+from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
 
 
 class TestECDH(unittest.TestCase):
@@ -31,6 +36,126 @@ class TestECDH(unittest.TestCase):
         assume(eva.llave_privada != alicia.llave_privada)
         assert secreto_alicia != eva.calcula_secreto_compartido(bob.llave_publica)
 
+    @settings(deadline=None)
+    @given(sampled_from(curvas_eliptipcas_sobre_Fq_famosas))
+    def test_secretos_compartidos(self, ce):
+        E, generador, orden = procesar_parametros_curva_eliptica(ce)
+
+        alicia = ECDH(E, generador, orden)
+        otros = [ECDH(E, generador, orden) for _ in range(3)]
+        llaves_publicas = [otro.llave_publica for otro in otros]
+        secretos = alicia.calcula_secretos_compartidos(llaves_publicas)
+        assert secretos == [alicia.calcula_secreto_compartido(Q) for Q in llaves_publicas]
+
+    def test_secretos_compartidos_procesos(self):
+        E, generador, orden = procesar_parametros_curva_eliptica(curvas_eliptipcas_sobre_Fq_famosas[0])
+
+        alicia = ECDH(E, generador, orden)
+        llaves_publicas = [ECDH(E, generador, orden).llave_publica for _ in range(5)]
+        secretos = alicia.calcula_secretos_compartidos(llaves_publicas, procesos=2)
+        assert secretos == alicia.calcula_secretos_compartidos(llaves_publicas)
+
+
+class TestECIES(unittest.TestCase):
+    """Conjuto de test para ECIES"""
+    @classmethod
+    def setUpClass(cls):
+        random.seed(5040)
+
+    @settings(deadline=None)
+    @given(sampled_from(curvas_eliptipcas_sobre_Fq_famosas), binary(), integers(min_value=1, max_value=64))
+    def test_ECIES(self, ce, mensaje, tam_bloque):
+        E, generador, orden = procesar_parametros_curva_eliptica(ce)
+
+        alicia = ECIES(E, generador, orden)
+        bob = ECIES(E, generador, orden)
+        entrada, cifrado = io.BytesIO(mensaje), io.BytesIO()
+        alicia.cifra_fichero(entrada, cifrado, bob.llave_publica, tam_bloque=tam_bloque)
+        cifrado = cifrado.getvalue()
+        assert bob.descifra(cifrado) == mensaje
+
+        eva = ECIES(E, generador, orden)
+        assume(eva.llave_privada != bob.llave_privada)
+        with self.assertRaises(ValueError):
+            eva.descifra(cifrado)
+
+        manipulado = bytearray(cifrado)
+        manipulado[-1] ^= 1
+        with self.assertRaises(ValueError):
+            bob.descifra(bytes(manipulado))
+        with self.assertRaises(ValueError):
+            bob.descifra(cifrado[:-1])
+
+    def test_llave_efimera_orden_pequeno(self):
+        # E tiene cofactor y T = (50, 0) es de orden 2: si la llave privada
+        # es par, el secreto compartido d T es el elemento neutro
+        E = curva_eliptica_sobre_Fq(a=324, b=1287, p=3851)
+        bob = ECIES(E, E(920, 303), 1964)
+        bob.llave_privada = 10
+        cifrado = b'\x04' + (50).to_bytes(2, 'big') + (0).to_bytes(2, 'big') + bytes(40)
+        with self.assertRaisesRegex(ValueError, "La llave efímera no es válida."):
+            bob.descifra(cifrado)
+
+
+class TestElGamal(unittest.TestCase):
+    """Conjuto de test para ElGamal"""
+    @classmethod
+    def setUpClass(cls):
+        random.seed(5040)
+
+    @settings(deadline=None, max_examples=20)
+    @given(sampled_from(curvas_eliptipcas_sobre_Fq_famosas),
+           lists(integers(min_value=0, max_value=99), min_size=1, max_size=5))
+    def test_ElGamal(self, ce, mensajes):
+        E, generador, orden = procesar_parametros_curva_eliptica(ce)
+
+        alicia = ElGamal(E, generador, orden)
+        bob = ElGamal(E, generador, orden)
+        tabla = TablaLogaritmoDiscreto(generador, limite=1000)
+        cifrados = [bob.cifra(m, alicia.llave_publica) for m in mensajes]
+        assert alicia.descifra_lote(cifrados, tabla) == mensajes
+
+        suma = cifrados[0]
+        for cifrado in cifrados[1:]:
+            suma = suma + cifrado
+        assert alicia.descifra(suma, tabla) == sum(mensajes)
+        assert alicia.descifra(3 * cifrados[0], tabla) == 3 * mensajes[0]
+
+        otros = bob.rerandomiza_lote(cifrados, alicia.llave_publica)
+        assert all(c.c1 != o.c1 for c, o in zip(cifrados, otros))
+        assert alicia.descifra_lote(otros, tabla) == mensajes
+
+    def test_tabla_en_fichero(self):
+        E, generador, orden = procesar_parametros_curva_eliptica(curvas_eliptipcas_sobre_Fq_famosas[0])
+
+        tabla = TablaLogaritmoDiscreto(generador, limite=5000)
+        descriptor, ruta = tempfile.mkstemp()
+        os.close(descriptor)
+        try:
+            tabla.guarda(ruta)
+            abiertos = []
+
+            def abre(*args):
+                abiertos.append(open(*args))
+                return abiertos[-1]
+
+            with mock.patch('ccepy.esquemas_criptograficos.open', abre, create=True):
+                with TablaLogaritmoDiscreto.carga(ruta, generador) as cargada:
+                    for m in [0, 1, 2500, 4999]:
+                        assert cargada.logaritmo(m * generador) == m
+                    assert cargada.logaritmo(5000 * generador) is None
+                # el fichero se cierra también si no contiene una tabla válida
+                with self.assertRaises(ValueError):
+                    TablaLogaritmoDiscreto.carga(ruta, 2 * generador)
+                with open(ruta, 'r+b') as fichero:
+                    fichero.truncate(60)
+                with self.assertRaises(ValueError):
+                    TablaLogaritmoDiscreto.carga(ruta, generador)
+            assert len(abiertos) == 3 and all(fichero.closed for fichero in abiertos)
+            tabla.cierra()  # no hace nada con una tabla en memoria
+        finally:
+            os.remove(ruta)
+
 
 class TestECDSA(unittest.TestCase):
     """Conjuto de test para ECDSA"""
@@ -57,5 +182,73 @@ class TestECDSA(unittest.TestCase):
         assert not bob.verifica(mensaje, rr, ss, alicia.llave_publica)
 
 
+class TestSchnorr(unittest.TestCase):
+    """Conjuto de test para Schnorr"""
+    @classmethod
+    def setUpClass(cls):
+        random.seed(5040)
+
+    @settings(deadline=None)
+    @given(sampled_from(curvas_eliptipcas_sobre_Fq_famosas), text(), text())
+    def test_Schnorr(self, ce, mensaje, otro_mensaje):
+        E, generador, orden = procesar_parametros_curva_eliptica(ce)
+
+        alicia = Schnorr(E, generador, orden)
+        bob = Schnorr(E, generador, orden)
+        R, s = alicia.firma(mensaje)
+        assert bob.verifica(mensaje, R, s, alicia.llave_publica)
+
+        assume(mensaje != otro_mensaje)
+        assert not bob.verifica(otro_mensaje, R, s, alicia.llave_publica)
+
+        eva = Schnorr(E, generador, orden)
+        assume(eva.llave_privada != alicia.llave_privada)
+        assert not bob.verifica(mensaje, R, s, eva.llave_publica)
+        RR, ss = eva.firma(mensaje)
+        assert not bob.verifica(mensaje, RR, ss, alicia.llave_publica)
+
+    @settings(deadline=None)
+    @given(sampled_from(curvas_eliptipcas_sobre_Fq_famosas), lists(text(), min_size=1, max_size=4))
+    def test_verifica_lote(self, ce, mensajes):
+        E, generador, orden = procesar_parametros_curva_eliptica(ce)
+
+        firmantes = [Schnorr(E, generador, orden) for _ in range(2)]
+        bob = Schnorr(E, generador, orden)
+        firmas = []
+        for i, mensaje in enumerate(mensajes):
+            firmante = firmantes[i % 2]
+            R, s = firmante.firma(mensaje)
+            firmas.append((mensaje, R, s, firmante.llave_publica))
+        assert bob.verifica_lote(firmas)
+
+        mensaje, R, s, Q = firmas[-1]
+        firmas[-1] = (mensaje, R, (s + 1) % orden, Q)
+        assert not bob.verifica_lote(firmas)
+
+    def test_verifica_lote_cofactor(self):
+        # E es Z/2 x Z/1964 y el generador tiene orden primo 491; T tiene
+        # orden 2, así que desaparece con un peso par
+        E = curva_eliptica_sobre_Fq(a=324, b=1287, p=3851)
+        generador, orden, T = E(490, 204), 491, E(50, 0)
+        alicia, bob = Schnorr(E, generador, orden), Schnorr(E, generador, orden)
+        firmas = [(m,) + alicia.firma(m) + (alicia.llave_publica,) for m in ["hola", "adiós"]]
+        assert bob.verifica_lote(firmas)
+
+        # firma con R' = k P + T y s = k + e d: s P - e Q = R' - T
+        k = 7
+        R = k * generador + T
+        s = (k + alicia._reto(R, alicia.llave_publica, "hola") * alicia.llave_privada) % orden
+        falsa = ("hola", R, s, alicia.llave_publica)
+        assert not bob.verifica(*falsa)
+        with mock.patch('ccepy.esquemas_criptograficos._aleatorio_seguro.getrandbits', lambda bits: 2):
+            assert not bob.verifica_lote([firmas[0], falsa])
+            # lo mismo con una llave pública fuera del subgrupo
+            Q = alicia.llave_publica + T
+            R = k * generador
+            s = (k + alicia._reto(R, Q, "hola") * alicia.llave_privada) % orden
+            assert not bob.verifica("hola", R, s, Q)
+            assert not bob.verifica_lote([firmas[0], ("hola", R, s, Q)])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,51 @@
+import sys
+sys.path.append('../ccepy')
+import unittest
+import doctest
+
+from hypothesis import given, settings
+from hypothesis.strategies import integers, sampled_from
+
+from ccepy import generacion_curvas
+from ccepy.generacion_curvas import genera_curva_orden_primo
+from ccepy.aritmetica_elemental import es_primo
+from ccepy.conteo_puntos import orden_curva
+from ccepy.listado_curvas_elipticas import procesar_parametros_curva_eliptica
+
+
+class TestGeneraCurvaOrdenPrimo(unittest.TestCase):
+    """Conjuto de test para genera_curva_orden_primo"""
+    @settings(deadline=None, max_examples=10)
+    @given(sampled_from([10007, 65537, 1000003, 2**31 - 1]), integers(min_value=1, max_value=4),
+           integers(min_value=0))
+    def test_criterios(self, p, cofactor_maximo, semilla):
+        parametros = genera_curva_orden_primo(p, cofactor_maximo=cofactor_maximo, semilla=semilla)
+        E, P, n = procesar_parametros_curva_eliptica(parametros)
+        N = orden_curva(E, 'bsgs')
+        assert es_primo(n) and N % n == 0 and N // n <= cofactor_maximo
+        assert (n * P).es_elemento_neutro() and not P.es_elemento_neutro()
+        assert n != p
+        assert all(pow(p, k, n) != 1 for k in range(1, 21))
+
+    def test_procesos(self):
+        # el resultado no depende del número de procesos
+        p = 2**40 - 87
+        secuencial = genera_curva_orden_primo(p, semilla=3)
+        paralelo = genera_curva_orden_primo(p, semilla=3, procesos=3)
+        assert secuencial == paralelo
+
+    def test_intentos(self):
+        with self.assertRaises(RuntimeError):
+            genera_curva_orden_primo(10007, semilla=0, intentos=0)
+        with self.assertRaises(ValueError):
+            genera_curva_orden_primo(10001)
+
+
+def load_tests(loader, tests, ignore):
+    """Añade los ejemplos insertados en los docstring."""
+    tests.addTests(doctest.DocTestSuite(generacion_curvas))
+    return tests
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import sys
+sys.path.append('../ccepy')
+import unittest
+import doctest
+
+from hypothesis import given, settings
+from hypothesis.strategies import integers
+
+from ccepy import instrumentacion
+from ccepy.instrumentacion import cuenta_operaciones
+from ccepy.cuerpos_finitos import Fq
+from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq
+from ccepy.listado_curvas_elipticas import parametros_dominio
+
+
+class TestCuentaOperaciones(unittest.TestCase):
+    """Conjuto de test para cuenta_operaciones"""
+    @classmethod
+    def setUpClass(cls):
+        cls.E, cls.G, cls.orden = parametros_dominio('NIST P-224')
+
+    @settings(deadline=None, max_examples=20)
+    @given(integers(min_value=1))
+    def test_multiplicacion_escalar(self, k):
+        E, G = self.E, self.G
+        with cuenta_operaciones(E, E.Fq) as recuento:
+            Q = k * G
+        assert Q == G * k
+        assert recuento[E]['multiplicacion_escalar'] == 1
+        assert recuento[E]['duplicacion'] == k.bit_length()
+        assert recuento[E]['suma'] == bin(k).count("1")
+        assert recuento[E]['normalizacion'] == 1
+        assert recuento[E.Fq]['inversion'] == 1
+
+    def test_restaura_clases(self):
+        E, F = self.E, Fq(3, 5)
+        antes = [dict(vars(clase)) for clase in (E, E.Fq, F)]
+        with self.assertRaises(ZeroDivisionError):
+            with cuenta_operaciones(E, E.Fq, F):
+                F([1, 2]) * F([2, 1, 1])
+                F.cero().inverso()
+        assert [dict(vars(clase)) for clase in (E, E.Fq, F)] == antes
+
+    def test_cuerpo_finito(self):
+        F = Fq(7, 3)
+        x, y = F([1, 2, 3]), F([4, 5])
+        with cuenta_operaciones(F) as recuento:
+            x * x
+            x * y
+            x ** 2
+            x - y
+            x / y
+            3 * y
+        assert recuento[F].pop('reduccion') >= 6
+        assert recuento[F] == {'cuadrado': 2, 'multiplicacion': 2, 'multiplicacion_constante': 1,
+                               'suma': 1, 'inversion': 1}
+
+    def test_duplicacion_afin(self):
+        E = curva_eliptica_sobre_Fq(2, 3, 97)
+        P, Q = E(0, 10), E(3, 6)
+        with cuenta_operaciones(E) as recuento:
+            P + P
+            P + Q
+            P - Q
+        assert recuento[E] == {'duplicacion': 1, 'suma': 2}
+        assert recuento.total('suma') == 2
+
+    def test_clase_no_instrumentable(self):
+        with self.assertRaises(TypeError):
+            with cuenta_operaciones(dict):
+                pass
+
+
+def load_tests(loader, tests, ignore):
+    """Añade los ejemplos insertados en los docstring."""
+    tests.addTests(doctest.DocTestSuite(instrumentacion))
+    return tests
+
+
+if __name__ == '__main__':
+    unittest.main()
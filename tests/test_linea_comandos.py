@@ -0,0 +1,132 @@
+import sys
+sys.path.append('../ccepy')
+import unittest
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+from ccepy.linea_comandos import main
+from ccepy.listado_curvas_elipticas import parametros_dominio
+
+
+def ejecuta(argumentos, entrada=None):
+    """Ejecuta el programa con la entrada dada y devuelve (código, registros)."""
+    descriptor, ruta = tempfile.mkstemp()
+    with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+        for registro in entrada or []:
+            f.write(json.dumps(registro) + '\n')
+    salida = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(salida), contextlib.redirect_stderr(io.StringIO()):
+            codigo = main(argumentos + ([] if entrada is None else [ruta]))
+    finally:
+        os.remove(ruta)
+    return codigo, [json.loads(linea) for linea in salida.getvalue().splitlines()]
+
+
+class TestLineaComandos(unittest.TestCase):
+    """Conjuto de test para el programa de línea de comandos"""
+    curva = ['--curva', 'NIST P-224']
+
+    def test_firma_verifica(self):
+        mensajes = [{'mensaje': 'registro {0}'.format(i)} for i in range(5)]
+        for esquema in ['ecdsa', 'schnorr']:
+            codigo, firmas = ejecuta(['sign', '--esquema', esquema, '--llave-privada', '12345'] +
+                                     self.curva, mensajes)
+            assert codigo == 0 and len(firmas) == 5
+
+            codigo, verificadas = ejecuta(['verify', '--esquema', esquema, '--lote', '2',
+                                           '--procesos', '2'] + self.curva, firmas)
+            assert codigo == 0
+            assert all(registro['valida'] for registro in verificadas)
+
+            firmas[3]['mensaje'] = 'manipulado'
+            codigo, verificadas = ejecuta(['verify', '--esquema', esquema] + self.curva, firmas)
+            assert codigo == 1
+            assert [registro['valida'] for registro in verificadas] == [True, True, True, False, True]
+
+    def test_keygen_ecdh(self):
+        E, generador, orden = parametros_dominio('NIST P-224')
+        codigo, llaves = ejecuta(['keygen', '-n', '3'] + self.curva)
+        assert codigo == 0 and len(llaves) == 3
+        for llave in llaves:
+            assert llave['llave_privada'] * generador == E(*llave['llave_publica'])
+
+        codigo, secretos = ejecuta(['ecdh', '--llave-privada', '7'] + self.curva, llaves)
+        assert codigo == 0
+        for llave, registro in zip(llaves, secretos):
+            assert registro['secreto'] == (7 * E(*llave['llave_publica'])).x
+
+    def test_curva_desconocida(self):
+        codigo, _ = ejecuta(['verify', '--curva', 'no existe'], [])
+        assert codigo == 2
+
+    def test_registros_incorrectos(self):
+        descriptor, ruta = tempfile.mkstemp()
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            f.write('{"mensaje": "hola"}\n\n{"texto": "adios"}\n')
+        try:
+            for procesos in ['1', '2']:
+                errores = io.StringIO()
+                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(errores):
+                    codigo = main(['sign', '--llave-privada', '3', '--procesos', procesos] +
+                                  self.curva + [ruta])
+                assert codigo == 2
+                assert "{0}:3: falta el campo 'mensaje'".format(ruta) in errores.getvalue()
+        finally:
+            os.remove(ruta)
+        errores = io.StringIO()
+        with contextlib.redirect_stderr(errores):
+            assert main(['ecdh', '--llave-privada', '3'] + self.curva + [ruta]) == 2
+        assert "no se puede leer {0}".format(ruta) in errores.getvalue()
+
+    def test_campos_no_validos(self):
+        _, llaves = ejecuta(['keygen', '-n', '1'] + self.curva)
+        Q = llaves[0]['llave_publica']
+        fuera = [Q[0], Q[1] + 1]  # no pertenece a la curva
+        casos = [
+            ('sign', [], {'mensaje': 5}, "'mensaje' debe ser una cadena"),
+            ('verify', [], {'mensaje': 'hola', 'r': 'x', 's': 1, 'llave_publica': Q},
+             "'r' debe ser un entero"),
+            ('verify', ['--esquema', 'schnorr'], {'mensaje': 'hola', 'R': [1], 's': 1, 'llave_publica': Q},
+             "'R' debe ser un punto"),
+            ('ecdh', [], {'llave_publica': [1]}, "'llave_publica' debe ser un punto"),
+            ('ecdh', [], {'llave_publica': fuera}, "no pertenece a la curva"),
+        ]
+        for orden, opciones, registro, mensaje in casos:
+            descriptor, ruta = tempfile.mkstemp()
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+                f.write(json.dumps({'mensaje': 'hola'} if orden == 'sign' else registro) + '\n')
+                f.write(json.dumps(registro) + '\n')
+            errores = io.StringIO()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(errores):
+                    argumentos = [orden] + opciones + self.curva + [ruta]
+                    if orden != 'verify':
+                        argumentos[1:1] = ['--llave-privada', '3']
+                    codigo = main(argumentos)
+            finally:
+                os.remove(ruta)
+            assert codigo == 2
+            linea = 2 if orden == 'sign' else 1
+            assert "{0}:{1}: ".format(ruta, linea) in errores.getvalue()
+            assert mensaje in errores.getvalue()
+
+        # en verify, los puntos fuera de la curva hacen que la firma no sea válida
+        for esquema in ['ecdsa', 'schnorr']:
+            _, firmas = ejecuta(['sign', '--esquema', esquema, '--llave-privada', '12345'] + self.curva,
+                                [{'mensaje': 'hola'}, {'mensaje': 'adios'}])
+            firmas[0]['llave_publica'] = fuera
+            if esquema == 'schnorr':
+                firmas[1]['R'] = [firmas[1]['R'][0], firmas[1]['R'][1] + 1]
+            else:
+                firmas[1]['llave_publica'] = fuera
+            codigo, verificadas = ejecuta(['verify', '--esquema', esquema] + self.curva, firmas)
+            assert codigo == 1
+            assert [registro['valida'] for registro in verificadas] == [False, False]
+
+
+if __name__ == '__main__':
+    unittest.main()
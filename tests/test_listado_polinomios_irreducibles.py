@@ -0,0 +1,73 @@
+import sys
+sys.path.append('../ccepy')
+import os
+import tempfile
+import unittest
+import doctest
+
+from hypothesis import given, settings
+from hypothesis.strategies import sampled_from
+
+from ccepy import listado_polinomios_irreducibles  # para cargar los docstring
+from ccepy.listado_polinomios_irreducibles import polinomio_irreducible, \
+    _TRINOMIOS_PENTANOMIOS_BINARIOS, _IRREDUCIBLES_IMPARES, _polinomio_irreducible
+from ccepy.aritmetica_elemental import PolinomioZp
+from ccepy.cuerpos_finitos import Fq
+
+
+class TestPolinomioIrreducible(unittest.TestCase):
+    """Conjuto de test para polinomio_irreducible"""
+    @settings(deadline=None, max_examples=30)
+    @given(sampled_from([(2, n) for n in _TRINOMIOS_PENTANOMIOS_BINARIOS if n <= 64] +
+                        [clave for clave in _IRREDUCIBLES_IMPARES if clave[1] <= 16]))
+    def test_tablas(self, clave):
+        p, n = clave
+        ruta = os.path.join(tempfile.mkdtemp(), "cache.txt")
+        f = polinomio_irreducible(p, n, ruta)
+        assert f == PolinomioZp.genera_irreducible_disperso(n, p)
+        assert not os.path.exists(ruta)  # estaba en las tablas
+
+    def test_tablas_binarias_estandares(self):
+        # polinomios de los cuerpos binarios del FIPS 186-4
+        estandares = {163: [7, 6, 3], 233: [74], 283: [12, 7, 5], 409: [87], 571: [10, 5, 2]}
+        for n, exponentes in estandares.items():
+            assert list(_TRINOMIOS_PENTANOMIOS_BINARIOS[n]) == exponentes
+
+    def test_cache(self):
+        ruta = os.path.join(tempfile.mkdtemp(), "ccepy", "cache.txt")
+        f = polinomio_irreducible(17, 9, ruta)
+        assert f == PolinomioZp.genera_irreducible_disperso(9, 17)
+        with open(ruta, encoding='utf-8') as fichero:
+            assert fichero.read().split() == ["17", "9"] + \
+                ["{0}:{1}".format(e, c) for e, c in reversed(list(enumerate(f.coeficientes))) if c and e < 9]
+        # se usa lo que haya en la caché
+        g = PolinomioZp.genera_irreducible(grado=7, p=19)
+        with open(ruta, 'a', encoding='utf-8') as fichero:
+            fichero.write("19 7 " + " ".join("{0}:{1}".format(e, c)
+                                             for e, c in reversed(list(enumerate(g.coeficientes))) if c and e < 7))
+        _polinomio_irreducible.cache_clear()
+        assert polinomio_irreducible(19, 7, ruta) == g
+        assert polinomio_irreducible(17, 9, ruta) == f
+
+    def test_cache_corrupta(self):
+        ruta = os.path.join(tempfile.mkdtemp(), "cache.txt")
+        # X^7 + 1 = (X + 1)(X^6 + ... + 1) no es irreducible
+        with open(ruta, 'w', encoding='utf-8') as fichero:
+            fichero.write("19 7 0:1\n")
+        _polinomio_irreducible.cache_clear()
+        f = polinomio_irreducible(19, 7, ruta)
+        assert f.es_irreducible()
+        assert f == PolinomioZp.genera_irreducible_disperso(7, 19)
+
+    def test_fq(self):
+        for p, n in [(2, 4), (3, 5), (2, 163)]:
+            assert Fq(p, n) is Fq(p, n, polinomio_irreducible(p, n))
+
+
+def load_tests(loader, tests, ignore):
+    """Añade los ejemplos insertados en los docstring."""
+    tests.addTests(doctest.DocTestSuite(listado_polinomios_irreducibles))
+    return tests
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import sys
+sys.path.append('../ccepy')
+import unittest
+import doctest
+
+from hypothesis import given, settings
+from hypothesis.strategies import integers
+
+from ccepy import logaritmo_discreto
+from ccepy.logaritmo_discreto import rho_pollard, pohlig_hellman, paso_bebe_paso_gigante, orden_elemento, \
+    canguro
+from ccepy.aritmetica_elemental import Zp
+from ccepy.cuerpos_finitos import Fq, PolinomioZp
+from ccepy.curvas_elipticas import curva_eliptica_sobre_Fq, curva_eliptica_sobre_F2m
+from ccepy.conteo_puntos import _punto_aleatorio
+
+
+class TestRhoPollard(unittest.TestCase):
+    """Conjuto de test para rho_pollard"""
+    @classmethod
+    def setUpClass(cls):
+        cls.E = curva_eliptica_sobre_Fq(1, 28, 10007)
+        cls.P = cls.E(4384, 7691)
+        cls.n = 9851
+        # curva sobre F_{2^13} de orden 2 * 4159
+        pol = PolinomioZp([1, 1, 0, 0, 1, 1, 0, 0, 1, 0, 1, 1, 1, 1], 2)
+        F = Fq(2, 13, pol)
+        E = curva_eliptica_sobre_F2m(F.uno(), F([0, 1]), 13, pol)
+        cls.P_F2m = 2 * _punto_aleatorio(E)
+        cls.n_F2m = 4159
+
+    @settings(deadline=None, max_examples=20)
+    @given(integers(min_value=0), integers(min_value=0))
+    def test_cuerpo_primo(self, k, semilla):
+        k %= self.n
+        assert rho_pollard(self.P, k * self.P, self.n, semilla=semilla) == k
+
+    @settings(deadline=None, max_examples=2)
+    @given(integers(min_value=0))
+    def test_cuerpo_caracteristica_2(self, k):
+        k %= self.n_F2m
+        P = self.P_F2m
+        assert rho_pollard(P, k * P, self.n_F2m, caminos=4, bits_distinguido=2) == k
+
+    def test_procesos_progreso(self):
+        progresos = []
+        k = rho_pollard(self.P, 1234 * self.P, self.n, procesos=2, caminos=4,
+                        bits_distinguido=2, informa=progresos.append, semilla=1)
+        assert k == 1234
+        for anterior, siguiente in zip(progresos, progresos[1:]):
+            assert anterior.pasos < siguiente.pasos
+            assert anterior.puntos_distinguidos <= siguiente.puntos_distinguidos
+
+    def test_subgrupo_pequeno(self):
+        E = curva_eliptica_sobre_Fq(2, 3, 97)
+        P = E(3, 6)
+        assert rho_pollard(P, 3 * P, 5) == 3
+        with self.assertRaises(ValueError):
+            rho_pollard(P, E(0, 10), 5)
+
+
+class TestCanguro(unittest.TestCase):
+    """Conjuto de test para el método de los canguros"""
+    def setUp(self):
+        E = curva_eliptica_sobre_Fq(1843546981, 285990742, 2**31 - 1)
+        self.P = E(695425564, 925964042)
+
+    @settings(deadline=None, max_examples=10)
+    @given(integers(min_value=0, max_value=2**30), integers(min_value=0, max_value=2**20),
+           integers(min_value=0, max_value=2**20))
+    def test_intervalo(self, a, desplazamiento, semilla):
+        b = a + 2**20
+        k = a + desplazamiento
+        assert canguro(self.P, k * self.P, a, b, semilla=semilla) == k
+
+    def test_intervalo_pequeno(self):
+        assert canguro(self.P, 1500 * self.P, 1000, 2000) == 1500
+        with self.assertRaises(ValueError):
+            canguro(self.P, 2500 * self.P, 1000, 2000)
+
+    def test_procesos_progreso(self):
+        progresos = []
+        k = 2**23 + 5 * 2**20 + 12345
+        assert canguro(self.P, k * self.P, 2**23, 2**24 + 2**23, procesos=2, canguros=4,
+                       informa=progresos.append, semilla=1) == k
+        assert progresos
+        assert progresos[-1].pasos <= 16 * progresos[-1].pasos_esperados
+
+    def test_fuera_del_intervalo(self):
+        with self.assertRaises(ValueError):
+            canguro(self.P, 5 * self.P, 2**20, 2**21, pasos_maximos=10000)
+
+
+class TestPohligHellman(unittest.TestCase):
+    """Conjuto de test para pohlig_hellman y paso_bebe_paso_gigante"""
+    @classmethod
+    def setUpClass(cls):
+        # curva de orden 3928 = 2^3 491; P de orden 1964
+        cls.E = curva_eliptica_sobre_Fq(324, 1287, 3851)
+        cls.P = cls.E(900, 1265)
+
+    @settings(deadline=None, max_examples=20)
+    @given(integers(min_value=0))
+    def test_puntos(self, k):
+        k %= 1964
+        assert orden_elemento(self.P) == 1964
+        assert pohlig_hellman(self.P, k * self.P) == k
+        assert paso_bebe_paso_gigante(self.P, k * self.P, 1964, tam_tabla=10) == k
+
+    @settings(deadline=None, max_examples=20)
+    @given(integers(min_value=0), integers(min_value=2, max_value=1000))
+    def test_cuerpo_primo(self, k, base):
+        # 2^31 - 2 = 2 3^2 7 11 31 151 331
+        Z = Zp(2**31 - 1)
+        g = Z(base)
+        n = orden_elemento(g)
+        assert pohlig_hellman(g, g ** k) == k % n
+
+    @settings(deadline=None, max_examples=10)
+    @given(integers(min_value=0))
+    def test_cuerpo_no_primo(self, k):
+        F = Fq(3, 7, PolinomioZp([1, 0, 2, 0, 0, 0, 0, 1], 3))
+        g = F([0, 1])
+        n = orden_elemento(g)
+        assert pohlig_hellman(g, g ** k) == k % n
+
+    def test_factor_grande(self):
+        # p = 2 q + 1 con q primo de 31 bits: se usa el método rho
+        p, q = 2147483783, 1073741891
+        g = Zp(p)(4)
+        assert orden_elemento(g) == q
+        assert pohlig_hellman(g, g ** 987654321, orden=q, tam_tabla=16) == 987654321
+
+    def test_no_pertenece(self):
+        Z = Zp(1009)
+        with self.assertRaises(ValueError):
+            pohlig_hellman(Z(11) ** 2, Z(11))
+        with self.assertRaises(ValueError):
+            paso_bebe_paso_gigante(Z(11) ** 2, Z(11), 504)
+
+    def test_no_pertenece_factor_grande(self):
+        # con tam_tabla pequeño el factor primo grande usaría el método rho,
+        # que no termina si h no está en el subgrupo
+        p, q = 2147483783, 1073741891
+        g = Zp(p)(4)
+        with self.assertRaises(ValueError):
+            pohlig_hellman(g, -g ** 5, orden=q, tam_tabla=16)
+        # E(F_p) = Z/2 x Z/1964: los puntos de orden 2 son (50, 0), que no
+        # es múltiplo de P, y 982 P
+        T = self.E(50, 0)
+        assert T != 982 * self.P
+        for Q in [self.P + T, T]:
+            with self.assertRaises(ValueError):
+                pohlig_hellman(self.P, Q, tam_tabla=2)
+
+
+def load_tests(loader, tests, ignore):
+    """Añade los ejemplos insertados en los docstring."""
+    tests.addTests(doctest.DocTestSuite(logaritmo_discreto))
+    return tests
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import sys
+sys.path.append('../ccepy')
+import unittest
+import doctest
+import os
+import tempfile
+import threading
+
+from ccepy import trazas
+from ccepy.trazas import tramo, trazando, activa_trazas, desactiva_trazas, Histograma
+from ccepy.esquemas_criptograficos import ECDH, ECDSA
+from ccepy.listado_curvas_elipticas import parametros_dominio
+
+
+class TestTrazas(unittest.TestCase):
+    """Conjuto de test para las trazas"""
+    @classmethod
+    def setUpClass(cls):
+        cls.E, cls.G, cls.orden = parametros_dominio('NIST P-224')
+
+    def tearDown(self):
+        desactiva_trazas()
+
+    def test_fases(self):
+        alicia = ECDSA(self.E, self.G, self.orden)
+        bob = ECDH(self.E, self.G, self.orden)
+        with trazando() as histograma:
+            r, s = alicia.firma("mensaje")
+            assert alicia.verifica("mensaje", r, s, alicia.llave_publica)
+            bob.calcula_secreto_compartido(alicia.llave_publica)
+            bob.calcula_secretos_compartidos([alicia.llave_publica, bob.llave_publica])
+        for nombre in ["ECDSA.firma/nonce", "ECDSA.firma/hash", "ECDSA.firma/inversion",
+                       "ECDSA.firma/multiplicacion_escalar/inversion",
+                       "ECDSA.verifica/hash", "ECDSA.verifica/multiplicacion_escalar",
+                       "ECDH.calcula_secreto_compartido/multiplicacion_escalar",
+                       "ECDH.calcula_secretos_compartidos/multiplicacion_escalar"]:
+            assert nombre in histograma.tramos, nombre
+        assert histograma.tramos["ECDSA.verifica/multiplicacion_escalar"].llamadas == 2
+        firma = histograma.tramos["ECDSA.firma"]
+        assert 0 < firma.minimo <= firma.media() <= firma.percentil(50) <= firma.maximo
+
+    def test_desactivadas(self):
+        histograma = Histograma()
+        with trazando(histograma):
+            pass
+        with tramo("operacion"):
+            pass
+        assert histograma.tramos == {}
+        assert tramo("operacion") is tramo("otra")
+
+    def test_muestreo(self):
+        histograma = activa_trazas(muestreo=4)
+        todas = []
+        activa_trazas(lambda nombre, segundos: todas.append(nombre))
+        for _ in range(10):
+            with tramo("operacion"):
+                with tramo("fase"):
+                    pass
+        assert histograma.tramos["operacion"].llamadas == 3  # operaciones 1, 5 y 9
+        assert histograma.tramos["operacion/fase"].llamadas == 3
+        assert len(todas) == 20
+
+    def test_hilos(self):
+        histograma = activa_trazas()
+        muestreado = activa_trazas(muestreo=2)
+        hilos, repeticiones = 4, 50
+        barrera = threading.Barrier(hilos)
+
+        def trabaja(i):
+            for _ in range(repeticiones):
+                with tramo("T{0}".format(i)):
+                    # todos los hilos tienen abierto su tramo a la vez
+                    barrera.wait()
+                    with tramo("fase"):
+                        barrera.wait()
+
+        trabajadores = [threading.Thread(target=trabaja, args=(i,)) for i in range(hilos)]
+        for trabajador in trabajadores:
+            trabajador.start()
+        for trabajador in trabajadores:
+            trabajador.join()
+        nombres = ["T{0}".format(i) for i in range(hilos)]
+        assert sorted(histograma.tramos) == sorted(nombres + [n + "/fase" for n in nombres])
+        assert all(e.llamadas == repeticiones for e in histograma.tramos.values())
+        assert sum(muestreado.tramos[n].llamadas for n in nombres) == hilos * repeticiones // 2
+
+    def test_excepcion(self):
+        with trazando() as histograma:
+            with self.assertRaises(ZeroDivisionError):
+                with tramo("operacion"):
+                    1 / 0
+            with tramo("otra"):
+                pass
+        assert sorted(histograma.tramos) == ["operacion", "otra"]
+
+    def test_exporta_carga(self):
+        histograma = Histograma()
+        for segundos in [1e-6, 3e-6, 2e-3]:
+            histograma("ECDH/fase", segundos)
+        histograma("ECDSA", 0.5)
+        descriptor, ruta = tempfile.mkstemp()
+        os.close(descriptor)
+        try:
+            histograma.exporta(ruta)
+            cargado = Histograma.carga(ruta)
+        finally:
+            os.remove(ruta)
+        assert sorted(cargado.tramos) == sorted(histograma.tramos)
+        for nombre, estadistica in histograma.tramos.items():
+            for atributo in estadistica.__slots__:
+                assert getattr(cargado.tramos[nombre], atributo) == getattr(estadistica, atributo)
+
+        cargado.fusiona(histograma)
+        assert cargado.tramos["ECDH/fase"].llamadas == 6
+        assert cargado.tramos["ECDH/fase"].maximo == 2e-3
+
+
+def load_tests(loader, tests, ignore):
+    """Añade los ejemplos insertados en los docstring."""
+    tests.addTests(doctest.DocTestSuite(trazas))
+    return tests
+
+
+if __name__ == '__main__':
+    unittest.main()